@@ -1,13 +1,159 @@
-from prisma import Prisma
+import asyncio
+import os
+import time
 from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from fastapi import HTTPException
+from prisma import Prisma
+
+from services.query_profiler import instrument
+
+# 데이터베이스 연결 수명 관리
+# - 연결은 서버 시작 시 한 번만 맺고(lifespan), 요청 경로에서는 connect를 호출하지 않음
+# - 쿼리 엔진의 커넥션 풀 크기/대기 시간은 DATABASE_URL의 connection_limit/pool_timeout으로 설정
+# - DB를 조회하는 핸들러만 get_db 의존성으로 풀 슬롯을 받아 주입된 클라이언트를 사용 (사용 중/대기 시간/타임아웃 집계)
+# - 캐시로 응답할 수 있는 핸들러는 캐시 미스일 때만 db_pool.acquire()로 슬롯을 잡음
+
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "10"))
+DB_WARMUP_CONNECTIONS = int(os.getenv("DB_WARMUP_CONNECTIONS", str(min(DB_POOL_SIZE, 4))))
+
+
+def _pooled_url(url: Optional[str]) -> Optional[str]:
+    """DATABASE_URL에 풀 설정이 없으면 connection_limit/pool_timeout을 추가합니다."""
+    if not url:
+        return None
+    parts = urlsplit(url)
+    query = dict(parse_qsl(parts.query))
+    query.setdefault("connection_limit", str(DB_POOL_SIZE))
+    query.setdefault("pool_timeout", str(int(DB_POOL_TIMEOUT)))
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
+_database_url = _pooled_url(os.getenv("DATABASE_URL"))
 
 # Prisma 클라이언트 인스턴스 생성
-prisma = Prisma()
+prisma = Prisma(datasource={"url": _database_url}) if _database_url else Prisma()
+# 요청별 쿼리 수/시간 기록 (services/query_profiler.py)
+instrument(prisma)
 
-@asynccontextmanager
-async def get_prisma():
+
+class DatabasePoolTimeout(Exception):
+    pass
+
+
+class DatabasePool:
+    """Prisma 클라이언트의 연결 수명과 요청별 풀 슬롯을 관리합니다."""
+
+    def __init__(self, client: Prisma, size: int = DB_POOL_SIZE, timeout: float = DB_POOL_TIMEOUT):
+        self.client = client
+        self.size = size
+        self.timeout = timeout
+        self._slots = asyncio.Semaphore(size)
+        self._connect_lock = asyncio.Lock()
+        self.in_use = 0
+        self.waiting = 0
+        self.acquired_total = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    # ---- 수명 관리 ----
+
+    async def connect(self, warm_up: int = DB_WARMUP_CONNECTIONS) -> None:
+        """연결을 맺고 풀의 일부 커넥션을 미리 열어 둡니다."""
+        async with self._connect_lock:
+            if not self.client.is_connected():
+                await self.client.connect()
+        if warm_up > 0:
+            await asyncio.gather(*(self.client.query_raw("SELECT 1") for _ in range(warm_up)))
+
+    async def disconnect(self) -> None:
+        async with self._connect_lock:
+            if self.client.is_connected():
+                await self.client.disconnect()
+
+    async def health(self) -> Dict[str, Any]:
+        """SELECT 1 응답 시간과 풀 상태를 반환합니다."""
+        started = time.perf_counter()
+        try:
+            await self.client.query_raw("SELECT 1")
+            status = "ok"
+            error = None
+        except Exception as e:
+            status = "error"
+            error = str(e)
+        return {
+            "status": status,
+            "error": error,
+            "connected": self.client.is_connected(),
+            "latency_ms": round((time.perf_counter() - started) * 1000, 2),
+            "pool": self.metrics(),
+        }
+
+    # ---- 풀 슬롯 ----
+
+    async def reserve(self) -> None:
+        """풀 슬롯 하나를 기다려 확보합니다. timeout을 넘기면 DatabasePoolTimeout."""
+        started = time.perf_counter()
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), timeout=self.timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise DatabasePoolTimeout(f"{self.timeout}초 동안 데이터베이스 연결을 얻지 못했습니다.")
+        finally:
+            self.waiting -= 1
+
+        waited = time.perf_counter() - started
+        self.acquired_total += 1
+        self.wait_time_total += waited
+        self.wait_time_max = max(self.wait_time_max, waited)
+        self.in_use += 1
+
+    def release(self) -> None:
+        self.in_use -= 1
+        self._slots.release()
+
+    @asynccontextmanager
+    async def acquire(self):
+        await self.reserve()
+        try:
+            yield self.client
+        finally:
+            self.release()
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "size": self.size,
+            "in_use": self.in_use,
+            "waiting": self.waiting,
+            "acquired_total": self.acquired_total,
+            "timeouts": self.timeouts,
+            "wait_time_avg_ms": round(self.wait_time_total / self.acquired_total * 1000, 3) if self.acquired_total else 0.0,
+            "wait_time_max_ms": round(self.wait_time_max * 1000, 3),
+        }
+
+
+db_pool = DatabasePool(prisma)
+
+
+async def get_db():
+    """FastAPI 의존성: 연결된 Prisma 클라이언트를 풀 슬롯과 함께 제공합니다."""
+    try:
+        await db_pool.reserve()
+    except DatabasePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     try:
-        await prisma.connect()
-        yield prisma
+        yield db_pool.client
     finally:
-        await prisma.disconnect() 
\ No newline at end of file
+        db_pool.release()
+
+
+@asynccontextmanager
+async def get_prisma():
+    """요청 경로 밖에서 사용하는 풀 슬롯 (연결/해제는 lifespan에서 관리)"""
+    async with db_pool.acquire() as client:
+        yield client
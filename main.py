@@ -1,23 +1,79 @@
 from fastapi import FastAPI, Request
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from contextlib import asynccontextmanager
 import os
 import logging
-from db.client import prisma
+import time
+from db.client import db_pool
+from services.civ_profiles import civ_profiles
+from services.game_catalog import game_catalog
+from services.catalog_views import catalog_views
+from services.ai_planner import ai_planner
+from services.snapshot_retention import snapshot_retention
+from services.game_pool import game_pool
+from services.game_aggregate import begin_scope, end_scope, game_aggregates
+from services.compression import RESPONSE_COMPRESSION, CompressionMiddleware, compression_cache
+from services.query_profiler import (
+    DB_QUERY_DEBUG_HEADERS,
+    begin_request,
+    end_request,
+    route_query_metrics,
+)
+from services.game_state_cache import game_state_cache
+from services.metrics import (
+    CACHE_REQUESTS,
+    DB_POOL_ACQUIRED,
+    DB_POOL_CONNECTIONS,
+    DB_POOL_TIMEOUTS,
+    HTTP_REQUEST_DURATION,
+    WEBSOCKET_CONNECTIONS,
+    registry as metrics_registry,
+)
 
 from routers import game, map, websocket, research, city, unit, building
 from routers import diplomacy
+from routers import catalog
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 애플리케이션 시작 시 실행
     print("서버가 시작되었습니다.")
-    await prisma.connect()
+    # 데이터베이스 연결 및 커넥션 풀 워밍업 (요청 경로에서는 연결하지 않음)
+    await db_pool.connect()
+    # 문명/지도자 프로필 캐시 적재
+    try:
+        count = await civ_profiles.preload()
+        print(f"문명 프로필 {count}개를 캐시에 적재했습니다.")
+    except Exception as e:
+        print(f"문명 프로필 캐시 적재 실패 (요청 시 개별 적재): {str(e)}")
+    # 건물/유닛/기술 카탈로그 적재 (AI 의사결정 중 DB 조회 없음)
+    try:
+        count = await game_catalog.preload()
+        print(f"게임 카탈로그 {count}개 항목을 캐시에 적재했습니다.")
+        # 카탈로그 목록 API의 필터별 응답/ETag를 미리 만들어 둠
+        views = catalog_views.build()
+        print(f"카탈로그 응답 {views}개를 미리 만들었습니다.")
+    except Exception as e:
+        print(f"게임 카탈로그 적재 실패 (처음 사용할 때 적재): {str(e)}")
+    # 외교 세션 write-behind 작업 시작
+    diplomacy.session_store.start()
+    # 턴 스냅샷 보존/압축 작업 시작
+    snapshot_retention.start()
+    # 게임 요약 백그라운드 작업 시작
+    game.summary_worker.start()
+    # 미리 생성해 둔 게임 풀 보충 작업 시작
+    game_pool.start()
     yield
     # 애플리케이션 종료 시 실행
     print("서버가 종료되었습니다.")
-    await prisma.disconnect()
+    await game_pool.stop()
+    await ai_planner.stop()
+    await game.summary_worker.stop()
+    await snapshot_retention.stop()
+    # 남은 외교 세션 변경 사항을 DB에 반영한 뒤 연결 종료
+    await diplomacy.session_store.stop()
+    await db_pool.disconnect()
 
 app = FastAPI(title="Civilization LLM Game API", lifespan=lifespan)
 
@@ -30,6 +86,31 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 응답 압축 (Accept-Encoding 협상, 최소 크기 이상만, ETag 있는 응답은 압축 본문 캐시 재사용)
+if RESPONSE_COMPRESSION:
+    app.add_middleware(CompressionMiddleware)
+
+# 요청 처리 시간과 요청별 DB 쿼리 수/시간 기록 (디버그 모드에서는 쿼리 정보를 응답 헤더로 노출)
+# 요청마다 게임 집계 메모 범위도 열어서 같은 요청 안의 반복 조회는 DB를 읽지 않음
+@app.middleware("http")
+async def instrument_request(request: Request, call_next):
+    started = time.perf_counter()
+    stats, token = begin_request()
+    scope_token = begin_scope()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+    finally:
+        end_scope(scope_token)
+        end_request(token)
+        route = getattr(request.scope.get("route"), "path", "unmatched")
+        HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, method=request.method, route=route, status=status)
+    route_query_metrics.observe(f"{request.method} {route}", stats)
+    if DB_QUERY_DEBUG_HEADERS:
+        response.headers.update(stats.headers())
+    return response
+
 # 로깅 설정
 logging.basicConfig(
     level=logging.INFO,
@@ -47,12 +128,60 @@ app.include_router(research.router, prefix="/technologies", tags=["Technologies"
 app.include_router(building.router, prefix="/buildings", tags=["Buildings"])
 app.include_router(websocket.router, prefix="/ws", tags=["WebSocket"])
 app.include_router(diplomacy.router, prefix="/diplomacy", tags=["Diplomacy"])
+app.include_router(catalog.router, prefix="/catalog", tags=["Catalog"])
 # app.include_router(city.router, prefix="/city", tags=["City"])
 
 @app.get("/")
 async def root():
     return {"message": "문명 게임 서버에 오신 것을 환영합니다!"}
 
+@app.get("/health", tags=["Health"])
+async def health():
+    """데이터베이스 연결 상태와 커넥션 풀 지표를 반환합니다."""
+    db_health = await db_pool.health()
+    return JSONResponse(
+        status_code=200 if db_health["status"] == "ok" else 503,
+        content={"success": db_health["status"] == "ok", "data": {"database": db_health}, "error": db_health["error"]},
+    )
+
+@metrics_registry.on_collect
+def collect_runtime_metrics():
+    # 캐시/연결/풀 상태는 각 모듈이 이미 집계하므로 /metrics 요청 때만 읽어서 반영
+    for cache, stats in (
+        ("game_state", game_state_cache.stats),
+        ("civ_profiles", civ_profiles.stats),
+        ("game_catalog", game_catalog.stats),
+        ("catalog_views", catalog_views.stats),
+        ("ai_plans", ai_planner.stats),
+        ("diplomacy_sessions", diplomacy.session_store.stats),
+        ("game_pool", game_pool.stats),
+        ("game_aggregates", game_aggregates.stats),
+        ("compressed_responses", compression_cache.stats),
+    ):
+        CACHE_REQUESTS.set_total(stats["hits"], cache=cache, result="hit")
+        CACHE_REQUESTS.set_total(stats["misses"], cache=cache, result="miss")
+    WEBSOCKET_CONNECTIONS.set(len(websocket.manager.active_connections), manager="chat")
+    WEBSOCKET_CONNECTIONS.set(len(diplomacy.ws_manager.active_connections), manager="diplomacy")
+    pool = db_pool.metrics()
+    DB_POOL_CONNECTIONS.set(pool["size"], state="size")
+    DB_POOL_CONNECTIONS.set(pool["in_use"], state="in_use")
+    DB_POOL_CONNECTIONS.set(pool["waiting"], state="waiting")
+    DB_POOL_ACQUIRED.set_total(pool["acquired_total"])
+    DB_POOL_TIMEOUTS.set_total(pool["timeouts"])
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 텍스트 포맷 지표"""
+    return PlainTextResponse(metrics_registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/internal/db-queries", include_in_schema=False)
+async def db_query_metrics(reset: bool = False):
+    """라우트별 요청당 쿼리 수/DB 시간 히스토그램과 자주 반복되는 쿼리, 가장 느린 쿼리를 반환합니다."""
+    data = route_query_metrics.snapshot()
+    if reset:
+        route_query_metrics.reset()
+    return {"success": True, "data": data, "error": None}
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception):
     return JSONResponse(
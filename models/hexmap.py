@@ -1,6 +1,6 @@
 from enum import Enum
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 class TerrainType(str, Enum):
     """지형 타입 열거형"""
@@ -24,22 +24,29 @@ class ResourceType(str, Enum):
     GOLD = "금"
     FISH = "물고기"
 
+def _fill_cube_s(model):
+    """s가 없으면 -q-r로 채우고, 있으면 q + r + s = 0인지 검사합니다."""
+    if model.s is None:
+        model.s = -model.q - model.r
+    elif model.q + model.r + model.s != 0:
+        raise ValueError("육각형 좌표는 q + r + s = 0이어야 합니다.")
+    return model
+
 class HexCoord(BaseModel):
     """육각형 좌표 모델"""
     q: int = Field(..., description="육각형 Q 좌표")
     r: int = Field(..., description="육각형 R 좌표")
-    s: int = Field(..., description="육각형 S 좌표 (Q + R + S = 0)")
+    s: Optional[int] = Field(None, description="육각형 S 좌표 (Q + R + S = 0, 생략하면 계산)")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if "s" not in data:
-            self.s = -self.q - self.r
+    @model_validator(mode="after")
+    def fill_s(self) -> "HexCoord":
+        return _fill_cube_s(self)
 
 class HexTile(BaseModel):
     """육각형 타일 모델"""
     q: int = Field(..., description="육각형 Q 좌표")
     r: int = Field(..., description="육각형 R 좌표")
-    s: int = Field(..., description="육각형 S 좌표")
+    s: Optional[int] = Field(None, description="육각형 S 좌표 (생략하면 계산)")
     terrain: TerrainType = Field(..., description="지형 타입")
     resource: Optional[ResourceType] = Field(None, description="자원 타입")
     visible: bool = Field(False, description="시야 범위 내 보이는지 여부")
@@ -48,10 +55,9 @@ class HexTile(BaseModel):
     unit_id: Optional[str] = Field(None, description="유닛 ID")
     occupant: Optional[str] = Field(None, description="점령 문명")
 
-    def __init__(self, **data):
-        super().__init__(**data)
-        if "s" not in data:
-            self.s = -self.q - self.r
+    @model_validator(mode="after")
+    def fill_s(self) -> "HexTile":
+        return _fill_cube_s(self)
 
 class Civilization(BaseModel):
     """문명 모델"""
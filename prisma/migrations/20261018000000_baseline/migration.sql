@@ -0,0 +1,443 @@
+-- 기준(baseline) 마이그레이션: 마이그레이션 도입 이전 스키마(db push로 만든 테이블) 전체
+-- 빈 DB에서는 `prisma migrate deploy`가 이 마이그레이션부터 순서대로 적용합니다.
+-- 이미 테이블이 있는 기존 DB는 이 마이그레이션을 적용된 것으로 표시한 뒤 나머지를 적용합니다:
+--   prisma migrate resolve --applied 20261018000000_baseline
+--   prisma migrate deploy
+
+-- CreateTable
+CREATE TABLE `Game` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `mapRadius` INTEGER NOT NULL,
+    `turnLimit` INTEGER NOT NULL,
+    `userName` VARCHAR(100) NOT NULL,
+    `year` INTEGER NOT NULL DEFAULT 1000,
+    `currentTurn` INTEGER NOT NULL DEFAULT 1,
+
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `CivType` (
+    `id` INTEGER NOT NULL AUTO_INCREMENT,
+    `name` VARCHAR(100) NOT NULL,
+    `personality` ENUM('Diplomat', 'Warlike', 'Pacifist', 'Trader') NOT NULL,
+    `leaderName` VARCHAR(100) NOT NULL,
+
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `GameCiv` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `civTypeId` INTEGER NOT NULL,
+    `gameId` BIGINT NOT NULL,
+    `isPlayer` BOOLEAN NOT NULL,
+    `startQ` INTEGER NOT NULL,
+    `startR` INTEGER NOT NULL,
+    `food` INTEGER NOT NULL DEFAULT 0,
+    `production` INTEGER NOT NULL DEFAULT 0,
+    `gold` INTEGER NOT NULL DEFAULT 30,
+    `science` INTEGER NOT NULL DEFAULT 5,
+    `culture` INTEGER NOT NULL DEFAULT 0,
+
+    INDEX `GameCiv_civTypeId_fkey`(`civTypeId`),
+    INDEX `GameCiv_gameId_fkey`(`gameId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `MapTile` (
+    `q` INTEGER NOT NULL,
+    `r` INTEGER NOT NULL,
+    `terrain` VARCHAR(100) NOT NULL,
+    `resource` ENUM('NoResource', 'Food', 'Production', 'Gold', 'Science') NOT NULL,
+    `gameId` BIGINT NOT NULL,
+
+    PRIMARY KEY (`gameId`, `q`, `r`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `City` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `name` VARCHAR(100) NOT NULL,
+    `q` INTEGER NOT NULL,
+    `r` INTEGER NOT NULL,
+    `population` INTEGER NOT NULL,
+    `createdTurn` INTEGER NOT NULL,
+    `food` INTEGER NOT NULL DEFAULT 20,
+    `production` INTEGER NOT NULL DEFAULT 10,
+    `gameCivId` BIGINT NOT NULL,
+
+    INDEX `City_gameCivId_fkey`(`gameCivId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `Technology` (
+    `id` INTEGER NOT NULL AUTO_INCREMENT,
+    `name` VARCHAR(100) NOT NULL,
+    `description` TEXT NOT NULL,
+    `era` ENUM('Medieval', 'Industrial', 'Modern') NOT NULL,
+    `researchCost` INTEGER NOT NULL,
+    `researchTimeModifier` DOUBLE NOT NULL,
+    `treeType` VARCHAR(100) NOT NULL,
+
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `Prerequisite` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `prereqId` INTEGER NOT NULL,
+    `techId` INTEGER NOT NULL,
+
+    INDEX `Prerequisite_prereqId_fkey`(`prereqId`),
+    INDEX `Prerequisite_techId_fkey`(`techId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `GameCivTechnology` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `status` ENUM('locked', 'available', 'in_progress', 'completed') NOT NULL,
+    `completedAt` DATETIME(3) NULL,
+    `gameCivId` BIGINT NOT NULL,
+    `progressPoints` INTEGER NOT NULL DEFAULT 0,
+    `startedAt` DATETIME(3) NULL,
+    `techId` INTEGER NOT NULL,
+
+    INDEX `GameCivTechnology_gameCivId_fkey`(`gameCivId`),
+    INDEX `GameCivTechnology_techId_fkey`(`techId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `TreeSelection` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `gameCivId` BIGINT NOT NULL,
+    `isMain` BOOLEAN NOT NULL,
+    `selectedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `treeType` VARCHAR(100) NOT NULL,
+
+    INDEX `TreeSelection_gameCivId_fkey`(`gameCivId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `ResearchQueue` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `addedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `gameCivId` BIGINT NOT NULL,
+    `queuePosition` INTEGER NOT NULL,
+    `techId` INTEGER NOT NULL,
+
+    INDEX `ResearchQueue_gameCivId_fkey`(`gameCivId`),
+    INDEX `ResearchQueue_techId_fkey`(`techId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `UnitType` (
+    `id` INTEGER NOT NULL AUTO_INCREMENT,
+    `name` VARCHAR(100) NOT NULL,
+    `category` ENUM('Melee', 'Ranged', 'Cavalry', 'Siege', 'Modern', 'Civilian') NOT NULL,
+    `era` ENUM('Medieval', 'Industrial', 'Modern') NOT NULL,
+    `maintenance` INTEGER NOT NULL,
+    `movement` INTEGER NOT NULL,
+    `sight` INTEGER NOT NULL,
+    `buildTime` INTEGER NOT NULL,
+    `prereqTechId` INTEGER NULL,
+
+    INDEX `UnitType_prereqTechId_fkey`(`prereqTechId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `GameUnit` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `q` INTEGER NOT NULL,
+    `r` INTEGER NOT NULL,
+    `hp` INTEGER NOT NULL,
+    `moved` BOOLEAN NOT NULL DEFAULT false,
+    `createdTurn` INTEGER NOT NULL,
+    `gameCivId` BIGINT NOT NULL,
+    `promotionLevel` INTEGER NOT NULL DEFAULT 0,
+    `unitTypeId` INTEGER NOT NULL,
+
+    INDEX `GameUnit_gameCivId_fkey`(`gameCivId`),
+    INDEX `GameUnit_unitTypeId_fkey`(`unitTypeId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `ProductionQueue` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `addedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `cityId` BIGINT NOT NULL,
+    `itemId` INTEGER NOT NULL,
+    `itemType` ENUM('unit', 'building') NOT NULL,
+    `queueOrder` INTEGER NOT NULL,
+    `turnsLeft` INTEGER NOT NULL,
+
+    INDEX `ProductionQueue_cityId_fkey`(`cityId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `Building` (
+    `id` INTEGER NOT NULL AUTO_INCREMENT,
+    `name` VARCHAR(100) NOT NULL,
+    `category` VARCHAR(100) NOT NULL,
+    `description` TEXT NOT NULL,
+    `buildTime` INTEGER NOT NULL,
+    `maintenanceCost` INTEGER NOT NULL,
+    `prerequisiteTechId` INTEGER NULL,
+    `resourceCost` INTEGER NOT NULL,
+
+    INDEX `Building_prerequisiteTechId_fkey`(`prerequisiteTechId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `PlayerBuilding` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `status` ENUM('queued', 'in_progress', 'completed') NOT NULL,
+    `buildingId` INTEGER NOT NULL,
+    `cityId` BIGINT NOT NULL,
+    `completedAt` DATETIME(3) NULL,
+    `gameCivId` BIGINT NOT NULL,
+    `startedAt` DATETIME(3) NULL,
+
+    INDEX `PlayerBuilding_buildingId_fkey`(`buildingId`),
+    INDEX `PlayerBuilding_cityId_fkey`(`cityId`),
+    INDEX `PlayerBuilding_gameCivId_fkey`(`gameCivId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `BuildQueue` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `addedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `buildingId` INTEGER NOT NULL,
+    `cityId` BIGINT NOT NULL,
+    `queuePosition` INTEGER NOT NULL,
+
+    INDEX `BuildQueue_buildingId_fkey`(`buildingId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `DiplomacySession` (
+    `personality` ENUM('Diplomat', 'Warlike', 'Pacifist', 'Trader') NOT NULL,
+    `aiCivId` BIGINT NOT NULL,
+    `gameCivId` BIGINT NOT NULL,
+    `relationshipScore` INTEGER NOT NULL,
+    `sessionId` BIGINT NOT NULL AUTO_INCREMENT,
+
+    INDEX `DiplomacySession_aiCivId_fkey`(`aiCivId`),
+    INDEX `DiplomacySession_gameCivId_fkey`(`gameCivId`),
+    PRIMARY KEY (`sessionId`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `DiplomacyAction` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `turn` INTEGER NOT NULL,
+    `terms` JSON NOT NULL,
+    `delta` INTEGER NOT NULL,
+    `actionType` ENUM('declare_friendship', 'propose_trade', 'declare_war', 'make_peace', 'offer_alliance') NOT NULL,
+    `newScore` INTEGER NOT NULL,
+    `sessionId` BIGINT NOT NULL,
+
+    INDEX `DiplomacyAction_sessionId_fkey`(`sessionId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `AdviceRequest` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `turn` INTEGER NOT NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `gameCivId` BIGINT NOT NULL,
+    `usedCount` INTEGER NOT NULL,
+
+    INDEX `AdviceRequest_gameCivId_fkey`(`gameCivId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `TurnSnapshot` (
+    `year` INTEGER NOT NULL,
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `civId` BIGINT NOT NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `updatedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `diplomacyState` JSON NOT NULL,
+    `gameId` BIGINT NOT NULL,
+    `observedMap` JSON NOT NULL,
+    `productionState` JSON NOT NULL,
+    `researchState` JSON NOT NULL,
+    `resourceState` JSON NULL,
+    `stateData` JSON NULL,
+    `playerResources` JSON NULL,
+    `turnNumber` INTEGER NOT NULL,
+
+    INDEX `TurnSnapshot_gameId_fkey`(`gameId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `LeaderProfile` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `backstory` VARCHAR(191) NULL,
+    `personality` ENUM('Diplomat', 'Warlike', 'Pacifist', 'Trader') NOT NULL,
+    `civTypeId` INTEGER NOT NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `fullName` VARCHAR(100) NOT NULL,
+    `imageUrl` VARCHAR(255) NULL,
+    `preferredVictories` VARCHAR(191) NULL,
+    `updatedAt` DATETIME(3) NOT NULL,
+
+    UNIQUE INDEX `LeaderProfile_civTypeId_key`(`civTypeId`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- CreateTable
+CREATE TABLE `GameSummary` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `gameId` VARCHAR(191) NOT NULL,
+    `userId` VARCHAR(191) NULL,
+    `turn` INTEGER NOT NULL,
+    `year` INTEGER NULL,
+    `difficulty` VARCHAR(191) NULL,
+    `mapType` VARCHAR(191) NULL,
+    `gameMode` VARCHAR(191) NULL,
+    `victoryType` VARCHAR(191) NULL,
+    `startTime` DATETIME(3) NULL,
+    `endTime` DATETIME(3) NULL,
+    `totalPlayTime` INTEGER NULL,
+    `civilizationId` INTEGER NULL,
+    `civilizationName` VARCHAR(191) NULL,
+    `leaderName` VARCHAR(191) NULL,
+    `resources` JSON NOT NULL,
+    `cities` JSON NOT NULL,
+    `totalCities` INTEGER NOT NULL,
+    `capitalCity` JSON NULL,
+    `capturedCities` INTEGER NOT NULL DEFAULT 0,
+    `foundedCities` INTEGER NOT NULL DEFAULT 0,
+    `units` JSON NOT NULL,
+    `totalUnits` INTEGER NOT NULL,
+    `militaryUnits` INTEGER NOT NULL,
+    `civilianUnits` INTEGER NOT NULL,
+    `unitsLost` INTEGER NOT NULL DEFAULT 0,
+    `unitsKilled` INTEGER NOT NULL DEFAULT 0,
+    `completedTechnologies` JSON NOT NULL,
+    `currentResearch` JSON NULL,
+    `researchProgress` INTEGER NULL,
+    `researchQueue` JSON NOT NULL,
+    `totalTechsResearched` INTEGER NOT NULL,
+    `techEra` VARCHAR(191) NULL,
+    `selectedTechTrees` JSON NOT NULL,
+    `diplomacyStates` JSON NOT NULL,
+    `wars` INTEGER NOT NULL DEFAULT 0,
+    `alliances` INTEGER NOT NULL DEFAULT 0,
+    `trades` INTEGER NOT NULL DEFAULT 0,
+    `battles` JSON NOT NULL,
+    `territoryCaptured` INTEGER NOT NULL DEFAULT 0,
+    `territoryLost` INTEGER NOT NULL DEFAULT 0,
+    `successfulDefenses` INTEGER NOT NULL DEFAULT 0,
+    `successfulAttacks` INTEGER NOT NULL DEFAULT 0,
+    `events` JSON NOT NULL,
+    `actionCounts` JSON NOT NULL,
+    `exploredTiles` INTEGER NOT NULL,
+    `visibleTiles` INTEGER NOT NULL,
+    `unexploredTiles` INTEGER NOT NULL,
+    `resourceLocations` JSON NOT NULL,
+    `totalScore` INTEGER NOT NULL,
+    `scoreComponents` JSON NOT NULL,
+    `achievements` JSON NOT NULL,
+    `milestones` JSON NOT NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+    `updatedAt` DATETIME(3) NOT NULL,
+
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `GameCiv` ADD CONSTRAINT `GameCiv_civTypeId_fkey` FOREIGN KEY (`civTypeId`) REFERENCES `CivType`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `GameCiv` ADD CONSTRAINT `GameCiv_gameId_fkey` FOREIGN KEY (`gameId`) REFERENCES `Game`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `MapTile` ADD CONSTRAINT `MapTile_gameId_fkey` FOREIGN KEY (`gameId`) REFERENCES `Game`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `City` ADD CONSTRAINT `City_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `Prerequisite` ADD CONSTRAINT `Prerequisite_prereqId_fkey` FOREIGN KEY (`prereqId`) REFERENCES `Technology`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `Prerequisite` ADD CONSTRAINT `Prerequisite_techId_fkey` FOREIGN KEY (`techId`) REFERENCES `Technology`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `GameCivTechnology` ADD CONSTRAINT `GameCivTechnology_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `GameCivTechnology` ADD CONSTRAINT `GameCivTechnology_techId_fkey` FOREIGN KEY (`techId`) REFERENCES `Technology`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `TreeSelection` ADD CONSTRAINT `TreeSelection_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `ResearchQueue` ADD CONSTRAINT `ResearchQueue_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `ResearchQueue` ADD CONSTRAINT `ResearchQueue_techId_fkey` FOREIGN KEY (`techId`) REFERENCES `Technology`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `UnitType` ADD CONSTRAINT `UnitType_prereqTechId_fkey` FOREIGN KEY (`prereqTechId`) REFERENCES `Technology`(`id`) ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `GameUnit` ADD CONSTRAINT `GameUnit_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `GameUnit` ADD CONSTRAINT `GameUnit_unitTypeId_fkey` FOREIGN KEY (`unitTypeId`) REFERENCES `UnitType`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `ProductionQueue` ADD CONSTRAINT `ProductionQueue_cityId_fkey` FOREIGN KEY (`cityId`) REFERENCES `City`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `Building` ADD CONSTRAINT `Building_prerequisiteTechId_fkey` FOREIGN KEY (`prerequisiteTechId`) REFERENCES `Technology`(`id`) ON DELETE SET NULL ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `PlayerBuilding` ADD CONSTRAINT `PlayerBuilding_buildingId_fkey` FOREIGN KEY (`buildingId`) REFERENCES `Building`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `PlayerBuilding` ADD CONSTRAINT `PlayerBuilding_cityId_fkey` FOREIGN KEY (`cityId`) REFERENCES `City`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `PlayerBuilding` ADD CONSTRAINT `PlayerBuilding_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `BuildQueue` ADD CONSTRAINT `BuildQueue_buildingId_fkey` FOREIGN KEY (`buildingId`) REFERENCES `Building`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `DiplomacySession` ADD CONSTRAINT `DiplomacySession_aiCivId_fkey` FOREIGN KEY (`aiCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `DiplomacySession` ADD CONSTRAINT `DiplomacySession_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `DiplomacyAction` ADD CONSTRAINT `DiplomacyAction_sessionId_fkey` FOREIGN KEY (`sessionId`) REFERENCES `DiplomacySession`(`sessionId`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `AdviceRequest` ADD CONSTRAINT `AdviceRequest_gameCivId_fkey` FOREIGN KEY (`gameCivId`) REFERENCES `GameCiv`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `TurnSnapshot` ADD CONSTRAINT `TurnSnapshot_gameId_fkey` FOREIGN KEY (`gameId`) REFERENCES `Game`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
+
+-- AddForeignKey
+ALTER TABLE `LeaderProfile` ADD CONSTRAINT `LeaderProfile_civTypeId_fkey` FOREIGN KEY (`civTypeId`) REFERENCES `CivType`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
@@ -0,0 +1,49 @@
+-- 턴 처리 핫 쿼리용 복합 인덱스
+-- 새 인덱스를 먼저 만든 뒤 단일 컬럼 FK 인덱스를 제거합니다. (새 인덱스의 선두 컬럼이 FK를 지원)
+
+-- 고유 인덱스 전에 중복 (gameCivId, techId) 행 정리: 가장 많이 진행된 행 하나만 남김
+-- (상태 locked < available < in_progress < completed, 같으면 progressPoints가 큰 행, 그다음 id가 작은 행)
+DELETE `t` FROM `GameCivTechnology` AS `t`
+JOIN `GameCivTechnology` AS `k`
+    ON `k`.`gameCivId` = `t`.`gameCivId` AND `k`.`techId` = `t`.`techId` AND `k`.`id` <> `t`.`id`
+    AND (FIELD(`k`.`status`, 'locked', 'available', 'in_progress', 'completed'), `k`.`progressPoints`, -`k`.`id`)
+      > (FIELD(`t`.`status`, 'locked', 'available', 'in_progress', 'completed'), `t`.`progressPoints`, -`t`.`id`);
+
+-- CreateIndex
+CREATE UNIQUE INDEX `GameCivTechnology_gameCivId_techId_key` ON `GameCivTechnology`(`gameCivId`, `techId`);
+
+-- CreateIndex
+CREATE INDEX `GameCivTechnology_gameCivId_status_idx` ON `GameCivTechnology`(`gameCivId`, `status`);
+
+-- CreateIndex
+CREATE INDEX `PlayerBuilding_cityId_status_idx` ON `PlayerBuilding`(`cityId`, `status`);
+
+-- CreateIndex
+CREATE INDEX `TurnSnapshot_gameId_turnNumber_idx` ON `TurnSnapshot`(`gameId`, `turnNumber`);
+
+-- CreateIndex
+CREATE INDEX `GameCiv_gameId_isPlayer_idx` ON `GameCiv`(`gameId`, `isPlayer`);
+
+-- CreateIndex
+CREATE INDEX `ProductionQueue_cityId_queueOrder_idx` ON `ProductionQueue`(`cityId`, `queueOrder`);
+
+-- CreateIndex
+CREATE INDEX `ResearchQueue_gameCivId_queuePosition_idx` ON `ResearchQueue`(`gameCivId`, `queuePosition`);
+
+-- DropIndex
+DROP INDEX `GameCivTechnology_gameCivId_fkey` ON `GameCivTechnology`;
+
+-- DropIndex
+DROP INDEX `PlayerBuilding_cityId_fkey` ON `PlayerBuilding`;
+
+-- DropIndex
+DROP INDEX `TurnSnapshot_gameId_fkey` ON `TurnSnapshot`;
+
+-- DropIndex
+DROP INDEX `GameCiv_gameId_fkey` ON `GameCiv`;
+
+-- DropIndex
+DROP INDEX `ProductionQueue_cityId_fkey` ON `ProductionQueue`;
+
+-- DropIndex
+DROP INDEX `ResearchQueue_gameCivId_fkey` ON `ResearchQueue`;
@@ -0,0 +1,14 @@
+-- TurnSnapshot 델타 인코딩: 키프레임 행만 상태 컬럼을 채우고, 델타 행은 delta만 저장
+-- 기존 행은 모두 키프레임(isKeyframe = true)으로 취급됩니다.
+
+-- AlterTable
+ALTER TABLE `TurnSnapshot` MODIFY `diplomacyState` JSON NULL,
+    MODIFY `observedMap` JSON NULL,
+    MODIFY `productionState` JSON NULL,
+    MODIFY `researchState` JSON NULL,
+    ADD COLUMN `isKeyframe` BOOLEAN NOT NULL DEFAULT true,
+    ADD COLUMN `keyframeTurn` INTEGER NULL,
+    ADD COLUMN `delta` JSON NULL;
+
+-- 기존 행의 키프레임 턴은 자기 자신
+UPDATE `TurnSnapshot` SET `keyframeTurn` = `turnNumber` WHERE `keyframeTurn` IS NULL;
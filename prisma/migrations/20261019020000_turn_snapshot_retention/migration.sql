@@ -0,0 +1,6 @@
+-- TurnSnapshot 보존 정책: 콜드 턴 압축 저장 컬럼
+
+-- AlterTable
+ALTER TABLE `TurnSnapshot` ADD COLUMN `compression` VARCHAR(16) NULL,
+    ADD COLUMN `compressedState` LONGBLOB NULL,
+    ADD COLUMN `retainedAt` DATETIME(3) NULL;
@@ -0,0 +1,21 @@
+-- 턴 종료 동시성 제어: Game.version(낙관적 잠금) + TurnCommit(멱등성 키별 처리 결과)
+
+-- AlterTable
+ALTER TABLE `Game` ADD COLUMN `version` INTEGER NOT NULL DEFAULT 0;
+
+-- CreateTable
+CREATE TABLE `TurnCommit` (
+    `id` BIGINT NOT NULL AUTO_INCREMENT,
+    `gameId` BIGINT NOT NULL,
+    `turn` INTEGER NOT NULL,
+    `idempotencyKey` VARCHAR(191) NOT NULL,
+    `response` JSON NOT NULL,
+    `createdAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3),
+
+    UNIQUE INDEX `TurnCommit_idempotencyKey_key`(`idempotencyKey`),
+    UNIQUE INDEX `TurnCommit_gameId_turn_key`(`gameId`, `turn`),
+    PRIMARY KEY (`id`)
+) DEFAULT CHARACTER SET utf8mb4 COLLATE utf8mb4_unicode_ci;
+
+-- AddForeignKey
+ALTER TABLE `TurnCommit` ADD CONSTRAINT `TurnCommit_gameId_fkey` FOREIGN KEY (`gameId`) REFERENCES `Game`(`id`) ON DELETE RESTRICT ON UPDATE CASCADE;
@@ -0,0 +1,8 @@
+-- 게임 풀: 미리 생성해 둔 미배정 게임 표시와 배정 시각
+
+-- AlterTable
+ALTER TABLE `Game` ADD COLUMN `pooled` BOOLEAN NOT NULL DEFAULT false,
+    ADD COLUMN `claimedAt` DATETIME(3) NULL;
+
+-- CreateIndex
+CREATE INDEX `Game_pooled_mapRadius_idx` ON `Game`(`pooled`, `mapRadius`);
@@ -0,0 +1,4 @@
+-- 게임 집계 로더의 도시별 건설 큐 조회 (cityId IN (...) ORDER BY queuePosition)
+
+-- CreateIndex
+CREATE INDEX `BuildQueue_cityId_queuePosition_idx` ON `BuildQueue`(`cityId`, `queuePosition`);
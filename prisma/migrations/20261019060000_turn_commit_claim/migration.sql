@@ -0,0 +1,15 @@
+-- 턴 선점: 작업 전에 처리 중 TurnCommit 행을 넣고(response = NULL), 완료 시 결과와 completedAt을 기록
+-- 멱등성 키는 게임별로 고유 (다른 게임에서 같은 키를 써도 충돌/재생하지 않음)
+
+-- AlterTable
+ALTER TABLE `TurnCommit` MODIFY `response` JSON NULL,
+    ADD COLUMN `completedAt` DATETIME(3) NULL;
+
+-- 기존 행은 모두 완료된 커밋
+UPDATE `TurnCommit` SET `completedAt` = `createdAt` WHERE `completedAt` IS NULL;
+
+-- CreateIndex
+CREATE UNIQUE INDEX `TurnCommit_gameId_idempotencyKey_key` ON `TurnCommit`(`gameId`, `idempotencyKey`);
+
+-- DropIndex
+DROP INDEX `TurnCommit_idempotencyKey_key` ON `TurnCommit`;
@@ -0,0 +1,15 @@
+-- 외교 세션 저장소(services/diplomacy_store.py): 세션 키, 플레이어 키, 직렬화된 세션 상태를 DiplomacySession에 저장
+-- 대화 메시지도 DiplomacyAction으로 기록하므로 ActionType에 conversation 추가
+-- 기존 세션은 sessionKey/playerKey/state가 NULL (저장소가 다음 저장 때 채움)
+
+-- AlterTable
+ALTER TABLE `DiplomacySession` ADD COLUMN `sessionKey` VARCHAR(191) NULL,
+    ADD COLUMN `playerKey` VARCHAR(191) NULL,
+    ADD COLUMN `state` JSON NULL,
+    ADD COLUMN `updatedAt` DATETIME(3) NOT NULL DEFAULT CURRENT_TIMESTAMP(3);
+
+-- AlterTable
+ALTER TABLE `DiplomacyAction` MODIFY `actionType` ENUM('declare_friendship', 'propose_trade', 'declare_war', 'make_peace', 'offer_alliance', 'conversation') NOT NULL;
+
+-- CreateIndex
+CREATE UNIQUE INDEX `DiplomacySession_sessionKey_key` ON `DiplomacySession`(`sessionKey`);
@@ -0,0 +1,4 @@
+-- 플레이어별 외교 세션 목록(find_for_player, /diplomacy/relationships 페이지 조회)용 인덱스
+
+-- CreateIndex
+CREATE INDEX `DiplomacySession_playerKey_idx` ON `DiplomacySession`(`playerKey`);
@@ -1,7 +1,9 @@
-from fastapi import APIRouter, HTTPException, Query, Body, Path
+from fastapi import APIRouter, HTTPException, Query, Body, Path, Depends, Header
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from db.client import prisma
+from db.client import prisma, get_db
+from prisma import Prisma
+from services.catalog_views import catalog_views
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -30,63 +32,14 @@ class BuildStatus(str, Enum):
 @router.get("/", summary="건물 목록 조회", response_description="건물 목록 반환")
 async def get_buildings(
     category: Optional[BuildingCategory] = None,
-    prereqTech: Optional[int] = None
+    prereqTech: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
-    """건물 목록을 조회합니다."""
+    """건물 목록을 조회합니다. (메모리 카탈로그에서 미리 만든 필터별 응답)"""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
-        # 조건 구성
-        where_condition = {}
-        
-        if category:
-            where_condition["category"] = category.value
-        
-        if prereqTech is not None:
-            where_condition["prerequisiteTechId"] = prereqTech
-        
-        # 건물 목록 조회
-        buildings = await prisma.building.find_many(
-            where=where_condition
-        )
-        
-        # 결과 변환
-        result = []
-        for building in buildings:
-            # 실제로는 리소스 비용이 JSON 형태로 저장되어 있거나, 별도 테이블에 있을 수 있음
-            # 여기서는 임의로 생성
-            resource_cost = {
-                "Food": 0,
-                "Production": building.resourceCost,
-                "Gold": 0,
-                "Science": 0
-            }
-            
-            maintenance_cost = {
-                "Gold": building.maintenanceCost
-            }
-            
-            result.append({
-                "id": building.id,
-                "name": building.name,
-                "category": building.category,
-                "description": building.description,
-                "buildTime": building.buildTime,
-                "resourceCost": resource_cost,
-                "maintenanceCost": maintenance_cost,
-                "prerequisiteTechId": building.prerequisiteTechId
-            })
-        
-        return {
-            "success": True,
-            "data": result,
-            "error": None
-        }
+        views = await catalog_views.ensure()
+        view = views.view("buildings", category=category, prereqTech=prereqTech)
+        return views.response(view, if_none_match)
     
     except Exception as e:
         return {
@@ -99,18 +52,11 @@ async def get_buildings(
         }
 
 @router.get("/{building_id}", summary="건물 상세 조회", response_description="건물 상세 정보 반환")
-async def get_building_detail(building_id: int = Path(..., description="조회할 건물 ID")):
+async def get_building_detail(building_id: int = Path(..., description="조회할 건물 ID"), db: Prisma = Depends(get_db)):
     """특정 건물의 상세 정보를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 건물 조회
-        building = await prisma.building.find_unique(
+        building = await db.building.find_unique(
             where={"id": building_id}
         )
         
@@ -165,18 +111,11 @@ async def get_building_detail(building_id: int = Path(..., description="조회
         }
 
 @router.get("/cities/{city_id}/buildings", summary="도시 건물 조회", response_description="도시의 건물 목록 반환")
-async def get_city_buildings(city_id: int = Path(..., description="조회할 도시 ID")):
+async def get_city_buildings(city_id: int = Path(..., description="조회할 도시 ID"), db: Prisma = Depends(get_db)):
     """특정 도시에 건설된 건물 목록을 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 도시의 건물 조회
-        player_buildings = await prisma.playerbuilding.find_many(
+        player_buildings = await db.playerbuilding.find_many(
             where={
                 "cityId": city_id
             },
@@ -214,18 +153,11 @@ async def get_city_buildings(city_id: int = Path(..., description="조회할 도
         }
 
 @router.get("/cities/{city_id}/build-queue", summary="건설 큐 조회", response_description="도시의 건설 큐 반환")
-async def get_build_queue(city_id: int = Path(..., description="조회할 도시 ID")):
+async def get_build_queue(city_id: int = Path(..., description="조회할 도시 ID"), db: Prisma = Depends(get_db)):
     """특정 도시의 건설 큐를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 건설 큐 조회
-        queue_entries = await prisma.buildqueue.find_many(
+        queue_entries = await db.buildqueue.find_many(
             where={
                 "cityId": city_id
             },
@@ -264,7 +196,8 @@ async def get_build_queue(city_id: int = Path(..., description="조회할 도시
 @router.post("/cities/{city_id}/build-queue", summary="건설 큐에 추가", response_description="건설 큐 추가 결과")
 async def add_to_build_queue(
     building_request: Dict[str, int] = Body(..., example={"buildingId": 5}),
-    city_id: int = Path(..., description="도시 ID")
+    city_id: int = Path(..., description="도시 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """건설 큐에 새 건물을 추가합니다."""
     try:
@@ -279,15 +212,8 @@ async def add_to_build_queue(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 건물 존재 확인
-        building = await prisma.building.find_unique(
+        building = await db.building.find_unique(
             where={"id": building_id}
         )
         
@@ -302,7 +228,7 @@ async def add_to_build_queue(
             }
         
         # 도시 존재 확인
-        city = await prisma.city.find_unique(
+        city = await db.city.find_unique(
             where={"id": city_id}
         )
         
@@ -317,7 +243,7 @@ async def add_to_build_queue(
             }
         
         # 현재 큐 크기 확인
-        current_queue = await prisma.buildqueue.find_many(
+        current_queue = await db.buildqueue.find_many(
             where={
                 "cityId": city_id
             }
@@ -329,7 +255,7 @@ async def add_to_build_queue(
             next_position = max(entry.queueOrder for entry in current_queue) + 1
         
         # 건설 큐에 추가
-        new_queue_entry = await prisma.buildqueue.create(
+        new_queue_entry = await db.buildqueue.create(
             data={
                 "cityId": city_id,
                 "buildingId": building_id,
@@ -363,19 +289,13 @@ async def add_to_build_queue(
 @router.delete("/cities/{city_id}/build-queue/{queue_id}", summary="건설 큐에서 제거", response_description="건설 큐 제거 결과")
 async def remove_from_build_queue(
     city_id: int = Path(..., description="도시 ID"),
-    queue_id: int = Path(..., description="큐 ID")
+    queue_id: int = Path(..., description="큐 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """건설 큐에서 건물을 제거합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 큐 엔트리 확인
-        queue_entry = await prisma.buildqueue.find_unique(
+        queue_entry = await db.buildqueue.find_unique(
             where={
                 "id": queue_id
             }
@@ -395,14 +315,14 @@ async def remove_from_build_queue(
         removed_position = queue_entry.queueOrder
         
         # 큐 엔트리 제거
-        await prisma.buildqueue.delete(
+        await db.buildqueue.delete(
             where={
                 "id": queue_id
             }
         )
         
         # 다른 큐 엔트리의 위치 재조정
-        await prisma.buildqueue.update_many(
+        await db.buildqueue.update_many(
             where={
                 "cityId": city_id,
                 "queueOrder": {
@@ -435,7 +355,8 @@ async def remove_from_build_queue(
 @router.post("/cities/{city_id}/build/start", summary="건설 즉시 시작", response_description="건설 시작 결과")
 async def start_building(
     building_request: Dict[str, int] = Body(..., example={"buildingId": 4}),
-    city_id: int = Path(..., description="도시 ID")
+    city_id: int = Path(..., description="도시 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """특정 건물의 건설을 즉시 시작합니다."""
     try:
@@ -450,15 +371,8 @@ async def start_building(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 도시 존재 확인
-        city = await prisma.city.find_unique(
+        city = await db.city.find_unique(
             where={"id": city_id}
         )
         
@@ -473,7 +387,7 @@ async def start_building(
             }
         
         # 건물 존재 확인
-        building = await prisma.building.find_unique(
+        building = await db.building.find_unique(
             where={"id": building_id}
         )
         
@@ -488,7 +402,7 @@ async def start_building(
             }
         
         # 이미 건설 중인 건물이 있는지 확인
-        in_progress = await prisma.playerbuilding.find_first(
+        in_progress = await db.playerbuilding.find_first(
             where={
                 "cityId": city_id,
                 "status": "in_progress"
@@ -506,7 +420,7 @@ async def start_building(
             }
         
         # 이미 도시에 같은 건물이 있는지 확인
-        existing_building = await prisma.playerbuilding.find_first(
+        existing_building = await db.playerbuilding.find_first(
             where={
                 "cityId": city_id,
                 "buildingId": building_id,
@@ -525,7 +439,7 @@ async def start_building(
             }
         
         # 건설 시작
-        player_building = await prisma.playerbuilding.create(
+        player_building = await db.playerbuilding.create(
             data={
                 "cityId": city_id,
                 "buildingId": building_id,
@@ -561,7 +475,8 @@ async def start_building(
 @router.post("/cities/{city_id}/build/cancel", summary="건설 취소", response_description="건설 취소 결과")
 async def cancel_building(
     building_request: Dict[str, int] = Body(..., example={"playerBuildingId": 104}),
-    city_id: int = Path(..., description="도시 ID")
+    city_id: int = Path(..., description="도시 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """진행 중인 건물 건설을 취소합니다."""
     try:
@@ -576,15 +491,8 @@ async def cancel_building(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 건설 중인 건물 확인
-        player_building = await prisma.playerbuilding.find_unique(
+        player_building = await db.playerbuilding.find_unique(
             where={"id": player_building_id}
         )
         
@@ -609,7 +517,7 @@ async def cancel_building(
             }
         
         # 건설 중인 건물 제거
-        await prisma.playerbuilding.delete(
+        await db.playerbuilding.delete(
             where={"id": player_building_id}
         )
         
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Header
+from typing import Optional
+from services.catalog_views import catalog_views
+
+router = APIRouter()
+
+@router.get("/", summary="전체 카탈로그 조회", response_description="유닛/건물/기술/선행 기술 관계 묶음 반환")
+async def get_catalog(if_none_match: Optional[str] = Header(None)):
+    """클라이언트 시작 시 한 번 받아 캐시하는 전체 정적 카탈로그 (ETag로 재검증)"""
+    try:
+        views = await catalog_views.ensure()
+        return views.response(views.bundle, if_none_match)
+    
+    except Exception as e:
+        return {
+            "success": False,
+            "data": None,
+            "error": {
+                "type": type(e).__name__,
+                "detail": str(e)
+            }
+        }
@@ -1,7 +1,7 @@
 from fastapi import APIRouter, HTTPException, Depends, Query, WebSocket, WebSocketDisconnect
 from fastapi.responses import JSONResponse
 from typing import Dict, List, Optional, Any
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr
 import os
 import json
 import uuid
@@ -9,14 +9,19 @@ import datetime
 from datetime import datetime
 import httpx
 import random
-# Ollama 관련 임포트 추가
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_ollama import ChatOllama
 # 메모리 관련 임포트 추가
 from langchain.memory import ConversationBufferMemory, ConversationSummaryMemory
 from langchain.chains import ConversationChain
 # Prisma 클라이언트 임포트 추가
 from db.client import prisma
+# LLM 프로바이더 라우터
+from services.llm_router import LLMRequest, LLMUnavailableError, build_llm_router
+# 외교 세션 저장소
+from services.diplomacy_store import DiplomacySessionStore
+# 문명/지도자 프로필 캐시
+from services.civ_profiles import civ_profiles
+# 대화 키워드 매처
+from services.keyword_matcher import KeywordHits, KeywordMatcher
 
 # API 라우터 설정
 router = APIRouter(
@@ -28,6 +33,7 @@ class Message(BaseModel):
     role: str
     content: str
     timestamp: Optional[str] = None
+    _keyword_hits: Optional[Any] = PrivateAttr(default=None)  # 키워드 분석 결과 캐시
 
 class MemoryData(BaseModel):
     """대화 메모리 데이터 모델"""
@@ -39,6 +45,7 @@ class MemoryData(BaseModel):
 class DiplomacySession(BaseModel):
     session_id: str
     civilization_id: int
+    game_id: Optional[int] = None  # 세션이 속한 게임 (DB 반영 시 이 게임의 GameCiv와 연결)
     player_name: str
     messages: List[Message]
     last_interaction: str
@@ -47,30 +54,68 @@ class DiplomacySession(BaseModel):
     is_first_encounter: bool
     can_interact_again_turn: Optional[int] = None
     memory_data: Optional[MemoryData] = None  # 대화 메모리 데이터 추가
+    scored_message_count: int = 0  # 관계 점수에 반영된 메시지 수
 
 class DiplomacyRequest(BaseModel):
-    game_id: int
+    game_id: int  # 게임 ID (Game.id), 턴으로 쓰지 않음
     player_name: str
     civilization_id: int
     message: Optional[str] = None
+    turn: Optional[int] = None  # 현재 턴 (없으면 게임의 currentTurn 사용)
 
 class DiplomacyResponse(BaseModel):
     success: bool
     data: Optional[Dict[str, Any]] = None
     error: Optional[str] = None
 
-# 메모리 저장소 (실제 구현에서는 데이터베이스 사용을 권장)
-diplomacy_sessions: Dict[str, DiplomacySession] = {}
+# LLM 라우터 (개발 환경은 Gemini, 프로덕션은 Ollama를 1순위로 사용)
+llm_router = build_llm_router(
+    primary="gemini" if os.getenv("ENVIRONMENT", "development") == "development" else "ollama",
+    gemini_model=os.getenv("GEMINI_MODEL", "gemini-pro")
+)
+
+# 외교 세션 저장소 (LRU 캐시 + DiplomacySession/DiplomacyAction 테이블 write-behind)
+# 대화 메모리(ConversationBufferMemory)도 세션 캐시 항목과 함께 관리됩니다.
+session_store = DiplomacySessionStore(
+    prisma,
+    session_model=DiplomacySession,
+    player_key=lambda session: generate_player_key(session.player_name),
+    max_entries=int(os.getenv("DIPLOMACY_CACHE_SIZE", "1000")),
+    ttl=float(os.getenv("DIPLOMACY_CACHE_TTL", "1800")),
+    flush_interval=float(os.getenv("DIPLOMACY_FLUSH_INTERVAL", "2.0")),
+    batch_size=int(os.getenv("DIPLOMACY_FLUSH_BATCH", "50")),
+    max_resolve_attempts=int(os.getenv("DIPLOMACY_RESOLVE_ATTEMPTS", "5"))
+)
 
-# 문명별 메모리 저장소
-civilization_memories: Dict[str, ConversationBufferMemory] = {}
+# 플레이어 키 생성 함수 (세션 보조 인덱스 키)
+def generate_player_key(player_name: str) -> str:
+    """특수문자 및 공백을 제거한 플레이어 키를 생성합니다."""
+    return "".join(c for c in player_name if c.isalnum())
 
 # 세션 ID 생성 함수
 def generate_session_id(player_name: str, civilization_id: int) -> str:
     """player_name과 civilization_id로 고유한 세션 ID를 생성합니다."""
-    # 특수문자 및 공백을 제거하여 안전한 키 생성
-    safe_name = "".join(c for c in player_name if c.isalnum())
-    return f"dipl_{safe_name}_{civilization_id}"
+    return f"dipl_{generate_player_key(player_name)}_{civilization_id}"
+
+# 요청의 현재 턴 결정
+# game_id는 항상 게임 ID이고, 턴은 turn 필드로 받습니다. turn이 없으면 게임의 현재 턴을 읽습니다.
+async def resolve_current_turn(game_id: Optional[int], turn: Optional[int] = None) -> int:
+    if turn is not None:
+        return int(turn)
+    if game_id is None:
+        return 0
+    game = await prisma.game.find_unique(where={"id": int(game_id)})
+    return game.currentTurn if game else 0
+
+# 대화 한 번(사용자 메시지 + AI 응답)을 DiplomacyAction 기록 형태로 변환
+def build_conversation_action(turn: int, user_message: Message, ai_message: Message, delta: int, new_score: int) -> Dict[str, Any]:
+    return {
+        "turn": turn or 0,
+        "actionType": "conversation",
+        "delta": delta,
+        "newScore": new_score,
+        "terms": {"messages": [user_message.model_dump(), ai_message.model_dump()]}
+    }
 
 # 기본 시스템 프롬프트
 SYSTEM_PROMPT = """당신은 문명 게임에서 AI 문명의 외교관 역할을 맡고 있습니다.
@@ -115,86 +160,27 @@ CIVILIZATION_TRAITS = {
     }
 }
 
-# 문명 정보를 데이터베이스에서 가져오는 함수
+# 문명 정보를 가져오는 함수 (프로필 캐시 사용)
 async def get_civilization_info(civilization_id: int) -> Dict[str, Any]:
-    """데이터베이스에서 문명 정보를 가져옵니다."""
+    """캐시된 문명/지도자 프로필에서 문명 정보를 가져옵니다."""
     try:
-        # 먼저 게임 내 문명 정보 조회 (GameCiv 테이블)
-        civ = await prisma.gameciv.find_first(
-            where={
-                "civTypeId": civilization_id
-            },
-            include={
-                "civType": True  # CivType 관련 정보 포함
-            }
-        )
-        
-        if civ:
-            # 문명 정보가 있는 경우
-            civ_type = civ.civType if hasattr(civ, 'civType') and civ.civType else None
-            
-            # 문명 유형 정보가 있으면 해당 정보 활용, 없으면 기본 정보 사용
-            if civ_type:
-                personality = get_personality_by_traits(civ_type.name, civ_type.leaderName)
-                trait = get_trait_description(civ_type.name)
-                
-                return {
-                    "id": civilization_id,
-                    "name": civ_type.name,
-                    "leader": civ_type.leaderName,
-                    "trait": trait,
-                    "personality": personality,
-                    "color": civ.color if hasattr(civ, 'color') else "blue"
-                }
-            else:
-                # CivType 정보가 없지만 civTypeId는 있는 경우 CivType 직접 조회
-                if hasattr(civ, 'civTypeId'):
-                    civ_type = await prisma.civtype.find_unique(
-                        where={"id": civ.civTypeId}
-                    )
-                    
-                    if civ_type:
-                        personality = get_personality_by_traits(civ_type.name, civ_type.leaderName)
-                        trait = get_trait_description(civ_type.name)
-                        
-                        return {
-                            "id": civilization_id,
-                            "name": civ_type.name,
-                            "leader": civ_type.leaderName,
-                            "trait": trait,
-                            "personality": personality,
-                            "color": civ.color if hasattr(civ, 'color') else "blue"
-                        }
-                
-                # 문명 유형 정보가 없는 경우 기본 정보
-                return {
-                    "id": civilization_id,
-                    "name": civ.name if hasattr(civ, 'name') else f"{CIVILIZATION_TRAITS.get(civilization_id, {}).get('name', '알 수 없는 문명')}",
-                    "leader": "알 수 없는 지도자",
-                    "trait": "특별한 특성이 없습니다.",
-                    "personality": "중립적",
-                    "color": civ.color if hasattr(civ, 'color') else "blue"
-                }
-        
-        # 게임 내 문명이 없으면 CivType 테이블 직접 조회
-        civ_type = await prisma.civtype.find_first(
-            where={
-                "id": civilization_id
-            }
-        )
+        profile = await civ_profiles.fetch(civilization_id)
         
-        if civ_type:
-            personality = get_personality_by_traits(civ_type.name, civ_type.leaderName)
-            trait = get_trait_description(civ_type.name)
-            
-            return {
+        if profile:
+            info = {
                 "id": civilization_id,
-                "name": civ_type.name,
-                "leader": civ_type.leaderName,
-                "trait": trait,
-                "personality": personality,
+                "name": profile.name,
+                "leader": profile.leader_name,
+                "trait": get_trait_description(profile.name),
+                "personality": get_personality_by_traits(profile.name, profile.leader_name),
                 "color": "blue"
             }
+            # 지도자 프로필이 있으면 함께 전달
+            if profile.leader_full_name:
+                info["leader_full_name"] = profile.leader_full_name
+            if profile.backstory:
+                info["backstory"] = profile.backstory
+            return info
             
         # 데이터베이스에 정보가 없는 경우 하드코딩된 CIVILIZATION_TRAITS 사용
         if civilization_id in CIVILIZATION_TRAITS:
@@ -208,30 +194,20 @@ async def get_civilization_info(civilization_id: int) -> Dict[str, Any]:
                 "color": "blue"
             }
             
-        # 모든 조회가 실패한 경우 기본값 반환
-        return {
-            "id": civilization_id,
-            "name": f"{CIVILIZATION_TRAITS.get(civilization_id, {}).get('name', '알 수 없는 문명')}",
-            "leader": "알 수 없는 지도자",
-            "trait": "특별한 특성이 없습니다.",
-            "personality": "중립적",
-            "color": "blue"
-        }
-        
     except Exception as e:
         print(f"문명 정보 조회 중 오류 발생: {str(e)}")
         import traceback
         traceback.print_exc()
-        
-        # 오류 발생 시 기본값 반환
-        return {
-            "id": civilization_id,
-            "name": f"{CIVILIZATION_TRAITS.get(civilization_id, {}).get('name', '알 수 없는 문명')}",
-            "leader": "알 수 없는 지도자",
-            "trait": "특별한 특성이 없습니다.",
-            "personality": "중립적",
-            "color": "blue"
-        }
+    
+    # 모든 조회가 실패한 경우 기본값 반환
+    return {
+        "id": civilization_id,
+        "name": f"{CIVILIZATION_TRAITS.get(civilization_id, {}).get('name', '알 수 없는 문명')}",
+        "leader": "알 수 없는 지도자",
+        "trait": "특별한 특성이 없습니다.",
+        "personality": "중립적",
+        "color": "blue"
+    }
 
 # 문명 이름과 지도자 이름을 기반으로 성격 결정
 def get_personality_by_traits(civ_name: str, leader_name: str) -> str:
@@ -294,13 +270,35 @@ def get_trait_description(civ_name: str) -> str:
 
 # 문명 메모리 관리 함수
 def get_civilization_memory(session_id: str, civilization_id: int) -> ConversationBufferMemory:
-    """문명별 대화 메모리를 가져오거나 생성하는 함수"""
-    if session_id not in civilization_memories:
-        # 새 메모리 생성
-        memory = ConversationBufferMemory(return_messages=True)
-        civilization_memories[session_id] = memory
-    
-    return civilization_memories[session_id]
+    """문명별 대화 메모리를 가져오거나 생성하는 함수 (세션 캐시 항목과 수명을 같이함)"""
+    return session_store.memory_for(
+        session_id,
+        lambda session: ConversationBufferMemory(return_messages=True)
+    )
+
+# 대화 분석용 키워드 (카테고리별로 한 번만 컴파일)
+TOPIC_KEYWORDS = ["평화", "전쟁", "무역", "동맹", "기술", "문화", "자원", "협력"]
+CONVERSATION_MATCHER = KeywordMatcher(
+    {
+        # 요약: 주제 및 감정 분석
+        "topic": TOPIC_KEYWORDS,
+        "sentiment_positive": ["감사", "좋음", "동의", "협력", "동맹", "평화", "존중", "우정"],
+        "sentiment_negative": ["분노", "불만", "전쟁", "공격", "적대", "위협", "파괴"],
+        # 관계 점수: 긍정적/부정적 키워드
+        "score_positive": ["동맹", "친구", "협력", "평화", "무역", "도움", "지원", "감사", "존중", "공정", "제안", "발전"],
+        "score_negative": ["전쟁", "공격", "위협", "적", "파괴", "침략", "배신", "거부", "무시", "분노", "제재"],
+    },
+    weights={
+        "score_positive": (1, 3),  # 보다 작은 증가폭
+        "score_negative": (-2, -1),  # 보다 작은 감소폭
+    }
+)
+
+def get_message_hits(msg: Message) -> KeywordHits:
+    """메시지의 키워드 적중 결과 (메시지당 한 번만 분석)"""
+    if msg._keyword_hits is None:
+        msg._keyword_hits = CONVERSATION_MATCHER.match(msg.content)
+    return msg._keyword_hits
 
 # 대화 메모리 요약 함수
 def summarize_conversation(messages: List[Message], civ_info: Dict) -> MemoryData:
@@ -312,35 +310,24 @@ def summarize_conversation(messages: List[Message], civ_info: Dict) -> MemoryDat
     last_messages = messages[-min(10, len(messages)):]
     summary = f"{civ_info['name']} 문명과의 최근 대화"
     
-    # 주요 키워드 추출
-    keywords = ["평화", "전쟁", "무역", "동맹", "기술", "문화", "자원", "협력"]
     key_points = []
-    
-    # 감정 분석
-    positive_words = ["감사", "좋음", "동의", "협력", "동맹", "평화", "존중", "우정"]
-    negative_words = ["분노", "불만", "전쟁", "공격", "적대", "위협", "파괴"]
-    
     positive_count = 0
     negative_count = 0
-    topics = set()
+    topics = []
     
     for msg in last_messages:
-        content = msg.content.lower()
+        hits = get_message_hits(msg)
         
-        # 키워드 확인
-        for keyword in keywords:
-            if keyword in content and keyword not in topics:
-                topics.add(keyword)
+        # 키워드 확인 (키워드 목록 순서 유지)
+        found_topics = hits.get("topic")
+        for keyword in TOPIC_KEYWORDS:
+            if keyword in found_topics and keyword not in topics:
+                topics.append(keyword)
                 key_points.append(f"{keyword}에 관한 논의가 있었습니다.")
         
         # 감정 분석
-        for word in positive_words:
-            if word in content:
-                positive_count += 1
-        
-        for word in negative_words:
-            if word in content:
-                negative_count += 1
+        positive_count += hits.count("sentiment_positive")
+        negative_count += hits.count("sentiment_negative")
     
     # 감정 상태 결정
     sentiment = "neutral"
@@ -352,37 +339,28 @@ def summarize_conversation(messages: List[Message], civ_info: Dict) -> MemoryDat
     return MemoryData(
         summary=summary,
         key_points=key_points[:5],  # 최대 5개 주요 포인트
-        last_topics=list(topics)[:3],  # 최대 3개 주제
+        last_topics=topics[:3],  # 최대 3개 주제
         sentiment=sentiment
     )
 
 # 관계 점수 계산 함수 개선
-def calculate_relationship_score(messages: List[Message], current_score: int, memory_data: MemoryData) -> int:
-    """대화 내용과 메모리 데이터를 기반으로 관계 점수를 계산하는 함수"""
+def calculate_relationship_score(messages: List[Message], current_score: int, memory_data: MemoryData, since: Optional[int] = None) -> int:
+    """대화 내용과 메모리 데이터를 기반으로 관계 점수를 계산하는 함수
+    
+    since가 주어지면 그 위치 이후의 새 메시지만 점수에 반영합니다. (최대 최근 5개)
+    """
     # 기본 점수는 현재 점수 유지
     score = current_score
     
     # 최근 메시지만 분석 (최대 5개)
-    recent_messages = messages[-min(5, len(messages)):]
-    user_messages = [msg for msg in recent_messages if msg.role == "user"]
+    start = max(0, len(messages) - 5)
+    if since is not None:
+        start = max(start, since)
+    user_messages = [msg for msg in messages[start:] if msg.role == "user"]
     
     # 긍정적/부정적 키워드에 따른 점수 조정
-    positive_keywords = ["동맹", "친구", "협력", "평화", "무역", "도움", "지원", "감사", "존중", "공정", "제안", "발전"]
-    negative_keywords = ["전쟁", "공격", "위협", "적", "파괴", "침략", "배신", "거부", "무시", "분노", "파괴", "제재"]
-    
-    # 최근 메시지 분석
     for msg in user_messages:
-        content = msg.content.lower()
-        
-        # 긍정적 키워드 확인
-        for keyword in positive_keywords:
-            if keyword in content:
-                score += random.randint(1, 3)  # 보다 작은 증가폭
-        
-        # 부정적 키워드 확인
-        for keyword in negative_keywords:
-            if keyword in content:
-                score -= random.randint(1, 2)  # 보다 작은 감소폭
+        score += CONVERSATION_MATCHER.score(get_message_hits(msg))
     
     # 메모리 데이터의 감정 상태 반영
     if memory_data:
@@ -402,7 +380,7 @@ def calculate_relationship_score(messages: List[Message], current_score: int, me
 
 # LLM 응답 생성 함수
 async def generate_llm_response(session_id: str, messages: List[Message], civilization_id: int) -> str:
-    """환경에 따라 Gemini 또는 Ollama를 통해 응답을 생성하는 함수"""
+    """LLM 라우터(Gemini/Ollama)를 통해 응답을 생성하는 함수"""
     
     # 문명 정보 추가
     civ_info = await get_civilization_info(civilization_id)
@@ -411,7 +389,7 @@ async def generate_llm_response(session_id: str, messages: List[Message], civili
     memory = get_civilization_memory(session_id, civilization_id)
     
     # 세션에서 메모리 데이터 가져오기
-    session = diplomacy_sessions.get(session_id)
+    session = await session_store.get(session_id)
     memory_data = None
     if session and session.memory_data:
         memory_data = session.memory_data
@@ -420,6 +398,8 @@ async def generate_llm_response(session_id: str, messages: List[Message], civili
     
     # 시스템 프롬프트 조정 (메모리 정보 포함)
     system_prompt = f"{SYSTEM_PROMPT}\n\n당신은 {civ_info['name']} 문명의 외교관입니다.\n{civ_info['trait']}\n성격: {civ_info['personality']}"
+    if civ_info.get("backstory"):
+        system_prompt += f"\n지도자 배경: {civ_info['backstory']}"
     
     # 메모리 정보 추가
     if memory_data and memory_data.key_points:
@@ -430,173 +410,50 @@ async def generate_llm_response(session_id: str, messages: List[Message], civili
         sentiment_text = "긍정적" if memory_data.sentiment == "positive" else "부정적"
         system_prompt += f"\n\n현재 대화 분위기는 {sentiment_text}입니다."
     
+    # 대화 메시지 준비
+    conversation: List[tuple] = []
+
+    # 이전 대화에서 중요한 맥락 추가
+    if len(messages) > 5:
+        conversation.append(("user", f"이전 대화의 요약: {memory_data.summary if memory_data.summary else '이전에 기본적인 외교 대화를 나눴습니다.'}"))
+        conversation.append(("assistant", "알겠습니다. 이전 대화를 기억하며 계속하겠습니다."))
+
+    # 대화 메시지 추가 (최근 5개만)
+    recent_messages = messages[-min(5, len(messages)):]
+    for msg in recent_messages:
+        if msg.role == "user":
+            conversation.append(("user", msg.content))
+            # 메모리에 사용자 메시지 저장
+            if memory:
+                memory.chat_memory.add_user_message(msg.content)
+        elif msg.role == "assistant":
+            conversation.append(("assistant", msg.content))
+            # 메모리에 AI 메시지 저장
+            if memory:
+                memory.chat_memory.add_ai_message(msg.content)
+
     try:
-        # 환경 변수에 따라 다른 LLM 사용
-        environment = os.getenv("ENVIRONMENT", "development")
-        
-        if environment == "development":
-            # 개발 환경에서는 Gemini 사용
-            print(f"개발 환경: Gemini 사용하여 {civ_info['name']} 문명 응답 생성")
-            
-            # 대화 메시지 준비
-            conversation_history = []
-            
-            # 이전 대화에서 중요한 맥락 추가
-            if len(messages) > 5:
-                conversation_history.append(f"이전 대화의 요약: {memory_data.summary if memory_data.summary else '이전에 기본적인 외교 대화를 나눴습니다.'}")
-                conversation_history.append("알겠습니다. 이전 대화를 기억하며 계속하겠습니다.")
-            
-            # 대화 메시지 추가 (최근 5개만)
-            recent_messages = messages[-min(5, len(messages)):]
-            for msg in recent_messages:
-                if msg.role == "user":
-                    conversation_history.append(f"플레이어: {msg.content}")
-                    # 메모리에 사용자 메시지 저장
-                    if memory:
-                        memory.chat_memory.add_user_message(msg.content)
-                elif msg.role == "assistant":
-                    conversation_history.append(f"{civ_info['name']} 문명: {msg.content}")
-                    # 메모리에 AI 메시지 저장
-                    if memory:
-                        memory.chat_memory.add_ai_message(msg.content)
-            
-            # Gemini API 호출 설정
-            google_api_key = os.getenv("GOOGLE_API_KEY", "YOUR_GEMINI_API_KEY")
-            gemini_model = os.getenv("GEMINI_MODEL", "gemini-pro")
-            gemini_api_url = os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/models")
-            
-            # URL 구성
-            # URL 끝에 슬래시가 있는지 확인하고 없으면 추가
-            if not gemini_api_url.endswith('/'):
-                gemini_api_url += '/'
-                
-            full_url = f"{gemini_api_url}{gemini_model}:generateContent"
-            print(f"Gemini API 호출 URL: {full_url}")
-            
-            # 요청 데이터 구성
-            prompt = f"{system_prompt}\n\n{''.join(conversation_history)}\n\n{civ_info['name']} 문명:"
-            request_data = {
-                "contents": [
-                    {
-                        "parts": [
-                            {
-                                "text": prompt
-                            }
-                        ]
-                    }
-                ],
-                "generationConfig": {
-                    "temperature": 0.7,
-                    "topK": 40,
-                    "topP": 0.8,
-                    "maxOutputTokens": 500
-                }
-            }
-            
-            # Gemini API 호출
-            try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.post(
-                        f"{full_url}?key={google_api_key}",
-                        json=request_data,
-                        timeout=30.0
-                    )
-                    
-                    if response.status_code == 200:
-                        result = response.json()
-                        try:
-                            response_text = result["candidates"][0]["content"]["parts"][0]["text"]
-                            
-                            # 결과가 없거나 빈 문자열인 경우 처리
-                            if not response_text or response_text.strip() == "":
-                                print("Gemini 응답이 비어있습니다.")
-                                # 기본 응답 사용
-                                response_text = f"{civ_info['name']} 문명이 당신을 환영합니다. 우리는 평화로운 관계를 희망합니다."
-                            
-                            # 메모리에 응답 저장
-                            if memory:
-                                memory.chat_memory.add_ai_message(response_text)
-                                
-                            return response_text
-                        except (KeyError, IndexError) as e:
-                            print(f"Gemini 응답 파싱 오류: {str(e)}")
-                            print(f"응답: {result}")
-                            # 오류 발생 시 기본 응답 사용
-                            return f"{civ_info['name']} 문명이 당신을 환영합니다. 우리의 외교관이 곧 응답할 것입니다."
-                    else:
-                        print(f"Gemini API 오류: {response.status_code} - {response.text}")
-                        # API 오류 시 기본 응답 사용
-                        return f"{civ_info['name']} 문명에서 메시지를 전하려 했으나 전달이 지연되고 있습니다."
-                    
-            except Exception as e:
-                print(f"Gemini API 호출 오류: {str(e)}")
-                # Gemini 호출 오류 시 기본 응답 사용
-                return f"{civ_info['name']} 문명이 당신의 제안에 관심을 보입니다. 잠시 후 다시 시도해 주세요."
-        
-        else:
-            # 프로덕션 환경에서는 Ollama 사용
-            print(f"프로덕션 환경: Ollama 사용하여 {civ_info['name']} 문명 응답 생성")
-            
-            # Ollama 설정
-            ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-            ollama_model = os.getenv("OLLAMA_MODEL", "eeve-korean-10.8b")
-            
-            # LangChain 메시지 리스트 생성
-            langchain_messages = [SystemMessage(content=system_prompt)]
-            
-            # 이전 대화에서 중요한 맥락 최대 5개 메시지 추가
-            if len(messages) > 5:
-                langchain_messages.append(HumanMessage(content=f"이전 대화의 요약: {memory_data.summary if memory_data.summary else '이전에 기본적인 외교 대화를 나눴습니다.'}"))
-                langchain_messages.append(AIMessage(content="알겠습니다. 이전 대화를 기억하며 계속하겠습니다."))
-            
-            # 대화 메시지 추가 (최근 5개만)
-            recent_messages = messages[-min(5, len(messages)):]
-            for msg in recent_messages:
-                if msg.role == "user":
-                    langchain_messages.append(HumanMessage(content=msg.content))
-                    # 메모리에 사용자 메시지 저장
-                    if memory:
-                        memory.chat_memory.add_user_message(msg.content)
-                elif msg.role == "assistant":
-                    langchain_messages.append(AIMessage(content=msg.content))
-                    # 메모리에 AI 메시지 저장
-                    if memory:
-                        memory.chat_memory.add_ai_message(msg.content)
-            
-            # Ollama 호출
-            try:
-                # 외교 대화에서는 Ollama 사용
-                print(f"외교 대화를 위해 Ollama 모델({ollama_model}) 사용")
-                chat_model = ChatOllama(
-                    model=ollama_model,
-                    base_url=ollama_url,
-                    temperature=0.7,
-                    top_p=0.8,
-                    top_k=40,
-                    num_predict=500,
-                )
-                
-                # LLM 호출
-                response = chat_model.invoke(langchain_messages)
-                
-                # 응답 텍스트 추출
-                response_text = response.content
-                
-                if not response_text:
-                    print("Ollama 응답에 텍스트가 없습니다.")
-                    return f"{civ_info['name']} 문명이 당신을 환영합니다. 우리는 평화로운 관계를 희망합니다."
-                    
-                # 메모리에 응답 저장
-                if memory:
-                    memory.chat_memory.add_ai_message(response_text)
-                    
-                return response_text
-                
-            except Exception as e:
-                print(f"Ollama 호출 오류: {str(e)}")
-                # Ollama 호출 오류 시 기본 응답 사용
-                return f"{civ_info['name']} 문명이 당신의 제안에 관심을 보입니다. 잠시 후 다시 시도해 주세요."
-                        
+        # 프로바이더 라우터 호출 (회로 차단 및 헤지 요청은 라우터가 처리)
+        result = await llm_router.generate(LLMRequest(
+            system=system_prompt,
+            messages=conversation,
+            temperature=0.7,
+            top_p=0.8,
+            top_k=40,
+            max_tokens=500
+        ))
+        print(f"{civ_info['name']} 문명 응답 생성 완료 (프로바이더: {result.provider}, {result.latency:.2f}초)")
+
+        # 메모리에 응답 저장
+        if memory:
+            memory.chat_memory.add_ai_message(result.text)
+
+        return result.text
+
+    except LLMUnavailableError as e:
+        print(f"LLM 호출 오류: {str(e)}")
+        # 모든 프로바이더 실패 시 기본 응답 사용
+        return f"{civ_info['name']} 문명이 당신의 제안에 관심을 보입니다. 잠시 후 다시 시도해 주세요."
     except Exception as e:
         print(f"LLM 응답 생성 오류: {str(e)}")
         return f"{civ_info['name']} 문명이 응답하지 않습니다. 전송 중 오류가 발생했습니다."
@@ -627,7 +484,8 @@ ws_manager = DiplomacyConnectionManager()
 async def diplomacy_ws(
     websocket: WebSocket, 
     player_name: str, 
-    civilization_id: int
+    civilization_id: int,
+    game_id: Optional[int] = None
 ):
     """WebSocket을 통한 외교 대화"""
     # 세션 ID 생성
@@ -642,13 +500,15 @@ async def diplomacy_ws(
         civ_info = await get_civilization_info(civ_id)
         
         # 세션 존재 확인 및 가져오기 또는 생성
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             # 새 세션 생성
             print(f"{player_name}과 {civ_info['name']} 문명({civ_info['leader']}) 사이의 새로운 외교 세션 생성")
             
             new_session = DiplomacySession(
                 session_id=session_id,
                 civilization_id=civ_id,
+                game_id=game_id,
                 player_name=player_name,
                 messages=[],
                 last_interaction=datetime.now().isoformat(),
@@ -662,7 +522,7 @@ async def diplomacy_ws(
             initial_message = get_initial_message_by_traits(civ_info)
             
             # 세션 저장
-            diplomacy_sessions[session_id] = new_session
+            session_store.put(new_session)
             
             # 메모리 초기화
             get_civilization_memory(session_id, civ_id)
@@ -680,10 +540,14 @@ async def diplomacy_ws(
                 "relationship_score": 30
             })
         else:
-            # 기존 세션 가져오기
-            session = diplomacy_sessions[session_id]
+            # 기존 세션 사용
             print(f"{player_name}과 {civ_info['name']} 문명({civ_info['leader']}) 사이의 기존 외교 세션 로드")
             
+            # 게임 ID 없이 만들어진 세션은 이번 연결의 게임에 연결
+            if session.game_id is None and game_id is not None:
+                session.game_id = game_id
+                session_store.put(session)
+            
             # 대화 가능 여부 확인
             if session.remaining_interactions <= 0:
                 await ws_manager.send_message(session_id, {
@@ -720,8 +584,8 @@ async def diplomacy_ws(
             # 클라이언트 메시지 수신
             data = await websocket.receive_json()
             
-            # 현재 세션 정보 가져오기
-            session = diplomacy_sessions[session_id]
+            # 현재 세션 정보 가져오기 (캐시에서 밀려난 경우 DB에서 다시 적재)
+            session = await session_store.get(session_id) or session
             
             # 대화 가능 여부 확인
             if session.remaining_interactions <= 0:
@@ -766,8 +630,10 @@ async def diplomacy_ws(
                 session.relationship_score = calculate_relationship_score(
                     session.messages, 
                     session.relationship_score, 
-                    session.memory_data
+                    session.memory_data,
+                    since=session.scored_message_count
                 )
+                session.scored_message_count = len(session.messages)
                 score_increase = session.relationship_score - old_score
                 
                 # 세션 업데이트
@@ -778,12 +644,15 @@ async def diplomacy_ws(
                 session.relationship_score = min(session.relationship_score, 100)
                 
                 # 마지막 대화인 경우 다음 대화 가능 턴 설정
+                current_turn = await resolve_current_turn(session.game_id, data.get("turn"))
                 if session.remaining_interactions == 0:
                     # 다음 대화 가능 턴 설정 (예: 5턴 후)
-                    session.can_interact_again_turn = data.get("game_id", 0) + 5
+                    session.can_interact_again_turn = current_turn + 5
                 
-                # 세션 저장
-                diplomacy_sessions[session_id] = session
+                # 세션 저장 (대화 기록은 DiplomacyAction으로 기록)
+                session_store.put(session, action=build_conversation_action(
+                    current_turn, user_message_obj, ai_message, score_increase, session.relationship_score
+                ))
                 
                 # 사용자 메시지 개수 파악 (role이 user인 메시지 개수)
                 user_message_count = sum(1 for msg in session.messages if msg.role == "user")
@@ -811,10 +680,10 @@ async def diplomacy_ws(
             
             # 턴 진행 알림 처리
             elif data.get("type") == "turn_update":
-                game_id = data.get("game_id", 0)
+                current_turn = await resolve_current_turn(session.game_id, data.get("turn"))
                 
                 # 대화 가능 여부 확인 및 업데이트
-                if session.can_interact_again_turn is not None and game_id >= session.can_interact_again_turn:
+                if session.can_interact_again_turn is not None and current_turn >= session.can_interact_again_turn:
                     # 대화 가능 상태로 업데이트
                     session.remaining_interactions = 5  # 재개 시 5번의 대화 기회
                     session.can_interact_again_turn = None
@@ -827,7 +696,7 @@ async def diplomacy_ws(
                                 session.memory_data.key_points = session.memory_data.key_points[-5:]
                     
                     # 세션 저장
-                    diplomacy_sessions[session_id] = session
+                    session_store.put(session)
                     
                     # 문명 특성에 따른 재개 메시지 생성
                     resume_message = get_resume_message_by_traits(civ_info)
@@ -995,13 +864,12 @@ async def get_simple_relationship(player_name: str, civilization_id: int):
         session_id = generate_session_id(player_name, civilization_id)
         
         # 세션 존재 확인
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             return JSONResponse(
                 status_code=404,
                 content={"success": False, "message": "외교 세션이 없습니다."}
             )
-        
-        session = diplomacy_sessions[session_id]
         civ_info = await get_civilization_info(civilization_id)
         
         return {
@@ -1029,7 +897,7 @@ async def first_encounter(request: DiplomacyRequest):
         session_id = generate_session_id(player_name, civilization_id)
         
         # 이미 조우한 문명인지 확인
-        if session_id in diplomacy_sessions:
+        if await session_store.exists(session_id):
             return JSONResponse(
                 status_code=400,
                 content={"success": False, "error": "이미 조우한 문명입니다.", "data": None}
@@ -1039,6 +907,7 @@ async def first_encounter(request: DiplomacyRequest):
         new_session = DiplomacySession(
             session_id=session_id,
             civilization_id=civilization_id,
+            game_id=request.game_id,
             player_name=player_name,
             messages=[],
             last_interaction=datetime.now().isoformat(),
@@ -1058,7 +927,7 @@ async def first_encounter(request: DiplomacyRequest):
         get_civilization_memory(session_id, civilization_id)
         
         # 세션 저장
-        diplomacy_sessions[session_id] = new_session
+        session_store.put(new_session)
         
         return JSONResponse(
             status_code=200,
@@ -1092,13 +961,16 @@ async def send_message(request: DiplomacyRequest):
         session_id = generate_session_id(player_name, civilization_id)
         
         # 세션 존재 확인
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             return JSONResponse(
                 status_code=404,
                 content={"success": False, "error": "외교 세션을 찾을 수 없습니다.", "data": None}
             )
         
-        session = diplomacy_sessions[session_id]
+        # 게임 ID 없이 만들어진 세션은 요청의 게임에 연결 (아래에서 세션과 함께 저장)
+        if session.game_id is None:
+            session.game_id = request.game_id
         
         # 대화 가능 횟수 확인
         if session.remaining_interactions <= 0:
@@ -1136,8 +1008,10 @@ async def send_message(request: DiplomacyRequest):
         session.relationship_score = calculate_relationship_score(
             session.messages, 
             session.relationship_score, 
-            session.memory_data
+            session.memory_data,
+            since=session.scored_message_count
         )
+        session.scored_message_count = len(session.messages)
         score_increase = session.relationship_score - old_score
         
         # 세션 업데이트
@@ -1148,12 +1022,15 @@ async def send_message(request: DiplomacyRequest):
         session.relationship_score = min(session.relationship_score, 100)
         
         # 마지막 대화인 경우 다음 대화 가능 턴 설정
+        current_turn = await resolve_current_turn(session.game_id, request.turn)
         if session.remaining_interactions == 0:
             # 다음 대화 가능 턴 설정 (예: 5턴 후)
-            session.can_interact_again_turn = request.game_id + 5
+            session.can_interact_again_turn = current_turn + 5
         
-        # 세션 저장
-        diplomacy_sessions[session_id] = session
+        # 세션 저장 (대화 기록은 DiplomacyAction으로 기록)
+        session_store.put(session, action=build_conversation_action(
+            current_turn, user_message, ai_message, score_increase, session.relationship_score
+        ))
         
         # 사용자 메시지 개수 파악 (role이 user인 메시지 개수)
         user_message_count = sum(1 for msg in session.messages if msg.role == "user")
@@ -1198,20 +1075,19 @@ async def resume_diplomacy(request: DiplomacyRequest):
     try:
         player_name = request.player_name
         civilization_id = request.civilization_id
-        game_id = request.game_id  # 현재 턴
         session_id = generate_session_id(player_name, civilization_id)
         
         # 세션 존재 확인
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             return JSONResponse(
                 status_code=404,
                 content={"success": False, "error": "외교 세션을 찾을 수 없습니다.", "data": None}
             )
         
-        session = diplomacy_sessions[session_id]
-        
         # 대화 가능 여부 확인
-        if session.can_interact_again_turn is None or game_id < session.can_interact_again_turn:
+        current_turn = await resolve_current_turn(session.game_id or request.game_id, request.turn)
+        if session.can_interact_again_turn is None or current_turn < session.can_interact_again_turn:
             return JSONResponse(
                 status_code=400,
                 content={
@@ -1242,7 +1118,7 @@ async def resume_diplomacy(request: DiplomacyRequest):
                     session.memory_data.key_points = session.memory_data.key_points[-5:]  # 최대 5개 유지
         
         # 세션 저장
-        diplomacy_sessions[session_id] = session
+        session_store.put(session)
         
         return JSONResponse(
             status_code=200,
@@ -1285,14 +1161,13 @@ async def get_relationship_score(player_name: str, civilization_id: int):
         session_id = generate_session_id(player_name, civilization_id)
         
         # 세션 존재 확인
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             return JSONResponse(
                 status_code=404,
                 content={"success": False, "error": "외교 세션을 찾을 수 없습니다.", "data": None}
             )
         
-        session = diplomacy_sessions[session_id]
-        
         # 문명 정보 가져오기
         civ_info = await get_civilization_info(civilization_id)
         
@@ -1337,14 +1212,13 @@ async def get_conversation_history(player_name: str, civilization_id: int, limit
         session_id = generate_session_id(player_name, civilization_id)
         
         # 세션 존재 확인
-        if session_id not in diplomacy_sessions:
+        session = await session_store.get(session_id)
+        if session is None:
             return JSONResponse(
                 status_code=404,
                 content={"success": False, "error": "외교 세션을 찾을 수 없습니다.", "data": None}
             )
         
-        session = diplomacy_sessions[session_id]
-        
         # 최근 메시지 가져오기
         recent_messages = session.messages[-limit:] if limit > 0 else session.messages
         
@@ -1387,42 +1261,40 @@ async def get_conversation_history(player_name: str, civilization_id: int, limit
             content={"success": False, "error": f"서버 오류: {str(e)}", "data": None}
         )
 
+# 관계 목록 항목 생성
+async def build_relationship_entry(session: DiplomacySession) -> Dict[str, Any]:
+    civ_id = session.civilization_id
+    civ_info = await get_civilization_info(civ_id)
+    
+    # 메모리 정보 추가
+    memory_summary = ""
+    sentiment = "neutral"
+    if session.memory_data:
+        memory_summary = session.memory_data.summary
+        sentiment = session.memory_data.sentiment
+        
+    return {
+        "civilization_id": civ_id,
+        "civilization_name": civ_info["name"],
+        "relationship_score": session.relationship_score,
+        "last_interaction": session.last_interaction,
+        "can_interact": session.remaining_interactions > 0 or session.can_interact_again_turn is None or session.can_interact_again_turn <= 0,
+        "can_interact_again_turn": session.can_interact_again_turn,
+        "memory_summary": memory_summary,
+        "sentiment": sentiment
+    }
+
 # 모든 문명과의 관계 조회 API
 @router.get("/{player_name}/all-relationships", response_model=DiplomacyResponse)
 async def get_all_relationships(player_name: str):
     """플레이어가 조우한 모든 문명과의 관계를 조회합니다."""
     try:
-        # player_name으로 시작하는 세션 찾기
-        safe_name = "".join(c for c in player_name if c.isalnum())
-        prefix = f"dipl_{safe_name}_"
-        player_sessions = {
-            k: v for k, v in diplomacy_sessions.items() 
-            if k.startswith(prefix)
-        }
+        # 플레이어 인덱스로 세션 찾기
+        _, player_sessions = await session_store.find_for_player(generate_player_key(player_name))
         
         relationships = []
-        
-        for session_id, session in player_sessions.items():
-            civ_id = session.civilization_id
-            civ_info = await get_civilization_info(civ_id)
-            
-            # 메모리 정보 추가
-            memory_summary = ""
-            sentiment = "neutral"
-            if session.memory_data:
-                memory_summary = session.memory_data.summary
-                sentiment = session.memory_data.sentiment
-                
-            relationships.append({
-                "civilization_id": civ_id,
-                "civilization_name": civ_info["name"],
-                "relationship_score": session.relationship_score,
-                "last_interaction": session.last_interaction,
-                "can_interact": session.remaining_interactions > 0 or session.can_interact_again_turn is None or session.can_interact_again_turn <= 0,
-                "can_interact_again_turn": session.can_interact_again_turn,
-                "memory_summary": memory_summary,
-                "sentiment": sentiment
-            })
+        for session in player_sessions.values():
+            relationships.append(await build_relationship_entry(session))
         
         return JSONResponse(
             status_code=200,
@@ -1444,4 +1316,48 @@ async def get_all_relationships(player_name: str):
         return JSONResponse(
             status_code=500,
             content={"success": False, "error": f"서버 오류: {str(e)}", "data": None}
-        ) 
\ No newline at end of file
+        )
+
+# 문명과의 관계 페이지 조회 API
+@router.get("/{player_name}/relationships", response_model=DiplomacyResponse)
+async def get_relationships_page(
+    player_name: str,
+    page: int = Query(1, ge=1),
+    page_size: int = Query(20, ge=1, le=100)
+):
+    """플레이어가 조우한 문명과의 관계를 페이지 단위로 조회합니다."""
+    try:
+        total, player_sessions = await session_store.find_for_player(
+            generate_player_key(player_name),
+            offset=(page - 1) * page_size,
+            limit=page_size
+        )
+        
+        relationships = []
+        for session in player_sessions.values():
+            relationships.append(await build_relationship_entry(session))
+        
+        return JSONResponse(
+            status_code=200,
+            content={
+                "success": True,
+                "data": {
+                    "player_name": player_name,
+                    "page": page,
+                    "page_size": page_size,
+                    "total": total,
+                    "has_next": page * page_size < total,
+                    "relationships": relationships
+                },
+                "error": None
+            }
+        )
+        
+    except Exception as e:
+        import traceback
+        print(f"관계 조회 오류: {str(e)}")
+        print(traceback.format_exc())
+        return JSONResponse(
+            status_code=500,
+            content={"success": False, "error": f"서버 오류: {str(e)}", "data": None}
+        )
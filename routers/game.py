@@ -1,13 +1,22 @@
 from typing import Optional
-from fastapi import APIRouter, HTTPException, Query, Depends, Path
+from fastapi import APIRouter, HTTPException, Query, Depends, Path, Header
 import json
 import hashlib
 import httpx
 import random
 import os
 from typing import Dict, List, Any
-from fastapi.responses import JSONResponse
-from db.client import prisma, get_prisma
+from fastapi.responses import JSONResponse, Response
+from db.client import DatabasePoolTimeout, db_pool, get_db, prisma
+from prisma import Prisma
+from services.game_state_cache import CachedGameState, etag_matches, game_state_cache
+from services.snapshot_store import snapshot_store
+from services.summary_worker import SummaryWorker
+from services.turn_commit import TurnConflictError, turn_commits, turn_locks
+from services.metrics import AI_DECISION_DURATION, TURN_STAGE_DURATION
+from services.ai_planner import ai_planner
+from services.game_aggregate import game_aggregates
+from services import fast_json
 from datetime import datetime
 from pydantic import BaseModel
 import logging
@@ -17,6 +26,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# 턴 상태가 저장/수정되면 GET /{game_id} 캐시 무효화
+snapshot_store.on_change(game_state_cache.invalidate)
+
 from fastapi import Body
 class CivilizationInfo(BaseModel):
     id: int
@@ -129,12 +141,112 @@ class TurnNextRequest(BaseModel):
     tiles : List[TileInfo] = []
     gameId :int
 
+def replay_turn_commit(previous: Any, idempotency_key: str, turn: int) -> JSONResponse:
+    """이미 선점/커밋된 턴 종료 요청: 같은 키로 완료됐으면 저장된 응답, 처리 중이거나 다른 키면 409"""
+    if previous.completedAt is None:
+        return JSONResponse(
+            status_code=409,
+            content={
+                "success": False,
+                "message": f"턴 {turn}을 다른 요청이 처리하는 중입니다."
+            }
+        )
+    if previous.idempotencyKey == idempotency_key:
+        return JSONResponse(content=previous.response, headers={"Idempotent-Replayed": "true"})
+    return JSONResponse(
+        status_code=409,
+        content={
+            "success": False,
+            "message": f"턴 {turn}은 이미 다른 요청으로 종료되었습니다."
+        }
+    )
+
+async def process_turn(request: TurnNextRequest, game: Any, game_id: str, current_turn: int, stages: Any, db: Prisma) -> Dict[str, Any]:
+    """선점한 턴의 플레이어 상태 반영과 AI 턴 처리 (end_turn이 턴을 선점한 뒤에만 호출)"""
+    # 3. AI 턴 계획 (쓰기 전에 계획해 LLM 대기 시간 동안 트랜잭션을 열어 두지 않음)
+    # 모든 AI 문명의 결정을 한 번에 계획 (LLM 모드면 배치 요청, 예산 초과 시 규칙 기반 폴백)
+    # AI 문명 데이터는 게임 집계 한 번으로 (문명/도시 수와 무관한 고정 쿼리 수)
+    # 계획 입력은 AI 문명 자신의 도시/연구뿐이라 플레이어 상태 반영 전에 읽어도 결과가 같음
+    aggregate = await game_aggregates.load(game_id, game=game)
+    ai_civs = aggregate.ai_civs()
+    civ_datas = [aggregate.civ_data(ai_civ.id) for ai_civ in ai_civs]
+    with AI_DECISION_DURATION.time(engine=ai_planner.mode):
+        plans = await ai_planner.plan(civ_datas, turn=current_turn)
+    stages.mark("ai")
+
+    # 4. 프론트에서 전달받은 플레이어 상태와 AI 결정을 한 트랜잭션으로 반영
+    # (실패하면 둘 다 반영되지 않으므로 선점을 풀고 재시도해도 AI 결정이 두 번 적용되지 않음)
+    try:
+        async with db.tx() as tx:
+            # 도시 정보 업데이트
+            if hasattr(request, "cities"):
+                for city in request.cities:
+                    await tx.city.update(
+                        where={"id": city.id},
+                        data={
+                            "name": city.name,
+                            "population": city.population,
+                            "q": city.location.q if hasattr(city.location, 'q') else None,
+                            "r": city.location.r if hasattr(city.location, 'r') else None,
+                            # 필요한 경우 food, production 등도 추가
+                        }
+                    )
+
+            # 유닛 정보 업데이트
+            if hasattr(request, "units"):
+                for unit in request.units:
+                    await tx.gameunit.update(
+                        where={"id": unit.id},
+                        data={
+                            "q": unit.location.q if hasattr(unit.location, 'q') else None,
+                            "r": unit.location.r if hasattr(unit.location, 'r') else None,
+                            "hp": unit.hp,
+                            # 필요한 경우 moved, promotionLevel 등도 추가
+                        }
+                    )
+
+            # 자원 정보 업데이트 (문명/플레이어)
+            if hasattr(request, "resources"):
+                await tx.gameciv.update(
+                    where={"id": request.civilizationId},
+                    data={
+                        "gold": request.resources.get("gold", 0),
+                        "science": request.resources.get("science", 0),
+                        "culture": request.resources.get("culture", 0),
+                        # 필요한 경우 추가 자원 필드 업데이트
+                    }
+                )
+
+            # 기타 필요한 정보(연구, 건설 등)도 request 기반으로 확장 가능
+
+            # AI 결정 적용
+            for ai_civ in ai_civs:
+                ai_decisions = plans.get(str(ai_civ.id))
+                if ai_decisions:
+                    await apply_ai_decisions(game_id, ai_civ.id, ai_decisions, db=tx)
+    finally:
+        # AI 결정으로 바뀐 상태를 같은 요청의 이후 조회가 읽도록 메모 무효화
+        game_aggregates.invalidate(game_id)
+    stages.mark("apply")
+
+    # 5. 응답 구성 (다음 턴 상태는 GET /games/{id}에서 조회)
+    response = {}
+    response["message"] = "턴이 정상적으로 종료되었으며, 다음 턴 데이터가 반환됩니다."
+    response["success"] = True
+    return response
+
 @router.post("/turn/end")
-async def end_turn(request: TurnNextRequest = Body(...)):
+async def end_turn(
+    request: TurnNextRequest = Body(...),
+    idempotency_key: Optional[str] = Header(None)
+):
     """
     프론트엔드에서 보낸 게임 상태를 바탕으로
     - 해당 턴의 정보를 업데이트하고
     - 다음 턴의 게임 상태 데이터를 반환합니다.
+
+    같은 게임의 턴 종료는 한 번에 하나씩, 턴마다 한 번만 처리합니다.
+    Idempotency-Key 헤더(없으면 게임 ID + 턴)로 재시도한 요청에는 저장된 결과를 그대로 반환합니다.
     """
     try:
         # 1. 전달받은 게임 상태 파싱
@@ -142,7 +254,6 @@ async def end_turn(request: TurnNextRequest = Body(...)):
         if hasattr(game_summary, 'civilizationId'):
             game_id = str(game_summary.gameId)
             current_turn = game_summary.turn
-            next_turn = current_turn + 1
         else:
             logger.error("[turn/end] 유효하지 않은 요청: 필수 필드 부족")
             return JSONResponse(
@@ -152,67 +263,60 @@ async def end_turn(request: TurnNextRequest = Body(...)):
                     "message": "유효하지 않은 요청: 필수 필드가 없습니다."
                 }
             )
+        commit_key = idempotency_key or f"{game_id}:{current_turn}"
 
-        # 2. 프론트에서 전달받은 데이터를 기반으로 DB 업데이트
-        # 도시 정보 업데이트
-        if hasattr(request, "cities"):
-            for city in request.cities:
-                await prisma.city.update(
-                    where={"id": city.id},
-                    data={
-                        "name": city.name,
-                        "population": city.population,
-                        "q": city.location.q if hasattr(city.location, 'q') else None,
-                        "r": city.location.r if hasattr(city.location, 'r') else None,
-                        # 필요한 경우 food, production 등도 추가
-                    }
-                )
+        # 이미 처리된 요청이면 저장된 결과 반환 (조회 1회)
+        previous = await turn_commits.find(game_id, current_turn, commit_key)
+        if previous is not None and not turn_commits.expired(previous):
+            return replay_turn_commit(previous, commit_key, current_turn)
 
-        # 유닛 정보 업데이트
-        if hasattr(request, "units"):
-            for unit in request.units:
-                await prisma.gameunit.update(
-                    where={"id": unit.id},
-                    data={
-                        "q": unit.location.q if hasattr(unit.location, 'q') else None,
-                        "r": unit.location.r if hasattr(unit.location, 'r') else None,
-                        "hp": unit.hp,
-                        # 필요한 경우 moved, promotionLevel 등도 추가
-                    }
-                )
-
-        # 자원 정보 업데이트 (문명/플레이어)
-        if hasattr(request, "resources"):
-            await prisma.gameciv.update(
-                where={"id": request.civilizationId},
-                data={
-                    "gold": request.resources.get("gold", 0),
-                    "science": request.resources.get("science", 0),
-                    "culture": request.resources.get("culture", 0),
-                    # 필요한 경우 추가 자원 필드 업데이트
-                }
-            )
+        async with turn_locks.hold(game_id):
+            # 같은 게임의 앞선 요청을 기다리는 동안에는 풀 슬롯을 잡지 않음 (잠금을 얻은 뒤에 슬롯 확보)
+            async with db_pool.acquire() as db:
+                # 잠금을 기다리는 동안 먼저 들어온 요청이 처리했을 수 있음
+                previous = await turn_commits.find(game_id, current_turn, commit_key)
+                if previous is not None and not turn_commits.expired(previous):
+                    return replay_turn_commit(previous, commit_key, current_turn)
 
-        # 기타 필요한 정보(연구, 건설 등)도 request 기반으로 확장 가능
+                game = await db.game.find_unique(where={"id": int(game_id)})
+                if not game:
+                    return JSONResponse(
+                        status_code=404,
+                        content={
+                            "success": False,
+                            "message": "해당 게임을 찾을 수 없습니다."
+                        }
+                    )
+                stages = TURN_STAGE_DURATION.stages()
 
-        # 3. AI 턴 처리 (기존 로직 유지)
-        ai_civs = await prisma.gameciv.find_many(where={"gameId": game_id, "isPlayer": False})
-        for ai_civ in ai_civs:
-            civ_data = await get_civ_data(ai_civ.id)
-            ai_decisions = await generate_mock_ai_decisions(civ_data)
-            await apply_ai_decisions(game_id, ai_civ.id, ai_decisions)
+                # 2. 어떤 쓰기보다 먼저 턴을 선점 (다른 워커가 먼저 선점했으면 아무것도 쓰지 않고 409)
+                claim = await turn_commits.claim(game_id, current_turn, commit_key, game.version)
+                stages.mark("claim")
+                try:
+                    response = await process_turn(request, game, game_id, current_turn, stages, db)
 
-        # 4. 새로운 턴 상태 스냅샷 저장 (TurnSnapshot 테이블 사용)
-        await collect_and_save_game_summary(game_id, next_turn)
+                    # 6. 선점한 턴에 결과를 저장 (이후 같은 키의 재시도는 저장된 응답을 받음)
+                    await turn_commits.complete(claim, response)
+                    stages.mark("commit")
+                except BaseException:
+                    # 처리 중 실패하면 선점을 풀어 재시도할 수 있게 함
+                    await turn_commits.release(claim)
+                    raise
 
-        # 5. 다음 턴의 전체 게임 상태 반환 (TurnSnapshot 테이블에서 최신 상태 조회)
-        a= await prisma.turnsnapshot.find_first(where={"gameId": game_id, "turnNumber": next_turn})
-        print('게임 상태',a)
-        response = {}
-        response["message"] = "턴이 정상적으로 종료되었으며, 다음 턴 데이터가 반환됩니다."
-        response["success"] = True
-        return JSONResponse(content=response)
+                # 7. 게임 요약 생성은 백그라운드 작업 큐에 예약 (응답 지연에 포함하지 않음, 스냅샷이 있는 종료한 턴 기준)
+                summary_worker.submit(game_id, current_turn)
+                return JSONResponse(content=response)
 
+    except TurnConflictError as e:
+        return JSONResponse(
+            status_code=409,
+            content={
+                "success": False,
+                "message": str(e)
+            }
+        )
+    except DatabasePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return JSONResponse(
             status_code=500,
@@ -221,6 +325,9 @@ async def end_turn(request: TurnNextRequest = Body(...)):
                 "message": f"턴 종료 처리 중 오류가 발생했습니다: {str(e)}"
             }
         )
+    finally:
+        # 턴 커밋 후 게임 상태 캐시 무효화
+        game_state_cache.invalidate(request.gameId)
 
 class GameSummary(BaseModel):
     """게임 상태 전체를 요약하는 모델"""
@@ -253,255 +360,107 @@ class TurnNextRequest(BaseModel):
     era: str = None
     game_summary: GameSummary = None
 
+def game_state_response(entry: CachedGameState, if_none_match: Optional[str]) -> Response:
+    """캐시된 게임 상태 응답 (If-None-Match가 일치하면 본문 없이 304)"""
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, entry.etag):
+        return Response(status_code=304, headers=headers)
+    if entry.body is not None:
+        return fast_json.json_bytes_response(entry.body, headers=headers)
+    return JSONResponse(content=entry.payload, headers=headers)
+
 @router.get("/{game_id}")
 async def get_game_state(
     game_id: str = None, 
     user_name: Optional[str] = Query(None, description="사용자 이름"),
-    turn: Optional[int] = None
+    turn: Optional[int] = None,
+    if_none_match: Optional[str] = Header(None)
 ):
-    """특정 게임의 상태 조회"""
+    """특정 게임의 상태 조회 (읽기 전용, 턴 커밋 전까지 프로세스 내 캐시와 ETag 사용)"""
     try:
-        # 연결이 필요한 경우에만 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return {
-                        "success": False,
-                        "status_code": 500,
-                        "message": f"데이터베이스 연결 오류: {str(e)}",
-                        "error": {
-                            "type": type(e).__name__,
-                            "detail": str(e)
-                        }
-                    }
-            # 이미 연결된 경우는 무시
-        
-        # 게임 조회 조건 설정
-        where_condition = {}
-        
-        # game_id가 제공된 경우
-        if game_id:
-            where_condition["id"] = game_id
-        # user_name이 제공된 경우
-        elif user_name:
-            # 사용자 이름을 SHA256으로 해시
-            user_name_hash = hashlib.sha256(user_name.encode()).hexdigest()
-            where_condition["userName"] = user_name_hash
-        # 둘 다 제공되지 않은 경우
-        else:
-            return {
-                "success": False,
-                "status_code": 400,
-                "message": "게임 ID 또는 사용자 이름이 필요합니다."
-            }
+        # 캐시에 있으면 DB 조회 없이 응답 (ETag가 같으면 304)
+        cache_key = game_state_cache.key(game_id, turn) if game_id else None
+        if cache_key is not None:
+            cached = game_state_cache.get(cache_key)
+            if cached is not None:
+                return game_state_response(cached, if_none_match)
+
+        # 캐시 미스일 때만 풀 슬롯을 잡음 (캐시 적중/304 응답은 DB 연결을 쓰지 않음)
+        async with db_pool.acquire() as db:
+            # 게임 조회 조건 설정
+            where_condition = {}
+        
+            # game_id가 제공된 경우
+            if game_id:
+                where_condition["id"] = game_id
+            # user_name이 제공된 경우
+            elif user_name:
+                # 사용자 이름을 SHA256으로 해시
+                user_name_hash = hashlib.sha256(user_name.encode()).hexdigest()
+                where_condition["userName"] = user_name_hash
+            # 둘 다 제공되지 않은 경우
+            else:
+                return {
+                    "success": False,
+                    "status_code": 400,
+                    "message": "게임 ID 또는 사용자 이름이 필요합니다."
+                }
         
-        # 게임 존재 여부 확인
-        game = await prisma.game.find_first(
-            where=where_condition,
-            order={"createdAt": "desc"}  # 가장 최근 게임 조회
-        )
+            # 게임 존재 여부 확인
+            game = await db.game.find_first(
+                where=where_condition,
+                order={"createdAt": "desc"}  # 가장 최근 게임 조회
+            )
         
-        if not game:
-            return {
-                "success": False,
-                "status_code": 404,
-                "message": "해당 게임을 찾을 수 없습니다."
-            }
+            if not game:
+                return {
+                    "success": False,
+                    "status_code": 404,
+                    "message": "해당 게임을 찾을 수 없습니다."
+                }
         
-        # 턴 번호 결정 (지정한 턴 또는 현재 턴)
-        query_turn = turn if turn is not None else game.currentTurn
+            # 턴 번호 결정 (지정한 턴 또는 현재 턴)
+            query_turn = turn if turn is not None else game.currentTurn
         
-        # TurnSnapshot에서 게임 상태 조회 (재화 정보 포함)
-        turn_snapshot = await prisma.turnsnapshot.find_first(
-            where={
-                "gameId": game.id,
-                "turnNumber": query_turn
-            }
-        )
+            # TurnSnapshot에서 게임 상태 조회 (재화 정보 포함, 키프레임 + 델타로 복원)
+            turn_snapshot = await snapshot_store.load(game.id, query_turn)
         
-        # TurnSnapshot이 없는 경우 기존 TurnSnapshot에서 조회
-        if not turn_snapshot:
-            # TurnSnapshot이 없는 경우 TurnSnapshot에서 조회
-            game_state = await prisma.turnsnapshot.find_first(
-                where={
-                    "gameId": game.id,
-                    "turnNumber": query_turn
-                }
-            )
-            
-            if not game_state:
+            # TurnSnapshot이 없는 경우
+            if not turn_snapshot:
                 return {
                     "success": False,
                     "status_code": 404,
                     "message": f"턴 {query_turn}의 게임 상태를 찾을 수 없습니다."
                 }
-                
-            # 플레이어 문명 정보 조회 (재화 데이터용)
-            player_civ = await prisma.gameciv.find_first(
-                where={
-                    "gameId": game.id,
-                    "id": game.playerCivId
-                }
-            )
-            
-            # 플레이어 도시들의 식량과 생산력 정보 조회
-            player_cities = None
-            total_food = 0
-            total_production = 0
-            
-            if player_civ:
-                player_cities = await prisma.city.find_many(
-                    where={
-                        "gameCivId": player_civ.id
-                    }
-                )
-                
-                if player_cities:
-                    for city in player_cities:
-                        total_food += city.food
-                        total_production += city.production
-            
-            # 플레이어 재화 정보 추가
-            player_resources = {
-                "gold": player_civ.gold if player_civ else 0,
-                "science": player_civ.science if player_civ else 0,
-                "culture": player_civ.culture if player_civ else 0,
-                "food": total_food,
-                "production": total_production
-            }
-            
-            # 실제 턴 데이터가 state_data에 들어가 있는지 확인하고, 없으면 생성
-            if not state_data or not isinstance(state_data, dict) or not state_data.get("cities"):
-                # 예시: cities, units, resources 등 실제 턴 데이터 구성
-                state_data = {
-                    "cities": [city.dict() for city in player_cities] if player_cities else [],
-                    "resources": player_resources,
-                    # 필요에 따라 units, tiles 등도 추가
-                }
-            
-            # TurnSnapshot에 저장하여 다음에는 더 빠르게 조회할 수 있도록 함
-            try:
-                await prisma.turnsnapshot.create(
-                    data={
-                        "gameId": game.id,
-                        "turnNumber": query_turn,
-                        "stateData": state_data,
-                        "playerResources": player_resources,
-                        "observedMap": {},  # 기본 빈 맵 정보
-                        "civId": game.playerCivId,
-                        "diplomacyState": {},
-                        "productionState": {},
-                        "researchState": {}
-                    }
-                )
-            except Exception as snapshot_error:
-                logger.error(f"TurnSnapshot 생성 중 오류: {str(snapshot_error)}")
-                # 스냅샷 생성 실패해도 계속 진행
-        else:
-            # TurnSnapshot에서 데이터 가져오기
-            try:
-                state_data = getattr(turn_snapshot, 'stateData', None)
-            except AttributeError:
-                state_data = None
-            
-            # playerResources가 없는 경우 (스키마 마이그레이션 전 데이터)
-            try:
-                player_resources = getattr(turn_snapshot, 'playerResources', None)
-            except AttributeError:
-                # playerResources 속성이 없는 경우
-                player_resources = None
-            
-            # state_data가 없는 경우 TurnSnapshot에서 가져오기
-            if not state_data:
-                # TurnSnapshot에서 데이터 가져오기
-                game_state = await prisma.turnsnapshot.find_first(
-                    where={
-                        "gameId": game.id,
-                        "turnNumber": query_turn
-                    }
-                )
-                
-                if game_state:
-                    state_data = game_state.stateData
-                    
-                    # TurnSnapshot 업데이트 시도 - 에러 무시
-                    try:
-                        await prisma.turnsnapshot.update(
-                            where={"id": turn_snapshot.id},
-                            data={"stateData": state_data}
-                        )
-                    except Exception as update_error:
-                        logger.error(f"TurnSnapshot stateData 업데이트 중 오류: {str(update_error)}")
-            
-            # 재화 정보가 없으면 직접 계산
+
+            state_data = turn_snapshot.stateData
+            player_resources = turn_snapshot.playerResources
+        
+            # 재화 정보가 없는 스냅샷(이전 데이터)은 응답용으로만 계산 (GET에서는 저장하지 않음)
             if not player_resources:
-                # 플레이어 문명 정보 조회
-                player_civ = await prisma.gameciv.find_first(
-                    where={
-                        "gameId": game.id,
-                        "id": game.playerCivId
-                    }
-                )
-                
-                # 플레이어 도시들의 식량과 생산력 정보 조회
-                total_food = 0
-                total_production = 0
-                
-                if player_civ:
-                    player_cities = await prisma.city.find_many(
-                        where={
-                            "gameCivId": player_civ.id
-                        }
-                    )
-                    
-                    if player_cities:
-                        for city in player_cities:
-                            total_food += city.food
-                            total_production += city.production
-                
-                # 플레이어 재화 정보 추가
-                player_resources = {
-                    "gold": player_civ.gold if player_civ else 0,
-                    "science": player_civ.science if player_civ else 0,
-                    "culture": player_civ.culture if player_civ else 0,
-                    "food": total_food,
-                    "production": total_production
+                aggregate = await game_aggregates.load(game.id, game=game)
+                player_resources = aggregate.player_resources()
+        
+            payload = fast_json.encodable({
+                "success": True,
+                "status_code": 200,
+                "message": f"턴 {query_turn}의 게임 상태를 조회했습니다.",
+                "data": state_data,
+                "player_resources": player_resources,
+                "meta": {
+                    "game_id": game.id,
+                    "turn": query_turn,
+                    "current_turn": game.currentTurn,
+                    # 조회 시각이 아닌 스냅샷 생성 시각 (본문 해시인 ETag가 같은 상태에서 바뀌지 않도록)
+                    "created_at": turn_snapshot.createdAt.isoformat() if turn_snapshot.createdAt else None
                 }
-                
-                # TurnSnapshot 업데이트 시도 - 에러 무시
-                try:
-                    await prisma.turnsnapshot.update(
-                        where={"id": turn_snapshot.id},
-                        data={
-                            "playerResources": player_resources,
-                            "stateData": state_data,
-                            "observedMap": getattr(turn_snapshot, 'observedMap', {}),
-                            "civId": getattr(turn_snapshot, 'civId', None),
-                            "diplomacyState": getattr(turn_snapshot, 'diplomacyState', {}),
-                            "productionState": getattr(turn_snapshot, 'productionState', {}),
-                            "researchState": getattr(turn_snapshot, 'researchState', {})
-                        }
-                    )
-                except Exception as update_error:
-                    logger.error(f"TurnSnapshot 업데이트 중 오류: {str(update_error)}")
-        
-        return {
-            "success": True,
-            "status_code": 200,
-            "message": f"턴 {query_turn}의 게임 상태를 조회했습니다.",
-            "data": state_data,
-            "player_resources": player_resources,
-            "meta": {
-                "game_id": game.id,
-                "turn": query_turn,
-                "current_turn": game.currentTurn,
-                "created_at": datetime.now().isoformat()
-            }
-        }
-        
+            })
+            if cache_key is None:
+                return fast_json.respond(payload)
+            return game_state_response(game_state_cache.put(cache_key, payload), if_none_match)
+
+    except DatabasePoolTimeout as e:
+        raise HTTPException(status_code=503, detail=str(e))
     except Exception as e:
         return {
             "success": False,
@@ -720,20 +679,20 @@ async def get_game_state(
         observed_map = getattr(game_summary, 'mapState', None) or {}
         research_state = getattr(game_summary, 'technologies', None) or {}
 
-        new_snapshot = await prisma.turnsnapshot.create(
-            data={
-                "gameId": request.gameId,
-                "turnNumber": next_turn_number,
-                "year": next_year,  # year 필드 추가
-                "civId": player_civ.id,
-                "observedMap": json.dumps(observed_map),
-                "researchState": json.dumps(research_state),
-                "productionState": json.dumps({}),
-                "diplomacyState": json.dumps({}),
-                "resourceState": json.dumps(next_resources),
-                "stateData": json.dumps(new_state_data),
+        new_snapshot = await snapshot_store.save(
+            request.gameId,
+            next_turn_number,
+            player_civ.id,
+            {
+                "observedMap": observed_map,
+                "researchState": research_state,
+                "productionState": {},
+                "diplomacyState": {},
+                "resourceState": next_resources,
+                "stateData": new_state_data,
                 "playerResources": next_resources
-            }
+            },
+            year=next_year  # year 필드 추가
         )
         
         # 플레이어 문명 자원 업데이트
@@ -823,9 +782,9 @@ async def update_research_progress(game_civ_id: int):
     if not in_progress:
         # 연구 중인 기술이 없으면 연구 큐에서 다음 기술 가져와서 연구 시작
         queue_list = await prisma.researchqueue.find_many(
-            where={"gameCivId": game_civ_id}
+            where={"gameCivId": game_civ_id},
+            order={"queuePosition": "asc"}
         )
-        queue_list = sorted(queue_list, key=lambda x: x.queuePosition)
         queue_entry = queue_list[0] if queue_list else None
         
         if queue_entry:
@@ -1149,25 +1108,10 @@ async def update_building_construction(city_id: int):
         )
 
 @router.get("/games")
-async def get_games():
+async def get_games(db: Prisma = Depends(get_db)):
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
-        games = await prisma.game.find_many()
+        # 게임 풀에 대기 중인 미배정 게임은 제외
+        games = await db.game.find_many(where={"pooled": False})
         return {
             "success": True,
             "data": games,
@@ -1181,25 +1125,9 @@ async def get_games():
         }
 
 @router.get("/games/{game_id}")
-async def get_game(game_id: int):
+async def get_game(game_id: int, db: Prisma = Depends(get_db)):
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
-        game = await prisma.game.find_unique(
+        game = await db.game.find_unique(
             where={
                 'id': game_id
             }
@@ -1224,350 +1152,8 @@ async def get_game(game_id: int):
             "error": f"서버 오류: {str(e)}"
         }
 
-async def get_civ_data(civ_id: int) -> Dict[str, Any]:
-    """특정 문명의 상세 데이터를 수집합니다."""
-    # 문명 기본 정보
-    civ = await prisma.gameciv.find_unique(
-        where={"id": civ_id},
-        include={"civType": True}
-    )
-    
-    if not civ:
-        return {}
-    
-    # 문명 도시 정보
-    cities = await prisma.city.find_many(
-        where={"gameCivId": civ_id}
-    )
-    
-    city_data = []
-    for city in cities:
-        # 도시 내 건물 정보
-        buildings = await prisma.playerbuilding.find_many(
-            where={
-                "cityId": city.id,
-                "status": "completed"
-            },
-            include={
-                "building": True
-            }
-        )
-        
-        # 현재 건설 중인 건물
-        in_progress_building = await prisma.playerbuilding.find_first(
-            where={
-                "cityId": city.id,
-                "status": "in_progress"
-            },
-            include={
-                "building": True
-            }
-        )
-        
-        # 건설 큐
-        build_queue = await prisma.buildqueue.find_many(
-            where={"cityId": city.id}
-        )
-        
-        sorted_queue = sorted(build_queue, key=lambda x: x.queueOrder)
-        
-        city_data.append({
-            "id": city.id,
-            "name": city.name,
-            "population": city.population,
-            "buildings": [{"id": b.buildingId, "name": b.building.name, "type": b.building.category} for b in buildings],
-            "in_progress": {
-                "building": in_progress_building.building.name if in_progress_building else None,
-                "progress": in_progress_building.progressPoints if in_progress_building and hasattr(in_progress_building, "progressPoints") else None,
-                "required": in_progress_building.building.buildTime if in_progress_building else None
-            } if in_progress_building else None,
-            "queue": [{"id": q.buildingId} for q in sorted_queue]
-        })
-    
-    # 연구 상태
-    completed_techs = await prisma.gamecivtechnology.find_many(
-        where={
-            "gameCivId": civ_id,
-            "status": "completed"
-        }
-    )
-    
-    in_progress_tech = await prisma.gamecivtechnology.find_first(
-        where={
-            "gameCivId": civ_id,
-            "status": "in_progress"
-        }
-    )
-    
-    research_queue = await prisma.researchqueue.find_many(
-        where={"gameCivId": civ_id}
-    )
-    
-    sorted_research_queue = sorted(research_queue, key=lambda x: x.queuePosition)
-    
-    # 최종 데이터 구성
-    civ_data = {
-        "id": civ.id,
-        "name": civ.civType.name if hasattr(civ, 'civType') and civ.civType else f"문명 {civ.id}",
-        "leader": civ.civType.leaderName if hasattr(civ, 'civType') and civ.civType else "알 수 없는 지도자",
-        "cities": city_data,
-        "research": {
-            "completed": [],
-            "in_progress": None,
-            "queue": [{"id": r.techId} for r in sorted_research_queue]
-        },
-        "resources": {
-            "gold": civ.gold,
-            "science": civ.science,
-            "culture": civ.culture
-        }
-    }
-    # completed 기술 상세 정보 추가
-    completed_techs_data = []
-    for t in completed_techs:
-        tech_obj = await prisma.technology.find_unique(where={"id": t.techId})
-        completed_techs_data.append({
-            "id": t.techId,
-            "name": tech_obj.name if tech_obj else None,
-            "required": tech_obj.researchCost if tech_obj else None
-        })
-    civ_data["research"]["completed"] = completed_techs_data
-    # in_progress_tech가 있으면 기술 상세 정보 추가
-    if in_progress_tech:
-        tech = await prisma.technology.find_unique(where={"id": in_progress_tech.techId})
-        civ_data["research"]["in_progress"] = {
-            "id": in_progress_tech.techId,
-            "name": tech.name if tech else None,
-            "progress": in_progress_tech.progressPoints,
-            "required": tech.researchCost if tech else None
-        }
-    return civ_data
-
-async def get_ai_decisions(civ_data: Dict[str, Any], game_state: Dict[str, Any], turn: int) -> Dict[str, Any]:
-    """LLM API를 호출하여 AI 문명의 결정사항을 가져옵니다."""
-    # LLM API 엔드포인트 설정
-    api_key = os.getenv("LLM_API_KEY", "YOUR_LLM_API_KEY")
-    api_url = os.getenv("LLM_API_URL", "https://api.example.com/v1/completion")
-    
-    # 문맥 구성
-    prompt = f"""
-문명 게임에서 당신은 다음 문명의 AI 플레이어 역할을 맡게 됩니다:
-
-현재 턴: {turn}
-문명 이름: {civ_data.get('name')}
-
-도시:
-{json.dumps(civ_data.get('cities', []), indent=2, ensure_ascii=False)}
-
-연구 상태:
-{json.dumps(civ_data.get('research', {}), indent=2, ensure_ascii=False)}
-
-자원:
-{json.dumps(civ_data.get('resources', {}), indent=2, ensure_ascii=False)}
-
-게임 상황:
-{json.dumps(game_state, indent=2, ensure_ascii=False)}
-
-이번 턴에 당신의 문명이 취해야 할 행동을 결정하세요:
-1. 각 도시별로 건설할 건물 또는 생산할 유닛
-2. 연구할 기술
-3. 기타 중요한 결정사항
-
-다음 JSON 형식으로 답변해주세요:
-{{
-  "cities": [
-    {{
-      "city_id": 도시ID,
-      "build": {{
-        "type": "building" 또는 "unit",
-        "id": 건물ID 또는 유닛ID
-      }}
-    }}
-  ],
-  "research": {{
-    "tech_id": 연구할 기술ID
-  }}
-}}
-"""
-
-    try:
-        # 실제 환경에서는 HTTP 요청을 통해 LLM API 호출
-        # 현재 개발 환경에서는 임의의 결정 생성
-        # async with httpx.AsyncClient() as client:
-        #     response = await client.post(
-        #         api_url,
-        #         headers={"Authorization": f"Bearer {api_key}"},
-        #         json={"prompt": prompt, "max_tokens": 1000}
-        #     )
-        #     result = response.json()
-        #     ai_decisions = json.loads(result["choices"][0]["text"])
-        #     return ai_decisions
-        
-        # 개발 환경용 임시 결정 (랜덤 생성)
-        return generate_mock_ai_decisions(civ_data)
-        
-    except Exception as e:
-        print(f"LLM API 호출 오류: {str(e)}")
-        # 오류 발생 시 기본적인 결정 반환
-        return {
-            "cities": [],
-            "research": None
-        }
-
-async def generate_mock_ai_decisions(civ_data: Dict[str, Any]):
-    """
-    AI의 의사결정을 모의로 생성합니다.
-    """
-    decisions = {
-        "cities": [],
-        "research": None
-    }
-    
-    # 각 도시별 의사결정 생성
-    for city in civ_data.get("cities", []):
-        city_id = city.get("id")
-        
-        # 이미 건설 중인 건물이 있는지 확인
-        building_in_progress = any(building.get("status") == "in_progress" for building in city.get("buildings", []))
-        
-        # 생산 큐 확인
-        production_in_progress = city.get("production_queue") and len(city.get("production_queue")) > 0
-        
-        # 건설이나 생산 중인 항목이 있으면 스킵
-        if building_in_progress or production_in_progress:
-            continue
-            
-        # 건설할 건물 또는 생산할 유닛 선택 (간단히 랜덤으로 결정)
-        build_choice = random.choice(["building", "unit"])
-        
-        if build_choice == "building":
-            # 건물 선택 로직
-            available_buildings = []
-            
-            # 연구 완료된 기술 기반 건설 가능 건물 조회
-            completed_techs = [tech.get("id") for tech in civ_data.get("research", {}).get("completed_techs", [])]
-            
-            try:
-                all_buildings = await prisma.building.find_many(
-                    where={
-                        "OR": [
-                            {"prerequisiteTechId": {"in": completed_techs}},
-                            {"prerequisiteTechId": None}
-                        ]
-                    }
-                )
-                
-                # 이미 완료된 건물 제외
-                completed_building_ids = [
-                    building.get("id") 
-                    for building in city.get("buildings", []) 
-                    if building.get("status") == "completed"
-                ]
-                
-                available_buildings = [
-                    building for building in all_buildings 
-                    if building.id not in completed_building_ids
-                ]
-                
-                # 건설 큐에서 있는 건물 제외
-                queued_building_ids = [
-                    entry.get("buildingId") for entry in city.get("build_queue", [])
-                ]
-                
-                available_buildings = [
-                    building for building in available_buildings 
-                    if building.id not in queued_building_ids
-                ]
-                
-            except Exception as e:
-                print(f"건물 조회 오류: {e}")
-                available_buildings = []
-            
-            if available_buildings:
-                # 간단히 랜덤으로 건물 선택
-                selected_building = random.choice(available_buildings)
-                
-                city_decision = {
-                    "city_id": city_id,
-                    "build": {
-                        "type": "building",
-                        "id": selected_building.id,
-                        "name": selected_building.name
-                    }
-                }
-                
-                decisions["cities"].append(city_decision)
-        else:
-            # 유닛 선택 로직
-            available_units = []
-            
-            # 연구 완료된 기술 기반 생산 가능 유닛 조회
-            completed_techs = [tech.get("id") for tech in civ_data.get("research", {}).get("completed_techs", [])]
-            
-            try:
-                all_units = await prisma.unittype.find_many(
-                    where={
-                        "OR": [
-                            {"prerequisiteTechId": {"in": completed_techs}},
-                            {"prerequisiteTechId": None}
-                        ]
-                    }
-                )
-                
-                available_units = all_units
-                
-            except Exception as e:
-                print(f"유닛 조회 오류: {e}")
-                available_units = []
-            
-            if available_units:
-                # 간단히 랜덤으로 유닛 선택
-                selected_unit = random.choice(available_units)
-                
-                city_decision = {
-                    "city_id": city_id,
-                    "build": {
-                        "type": "unit",
-                        "id": selected_unit.id,
-                        "name": selected_unit.name
-                    }
-                }
-                
-                decisions["cities"].append(city_decision)
-    
-    # 연구 의사결정 - 간단히 랜덤으로 선택
-    try:
-        # 이미 연구 중인 기술이 있는지 확인
-        current_research = civ_data.get("research", {}).get("current_research")
-        
-        if not current_research:
-            # 완료된 기술과 현재 연구 중인 기술 제외하고 선택
-            completed_tech_ids = [tech.get("id") for tech in civ_data.get("research", {}).get("completed_techs", [])]
-            queued_tech_ids = [entry.get("technologyId") for entry in civ_data.get("research", {}).get("research_queue", [])]
-            excluded_tech_ids = completed_tech_ids + queued_tech_ids
-            
-            available_techs = await prisma.technology.find_many(
-                where={
-                    "id": {"not": {"in": excluded_tech_ids}}
-                }
-            )
-            
-            if available_techs:
-                # 기술 트리를 고려한 선택 (여기서는 간단히 랜덤으로 선택)
-                selected_tech = random.choice(available_techs)
-                
-                decisions["research"] = {
-                    "tech_id": selected_tech.id,
-                    "name": selected_tech.name
-                }
-    
-    except Exception as e:
-        print(f"연구 의사결정 오류: {e}")
-    
-    return decisions
-
-async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any]):
-    """AI의 의사결정을 게임 상태에 적용합니다."""
+async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any], db: Prisma = prisma):
+    """AI의 의사결정을 게임 상태에 적용합니다. db로 턴 처리 트랜잭션을 넘겨받아 같은 트랜잭션에서 씁니다."""
     
     # 도시별 결정 적용
     for city_decision in decisions.get("cities", []):
@@ -1579,7 +1165,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
         
         try:
             # 도시 정보 조회
-            city = await prisma.city.find_unique(
+            city = await db.city.find_unique(
                 where={"id": city_id},
                 include={
                     "buildings": True
@@ -1597,7 +1183,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                 building_id = build_info.get("id")
                 
                 # 이미 건설 중인 건물이 있는지 확인
-                in_progress_building = await prisma.citybuilding.find_first(
+                in_progress_building = await db.citybuilding.find_first(
                     where={
                         "cityId": city_id,
                         "status": "in_progress"
@@ -1606,7 +1192,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                 
                 if in_progress_building:
                     # 건설 큐에 추가
-                    await prisma.buildqueue.create(
+                    await db.buildqueue.create(
                         data={
                             "cityId": city_id,
                             "buildingId": building_id
@@ -1614,14 +1200,14 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                     )
                 else:
                     # 즉시 건설 시작
-                    building = await prisma.building.find_unique(
+                    building = await db.building.find_unique(
                         where={"id": building_id}
                     )
                     
                     if building:
                         turns_remaining = building.turns_to_build
                         
-                        await prisma.citybuilding.create(
+                        await db.citybuilding.create(
                             data={
                                 "cityId": city_id,
                                 "buildingId": building_id,
@@ -1634,7 +1220,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                 unit_id = build_info.get("id")
                 
                 # 이미 생산 중인 유닛이 있는지 확인
-                in_progress_production = await prisma.productionqueue.find_first(
+                in_progress_production = await db.productionqueue.find_first(
                     where={
                         "cityId": city_id,
                         "status": "in_progress"
@@ -1646,7 +1232,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                     next_order = 2  # 기본적으로 큐의 두 번째 위치
                     
                     # 현재 큐에서 가장 높은 순서 확인
-                    latest_queue_item = await prisma.productionqueue.find_first(
+                    latest_queue_item = await db.productionqueue.find_first(
                         where={"cityId": city_id},
                         order={"queueOrder": "desc"}
                     )
@@ -1654,7 +1240,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                     if latest_queue_item:
                         next_order = latest_queue_item.queueOrder + 1
                     
-                    await prisma.productionqueue.create(
+                    await db.productionqueue.create(
                         data={
                             "cityId": city_id,
                             "unitTypeId": unit_id,
@@ -1664,14 +1250,14 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                     )
                 else:
                     # 즉시 생산 시작
-                    unit_type = await prisma.unittype.find_unique(
+                    unit_type = await db.unittype.find_unique(
                         where={"id": unit_id}
                     )
                     
                     if unit_type:
                         turns_remaining = unit_type.turns_to_build
                         
-                        await prisma.productionqueue.create(
+                        await db.productionqueue.create(
                             data={
                                 "cityId": city_id,
                                 "unitTypeId": unit_id,
@@ -1693,7 +1279,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
         if tech_id:
             try:
                 # 현재 연구 중인 기술 확인
-                civ_data = await prisma.civilization.find_unique(
+                civ_data = await db.civilization.find_unique(
                     where={"id": civ_id},
                     include={
                         "research_status": {
@@ -1710,7 +1296,7 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                     
                     if current_research:
                         # 이미 연구 중인 기술이 있으면 큐에 추가
-                        await prisma.researchqueue.create(
+                        await db.researchqueue.create(
                             data={
                                 "researchStatusId": research_status_id,
                                 "technologyId": tech_id
@@ -1718,14 +1304,14 @@ async def apply_ai_decisions(game_id: str, civ_id: str, decisions: Dict[str, Any
                         )
                     else:
                         # 즉시 연구 시작
-                        technology = await prisma.technology.find_unique(
+                        technology = await db.technology.find_unique(
                             where={"id": tech_id}
                         )
                         
                         if technology:
                             turns_remaining = technology.turns_to_research
                             
-                            await prisma.researchstatus.update(
+                            await db.researchstatus.update(
                                 where={"id": research_status_id},
                                 data={
                                     "currentResearchId": tech_id,
@@ -1920,115 +1506,97 @@ async def update_city_resources(city_id: int):
     }
 
 async def save_game_summary(game_summary: GameSummary):
-    """게임 요약 정보를 저장하는 함수"""
-    try:
-        # 게임 요약 정보를 JSON으로 변환
-        game_summary_json = game_summary.dict()
-        
-        # 게임 요약 정보를 데이터베이스에 저장
-        await prisma.gamesummary.upsert(
-            where={
-                "gameId_turn": {
-                    "gameId": game_summary.gameId,
-                    "turn": game_summary.turn
-                }
-            },
-            create={
+    """게임 요약 정보를 저장하는 함수 (DB 오류는 호출한 요약 작업 큐가 재시도하도록 그대로 전달)"""
+    # 게임 요약 정보를 JSON으로 변환
+    game_summary_json = game_summary.dict()
+    
+    # 게임 요약 정보를 데이터베이스에 저장
+    await prisma.gamesummary.upsert(
+        where={
+            "gameId_turn": {
                 "gameId": game_summary.gameId,
-                "turn": game_summary.turn,
-                "data": game_summary_json
-            },
-            update={
-                "data": game_summary_json,
-                "updatedAt": datetime.now()
+                "turn": game_summary.turn
             }
-        )
-        
-        logger.info(f"게임 요약 정보가 저장되었습니다. 게임 ID: {game_summary.gameId}, 턴: {game_summary.turn}")
-        return True
-    except Exception as e:
-        logger.error(f"게임 요약 정보 저장 중 오류 발생: {str(e)}")
-        return False
+        },
+        create={
+            "gameId": game_summary.gameId,
+            "turn": game_summary.turn,
+            "data": game_summary_json
+        },
+        update={
+            "data": game_summary_json,
+            "updatedAt": datetime.now()
+        }
+    )
+    
+    logger.info(f"게임 요약 정보가 저장되었습니다. 게임 ID: {game_summary.gameId}, 턴: {game_summary.turn}")
+    return True
 
 async def collect_and_save_game_summary(game_id: str, turn: int):
-    """게임 상태를 분석하여 요약 정보를 수집하고 저장하는 함수"""
-    try:
-        # 게임 정보 조회
-        game = await prisma.game.find_unique(
-            where={"id": game_id}
-        )
-        
-        if not game:
-            logger.error(f"게임 요약 정보 수집 실패: 게임을 찾을 수 없습니다. 게임 ID: {game_id}")
-            return False
-        
-        # 현재 턴의 게임 상태 조회 (TurnSnapshot 사용)
-        game_states = await prisma.turnsnapshot.find_many(
-            where={
-                "gameId": game_id,
-                "turnNumber": turn
-            }
-        )
-        
-        if not game_states or len(game_states) == 0:
-            logger.error(f"게임 요약 정보 수집 실패: 게임 상태를 찾을 수 없습니다. 게임 ID: {game_id}, 턴: {turn}")
-            return False
-        
-        current_state = game_states[0]
-        state_data = current_state.stateData
-        
-        # 플레이어 문명 정보 조회
-        player_civ = await prisma.gameciv.find_first(
-            where={
-                "gameId": game_id,
-                "id": game.playerCivId
-            }
-        )
-        
-        # 플레이어 도시들의 평균 식량과 생산력 계산
-        player_cities = await prisma.city.find_many(
-            where={
-                "gameCivId": game.playerCivId
-            }
-        )
-        
-        avg_food = 0
-        avg_production = 0
-        
-        if player_cities and len(player_cities) > 0:
-            total_food = sum(city.food for city in player_cities)
-            total_production = sum(city.production for city in player_cities)
-            avg_food = total_food // len(player_cities)
-            avg_production = total_production // len(player_cities)
-        
-        # 게임 상태로부터 요약 정보 생성
-        game_summary = GameSummary(
-            gameId=game_id,
-            userId=game.userName,
-            turn=turn,
-            year=state_data.get("year"),
-            difficulty=game.difficulty,
-            mapType=game.mapType,
-            gameMode=game.gameMode,
-            startTime=game.createdAt,
-            civilizationId=game.playerCivId,
-            civilizationName=state_data.get("player_civ", {}).get("name"),
-            leaderName=state_data.get("player_civ", {}).get("leader"),
-            gold=player_civ.gold if player_civ else 0,
-            science=player_civ.science if player_civ else 0,
-            culture=player_civ.culture if player_civ else 0,
-            food=avg_food,
-            production=avg_production,
-            resources=state_data.get("resources", {}),
-            totalCities=len(state_data.get("cities", [])),
-            totalUnits=len(state_data.get("units", [])),
-        )
-        
-        # 게임 요약 정보 저장
-        return await save_game_summary(game_summary)
-    except Exception as e:
-        logger.error(f"게임 요약 정보 수집 및 저장 중 오류 발생: {str(e)}")
+    """게임 상태를 분석하여 요약 정보를 수집하고 저장하는 함수
+
+    게임이나 해당 턴 스냅샷이 없으면 False(재시도해도 결과가 같음), 조회/저장 오류는 예외로 전달해 재시도합니다.
+    """
+    # 게임 정보 조회
+    game = await prisma.game.find_unique(
+        where={"id": game_id}
+    )
+    
+    if not game:
+        logger.warning(f"게임 요약 정보 수집 건너뜀: 게임을 찾을 수 없습니다. 게임 ID: {game_id}")
+        return False
+    
+    # 현재 턴의 게임 상태 조회 (TurnSnapshot 사용)
+    current_state = await snapshot_store.load(game_id, turn)
+    
+    if not current_state:
+        logger.warning(f"게임 요약 정보 수집 건너뜀: 게임 상태를 찾을 수 없습니다. 게임 ID: {game_id}, 턴: {turn}")
         return False
+    
+    state_data = current_state.stateData
+    
+    # 플레이어 문명과 도시들의 평균 식량과 생산력 계산
+    aggregate = await game_aggregates.load(game_id, game=game)
+    player_civ = aggregate.player_civ
+    player_cities = player_civ.cities if player_civ else []
+    
+    avg_food = 0
+    avg_production = 0
+    
+    if player_cities and len(player_cities) > 0:
+        total_food = sum(city.food for city in player_cities)
+        total_production = sum(city.production for city in player_cities)
+        avg_food = total_food // len(player_cities)
+        avg_production = total_production // len(player_cities)
+    
+    # 게임 상태로부터 요약 정보 생성
+    game_summary = GameSummary(
+        gameId=game_id,
+        userId=game.userName,
+        turn=turn,
+        year=state_data.get("year"),
+        difficulty=game.difficulty,
+        mapType=game.mapType,
+        gameMode=game.gameMode,
+        startTime=game.createdAt,
+        civilizationId=game.playerCivId,
+        civilizationName=state_data.get("player_civ", {}).get("name"),
+        leaderName=state_data.get("player_civ", {}).get("leader"),
+        gold=player_civ.gold if player_civ else 0,
+        science=player_civ.science if player_civ else 0,
+        culture=player_civ.culture if player_civ else 0,
+        food=avg_food,
+        production=avg_production,
+        resources=state_data.get("resources", {}),
+        totalCities=len(state_data.get("cities", [])),
+        totalUnits=len(state_data.get("units", [])),
+    )
+    
+    # 게임 요약 정보 저장
+    return await save_game_summary(game_summary)
+
+# 게임 요약 백그라운드 작업 큐 (main.py lifespan에서 시작/종료)
+summary_worker = SummaryWorker(collect_and_save_game_summary)
 
 async def update_research_queue(game_civ_id):
     """연구 큐의 위치 업데이트"""
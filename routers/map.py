@@ -1,4 +1,4 @@
-from fastapi import APIRouter, HTTPException, status, Query
+from fastapi import APIRouter, HTTPException, status, Query, Depends
 from typing import List, Dict, Any, Optional
 from models.hexmap import HexTile, TerrainType, ResourceType, GameMapState, HexCoord, Civilization
 import random
@@ -7,7 +7,14 @@ import uuid
 from datetime import datetime
 import json
 import hashlib
-from db.client import prisma
+from db.client import get_db
+from prisma import Prisma
+from services.game_bootstrap import MAP_RADIUS, game_bootstrapper
+from services.game_aggregate import game_aggregates
+from services import fast_json
+from services.game_pool import game_pool
+from services.hex_grid import TileGrid
+from services.snapshot_store import snapshot_store
 
 router = APIRouter()
 
@@ -15,374 +22,15 @@ router = APIRouter()
 async def initialize_map(user_name: str):
     """새 게임 맵을 초기화하고 데이터베이스에 저장"""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-            print('Connected to Prisma')
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 사용자 이름을 SHA256으로 해시
         user_name_hash = hashlib.sha256(user_name.encode()).hexdigest()
         
-        # 1. 새 게임 생성
-        new_game = await prisma.game.create(
-            data={
-                "userName": user_name_hash,  # snake_case가 아닌 camelCase 사용
-                "mapRadius": 10,
-                "turnLimit": 50,
-                "createdAt": datetime.now(),
-                "year": 1000,  # 1턴의 연도를 1000년으로 세팅
-                "currentTurn": 1
-            }
-        )
-        
-        # 2. 문명 타입 생성 (7개 문명)
-        civ_types = [
-            {"name": "한국", "leaderName": "세종대왕", "personality": "Diplomat"},
-            {"name": "일본", "leaderName": "오다 노부나가", "personality": "Warlike"},
-            {"name": "중국", "leaderName": "무측천", "personality": "Diplomat"},
-            {"name": "몽골", "leaderName": "칭기스 칸", "personality": "Warlike"},
-            {"name": "러시아", "leaderName": "예카테리나", "personality": "Trader"},
-            {"name": "로마", "leaderName": "아우구스투스", "personality": "Warlike"},
-            {"name": "이집트", "leaderName": "클레오파트라", "personality": "Trader"}
-        ]
-        
-        created_civ_types = []
-        for civ in civ_types:
-            civ_type = await prisma.civtype.create(
-                data={
-                    "name": civ["name"],
-                    "leaderName": civ["leaderName"],  # leader_name이 아닌 leaderName 사용
-                    "personality": civ["personality"]
-                }
-            )
-            created_civ_types.append(civ_type)
-        print('Created civilization types')
-        
-        # 3. 플레이어 문명 생성 (중앙에 위치)
-        player_civ = await prisma.gameciv.create(
-            data={
-                "gameId": new_game.id,  # game_id가 아닌 gameId 사용
-                "civTypeId": created_civ_types[0].id,  # civ_type_id가 아닌 civTypeId 사용
-                "isPlayer": True,  # is_player가 아닌 isPlayer 사용
-                "startQ": 0,  # start_q가 아닌 startQ 사용
-                "startR": 0   # start_r가 아닌 startR 사용
-            }
-        )
-        print('Created player civilization')
-        
-        # 4. AI 문명 생성 (플레이어와 14헥스 이상 거리)
-        ai_civs = []
-        for i, civ_type in enumerate(created_civ_types[1:], 1):
-            # AI 문명의 시작 위치 계산 (플레이어와 14헥스 이상 거리)
-            angle = (2 * math.pi * i) / 6  # 6개의 AI 문명을 균등하게 배치
-            distance = 15  # 14헥스 이상 거리 확보
-            q = int(distance * math.cos(angle))
-            r = int(distance * math.sin(angle))
-            
-            ai_civ = await prisma.gameciv.create(
-                data={
-                    "gameId": new_game.id,
-                    "civTypeId": civ_type.id,
-                    "isPlayer": False,
-                    "startQ": q,
-                    "startR": r
-                }
-            )
-            ai_civs.append(ai_civ)
-            print(f'Created AI civilization {civ_type.name} at {q}, {r}')
-        
-        # 5. 맵 타일 생성 (반경 10의 육각형 맵)
-        map_tiles = []
-        for q in range(-10, 11):
-            for r in range(-10, 11):
-                # 육각형 좌표 제약 조건: |q| + |r| + |s| ≤ 10
-                s = -q - r
-                if abs(q) + abs(r) + abs(s) <= 20:  # 반경 10의 육각형
-                    # 지형 랜덤 생성
-                    terrain_types = ["Plains", "Grassland", "Hills", "Forest", "Desert", "Mountain"]
-                    terrain = random.choice(terrain_types)
-                    
-                    # 자원 랜덤 생성 (20% 확률)
-                    resource = "NoResource"  # 기본값
-                    if random.random() < 0.2:
-                        resource_types = ["Food", "Production", "Gold", "Science"]
-                        resource = random.choice(resource_types)
-                    
-                    map_tile = await prisma.maptile.create(
-                        data={
-                            "gameId": new_game.id,
-                            "q": q,
-                            "r": r,
-                            "terrain": terrain,
-                            "resource": resource
-                        }
-                    )
-                    map_tiles.append(map_tile)
-        
-        # 6. 플레이어 도시 생성
-        player_city = await prisma.city.create(
-            data={
-                "gameCivId": player_civ.id,  # game_civ_id가 아닌 gameCivId 사용
-                "name": "서울",
-                "q": 0,
-                "r": 0,
-                "population": 1,
-                "createdTurn": 1,  # created_turn이 아닌 createdTurn 사용
-                "food": 20,        # 초기 식량 20
-                "production": 10    # 초기 생산력 10
-            }
-        )
-        
-        # 7. AI 도시 생성
-        ai_city_names = ["도쿄", "베이징", "울란바토르", "모스크바", "로마", "알렉산드리아"]
-        for i, ai_civ in enumerate(ai_civs):
-            await prisma.city.create(
-                data={
-                    "gameCivId": ai_civ.id,
-                    "name": ai_city_names[i],
-                    "q": ai_civ.startQ,
-                    "r": ai_civ.startR,
-                    "population": 1,
-                    "createdTurn": 1,
-                    "food": 20,
-                    "production": 10
-                }
-            )
-        
-        # 문명 초기 자원 설정
-        await prisma.gameciv.update(
-            where={"id": player_civ.id},
-            data={
-                "gold": 30,
-                "science": 5,
-                "culture": 0
-            }
-        )
-        
-        # AI 문명 초기 자원 설정
-        for ai_civ in ai_civs:
-            await prisma.gameciv.update(
-                where={"id": ai_civ.id},
-                data={
-                    "gold": 30,
-                    "science": 5,
-                    "culture": 0
-                }
-            )
-        
-        # 8. 초기 유닛 생성
-        # 플레이어 문명 시작 유닛 생성
-        # 초기 전사 유닛 (근접 유닛)
-        initial_warrior = await prisma.unittype.find_first(
-            where={
-                "category": "Melee",
-                "era": "Medieval"
-            }
-        )
-        
-        if initial_warrior:
-            await prisma.gameunit.create(
-                data={
-                    "gameCivId": player_civ.id,
-                    "unitTypeId": initial_warrior.id,
-                    "q": 0,  # 도시 위치와 동일
-                    "r": 0,
-                    "hp": 100,
-                    "createdTurn": 1,
-                    "moved": False
-                }
-            )
-        
-        # 초기 정찰병 (정찰 유닛)
-        initial_scout = await prisma.unittype.find_first(
-            where={
-                "category": "Civilian",
-                "era": "Medieval"
-            }
-        )
-        
-        if initial_scout:
-            await prisma.gameunit.create(
-                data={
-                    "gameCivId": player_civ.id,
-                    "unitTypeId": initial_scout.id,
-                    "q": 0,  # 도시 위치와 동일
-                    "r": 0,
-                    "hp": 100,
-                    "createdTurn": 1,
-                    "moved": False
-                }
-            )
-        
-        # AI 문명 시작 유닛 생성
-        for ai_civ in ai_civs:
-            # AI 전사 유닛
-            if initial_warrior:
-                await prisma.gameunit.create(
-                    data={
-                        "gameCivId": ai_civ.id,
-                        "unitTypeId": initial_warrior.id,
-                        "q": ai_civ.startQ,  # AI 도시 위치와 동일
-                        "r": ai_civ.startR,
-                        "hp": 100,
-                        "createdTurn": 1,
-                        "moved": False
-                    }
-                )
-            
-            # AI 정찰병 유닛 (50% 확률로 생성)
-            if initial_scout and random.random() < 0.5:
-                await prisma.gameunit.create(
-                    data={
-                        "gameCivId": ai_civ.id,
-                        "unitTypeId": initial_scout.id,
-                        "q": ai_civ.startQ,  # AI 도시 위치와 동일
-                        "r": ai_civ.startR,
-                        "hp": 100,
-                        "createdTurn": 1,
-                        "moved": False
-                    }
-                )
-        
-        # 9. 기술 트리 선택 (플레이어)
-        await prisma.treeselection.create(
-            data={
-                "gameCivId": player_civ.id,
-                "treeType": "군사",  # tree_type이 아닌 treeType 사용
-                "isMain": True  # is_main이 아닌 isMain 사용
-            }
-        )
-        
-        # 8-1. 초기 기술 설정 (첫 시대의 기술들을 available 상태로 설정)
-        # 첫 시대(Medieval) 기술 조회
-        initial_techs = await prisma.technology.find_many(
-            where={
-                "era": "Medieval"
-            }
-        )
-        
-        # 각 기술을 available 상태로 설정
-        for tech in initial_techs:
-            await prisma.gamecivtechnology.create(
-                data={
-                    "gameCivId": player_civ.id,
-                    "techId": tech.id,
-                    "status": "available",
-                    "progressPoints": 0
-                }
-            )
-        
-        # AI 문명에도 동일하게 적용
-        for ai_civ in ai_civs:
-            for tech in initial_techs:
-                await prisma.gamecivtechnology.create(
-                    data={
-                        "gameCivId": ai_civ.id,
-                        "techId": tech.id,
-                        "status": "available",
-                        "progressPoints": 0
-                    }
-                )
-        
-        # 9. 턴 스냅샷 생성
-        # 플레이어 도시 주변 시야 계산 (2헥스 범위)
-        city_sight_range = 2
-        visible_tiles = set()
-        visible_tiles.add((0, 0))  # 플레이어 도시 위치
-        
-        # 도시 주변 타일 추가
-        for q_offset in range(-city_sight_range, city_sight_range + 1):
-            for r_offset in range(max(-city_sight_range, -q_offset - city_sight_range), 
-                                min(city_sight_range, -q_offset + city_sight_range) + 1):
-                visible_tiles.add((q_offset, r_offset))
-        
-        # 시야 정보가 포함된 초기 맵 상태
-        initial_observed_tiles = [
-            {"q": t.q, "r": t.r, "terrain": t.terrain, "resource": t.resource}
-            for t in map_tiles if (t.q, t.r) in visible_tiles
-        ]
-        
-        # 초기 게임 상태 데이터 생성
-        initial_state_data = {
-            "turn": 1,
-            "year": 1000,  # 게임 시작 연도
-            "era": "Medieval",
-            "player_civ": {
-                "id": player_civ.id,
-                "name": created_civ_types[0].name,
-                "leader": created_civ_types[0].leaderName
-            },
-            "cities": [],  # 빈 초기 도시 목록 (나중에 업데이트됨)
-            "units": [],   # 빈 초기 유닛 목록 (나중에 업데이트됨)
-            "resources": {
-                "gold": 30,
-                "science": 5,
-                "culture": 0,
-                "food": 20,
-                "production": 10
-            }
-        }
-        
-        # 플레이어 재화 정보
-        player_resources = {
-            "gold": 30,
-            "science": 5,
-            "culture": 0,
-            "food": 20,
-            "production": 10
-        }
-        
-        # TurnSnapshot 생성
-        try:
-            turn_snapshot = await prisma.turnsnapshot.create(
-                data={
-                    "gameId": new_game.id,
-                    "turnNumber": 1,
-                    "civId": player_civ.id,
-                    "observedMap": json.dumps({"tiles": initial_observed_tiles}),
-                    "researchState": json.dumps({"current": None, "queue": []}),
-                    "productionState": json.dumps({"current": None, "queue": []}),
-                    "diplomacyState": json.dumps({"relations": {}}),
-                    "resourceState": json.dumps({
-                        "gold": 30,
-                        "science": 20,
-                        "food": 30,
-                        "production": 20,
-                        "culture": 0
-                    }),
-                    "stateData": initial_state_data,
-                    "playerResources": player_resources
-                }
-            )
-            print(f"TurnSnapshot 생성 성공: ID {turn_snapshot.id}, 게임 ID {new_game.id}")
-        except Exception as e:
-            print(f"TurnSnapshot 생성 오류: {str(e)}")
-            # 오류 세부 정보 출력
-            import traceback
-            traceback.print_exc()
-            
-            # TurnSnapshot 생성 실패 시 다시 시도 (기본 필수 필드만)
-            try:
-                simplified_snapshot = await prisma.turnsnapshot.create(
-                    data={
-                        "gameId": new_game.id,
-                        "turnNumber": 1,
-                        "civId": player_civ.id,
-                        "observedMap": "{}",
-                        "researchState": "{}",
-                        "productionState": "{}",
-                        "diplomacyState": "{}"
-                    }
-                )
-                print(f"기본 TurnSnapshot 생성 성공: ID {simplified_snapshot.id}, 게임 ID {new_game.id}")
-            except Exception as e2:
-                print(f"기본 TurnSnapshot 생성도 실패: {str(e2)}")
-                traceback.print_exc()
-                print(f"TurnSnapshot 생성 실패했지만 계속 진행합니다. 게임 ID: {new_game.id}")
-                # 이 경우 게임 상태 조회 시 오류가 발생할 수 있음
+        # 미리 생성해 둔 게임이 있으면 바로 배정, 없으면
+        # 게임, 문명, 타일, 도시, 유닛, 기술, 1턴 스냅샷을 한 트랜잭션으로 생성 (실패 시 전체 롤백)
+        world = await game_pool.claim(user_name_hash, MAP_RADIUS)
+        if world is None:
+            world = await game_bootstrapper.create(user_name_hash)
+        new_game = world.game
         
         # 성공 응답 반환
         return {
@@ -394,9 +42,9 @@ async def initialize_map(user_name: str):
                 "userName": user_name,  # 원본 사용자 이름 반환
                 "mapRadius": new_game.mapRadius,
                 "turnLimit": new_game.turnLimit,
-                "player_civ_id": player_civ.id,
-                "ai_civ_ids": [civ.id for civ in ai_civs],
-                "tileCount": len(map_tiles),
+                "player_civ_id": world.player_civ.id,
+                "ai_civ_ids": [civ.id for civ in world.ai_civs],
+                "tileCount": world.tile_count,
                 "year": 1000,  # 1턴의 연도 정보 반환
                 "turn": 1
             },
@@ -417,27 +65,9 @@ async def initialize_map(user_name: str):
     
 
 @router.get("/data", summary="맵 데이터 조회", response_description="맵 데이터 반환")
-async def get_map_data(game_id: Optional[int] = Query(None, description="게임 ID")):
+async def get_map_data(game_id: Optional[int] = Query(None, description="게임 ID"), db: Prisma = Depends(get_db)):
     """게임 맵 데이터 반환"""
     try:
-        # 연결이 필요한 경우에만 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return {
-                        "success": False,
-                        "status_code": 500,
-                        "message": f"데이터베이스 연결 오류: {str(e)}",
-                        "error": {
-                            "type": type(e).__name__,
-                            "detail": str(e)
-                        }
-                    }
-            # 이미 연결된 경우는 무시
-        
         # 게임 ID가 제공되지 않은 경우
         if not game_id:
             return {
@@ -447,7 +77,7 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
             }
         
         # 게임 존재 여부 확인
-        game = await prisma.game.find_unique(
+        game = await db.game.find_unique(
             where={"id": game_id}
         )
         
@@ -458,24 +88,17 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                 "message": "해당 게임을 찾을 수 없습니다."
             }
         
-        # 최신 턴 스냅샷 조회
-        turn_snapshots = await prisma.turnsnapshot.find_many(
-            where={
-                "gameId": game_id,
-            }
-        )
+        # 최신 턴 스냅샷 조회 (키프레임 + 델타로 복원)
+        turn_snapshot = await snapshot_store.latest(game_id)
+        tile_grid = None
         
         # 턴 스냅샷이 없는 경우 초기 턴 스냅샷 생성
-        if not turn_snapshots:
+        if not turn_snapshot:
             print(f"게임 ID {game_id}에 대한 턴 스냅샷이 없습니다. 초기 스냅샷 생성 시도...")
             
-            # 플레이어 문명 찾기
-            player_civ = await prisma.gameciv.find_first(
-                where={
-                    "gameId": game_id,
-                    "isPlayer": True
-                }
-            )
+            # 플레이어 문명 찾기 (게임 집계는 아래 맵 응답에서도 재사용)
+            aggregate = await game_aggregates.load(game_id, game=game)
+            player_civ = next((civ for civ in aggregate.civs if civ.is_player), None)
             
             if not player_civ:
                 return {
@@ -484,38 +107,18 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                     "message": "플레이어 문명을 찾을 수 없습니다."
                 }
             
-            # 맵 타일 조회
-            map_tiles = await prisma.maptile.find_many(
-                where={
-                    "gameId": game_id
-                }
-            )
-            
-            # 플레이어 도시 주변 시야 계산 (2헥스 범위)
-            city_sight_range = 2
-            visible_tiles = set()
+            # 맵 타일 조회 (열 기반 타일 맵, 아래 맵 응답에서도 재사용)
+            tile_grid = await TileGrid.load(db, game_id)
             
             # 플레이어 도시 찾기
-            player_cities = await prisma.city.find_many(
-                where={
-                    "gameCivId": player_civ.id
-                }
-            )
+            player_cities = player_civ.cities
             
-            # 도시 위치 기준 시야 계산
-            for city in player_cities:
-                visible_tiles.add((city.q, city.r))
-                
-                for q_offset in range(-city_sight_range, city_sight_range + 1):
-                    for r_offset in range(max(-city_sight_range, -q_offset - city_sight_range), 
-                                         min(city_sight_range, -q_offset + city_sight_range) + 1):
-                        visible_tiles.add((city.q + q_offset, city.r + r_offset))
+            # 플레이어 도시 주변 시야 계산 (2헥스 범위)
+            city_sight_range = 2
+            visible_mask = tile_grid.sight_mask(((city.q, city.r) for city in player_cities), city_sight_range)
             
             # 시야 정보가 포함된 초기 맵 상태
-            initial_observed_tiles = [
-                {"q": t.q, "r": t.r, "terrain": t.terrain, "resource": t.resource}
-                for t in map_tiles if (t.q, t.r) in visible_tiles
-            ]
+            initial_observed_tiles = tile_grid.tiles(visible_mask)
             
             # 초기 게임 상태 데이터 생성
             initial_state_data = {
@@ -525,7 +128,7 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                 "player_civ": {
                     "id": player_civ.id,
                     "name": player_civ.name,
-                    "leader": player_civ.leaderName
+                    "leader": player_civ.leader
                 },
                 "cities": [],  # 빈 초기 도시 목록
                 "units": []    # 빈 초기 유닛 목록
@@ -554,39 +157,41 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
             
             # 초기 턴 스냅샷 생성
             try:
-                new_snapshot = await prisma.turnsnapshot.create(
-                    data={
-                        "gameId": game_id,
-                        "turnNumber": 1,
-                        "civId": player_civ.id,
-                        "observedMap": json.dumps({"tiles": initial_observed_tiles}),
-                        "researchState": json.dumps({"current": None, "queue": []}),
-                        "productionState": json.dumps({"current": None, "queue": []}),
-                        "diplomacyState": json.dumps({"relations": {}}),
-                        "resourceState": json.dumps(player_resources),
+                new_snapshot = await snapshot_store.save(
+                    game_id,
+                    1,
+                    player_civ.id,
+                    {
+                        "observedMap": {"tiles": initial_observed_tiles},
+                        "researchState": {"current": None, "queue": []},
+                        "productionState": {"current": None, "queue": []},
+                        "diplomacyState": {"relations": {}},
+                        "resourceState": player_resources,
                         "stateData": initial_state_data,
                         "playerResources": player_resources
-                    }
+                    },
+                    year=game.year
                 )
                 print(f"게임 ID {game_id}에 대한 초기 턴 스냅샷 생성 성공: ID {new_snapshot.id}")
-                turn_snapshots = [new_snapshot]
+                turn_snapshot = new_snapshot
             except Exception as e:
                 print(f"초기 턴 스냅샷 생성 실패: {str(e)}")
                 # 다시 시도 (간소화된 버전)
                 try:
-                    simple_snapshot = await prisma.turnsnapshot.create(
-                        data={
-                            "gameId": game_id,
-                            "turnNumber": 1,
-                            "civId": player_civ.id,
-                            "observedMap": "{}",
-                            "researchState": "{}",
-                            "productionState": "{}",
-                            "diplomacyState": "{}"
-                        }
+                    simple_snapshot = await snapshot_store.save(
+                        game_id,
+                        1,
+                        player_civ.id,
+                        {
+                            "observedMap": {},
+                            "researchState": {},
+                            "productionState": {},
+                            "diplomacyState": {}
+                        },
+                        year=game.year
                     )
                     print(f"간소화된 초기 턴 스냅샷 생성 성공: ID {simple_snapshot.id}")
-                    turn_snapshots = [simple_snapshot]
+                    turn_snapshot = simple_snapshot
                 except Exception as e2:
                     print(f"간소화된 초기 턴 스냅샷 생성도 실패: {str(e2)}")
                     return {
@@ -599,90 +204,44 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                         }
                     }
         
-        # 가장 높은 턴 번호를 가진 스냅샷 찾기
-        turn_snapshot = max(turn_snapshots, key=lambda x: x.turnNumber)
+        # 맵 타일 조회 (타일마다 모델 객체를 만들지 않고 지형/자원 코드 배열로)
+        if tile_grid is None:
+            tile_grid = await TileGrid.load(db, game_id)
         
-        # 맵 타일 조회
-        map_tiles = await prisma.maptile.find_many(
-            where={
-                "gameId": game_id
-            }
-        )
-        
-        # 문명 정보 조회
-        game_civs = await prisma.gameciv.find_many(
-            where={
-                "gameId": game_id
-            },
-            include={
-                "civType": True,
-                "cities": True,
-                "units": True
-            }
-        )
+        # 문명/도시/유닛 정보 (게임 집계, 초기 스냅샷을 만들었으면 같은 요청의 메모에서 재사용)
+        aggregate = await game_aggregates.load(game_id, game=game)
+        game_civs = aggregate.civs
         
         # 플레이어 문명 찾기
-        player_civ = next((civ for civ in game_civs if civ.isPlayer), None)
-        
-        # 시야 범위 계산 (플레이어의 도시와 유닛 주변)
-        visible_tiles = set()
-        explored_tiles = set()
+        player_civ = next((civ for civ in game_civs if civ.is_player), None)
         
         # 턴 스냅샷에서 이전에 탐색한 타일 정보 가져오기
+        explored_coords = []
         try:
-            observed_map = json.loads(turn_snapshot.observedMap)
+            observed_map = turn_snapshot.observedMap
             if isinstance(observed_map, dict) and "tiles" in observed_map:
                 for tile_data in observed_map["tiles"]:
-                    explored_tiles.add((tile_data["q"], tile_data["r"]))
+                    explored_coords.append((tile_data["q"], tile_data["r"]))
         except (json.JSONDecodeError, TypeError, KeyError) as e:
-            # 오류 발생 시 로그만 남기고 진행 (빈 explored_tiles 사용)
+            # 오류 발생 시 로그만 남기고 진행 (탐색 기록 없이)
             print(f"맵 상태 파싱 오류: {str(e)}")
+        explored_mask = tile_grid.mask_of(explored_coords)
         
+        # 시야 범위 계산 (플레이어의 도시와 유닛 주변 2헥스, 유닛 타입에 따라 다를 수 있음)
+        sight_centers = []
         if player_civ:
-            # 도시 시야 범위 (2 헥스로 변경)
-            city_sight_range = 2
-            for city in player_civ.cities:
-                # 도시 위치 자체도 추가
-                visible_tiles.add((city.q, city.r))
-                
-                # 도시 주변 타일 추가
-                for q_offset in range(-city_sight_range, city_sight_range + 1):
-                    for r_offset in range(max(-city_sight_range, -q_offset - city_sight_range), 
-                                         min(city_sight_range, -q_offset + city_sight_range) + 1):
-                        visible_tiles.add((city.q + q_offset, city.r + r_offset))
-            
-            # 유닛 시야 범위 (일반적으로 2 헥스, 유닛 타입에 따라 다를 수 있음)
-            for unit in player_civ.units:
-                # 기본 시야 범위
-                unit_sight_range = 2
-                
-                # 유닛 위치 자체도 추가
-                visible_tiles.add((unit.q, unit.r))
-                
-                # 유닛 주변 타일 추가
-                for q_offset in range(-unit_sight_range, unit_sight_range + 1):
-                    for r_offset in range(max(-unit_sight_range, -q_offset - unit_sight_range), 
-                                         min(unit_sight_range, -q_offset + unit_sight_range) + 1):
-                        visible_tiles.add((unit.q + q_offset, unit.r + r_offset))
+            sight_centers += [(city.q, city.r) for city in player_civ.cities]
+            sight_centers += [(unit.q, unit.r) for unit in player_civ.units]
+        visible_mask = tile_grid.sight_mask(sight_centers, 2)
         
         # 시야 정보를 포함한 타일 정보 생성
         game_state = {
-            "tiles": [
-                {
-                    "q": tile.q,
-                    "r": tile.r,
-                    "terrain": tile.terrain,
-                    "resource": tile.resource,
-                    "exploration": "visible" if (tile.q, tile.r) in visible_tiles else
-                                  "explored" if (tile.q, tile.r) in explored_tiles else 
-                                  "unexplored"
-                } for tile in map_tiles
-            ],
+            "tiles": tile_grid.exploration_tiles(visible_mask, explored_mask),
             "civs": [
                 {
                     "id": civ.id,
-                    "name": civ.civType.name,
-                    "isPlayer": civ.isPlayer,
+                    "name": civ.name,
+                    "isPlayer": civ.is_player,
                     "gold": civ.gold,
                     "science": civ.science,
                     "culture": civ.culture,
@@ -700,7 +259,7 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                     "units": [
                         {
                             "id": unit.id,
-                            "typeId": unit.unitTypeId,
+                            "typeId": unit.unit_type_id,
                             "q": unit.q,
                             "r": unit.r,
                             "hp": unit.hp
@@ -739,14 +298,15 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
             
             # TurnSnapshot 업데이트 시도 - 에러 무시
             try:
-                await prisma.turnsnapshot.update(
-                    where={"id": turn_snapshot.id},
-                    data={"playerResources": player_resources}
+                await snapshot_store.update(
+                    game_id,
+                    turn_snapshot.turnNumber,
+                    {"playerResources": player_resources}
                 )
             except Exception as update_error:
                 print(f"TurnSnapshot 업데이트 중 오류: {str(update_error)}")
         
-        return {
+        return fast_json.respond({
             "success": True,
             "status_code": 200,
             "message": f"턴 {turn_snapshot.turnNumber}의 게임 상태를 조회했습니다.",
@@ -758,7 +318,7 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
                 "year": turn_snapshot.year,
                 "createdAt": turn_snapshot.createdAt.isoformat()
             }
-        }
+        })
         
     except Exception as e:
         return {
@@ -772,17 +332,9 @@ async def get_map_data(game_id: Optional[int] = Query(None, description="게임
         }
 
 @router.get("/adjacent")
-async def get_adjacent_tiles(q: int, r: int, game_id: int):
+async def get_adjacent_tiles(q: int, r: int, game_id: int, db: Prisma = Depends(get_db)):
     """지정된 타일 주변의 인접 타일 정보 반환"""
     try:
-        # 연결 확인
-        try:
-            await prisma.connect()
-        except Exception as e:
-            
-            if "Already connected" not in str(e):
-                raise e
-        
         # 인접 방향 (육각형 그리드)
         directions = [
             (1, 0, -1),  # 동쪽
@@ -800,7 +352,7 @@ async def get_adjacent_tiles(q: int, r: int, game_id: int):
             adj_r = r + dir_r
             
             # 데이터베이스에서 실제 타일 조회
-            tile = await prisma.maptile.find_first(
+            tile = await db.maptile.find_first(
                 where={
                     "gameId": game_id,
                     "q": adj_q,
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Query, Body, Path
+from fastapi import APIRouter, HTTPException, Query, Body, Path, Depends, Header
 from typing import List, Optional, Dict, Any
 from enum import Enum
-from db.client import prisma
+from db.client import prisma, get_db
+from prisma import Prisma
+from services import fast_json
+from services.catalog_views import catalog_views
 from pydantic import BaseModel
 
 router = APIRouter()
@@ -37,57 +40,19 @@ class UnitCategory(str, Enum):
 async def get_technologies(
     era: Optional[EraType] = None,
     treeType: Optional[TreeType] = None,
+    prereqTech: Optional[int] = None,
     available: Optional[bool] = None,
-    limit: int = Query(50, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """기술 목록을 조회합니다."""
+    """기술 목록을 조회합니다. (메모리 카탈로그에서 미리 만든 필터별 응답, limit이 없으면 전체)"""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
-        # 조건 구성
-        where_condition = {}
-        
-        if era:
-            where_condition["era"] = era.value
-        
-        if treeType:
-            where_condition["treeType"] = treeType.value
-        
-        # 가용 기술 필터링은 별도로 처리해야 함 (아래에서 DB 쿼리 후)
-        
-        # 기술 목록 조회
-        technologies = await prisma.technology.find_many(
-            where=where_condition,
-            skip=offset,
-            take=limit
-        )
-        
-        # 결과 변환
-        result = []
-        for tech in technologies:
-            result.append({
-                "id": tech.id,
-                "name": tech.name,
-                "description": tech.description,
-                "era": tech.era,
-                "treeType": tech.treeType,
-                "researchCost": tech.researchCost,
-                "researchTimeModifier": tech.researchTimeModifier
-            })
-        
-        # available 필터링은 구현이 복잡하므로 이 부분은 실제 구현 시 확장 필요
-        
-        return {
-            "success": True,
-            "data": result,
-            "error": None
-        }
+        views = await catalog_views.ensure()
+        # available 필터링은 문명별 연구 상태가 필요하므로 이 부분은 실제 구현 시 확장 필요
+        view = views.view("technologies", offset=offset, limit=limit, era=era, treeType=treeType,
+                          prereqTech=prereqTech)
+        return views.response(view, if_none_match)
     
     except Exception as e:
         return {
@@ -100,18 +65,11 @@ async def get_technologies(
         }
 
 @router.get("/{tech_id}", summary="기술 상세 조회", response_description="기술 상세 정보 반환")
-async def get_technology_detail(tech_id: int):
+async def get_technology_detail(tech_id: int, db: Prisma = Depends(get_db)):
     """특정 기술의 상세 정보를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 기술 조회
-        tech = await prisma.technology.find_unique(
+        tech = await db.technology.find_unique(
             where={"id": tech_id}
         )
         
@@ -153,18 +111,11 @@ async def get_technology_detail(tech_id: int):
         }
 
 @router.get("/game-civs/{game_civ_id}/research-status", summary="연구 상태 조회", response_description="문명별 연구 상태 반환")
-async def get_research_status(game_civ_id: int = Path(..., description="문명 인스턴스 ID")):
+async def get_research_status(game_civ_id: int = Path(..., description="문명 인스턴스 ID"), db: Prisma = Depends(get_db)):
     """한 문명의 전체 연구 현황(완료·진행중·가능)을 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 연구 완료된 기술 조회
-        completed_techs = await prisma.gamecivtechnology.find_many(
+        completed_techs = await db.gamecivtechnology.find_many(
             where={
                 "gameCivId": game_civ_id,
                 "status": "completed"
@@ -172,7 +123,7 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
         )
         
         # 연구 중인 기술 조회
-        in_progress_tech = await prisma.gamecivtechnology.find_first(
+        in_progress_tech = await db.gamecivtechnology.find_first(
             where={
                 "gameCivId": game_civ_id,
                 "status": "in_progress"
@@ -183,7 +134,7 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
         completed_tech_ids = [tech.techId for tech in completed_techs]
         
         # 선택된 트리 조회
-        tree_selections = await prisma.treeselection.find_many(
+        tree_selections = await db.treeselection.find_many(
             where={
                 "gameCivId": game_civ_id
             }
@@ -195,7 +146,7 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
             selected_tree_types.append(tree.treeType)
         
         # 모든 기술 조회
-        all_techs = await prisma.technology.find_many()
+        all_techs = await db.technology.find_many()
         
         # 가용 기술 (완료되지 않은 기술 중 선행 기술 요구사항을 충족하는 것)
         available_tech_ids = []
@@ -227,7 +178,7 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
         in_progress_data = None
         if in_progress_tech:
             # 해당 기술의 총 연구 비용 조회
-            tech_details = await prisma.technology.find_unique(
+            tech_details = await db.technology.find_unique(
                 where={"id": in_progress_tech.techId}
             )
             
@@ -243,11 +194,11 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
             "available": available_tech_ids
         }
         
-        return {
+        return fast_json.respond({
             "success": True,
             "data": result,
             "error": None
-        }
+        })
     
     except Exception as e:
         return {
@@ -260,18 +211,11 @@ async def get_research_status(game_civ_id: int = Path(..., description="문명 
         }
 
 @router.get("/game-civs/{game_civ_id}/research-queue", summary="연구 큐 조회", response_description="연구 예약 목록 반환")
-async def get_research_queue(game_civ_id: int = Path(..., description="문명 인스턴스 ID")):
+async def get_research_queue(game_civ_id: int = Path(..., description="문명 인스턴스 ID"), db: Prisma = Depends(get_db)):
     """연구 예약 큐를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 연구 큐 조회
-        queue_entries = await prisma.researchqueue.find_many(
+        queue_entries = await db.researchqueue.find_many(
             where={
                 "gameCivId": game_civ_id
             }
@@ -306,7 +250,8 @@ async def get_research_queue(game_civ_id: int = Path(..., description="문명 
 @router.post("/game-civs/{game_civ_id}/research-queue", summary="연구 큐 추가", response_description="연구 예약 추가 결과")
 async def add_to_research_queue(
     tech_request: Dict[str, int] = Body(..., example={"techId": 8}),
-    game_civ_id: int = Path(..., description="문명 인스턴스 ID")
+    game_civ_id: int = Path(..., description="문명 인스턴스 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """새로운 기술을 연구 큐에 추가합니다."""
     try:
@@ -321,15 +266,8 @@ async def add_to_research_queue(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 현재 큐 크기 확인
-        current_queue = await prisma.researchqueue.find_many(
+        current_queue = await db.researchqueue.find_many(
             where={
                 "gameCivId": game_civ_id
             }
@@ -351,7 +289,7 @@ async def add_to_research_queue(
             next_position = max(entry.queuePosition for entry in current_queue) + 1
         
         # 연구 큐에 추가
-        new_queue_entry = await prisma.researchqueue.create(
+        new_queue_entry = await db.researchqueue.create(
             data={
                 "gameCivId": game_civ_id,
                 "techId": tech_id,
@@ -385,19 +323,13 @@ async def add_to_research_queue(
 @router.delete("/game-civs/{game_civ_id}/research-queue/{queue_id}", summary="연구 큐 제거", response_description="연구 예약 취소 결과")
 async def remove_from_research_queue(
     game_civ_id: int = Path(..., description="문명 인스턴스 ID"),
-    queue_id: int = Path(..., description="큐 엔트리 ID")
+    queue_id: int = Path(..., description="큐 엔트리 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """연구 큐에서 기술을 제거합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 큐 엔트리 확인
-        queue_entry = await prisma.researchqueue.find_unique(
+        queue_entry = await db.researchqueue.find_unique(
             where={
                 "id": queue_id
             }
@@ -417,14 +349,14 @@ async def remove_from_research_queue(
         removed_position = queue_entry.queuePosition
         
         # 큐 엔트리 제거
-        await prisma.researchqueue.delete(
+        await db.researchqueue.delete(
             where={
                 "id": queue_id
             }
         )
         
         # 다른 큐 엔트리의 위치 재조정
-        await prisma.researchqueue.update_many(
+        await db.researchqueue.update_many(
             where={
                 "gameCivId": game_civ_id,
                 "queuePosition": {
@@ -457,7 +389,8 @@ async def remove_from_research_queue(
 @router.post("/game-civs/{game_civ_id}/research/start", summary="연구 시작", response_description="연구 시작 결과")
 async def start_research(
     tech_request: Dict[str, int] = Body(..., example={"techId": 9}),
-    game_civ_id: int = Path(..., description="문명 인스턴스 ID")
+    game_civ_id: int = Path(..., description="문명 인스턴스 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """특정 기술의 연구를 직접 시작합니다."""
     try:
@@ -472,15 +405,8 @@ async def start_research(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 이미 연구 중인 기술이 있는지 확인
-        in_progress = await prisma.gamecivtechnology.find_first(
+        in_progress = await db.gamecivtechnology.find_first(
             where={
                 "gameCivId": game_civ_id,
                 "status": "in_progress"
@@ -498,7 +424,7 @@ async def start_research(
             }
         
         # 기술 정보 조회
-        tech = await prisma.technology.find_unique(
+        tech = await db.technology.find_unique(
             where={"id": tech_id}
         )
         
@@ -513,7 +439,7 @@ async def start_research(
             }
         
         # 이미 완료된 기술인지 확인
-        completed = await prisma.gamecivtechnology.find_first(
+        completed = await db.gamecivtechnology.find_first(
             where={
                 "gameCivId": game_civ_id,
                 "techId": tech_id,
@@ -532,7 +458,7 @@ async def start_research(
             }
         
         # 연구 시작 (또는 기존 레코드 업데이트)
-        existing_record = await prisma.gamecivtechnology.find_first(
+        existing_record = await db.gamecivtechnology.find_first(
             where={
                 "gameCivId": game_civ_id,
                 "techId": tech_id
@@ -543,7 +469,7 @@ async def start_research(
         
         if existing_record:
             # 기존 레코드 업데이트
-            research_record = await prisma.gamecivtechnology.update(
+            research_record = await db.gamecivtechnology.update(
                 where={"id": existing_record.id},
                 data={
                     "status": "in_progress",
@@ -552,7 +478,7 @@ async def start_research(
             )
         else:
             # 새 레코드 생성
-            research_record = await prisma.gamecivtechnology.create(
+            research_record = await db.gamecivtechnology.create(
                 data={
                     "gameCivId": game_civ_id,
                     "techId": tech_id,
@@ -588,7 +514,8 @@ async def start_research(
 @router.post("/game-civs/{game_civ_id}/research/cancel", summary="연구 취소", response_description="연구 취소 결과")
 async def cancel_research(
     tech_request: Dict[str, int] = Body(..., example={"techId": 9}),
-    game_civ_id: int = Path(..., description="문명 인스턴스 ID")
+    game_civ_id: int = Path(..., description="문명 인스턴스 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """진행 중인 기술 연구를 취소합니다."""
     try:
@@ -603,15 +530,8 @@ async def cancel_research(
                 }
             }
         
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 연구 중인 기술 찾기
-        research_record = await prisma.gamecivtechnology.find_first(
+        research_record = await db.gamecivtechnology.find_first(
             where={
                 "gameCivId": game_civ_id,
                 "techId": tech_id,
@@ -630,7 +550,7 @@ async def cancel_research(
             }
         
         # 연구 상태 업데이트 (available 상태로)
-        await prisma.gamecivtechnology.update(
+        await db.gamecivtechnology.update(
             where={"id": research_record.id},
             data={
                 "status": "available",
@@ -655,18 +575,11 @@ async def cancel_research(
         }
 
 @router.get("/game-civs/{game_civ_id}/tree-selection", summary="기술 트리 선택 조회", response_description="선택된 기술 트리 반환")
-async def get_tree_selection(game_civ_id: int = Path(..., description="문명 인스턴스 ID")):
+async def get_tree_selection(game_civ_id: int = Path(..., description="문명 인스턴스 ID"), db: Prisma = Depends(get_db)):
     """문명의 현재 선택된 기술 트리를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 선택된 트리 조회
-        tree_selections = await prisma.treeselection.find_many(
+        tree_selections = await db.treeselection.find_many(
             where={
                 "gameCivId": game_civ_id
             }
@@ -706,19 +619,13 @@ async def get_tree_selection(game_civ_id: int = Path(..., description="문명 
 @router.post("/game-civs/{game_civ_id}/tree-selection", summary="기술 트리 선택", response_description="기술 트리 선택 결과")
 async def set_tree_selection(
     selection: TreeSelectionRequest,
-    game_civ_id: int = Path(..., description="문명 인스턴스 ID")
+    game_civ_id: int = Path(..., description="문명 인스턴스 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """문명의 기술 트리를 선택합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 기존 선택 조회
-        existing_selections = await prisma.treeselection.find_many(
+        existing_selections = await db.treeselection.find_many(
             where={
                 "gameCivId": game_civ_id
             }
@@ -729,7 +636,7 @@ async def set_tree_selection(
         for tree in existing_selections:
             if tree.isMain:
                 # 메인 트리 업데이트
-                await prisma.treeselection.update(
+                await db.treeselection.update(
                     where={"id": tree.id},
                     data={
                         "treeType": selection.main,
@@ -741,7 +648,7 @@ async def set_tree_selection(
         
         if not main_tree_exists:
             # 새 메인 트리 생성
-            await prisma.treeselection.create(
+            await db.treeselection.create(
                 data={
                     "gameCivId": game_civ_id,
                     "treeType": selection.main,
@@ -756,7 +663,7 @@ async def set_tree_selection(
             for tree in existing_selections:
                 if not tree.isMain:
                     # 보조 트리 업데이트
-                    await prisma.treeselection.update(
+                    await db.treeselection.update(
                         where={"id": tree.id},
                         data={
                             "treeType": selection.sub,
@@ -768,7 +675,7 @@ async def set_tree_selection(
             
             if not sub_tree_exists:
                 # 새 보조 트리 생성
-                await prisma.treeselection.create(
+                await db.treeselection.create(
                     data={
                         "gameCivId": game_civ_id,
                         "treeType": selection.sub,
@@ -780,7 +687,7 @@ async def set_tree_selection(
             # 보조 트리 선택을 해제한 경우, 기존 보조 트리 삭제
             for tree in existing_selections:
                 if not tree.isMain:
-                    await prisma.treeselection.delete(
+                    await db.treeselection.delete(
                         where={"id": tree.id}
                     )
         
@@ -1,6 +1,8 @@
-from fastapi import APIRouter, HTTPException, Query, Path
+from fastapi import APIRouter, HTTPException, Query, Path, Depends, Header
 from typing import List, Optional, Dict, Any
-from db.client import prisma
+from db.client import get_db
+from prisma import Prisma
+from services.catalog_views import catalog_views
 from enum import Enum
 from fastapi.responses import JSONResponse
 from datetime import datetime
@@ -38,57 +40,15 @@ async def get_units(
     era: Optional[EraType] = None,
     category: Optional[UnitCategory] = None,
     prereqTech: Optional[int] = None,
-    limit: int = Query(20, ge=1, le=100),
-    offset: int = Query(0, ge=0)
+    limit: Optional[int] = Query(None, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    if_none_match: Optional[str] = Header(None)
 ):
-    """유닛 목록을 조회합니다."""
+    """유닛 목록을 조회합니다. (메모리 카탈로그에서 미리 만든 필터별 응답, limit이 없으면 전체)"""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
-        # 조건 구성
-        where_condition = {}
-        
-        if era:
-            where_condition["era"] = era.value
-        
-        if category:
-            where_condition["category"] = category.value
-        
-        if prereqTech is not None:
-            where_condition["prereqTechId"] = prereqTech
-        
-        # 유닛 목록 조회
-        units = await prisma.unittype.find_many(
-            where=where_condition,
-            skip=offset,
-            take=limit
-        )
-        
-        # 결과 변환
-        result = []
-        for unit in units:
-            result.append({
-                "id": unit.id,
-                "name": unit.name,
-                "category": unit.category,
-                "era": unit.era,
-                "maintenance": unit.maintenance,
-                "movement": unit.movement,
-                "sight": unit.sight,
-                "buildTime": unit.buildTime,
-                "prereqTechId": unit.prereqTechId
-            })
-        
-        return {
-            "success": True,
-            "data": result,
-            "error": None
-        }
+        views = await catalog_views.ensure()
+        view = views.view("units", offset=offset, limit=limit, era=era, category=category, prereqTech=prereqTech)
+        return views.response(view, if_none_match)
     
     except Exception as e:
         return {
@@ -101,18 +61,11 @@ async def get_units(
         }
 
 @router.get("/{unit_id}", summary="유닛 상세 조회", response_description="유닛 상세 정보 반환")
-async def get_unit_detail(unit_id: int):
+async def get_unit_detail(unit_id: int, db: Prisma = Depends(get_db)):
     """특정 유닛의 상세 정보를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                raise e
-        
         # 유닛 조회
-        unit = await prisma.unittype.find_unique(
+        unit = await db.unittype.find_unique(
             where={"id": unit_id}
         )
         
@@ -158,28 +111,13 @@ async def get_unit_detail(unit_id: int):
 @router.post("/cities/{city_id}/produce-unit", summary="유닛 생산 시작", response_description="유닛 생산 시작 결과")
 async def produce_unit(
     city_id: int = Path(..., description="도시 ID"),
-    request: UnitProductionRequest = None
+    request: UnitProductionRequest = None,
+    db: Prisma = Depends(get_db)
 ):
     """특정 도시에서 유닛 생산을 시작하거나 생산 큐에 추가합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
         # 도시 존재 확인
-        city = await prisma.city.find_unique(
+        city = await db.city.find_unique(
             where={"id": city_id}
         )
         
@@ -194,7 +132,7 @@ async def produce_unit(
             )
         
         # 유닛 타입 확인
-        unit_type = await prisma.unittype.find_unique(
+        unit_type = await db.unittype.find_unique(
             where={"id": request.unit_type_id}
         )
         
@@ -210,7 +148,7 @@ async def produce_unit(
         
         # 선행 기술 확인
         if unit_type.prereqTechId:
-            completed_techs = await prisma.gamecivtechnology.find_many(
+            completed_techs = await db.gamecivtechnology.find_many(
                 where={
                     "gameCivId": city.gameCivId,
                     "status": "completed"
@@ -231,7 +169,7 @@ async def produce_unit(
         
         # 현재 건설/생산 중인 항목 확인
         # 1. 건물 건설 확인
-        in_progress_building = await prisma.playerbuilding.find_first(
+        in_progress_building = await db.playerbuilding.find_first(
             where={
                 "cityId": city_id,
                 "status": "in_progress"
@@ -239,7 +177,7 @@ async def produce_unit(
         )
         
         # 2. 현재 유닛 생산 확인
-        in_progress_production = await prisma.productionqueue.find_first(
+        in_progress_production = await db.productionqueue.find_first(
             where={
                 "cityId": city_id,
                 "queueOrder": 1
@@ -249,7 +187,7 @@ async def produce_unit(
         # 도시가 이미 다른 작업 중인지 확인
         if in_progress_building or in_progress_production:
             # 생산 큐에 추가
-            current_queue = await prisma.productionqueue.find_many(
+            current_queue = await db.productionqueue.find_many(
                 where={"cityId": city_id}
             )
             
@@ -261,7 +199,7 @@ async def produce_unit(
             turns_left = unit_type.buildTime
             
             # 생산 큐에 추가
-            queue_entry = await prisma.productionqueue.create(
+            queue_entry = await db.productionqueue.create(
                 data={
                     "cityId": city_id,
                     "itemId": request.unit_type_id,
@@ -295,7 +233,7 @@ async def produce_unit(
             turns_left = unit_type.buildTime
             
             # 생산 큐에 추가 (첫 번째 위치)
-            queue_entry = await prisma.productionqueue.create(
+            queue_entry = await db.productionqueue.create(
                 data={
                     "cityId": city_id,
                     "itemId": request.unit_type_id,
@@ -334,27 +272,11 @@ async def produce_unit(
         )
 
 @router.get("/cities/{city_id}/production-queue", summary="유닛 생산 큐 조회", response_description="유닛 생산 큐 정보")
-async def get_production_queue(city_id: int = Path(..., description="도시 ID")):
+async def get_production_queue(city_id: int = Path(..., description="도시 ID"), db: Prisma = Depends(get_db)):
     """특정 도시의 유닛 생산 큐를 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
         # 도시 존재 확인
-        city = await prisma.city.find_unique(
+        city = await db.city.find_unique(
             where={"id": city_id}
         )
         
@@ -369,7 +291,7 @@ async def get_production_queue(city_id: int = Path(..., description="도시 ID")
             )
         
         # 생산 큐 조회
-        production_queue = await prisma.productionqueue.find_many(
+        production_queue = await db.productionqueue.find_many(
             where={
                 "cityId": city_id,
                 "itemType": "unit"
@@ -383,7 +305,7 @@ async def get_production_queue(city_id: int = Path(..., description="도시 ID")
         queue_items = []
         for item in production_queue:
             # 유닛 타입 정보 가져오기
-            unit_type = await prisma.unittype.find_unique(
+            unit_type = await db.unittype.find_unique(
                 where={"id": item.itemId}
             )
             
@@ -427,28 +349,13 @@ async def get_production_queue(city_id: int = Path(..., description="도시 ID")
 @router.delete("/cities/{city_id}/production-queue/{queue_id}", summary="유닛 생산 큐에서 제거", response_description="유닛 생산 큐 제거 결과")
 async def cancel_unit_production(
     city_id: int = Path(..., description="도시 ID"),
-    queue_id: int = Path(..., description="큐 항목 ID")
+    queue_id: int = Path(..., description="큐 항목 ID"),
+    db: Prisma = Depends(get_db)
 ):
     """유닛 생산 큐에서 특정 항목을 제거합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
         # 큐 항목 확인
-        queue_item = await prisma.productionqueue.find_unique(
+        queue_item = await db.productionqueue.find_unique(
             where={"id": queue_id}
         )
         
@@ -477,12 +384,12 @@ async def cancel_unit_production(
         removed_position = queue_item.queueOrder
         
         # 큐에서 제거
-        await prisma.productionqueue.delete(
+        await db.productionqueue.delete(
             where={"id": queue_id}
         )
         
         # 나머지 큐 재정렬
-        await prisma.productionqueue.update_many(
+        await db.productionqueue.update_many(
             where={
                 "cityId": city_id,
                 "queueOrder": {
@@ -518,27 +425,11 @@ async def cancel_unit_production(
         )
 
 @router.get("/cities/{city_id}/units", summary="도시 생산 유닛 목록 조회", response_description="도시가 생산한 유닛 목록")
-async def get_city_units(city_id: int = Path(..., description="도시 ID")):
+async def get_city_units(city_id: int = Path(..., description="도시 ID"), db: Prisma = Depends(get_db)):
     """특정 도시에서 생산된 유닛 목록을 조회합니다."""
     try:
-        # Prisma 연결
-        try:
-            await prisma.connect()
-        except Exception as e:
-            if "Already connected" not in str(e):
-                # 실제 연결 오류인 경우에만 오류 반환
-                if "Could not connect" in str(e):
-                    return JSONResponse(
-                        status_code=500,
-                        content={
-                            "success": False,
-                            "data": None,
-                            "error": f"데이터베이스 연결 오류: {str(e)}"
-                        }
-                    )
-        
         # 도시 존재 확인
-        city = await prisma.city.find_unique(
+        city = await db.city.find_unique(
             where={"id": city_id}
         )
         
@@ -554,7 +445,7 @@ async def get_city_units(city_id: int = Path(..., description="도시 ID")):
         
         # 이 도시 주변의 유닛 조회 (q, r 좌표가 도시의 좌표와 일치하거나 인접한 경우)
         # 간단한 구현을 위해 도시의 gameCivId를 활용
-        units = await prisma.gameunit.find_many(
+        units = await db.gameunit.find_many(
             where={
                 "gameCivId": city.gameCivId,
                 "OR": [
@@ -7,16 +7,15 @@ import uuid
 from datetime import datetime
 from pydantic import BaseModel
 import asyncio
-# LangChain 관련 임포트 수정
-from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
-from langchain_google_genai import ChatGoogleGenerativeAI
-from langchain.chains import ConversationChain
-from langchain.memory import ConversationBufferMemory
-# Ollama 관련 임포트는 유지 (필요할 수 있으므로)
-from langchain_ollama import ChatOllama
+# LLM 프로바이더 라우터
+from services.llm_router import LLMRequest, LLMUnavailableError, build_llm_router
+from services.prompt_builder import StateMemory, advisor_context
 
 router = APIRouter()
 
+# 채팅용 LLM 라우터 (Gemini 1순위, Ollama 예비)
+llm_router = build_llm_router(primary="gemini", gemini_model=os.getenv("GEMINI_MODEL", "gemini-1.5-pro"))
+
 # 활성 연결 관리를 위한 클래스
 class ConnectionManager:
     def __init__(self):
@@ -54,6 +53,8 @@ class ConnectionManager:
 
 # 싱글톤 연결 관리자
 manager = ConnectionManager()
+# 채팅별 직전 게임 상태 요약 (상담가 컨텍스트의 변화분 계산용)
+advisor_memory = StateMemory()
 
 # 시스템 프롬프트 템플릿
 SYSTEM_PROMPT = """당신은 문명 게임 내의 AI 상담가이자 길잡이입니다. 
@@ -132,16 +133,10 @@ async def websocket_endpoint(websocket: WebSocket, chat_id: str):
 @router.post("/chat/init/{chat_id}")
 async def initialize_chat(chat_id: str, game_state: Optional[Dict[str, Any]] = None):
     """새로운 채팅 세션 초기화"""
-    # 게임 상태 정보가 있는 경우 추가 컨텍스트 구성
+    # 게임 상태 정보가 있는 경우 추가 컨텍스트 구성 (새 세션이므로 직전 상태는 잊음)
+    advisor_memory.forget(chat_id)
     if game_state:
-        additional_context = f"""
-현재 게임 상태:
-- 턴: {game_state.get('turn', '정보 없음')}
-- 시대: {game_state.get('era', '정보 없음')}
-- 플레이어 문명: {game_state.get('player_civ', {}).get('name', '정보 없음')}
-- 도시 수: {len(game_state.get('player_civ', {}).get('cities', []))}개
-- 현재 연구 중인 기술: {game_state.get('player_civ', {}).get('research', {}).get('in_progress', {}).get('name', '없음')}
-"""
+        additional_context = advisor_context(game_state, advisor_memory, chat_id)
     else:
         additional_context = "현재 게임에 대한 추가 정보가 없습니다. 일반적인 조언을 제공합니다."
     
@@ -170,129 +165,58 @@ async def get_chat_history(chat_id: str):
     }
 
 async def generate_llm_response(chat_id: str, user_message: str, game_state: Optional[Dict[str, Any]] = None) -> str:
-    """LangChain을 사용하여 Gemini API를 호출하여 응답을 생성합니다."""
+    """LLM 라우터를 통해 Gemini(예비: Ollama)를 호출하여 응답을 생성합니다."""
     try:
-        # Gemini 모델 설정
-        google_api_key = os.getenv("GOOGLE_API_KEY")
-        gemini_model = os.getenv("GEMINI_MODEL", "gemini-1.5-pro")
-        
         # 대화 기록 가져오기
         conversation = manager.get_conversation_history(chat_id)
         
-        # 게임 상태 정보가 있는 경우 컨텍스트 업데이트
+        # 게임 상태 정보가 있는 경우 컨텍스트 교체
+        # (매 메시지마다 시스템 메시지에 덧붙이면 대화가 길어질수록 프롬프트가 계속 커지므로 최신 요약 하나만 유지)
         if game_state:
-            # 플레이어 문명 정보
-            player_civ = game_state.get("player_civ", {})
-            
-            # 현재 연구 상태
-            research_status = player_civ.get("research", {})
-            current_research = research_status.get("in_progress", {}).get("name", "없음")
-            
-            # 도시 정보
-            cities = player_civ.get("cities", [])
-            city_info = "\n".join([f"- {city.get('name', '이름 없음')}: 인구 {city.get('population', '정보 없음')}, "
-                                  f"건설 중: {city.get('in_progress', {}).get('building', '없음')}"
-                                  for city in cities])
-            
-            context_update = f"""
-현재 게임 상태 업데이트:
-턴: {game_state.get('turn', '정보 없음')}
-시대: {game_state.get('era', '정보 없음')}
-현재 연구 중인 기술: {current_research}
-
-도시 정보:
-{city_info}
-
-이 정보를 바탕으로 플레이어의 질문에 답변해주세요.
-"""
-            # 시스템 메시지 업데이트
+            system_prompt = SYSTEM_PROMPT.format(
+                additional_context=advisor_context(game_state, advisor_memory, chat_id)
+            )
             system_found = False
             for msg in conversation:
                 if msg["role"] == "system":
-                    msg["content"] += f"\n\n{context_update}"
+                    msg["content"] = system_prompt
                     system_found = True
                     break
-            
+
             if not system_found:
                 # 시스템 메시지가 없으면 새로 추가
-                additional_context = context_update
-                system_prompt = SYSTEM_PROMPT.format(additional_context=additional_context)
                 conversation.insert(0, {"role": "system", "content": system_prompt})
-        
-        # LangChain 메시지 형식으로 변환
-        langchain_messages = []
-        
+
+        # 라우터 요청 형식으로 변환 (system 메시지는 하나로 합침)
+        system_parts = []
+        chat_messages = []
+
         for msg in conversation:
             if msg["role"] == "system":
-                langchain_messages.append(SystemMessage(content=msg["content"]))
-            elif msg["role"] == "user":
-                langchain_messages.append(HumanMessage(content=msg["content"]))
-            elif msg["role"] == "assistant":
-                langchain_messages.append(AIMessage(content=msg["content"]))
-        
+                system_parts.append(msg["content"])
+            elif msg["role"] in ("user", "assistant"):
+                chat_messages.append((msg["role"], msg["content"]))
+
         # 마지막 메시지가 사용자의 현재 질문인지 확인
-        if not langchain_messages or langchain_messages[-1].type != "human" or langchain_messages[-1].content != user_message:
-            langchain_messages.append(HumanMessage(content=user_message))
-        
+        if not chat_messages or chat_messages[-1] != ("user", user_message):
+            chat_messages.append(("user", user_message))
+
         try:
-            # 환경 변수 확인
-            if not google_api_key:
-                print("GOOGLE_API_KEY 환경 변수가 설정되지 않았습니다.")
-                raise ValueError("Google API Key가 설정되지 않았습니다.")
-            
-            # 채팅에서는 Gemini 사용
-            print(f"채팅 대화를 위해 Gemini 모델({gemini_model}) 사용")
-            chat_model = ChatGoogleGenerativeAI(
-                model=gemini_model,
-                google_api_key=google_api_key,
+            # Gemini 우선, 실패하거나 느리면 Ollama로 폴백/헤지
+            result = await llm_router.generate(LLMRequest(
+                system="\n\n".join(system_parts),
+                messages=chat_messages,
                 temperature=0.7,
                 top_p=0.95,
                 top_k=40,
-                convert_system_message_to_human=True  # Gemini는 SystemMessage를 직접 처리하지 않음
-            )
-            
-            # LLM 호출
-            response = chat_model.invoke(langchain_messages)
-            
-            # 응답 텍스트 추출
-            response_text = response.content
-            
-            if not response_text:
-                print("Gemini 응답에 텍스트가 없습니다.")
-                return "죄송합니다. API에서 텍스트 응답을 받지 못했습니다. 잠시 후 다시 시도해주세요."
-            
-            return response_text
-            
-        except Exception as e:
-            print(f"Gemini 모델 호출 오류: {str(e)}")
-            
-            # Gemini 호출 실패 시 예비로 Ollama 사용 시도
-            try:
-                # Ollama 설정
-                ollama_url = os.getenv("OLLAMA_URL", "http://localhost:11434")
-                ollama_model = os.getenv("OLLAMA_MODEL", "eeve-korean-10.8b") 
-                
-                print(f"Gemini 호출 실패로 인한 Ollama 모델({ollama_model}) 백업 사용")
-                chat_model = ChatOllama(
-                    model=ollama_model,
-                    base_url=ollama_url,
-                    temperature=0.7,
-                    top_p=0.8,
-                    top_k=40,
-                    num_predict=1000,
-                )
-                
-                # LLM 호출
-                response = chat_model.invoke(langchain_messages)
-                
-                # 응답 텍스트 추출
-                response_text = response.content
-                
-                if response_text:
-                    return response_text
-            except Exception as e2:
-                print(f"Ollama 백업 호출도 실패: {str(e2)}")
-            
+                max_tokens=1000
+            ))
+            print(f"채팅 응답 생성 완료 (프로바이더: {result.provider}, {result.latency:.2f}초)")
+            return result.text
+
+        except LLMUnavailableError as e:
+            print(f"LLM 호출 실패: {str(e)}")
+
             # 오류 발생 시 백업으로 개발 모드 응답 사용
             if os.getenv("ENVIRONMENT", "development") == "development":
                 print("개발 모드에서 백업 응답을 사용합니다.")
@@ -0,0 +1,267 @@
+import os
+import random
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+from services.game_catalog import GameCatalog, game_catalog
+
+# 규칙 기반 AI 의사결정 엔진
+# - 건물/유닛/기술마다 특성 벡터(성장, 생산, 과학, 금, 군사, 방어)를 정하고 비용으로 나눈 행렬을 만듦
+# - 행렬에 문명 성향(CivType.personality) 가중치를 곱해 성향+카탈로그 버전별로 한 번만 계산해 둠
+# - 도시마다 "필요도" 벡터(이미 가진 건물 분야는 낮게, 인구가 적으면 성장 높게)를 만들고
+#   허용된 후보 행마다 필요도 벡터와의 내적(6차원, 후보마다 작은 무작위 흔들림)으로 점수화해 가장 높은 후보를 선택
+#   (후보 행렬은 미리 계산되어 있으므로 결정 비용은 도시 수 × 후보 수의 내적 계산뿐)
+# - 카탈로그는 game_catalog 캐시에서 읽으므로 결정하는 동안 DB를 읽지 않음
+# 입력은 GameAggregate.civ_data()의 문명 데이터, 출력은 apply_ai_decisions()가 받는 결정 형식입니다.
+
+AXES = ("growth", "production", "science", "gold", "military", "defense")
+
+PERSONALITY_WEIGHTS: Dict[str, Tuple[float, ...]] = {
+    "Diplomat": (1.2, 1.0, 1.2, 1.1, 0.6, 1.0),
+    "Warlike":  (0.8, 1.2, 0.8, 0.8, 1.6, 1.0),
+    "Pacifist": (1.3, 1.0, 1.3, 1.0, 0.4, 1.1),
+    "Trader":   (1.0, 1.1, 0.9, 1.6, 0.7, 0.9),
+}
+DEFAULT_WEIGHTS = (1.0,) * len(AXES)
+
+BUILDING_FEATURES: Dict[str, Tuple[float, ...]] = {
+    "Housing":    (1.0, 0.0, 0.0, 0.0, 0.0, 0.0),
+    "Production": (0.0, 1.0, 0.0, 0.0, 0.0, 0.0),
+    "Science":    (0.0, 0.0, 1.0, 0.0, 0.0, 0.0),
+    "Trade":      (0.0, 0.0, 0.0, 1.0, 0.0, 0.0),
+    "Defense":    (0.0, 0.0, 0.0, 0.0, 0.0, 1.0),
+}
+UNIT_FEATURES: Dict[str, Tuple[float, ...]] = {
+    "Melee":    (0.0, 0.0, 0.0, 0.0, 1.0, 0.4),
+    "Ranged":   (0.0, 0.0, 0.0, 0.0, 0.8, 0.8),
+    "Cavalry":  (0.0, 0.0, 0.0, 0.0, 1.1, 0.2),
+    "Siege":    (0.0, 0.0, 0.0, 0.0, 1.3, 0.0),
+    "Modern":   (0.0, 0.0, 0.0, 0.0, 1.5, 0.5),
+    "Civilian": (0.6, 0.4, 0.0, 0.2, 0.0, 0.0),
+}
+TECH_FEATURES: Dict[str, Tuple[float, ...]] = {
+    "military":  (0.0, 0.2, 0.0, 0.0, 1.0, 0.0),
+    "defense":   (0.0, 0.0, 0.0, 0.0, 0.2, 1.0),
+    "economic":  (0.2, 0.6, 0.0, 0.6, 0.0, 0.0),
+    "science":   (0.0, 0.0, 1.0, 0.0, 0.0, 0.0),
+    "diplomacy": (0.6, 0.0, 0.0, 0.4, 0.0, 0.0),
+}
+# 분류를 알 수 없는 항목은 모든 분야에 조금씩
+UNKNOWN_FEATURES = (0.2,) * len(AXES)
+ERA_SCALE = {"Medieval": 1.0, "Industrial": 1.3, "Modern": 1.6}
+
+# 유닛은 같은 점수라면 건물보다 덜 선호 (유지비)
+UNIT_BIAS = float(os.getenv("AI_RULE_UNIT_BIAS", "0.8"))
+# 0보다 크면 점수에 곱하는 무작위 흔들림 비율 (같은 성향 문명끼리 똑같이 움직이지 않도록)
+AI_RULE_JITTER = float(os.getenv("AI_RULE_JITTER", "0.1"))
+
+Matrix = List[Tuple[float, ...]]
+
+
+def _value(value: Any) -> str:
+    """Prisma enum/문자열을 그대로 비교할 수 있는 문자열로"""
+    return str(getattr(value, "value", value)) if value is not None else ""
+
+
+def _scaled(features: Sequence[float], weights: Sequence[float], scale: float) -> Tuple[float, ...]:
+    return tuple(f * w * scale for f, w in zip(features, weights))
+
+
+def _dot(row: Sequence[float], vector: Sequence[float]) -> float:
+    return sum(a * b for a, b in zip(row, vector))
+
+
+class ScoringTable:
+    """성향 하나에 대한 후보별 점수 행렬 (행: 카탈로그 항목, 열: AXES)"""
+
+    __slots__ = ("buildings", "units", "techs", "building_rows", "unit_rows", "tech_rows")
+
+    def __init__(self, catalog: GameCatalog, weights: Sequence[float]):
+        self.buildings = catalog.buildings
+        self.units = catalog.unit_types
+        self.techs = catalog.technologies
+        self.building_rows: Matrix = [
+            _scaled(BUILDING_FEATURES.get(_value(b.category), UNKNOWN_FEATURES), weights, 1.0 / max(1, b.buildTime))
+            for b in self.buildings
+        ]
+        self.unit_rows: Matrix = [
+            _scaled(
+                UNIT_FEATURES.get(_value(u.category), UNKNOWN_FEATURES), weights,
+                UNIT_BIAS * ERA_SCALE.get(_value(u.era), 1.0) / max(1, u.buildTime),
+            )
+            for u in self.units
+        ]
+        # 연구 비용은 건설 턴 수보다 단위가 커서 제곱근으로 완화
+        self.tech_rows: Matrix = [
+            _scaled(
+                TECH_FEATURES.get(_value(t.treeType), UNKNOWN_FEATURES), weights,
+                ERA_SCALE.get(_value(t.era), 1.0) / max(1.0, float(t.researchCost or 1)) ** 0.5,
+            )
+            for t in self.techs
+        ]
+
+
+def city_needs(city: Dict[str, Any], catalog: GameCatalog) -> Tuple[float, ...]:
+    """도시 필요도 벡터: 이미 지은 건물 분야는 수확 체감, 인구가 적으면 성장 우선"""
+    owned = [0.0] * len(AXES)
+    for building in city.get("buildings", []):
+        row = catalog.building_by_id.get(building.get("id"))
+        category = _value(row.category) if row is not None else building.get("type")
+        for index, feature in enumerate(BUILDING_FEATURES.get(category, UNKNOWN_FEATURES)):
+            owned[index] += feature
+    needs = [1.0 / (1.0 + count) for count in owned]
+    population = city.get("population") or 1
+    needs[AXES.index("growth")] *= 1.0 + 1.0 / population
+    needs[AXES.index("military")] = max(needs[AXES.index("military")], 0.5)
+    return tuple(needs)
+
+
+def _ids(entries: Iterable[Any], key: str = "id") -> Set[Any]:
+    ids = set()
+    for entry in entries or []:
+        value = entry.get(key) if isinstance(entry, dict) else entry
+        if value is not None:
+            ids.add(value)
+    return ids
+
+
+def top_k_by(items: List[Any], k: Optional[int], score) -> List[Any]:
+    """k가 있으면 점수 높은 순 상위 k개, 없으면 원래 목록 그대로"""
+    if k is None:
+        return items
+    return sorted(items, key=score, reverse=True)[:max(0, k)]
+
+
+def city_is_idle(city: Dict[str, Any]) -> bool:
+    """건설 중이거나 큐에 항목이 있으면 이번 턴은 새로 정하지 않음"""
+    return not (city.get("in_progress") or city.get("queue") or city.get("production_queue"))
+
+
+def research_is_idle(research: Dict[str, Any]) -> bool:
+    return not research.get("in_progress") and not research.get("queue")
+
+
+class RuleBasedAIEngine:
+    def __init__(self, catalog: GameCatalog, jitter: float = AI_RULE_JITTER, rng: Optional[random.Random] = None):
+        self.catalog = catalog
+        self.jitter = max(0.0, jitter)
+        self.rng = rng or random.Random()
+        self._tables: Dict[Tuple[str, int], ScoringTable] = {}
+
+    def table(self, personality: Optional[str]) -> ScoringTable:
+        key = (personality or "", self.catalog.version)
+        table = self._tables.get(key)
+        if table is None:
+            # 카탈로그가 다시 적재되면 이전 버전 행렬은 버림
+            self._tables = {k: v for k, v in self._tables.items() if k[1] == self.catalog.version}
+            table = self._tables[key] = ScoringTable(
+                self.catalog, PERSONALITY_WEIGHTS.get(personality or "", DEFAULT_WEIGHTS)
+            )
+        return table
+
+    def _noise(self) -> float:
+        return 1.0 + self.rng.uniform(-self.jitter, self.jitter) if self.jitter else 1.0
+
+    async def decide(self, civ_data: Dict[str, Any]) -> Dict[str, Any]:
+        """문명 하나의 이번 턴 결정을 만듭니다. 카탈로그가 적재되어 있으면 DB를 읽지 않습니다."""
+        await self.catalog.ensure_loaded()
+        return self.decide_loaded(civ_data)
+
+    def _masks(self, table: ScoringTable, completed_techs: Set[Any]) -> Tuple[List[bool], List[bool]]:
+        """문명 단위로 한 번만 계산하는 후보 마스크 (선행 기술을 연구한 건물/유닛)"""
+        building_mask = [
+            b.prerequisiteTechId is None or b.prerequisiteTechId in completed_techs for b in table.buildings
+        ]
+        unit_mask = [u.prereqTechId is None or u.prereqTechId in completed_techs for u in table.units]
+        return building_mask, unit_mask
+
+    def _tech_open(self, tech: Any, completed: Set[Any]) -> bool:
+        return tech.id not in completed and self.catalog.prerequisites.get(tech.id, set()) <= completed
+
+    def decide_loaded(self, civ_data: Dict[str, Any]) -> Dict[str, Any]:
+        decisions: Dict[str, Any] = {"cities": [], "research": None}
+        research = civ_data.get("research") or {}
+        completed_techs = _ids(research.get("completed"))
+        table = self.table(_value(civ_data.get("personality")))
+        building_mask, unit_mask = self._masks(table, completed_techs)
+
+        for city in civ_data.get("cities", []):
+            if not city_is_idle(city):
+                continue
+            needs = city_needs(city, self.catalog)
+            excluded = _ids(city.get("buildings"))
+
+            best: Optional[Tuple[float, str, Any]] = None
+            for allowed, row, building in zip(building_mask, table.building_rows, table.buildings):
+                if allowed and building.id not in excluded:
+                    score = _dot(row, needs) * self._noise()
+                    if best is None or score > best[0]:
+                        best = (score, "building", building)
+            for allowed, row, unit in zip(unit_mask, table.unit_rows, table.units):
+                if allowed:
+                    score = _dot(row, needs) * self._noise()
+                    if best is None or score > best[0]:
+                        best = (score, "unit", unit)
+            if best is not None:
+                _, kind, item = best
+                decisions["cities"].append({
+                    "city_id": city.get("id"),
+                    "build": {"type": kind, "id": item.id, "name": item.name}
+                })
+
+        if research_is_idle(research):
+            decisions["research"] = self._pick_tech(table, completed_techs)
+        return decisions
+
+    def options(self, civ_data: Dict[str, Any], top_k: Optional[int] = None) -> Dict[str, Any]:
+        """결정에 쓸 수 있는 후보 ID 목록 (LLM 프롬프트와 응답 검증용)
+
+        cities에는 이번 턴에 새로 정할 수 있는 도시만 들어가며, buildings는 도시마다 이미 지은 건물을 뺀 목록입니다.
+        top_k를 주면 규칙 점수가 높은 순으로 종류별 상위 k개만 남깁니다. (유닛은 결정할 도시들의 평균 필요도 기준)
+        """
+        research = civ_data.get("research") or {}
+        completed_techs = _ids(research.get("completed"))
+        table = self.table(_value(civ_data.get("personality")))
+        building_mask, unit_mask = self._masks(table, completed_techs)
+        buildings = [(b.id, row) for allowed, b, row in zip(building_mask, table.buildings, table.building_rows) if allowed]
+
+        cities = {}
+        need_rows = []
+        for city in civ_data.get("cities", []):
+            if not city_is_idle(city):
+                continue
+            built = _ids(city.get("buildings"))
+            needs = city_needs(city, self.catalog)
+            need_rows.append(needs)
+            candidates = [(building_id, row) for building_id, row in buildings if building_id not in built]
+            cities[city.get("id")] = [
+                building_id for building_id, _ in top_k_by(candidates, top_k, lambda item: _dot(item[1], needs))
+            ]
+
+        mean_needs = (
+            tuple(sum(column) / len(need_rows) for column in zip(*need_rows)) if need_rows else (1.0,) * len(AXES)
+        )
+        units = [(u.id, row) for allowed, u, row in zip(unit_mask, table.units, table.unit_rows) if allowed]
+        techs = [
+            (t.id, row) for t, row in zip(table.techs, table.tech_rows) if self._tech_open(t, completed_techs)
+        ] if research_is_idle(research) else []
+        return {
+            "cities": cities,
+            "units": [unit_id for unit_id, _ in top_k_by(units, top_k, lambda item: _dot(item[1], mean_needs))],
+            "techs": [tech_id for tech_id, _ in top_k_by(techs, top_k, lambda item: sum(item[1]))],
+        }
+
+    def _pick_tech(self, table: ScoringTable, completed: Set[Any]) -> Optional[Dict[str, Any]]:
+        # 연구 필요도는 문명 전체 기준 (분야 구분 없이 동일)
+        best = None
+        for row, tech in zip(table.tech_rows, table.techs):
+            if not self._tech_open(tech, completed):
+                continue
+            score = sum(row) * self._noise()
+            if best is None or score > best[0]:
+                best = (score, tech)
+        if best is None:
+            return None
+        return {"tech_id": best[1].id, "name": best[1].name}
+
+
+rule_ai_engine = RuleBasedAIEngine(game_catalog)
@@ -0,0 +1,394 @@
+import asyncio
+import hashlib
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from services.ai_engine import RuleBasedAIEngine, rule_ai_engine
+from services.game_catalog import GameCatalog, game_catalog
+from services.llm_router import LLMRequest, LLMRouter, build_llm_router
+from services.metrics import AI_PLAN_DECISIONS
+from services.prompt_builder import StateMemory, compact_json, estimate_tokens
+
+# AI 턴 계획기 (LLM 기반 + 규칙 기반 폴백)
+# - AI_PLANNER_MODE=rules(기본)면 규칙 기반 엔진만 사용, llm이면 LLM에 계획을 요청
+# - 여러 게임의 end_turn에서 동시에 들어온 문명들을 AI_PLANNER_BATCH_WINDOW_MS 동안 모아
+#   AI_PLANNER_BATCH_SIZE개씩 한 요청(멀티 문명 프롬프트)으로 묶고, 요청은 AI_PLANNER_CONCURRENCY개까지 동시에 보냄
+# - 응답 JSON은 스키마와 후보 목록(이번 턴에 실제로 고를 수 있는 건물/유닛/기술 ID)으로 검증하고,
+#   틀린 문명은 그 문명만 규칙 기반 결정으로 대체
+# - 같은 상태(지문)의 문명은 캐시된 계획을 재사용하고, 진행 중인 같은 지문 요청에는 합류
+# - AI_PLANNER_BUDGET_MS 안에 응답이 없으면 규칙 기반 결정으로 응답 (늦게 도착한 응답은 캐시에만 반영)
+
+AI_PLANNER_MODE = os.getenv("AI_PLANNER_MODE", "rules").lower()
+AI_PLANNER_PROVIDER = os.getenv("AI_PLANNER_PROVIDER", "gemini")
+AI_PLANNER_BUDGET_MS = float(os.getenv("AI_PLANNER_BUDGET_MS", "3000"))
+AI_PLANNER_BATCH_SIZE = int(os.getenv("AI_PLANNER_BATCH_SIZE", "6"))
+AI_PLANNER_BATCH_WINDOW_MS = float(os.getenv("AI_PLANNER_BATCH_WINDOW_MS", "20"))
+AI_PLANNER_CONCURRENCY = int(os.getenv("AI_PLANNER_CONCURRENCY", "4"))
+AI_PLANNER_CACHE_SIZE = int(os.getenv("AI_PLANNER_CACHE_SIZE", "2048"))
+# 프롬프트에 넣는 종류별 후보 수(규칙 점수 상위 K개)와 문명 하나당 추정 토큰 예산
+AI_PROMPT_TOP_K = int(os.getenv("AI_PROMPT_TOP_K", "5"))
+AI_PROMPT_CIV_TOKENS = int(os.getenv("AI_PROMPT_CIV_TOKENS", "250"))
+
+EMPTY_DECISIONS: Dict[str, Any] = {"cities": [], "research": None}
+
+PLANNER_SYSTEM_PROMPT = """당신은 문명 게임의 AI 문명들을 대신해 이번 턴의 행동을 정합니다.
+각 문명의 성향(personality)과 자원을 고려해 도시마다 건설할 건물 또는 생산할 유닛 하나와, 연구할 기술 하나를 고르세요.
+입력은 문명 목록(civs)과 후보 이름표(cat)입니다. 키 약어: nm=이름, per=성향, t=턴, res=자원(gld 금, sci 과학, cul 문화),
+cty=결정할 도시(id, pop 인구, opt 건설 가능 건물 ID), un=생산 가능 유닛 ID, tech=연구 가능 기술 ID, chg=지난 턴 대비 변화,
+cat.b/u/t=건물/유닛/기술 ID → "이름|분류".
+반드시 opt/un/tech에 있는 ID만 사용하고, cty에 없는 도시와 tech가 없는 문명의 연구는 생략하세요.
+설명 없이 JSON 객체 하나로만 답하세요. 형식:
+{"plans": [{"civ_id": 문명ID, "cities": [{"city_id": 도시ID, "build": {"type": "building" 또는 "unit", "id": 항목ID}}], "research": {"tech_id": 기술ID} 또는 null}]}"""
+
+_JSON_FENCE = re.compile(r"```(?:json)?\s*(.*?)```", re.S)
+
+
+class PlanValidationError(ValueError):
+    """LLM 응답이 계획 스키마를 따르지 않는 경우"""
+
+
+def _tech_ids(civ_data: Dict[str, Any]) -> List[Any]:
+    return [tech.get("id") for tech in (civ_data.get("research") or {}).get("completed") or []]
+
+
+def civ_key(civ_data: Dict[str, Any]) -> str:
+    return str(civ_data.get("id"))
+
+
+def state_fingerprint(civ_data: Dict[str, Any], catalog_version: int) -> str:
+    """문명 상태 지문 (같은 지문이면 같은 계획을 재사용)"""
+    canonical = json.dumps(civ_data, sort_keys=True, ensure_ascii=False, separators=(",", ":"), default=str)
+    return hashlib.sha256(f"{catalog_version}:{canonical}".encode()).hexdigest()
+
+
+def extract_json(text: str) -> Any:
+    """응답 텍스트에서 JSON 객체를 꺼냅니다. (코드 블록/앞뒤 설명 허용)"""
+    match = _JSON_FENCE.search(text)
+    if match:
+        text = match.group(1)
+    start, end = text.find("{"), text.rfind("}")
+    if start < 0 or end < start:
+        raise PlanValidationError("응답에 JSON 객체가 없습니다.")
+    try:
+        return json.loads(text[start:end + 1])
+    except json.JSONDecodeError as e:
+        raise PlanValidationError(f"JSON 파싱 실패: {e}")
+
+
+def _int(value: Any) -> Optional[int]:
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.isdigit():
+        return int(value)
+    return None
+
+
+def validate_civ_plan(plan: Any, options: Dict[str, Any], catalog: GameCatalog) -> Dict[str, Any]:
+    """문명 하나의 계획을 후보 목록으로 검증해 apply_ai_decisions 형식으로 바꿉니다."""
+    if not isinstance(plan, dict):
+        raise PlanValidationError("plan이 객체가 아닙니다.")
+    # 응답의 ID는 문자열/숫자 어느 쪽이든 허용하고, 결정에는 원래 도시 ID를 사용
+    city_options = {str(city_id): (city_id, ids) for city_id, ids in options["cities"].items()}
+    units = set(options["units"])
+    decisions: Dict[str, Any] = {"cities": [], "research": None}
+    seen: Set[str] = set()
+
+    cities = plan.get("cities") or []
+    if not isinstance(cities, list):
+        raise PlanValidationError("cities가 배열이 아닙니다.")
+    for entry in cities:
+        if not isinstance(entry, dict) or not isinstance(entry.get("build"), dict):
+            raise PlanValidationError("도시 결정 형식이 잘못되었습니다.")
+        city_id = str(entry.get("city_id"))
+        if city_id not in city_options or city_id in seen:
+            raise PlanValidationError(f"결정할 수 없는 도시입니다: {city_id}")
+        seen.add(city_id)
+        kind, item_id = entry["build"].get("type"), _int(entry["build"].get("id"))
+        original_id, building_ids = city_options[city_id]
+        if kind == "building" and item_id in building_ids:
+            item = catalog.building_by_id[item_id]
+        elif kind == "unit" and item_id in units:
+            item = catalog.unit_type_by_id[item_id]
+        else:
+            raise PlanValidationError(f"선택할 수 없는 항목입니다: {kind} {entry['build'].get('id')}")
+        decisions["cities"].append({"city_id": original_id, "build": {"type": kind, "id": item.id, "name": item.name}})
+
+    research = plan.get("research")
+    if research is not None:
+        tech_id = _int(research.get("tech_id")) if isinstance(research, dict) else None
+        if tech_id not in options["techs"]:
+            raise PlanValidationError(f"연구할 수 없는 기술입니다: {research}")
+        decisions["research"] = {"tech_id": tech_id, "name": catalog.technology_by_id[tech_id].name}
+    return decisions
+
+
+def parse_plans(text: str, expected: Dict[str, Dict[str, Any]], catalog: GameCatalog) -> Dict[str, Any]:
+    """배치 응답을 검증합니다. → {문명 키: 결정 또는 PlanValidationError}"""
+    data = extract_json(text)
+    plans = data.get("plans") if isinstance(data, dict) else None
+    if not isinstance(plans, list):
+        raise PlanValidationError("plans 배열이 없습니다.")
+    results: Dict[str, Any] = {}
+    for plan in plans:
+        key = str(plan.get("civ_id")) if isinstance(plan, dict) else None
+        if key not in expected or key in results:
+            continue
+        try:
+            results[key] = validate_civ_plan(plan, expected[key], catalog)
+        except PlanValidationError as e:
+            results[key] = e
+    return results
+
+
+class _PlanJob:
+    __slots__ = ("key", "civ_data", "options", "fingerprint", "turn", "future")
+
+    def __init__(self, key: str, civ_data: Dict[str, Any], options: Dict[str, Any], fingerprint: str,
+                 turn: Optional[int], future: asyncio.Future):
+        self.key = key
+        self.civ_data = civ_data
+        self.options = options
+        self.fingerprint = fingerprint
+        self.turn = turn
+        self.future = future
+
+
+class AITurnPlanner:
+    def __init__(
+        self,
+        engine: RuleBasedAIEngine,
+        catalog: GameCatalog,
+        mode: str = AI_PLANNER_MODE,
+        router: Optional[LLMRouter] = None,
+        budget_ms: float = AI_PLANNER_BUDGET_MS,
+        batch_size: int = AI_PLANNER_BATCH_SIZE,
+        batch_window_ms: float = AI_PLANNER_BATCH_WINDOW_MS,
+        concurrency: int = AI_PLANNER_CONCURRENCY,
+        cache_size: int = AI_PLANNER_CACHE_SIZE,
+        top_k: Optional[int] = AI_PROMPT_TOP_K,
+        civ_token_budget: int = AI_PROMPT_CIV_TOKENS,
+    ):
+        self.engine = engine
+        self.catalog = catalog
+        self.mode = mode if mode in ("rules", "llm") else "rules"
+        self._router = router
+        self.budget = budget_ms / 1000
+        self.batch_size = max(1, batch_size)
+        self.batch_window = batch_window_ms / 1000
+        self.concurrency = max(1, concurrency)
+        self.cache_size = cache_size
+        self.top_k = top_k
+        self.civ_token_budget = civ_token_budget
+        self._memory = StateMemory()
+        self._cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._pending: List[_PlanJob] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self.stats = {
+            "hits": 0, "misses": 0, "llm": 0, "rules": 0, "fallback": 0,
+            "invalid": 0, "requests": 0, "errors": 0,
+        }
+
+    @property
+    def router(self) -> LLMRouter:
+        if self._router is None:
+            self._router = build_llm_router(primary=AI_PLANNER_PROVIDER)
+        return self._router
+
+    def _count(self, source: str, amount: int = 1) -> None:
+        if amount:
+            self.stats[source] += amount
+            AI_PLAN_DECISIONS.inc(amount, source=source)
+
+    # ---- 계획 ----
+
+    async def plan(self, civs: List[Dict[str, Any]], turn: Optional[int] = None) -> Dict[str, Dict[str, Any]]:
+        """AI 문명들의 이번 턴 결정을 만듭니다. → {str(문명 ID): 결정}"""
+        civs = [civ for civ in civs if civ]
+        if self.mode == "rules":
+            results = {civ_key(civ): await self.engine.decide(civ) for civ in civs}
+            self._count("rules", len(results))
+            return results
+
+        await self.catalog.ensure_loaded()
+        results: Dict[str, Dict[str, Any]] = {}
+        waiting: Dict[str, Tuple[Dict[str, Any], asyncio.Future]] = {}
+        for civ in civs:
+            key = civ_key(civ)
+            options = self.engine.options(civ, self.top_k)
+            if not options["cities"] and not options["techs"]:
+                # 정할 것이 없는 문명은 LLM에 보내지 않음
+                results[key] = dict(EMPTY_DECISIONS)
+                continue
+            fingerprint = state_fingerprint(civ, self.catalog.version)
+            cached = self._cache.get(fingerprint)
+            if cached is not None:
+                self._cache.move_to_end(fingerprint)
+                self.stats["hits"] += 1
+                results[key] = cached
+                AI_PLAN_DECISIONS.inc(source="cache")
+                continue
+            self.stats["misses"] += 1
+            waiting[key] = (civ, self._enqueue(key, civ, options, fingerprint, turn))
+
+        if waiting:
+            futures = {future for _, future in waiting.values()}
+            await asyncio.wait(futures, timeout=self.budget)
+            for key, (civ, future) in waiting.items():
+                decisions = future.result() if future.done() and not future.cancelled() else None
+                if decisions is not None:
+                    results[key] = decisions
+                    self._count("llm")
+                else:
+                    # 시간 초과/실패/검증 실패 → 규칙 기반 결정
+                    results[key] = self.engine.decide_loaded(civ)
+                    self._count("fallback")
+        return results
+
+    def _enqueue(self, key: str, civ_data: Dict[str, Any], options: Dict[str, Any],
+                 fingerprint: str, turn: Optional[int]) -> asyncio.Future:
+        inflight = self._inflight.get(fingerprint)
+        if inflight is not None:
+            return inflight
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[fingerprint] = future
+        self._pending.append(_PlanJob(key, civ_data, options, fingerprint, turn, future))
+        if len(self._pending) >= self.batch_size * self.concurrency:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return future
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        jobs, self._pending = self._pending, []
+        for start in range(0, len(jobs), self.batch_size):
+            task = asyncio.create_task(self._request(jobs[start:start + self.batch_size]))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    # ---- LLM 요청 ----
+
+    def civ_digest(self, job: _PlanJob) -> Dict[str, Any]:
+        """문명 하나의 압축 요약 (후보는 plan()에서 이미 상위 K개로 줄어든 상태)"""
+        civ, options = job.civ_data, job.options
+        populations = {str(city.get("id")): city.get("population") for city in civ.get("cities", [])}
+        tracked = {
+            "resources": civ.get("resources"),
+            "pop": populations,
+            "done": sorted(_tech_ids(civ)),
+        }
+        # 직전 턴 대비 변화 (자원 증감, 인구 변화, 새로 완료한 기술)
+        change, _ = self._memory.delta(job.key, tracked)
+        return {
+            "civ_id": civ.get("id"),
+            "name": civ.get("name"),
+            "personality": civ.get("personality"),
+            "turn": job.turn,
+            "resources": civ.get("resources"),
+            "cities": [
+                {"id": city_id, "pop": populations.get(str(city_id)), "opt": ids}
+                for city_id, ids in options["cities"].items()
+            ],
+            "units": options["units"],
+            "tech": options["techs"],
+            "chg": change,
+        }
+
+    def build_prompt(self, jobs: List[_PlanJob]) -> str:
+        civs = []
+        for job in jobs:
+            digest = self.civ_digest(job)
+            if estimate_tokens(compact_json(digest)) > self.civ_token_budget:
+                # 예산 초과 시 변화량 → 도시별 후보 수 순서로 줄임
+                digest.pop("chg", None)
+                for limit in (3, 2, 1):
+                    if estimate_tokens(compact_json(digest)) <= self.civ_token_budget:
+                        break
+                    for city in digest["cities"]:
+                        city["opt"] = city["opt"][:limit]
+                    digest["units"] = digest["units"][:limit]
+                    digest["tech"] = digest["tech"][:limit]
+            civs.append(digest)
+
+        referenced: Dict[str, Set[int]] = {"b": set(), "u": set(), "t": set()}
+        for digest in civs:
+            for city in digest["cities"]:
+                referenced["b"].update(city["opt"])
+            referenced["u"].update(digest["units"])
+            referenced["t"].update(digest["tech"])
+        catalog = {
+            "b": {b: f"{self.catalog.building_by_id[b].name}|{self.catalog.building_by_id[b].category}"
+                  for b in sorted(referenced["b"])},
+            "u": {u: f"{self.catalog.unit_type_by_id[u].name}|{self.catalog.unit_type_by_id[u].category}"
+                  for u in sorted(referenced["u"])},
+            "t": {t: f"{self.catalog.technology_by_id[t].name}|{self.catalog.technology_by_id[t].treeType}"
+                  for t in sorted(referenced["t"])},
+        }
+        state = compact_json({"civs": civs, "cat": catalog})
+        return f"```json\n{state}\n```"
+
+    async def _request(self, jobs: List[_PlanJob]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        parsed: Dict[str, Any] = {}
+        try:
+            async with self._semaphore:
+                self.stats["requests"] += 1
+                result = await self.router.generate(LLMRequest(
+                    system=PLANNER_SYSTEM_PROMPT,
+                    messages=[("user", self.build_prompt(jobs))],
+                    temperature=0.2,
+                    max_tokens=200 + 150 * len(jobs),
+                ))
+            parsed = parse_plans(result.text, {job.key: job.options for job in jobs}, self.catalog)
+        except PlanValidationError as e:
+            self.stats["invalid"] += len(jobs)
+            print(f"AI 계획 응답 검증 실패: {str(e)}")
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"AI 계획 요청 오류: {str(e)}")
+        finally:
+            for job in jobs:
+                decisions = parsed.get(job.key)
+                if isinstance(decisions, PlanValidationError):
+                    self.stats["invalid"] += 1
+                    decisions = None
+                if decisions is not None:
+                    self._remember(job.fingerprint, decisions)
+                self._inflight.pop(job.fingerprint, None)
+                if not job.future.done():
+                    job.future.set_result(decisions)
+
+    def _remember(self, fingerprint: str, decisions: Dict[str, Any]) -> None:
+        self._cache[fingerprint] = decisions
+        self._cache.move_to_end(fingerprint)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    async def stop(self) -> None:
+        """진행 중인 LLM 요청을 취소합니다."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        for job in self._pending:
+            if not job.future.done():
+                job.future.set_result(None)
+        self._pending = []
+        for task in list(self._tasks):
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks.clear()
+        self._inflight.clear()
+
+
+ai_planner = AITurnPlanner(rule_ai_engine, game_catalog)
@@ -0,0 +1,166 @@
+import hashlib
+import os
+from itertools import product
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from fastapi.responses import Response
+
+from services import fast_json
+from services.game_catalog import GameCatalog, game_catalog
+from services.game_state_cache import etag_matches
+
+# 정적 카탈로그 응답 (GET /units/, /buildings/, /technologies/, /catalog/)
+# - game_catalog(메모리)에서 목록 응답을 만들고 DB는 읽지 않음
+# - 카탈로그를 적재할 때(버전이 바뀔 때) 필터 조합(시대/분류/선행 기술 등, 각 필터 사용 여부 포함)마다
+#   응답 본문을 한 번 직렬화해 두고 본문 해시로 ETag를 붙임 → 요청은 dict 조회 + bytes 응답
+# - If-None-Match가 일치하면 304, Cache-Control로 CATALOG_CACHE_MAX_AGE초 동안 재검증 없이 재사용
+# - ETag가 고정이라 압축 미들웨어도 (ETag, 인코딩)별로 한 번만 압축함
+# 카탈로그가 무효화되면(game_catalog.invalidate) 다음 요청에서 다시 적재하고 뷰도 새로 만듭니다.
+
+CATALOG_CACHE_MAX_AGE = int(os.getenv("CATALOG_CACHE_MAX_AGE", "300"))
+
+# 목록별 필터 이름 (쿼리 파라미터 이름과 같음)
+CATALOG_FILTERS: Dict[str, Tuple[str, ...]] = {
+    "units": ("era", "category", "prereqTech"),
+    "buildings": ("category", "prereqTech"),
+    "technologies": ("era", "treeType", "prereqTech"),
+}
+
+FilterKey = Tuple[Any, ...]
+
+
+def _value(value: Any) -> Any:
+    """Prisma enum은 문자열 값으로"""
+    return getattr(value, "value", value)
+
+
+def unit_item(unit: Any) -> Dict[str, Any]:
+    return {
+        "id": unit.id,
+        "name": unit.name,
+        "category": _value(unit.category),
+        "era": _value(unit.era),
+        "maintenance": unit.maintenance,
+        "movement": unit.movement,
+        "sight": unit.sight,
+        "buildTime": unit.buildTime,
+        "prereqTechId": unit.prereqTechId,
+    }
+
+
+def building_item(building: Any) -> Dict[str, Any]:
+    return {
+        "id": building.id,
+        "name": building.name,
+        "category": building.category,
+        "description": building.description,
+        "buildTime": building.buildTime,
+        "resourceCost": {"Food": 0, "Production": building.resourceCost, "Gold": 0, "Science": 0},
+        "maintenanceCost": {"Gold": building.maintenanceCost},
+        "prerequisiteTechId": building.prerequisiteTechId,
+    }
+
+
+def technology_item(tech: Any) -> Dict[str, Any]:
+    return {
+        "id": tech.id,
+        "name": tech.name,
+        "description": tech.description,
+        "era": _value(tech.era),
+        "treeType": tech.treeType,
+        "researchCost": tech.researchCost,
+        "researchTimeModifier": tech.researchTimeModifier,
+    }
+
+
+class CatalogView:
+    """직렬화해 둔 목록 응답 (items는 페이지를 자를 때 사용)"""
+    __slots__ = ("items", "body", "etag")
+
+    def __init__(self, name: str, items: List[Dict[str, Any]], data: Any = None):
+        self.items = items
+        self.body = fast_json.dumps({"success": True, "data": items if data is None else data, "error": None})
+        self.etag = f'"{name}-{hashlib.sha1(self.body).hexdigest()[:20]}"'
+
+    def page(self, name: str, offset: int, limit: Optional[int]) -> "CatalogView":
+        end = None if limit is None else offset + limit
+        return CatalogView(name, self.items[offset:end])
+
+
+class CatalogViews:
+    def __init__(self, catalog: GameCatalog):
+        self.catalog = catalog
+        self.version: Optional[int] = None
+        self._views: Dict[Tuple[str, FilterKey], CatalogView] = {}
+        self._empty: Optional[CatalogView] = None
+        self.bundle: Optional[CatalogView] = None
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "builds": 0}
+
+    def _group(self, name: str, rows: Iterable[Tuple[Dict[str, Any], Tuple[Tuple[Any, ...], ...]]]) -> None:
+        """행마다 필터별 값 목록을 받아, 필터를 쓰지 않는 경우(None)까지 모든 조합의 뷰를 만듭니다."""
+        grouped: Dict[FilterKey, List[Dict[str, Any]]] = {}
+        for item, values in rows:
+            options = [(None,) + tuple(value for value in filter_values if value is not None)
+                       for filter_values in values]
+            for key in product(*options):
+                grouped.setdefault(key, []).append(item)
+        empty_key = (None,) * len(CATALOG_FILTERS[name])
+        grouped.setdefault(empty_key, [])
+        for key, items in grouped.items():
+            self._views[(name, key)] = CatalogView(name, items)
+
+    def build(self) -> int:
+        """현재 카탈로그로 모든 뷰와 묶음 응답을 다시 만듭니다. 만든 뷰 수를 반환합니다."""
+        catalog = self.catalog
+        self._views = {}
+        units = [unit_item(unit) for unit in catalog.unit_types]
+        buildings = [building_item(building) for building in catalog.buildings]
+        technologies = [technology_item(tech) for tech in catalog.technologies]
+        self._group("units", (
+            (item, ((item["era"],), (item["category"],), (item["prereqTechId"],))) for item in units))
+        self._group("buildings", (
+            (item, ((item["category"],), (item["prerequisiteTechId"],))) for item in buildings))
+        # 기술의 선행 기술 필터: 해당 기술을 직접 선행으로 요구하는 기술들
+        self._group("technologies", (
+            (item, ((item["era"],), (item["treeType"],), tuple(sorted(catalog.prerequisites.get(item["id"], ())))))
+            for item in technologies))
+        self._empty = CatalogView("empty", [])
+        prerequisites = {tech_id: sorted(prereq_ids) for tech_id, prereq_ids in sorted(catalog.prerequisites.items())}
+        self.bundle = CatalogView("catalog", [], data={
+            "units": units,
+            "buildings": buildings,
+            "technologies": technologies,
+            "prerequisites": prerequisites,
+        })
+        self.version = catalog.version
+        self.stats["builds"] += 1
+        return len(self._views)
+
+    async def ensure(self) -> "CatalogViews":
+        """카탈로그를 적재하고, 카탈로그 버전이 바뀌었으면 뷰를 다시 만듭니다."""
+        await self.catalog.ensure_loaded()
+        if self.version != self.catalog.version:
+            self.stats["misses"] += 1
+            self.build()
+        else:
+            self.stats["hits"] += 1
+        return self
+
+    def view(self, name: str, offset: int = 0, limit: Optional[int] = None, **filters: Any) -> CatalogView:
+        """필터 조합의 뷰 (offset/limit이 있으면 그 구간만 잘라 새로 직렬화)"""
+        key = tuple(_value(filters.get(filter_name)) for filter_name in CATALOG_FILTERS[name])
+        view = self._views.get((name, key)) or self._empty
+        if offset or limit is not None:
+            return view.page(name, offset, limit)
+        return view
+
+    def response(self, view: CatalogView, if_none_match: Optional[str]) -> Response:
+        """ETag/Cache-Control을 붙인 응답 (If-None-Match가 일치하면 본문 없이 304)"""
+        headers = {"ETag": view.etag, "Cache-Control": f"public, max-age={CATALOG_CACHE_MAX_AGE}"}
+        if etag_matches(if_none_match, view.etag):
+            self.stats["not_modified"] += 1
+            return Response(status_code=304, headers=headers)
+        return fast_json.json_bytes_response(view.body, headers=headers)
+
+
+catalog_views = CatalogViews(game_catalog)
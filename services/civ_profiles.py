@@ -0,0 +1,100 @@
+import asyncio
+from typing import Any, Dict, Iterable, Optional, Set
+
+from db.client import prisma
+
+# 문명/지도자 프로필 캐시
+# - 서버 시작 시 CivType + LeaderProfile 전체를 한 번에 읽어 CivType ID 기준으로 보관
+# - 문명 타입을 생성/수정하는 코드는 update()로 캐시를 직접 갱신하거나 invalidate()로 무효화
+# - 캐시에 없는 ID는 한 번만 DB에서 읽고, 없는 ID도 기억해 같은 ID로 반복 조회하지 않음
+# 외교 메시지 처리 중에는 프로필 조회를 위해 DB를 읽지 않습니다.
+
+
+class CivProfile:
+    """문명 타입과 지도자 프로필을 합친 읽기 전용 정보"""
+
+    __slots__ = (
+        "id", "name", "leader_name", "personality",
+        "leader_full_name", "backstory", "preferred_victories", "image_url",
+    )
+
+    def __init__(self, civ_type: Any, leader_profile: Any = None):
+        self.id = civ_type.id
+        self.name = civ_type.name
+        self.leader_name = civ_type.leaderName
+        self.personality = str(civ_type.personality) if civ_type.personality else None
+        self.leader_full_name = leader_profile.fullName if leader_profile else None
+        self.backstory = leader_profile.backstory if leader_profile else None
+        self.preferred_victories = leader_profile.preferredVictories if leader_profile else None
+        self.image_url = leader_profile.imageUrl if leader_profile else None
+
+
+class CivProfileCache:
+    def __init__(self, db):
+        self.db = db
+        self._profiles: Dict[int, CivProfile] = {}
+        self._missing: Set[int] = set()
+        self._lock = asyncio.Lock()
+        self.loaded = False
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def preload(self) -> int:
+        """모든 문명 타입과 지도자 프로필을 캐시에 적재합니다."""
+        rows = await self.db.civtype.find_many(include={"leaderProfile": True})
+        self.load(rows)
+        self.loaded = True
+        return len(rows)
+
+    def load(self, civ_types: Iterable[Any]) -> None:
+        profiles = {}
+        for civ_type in civ_types:
+            profiles[civ_type.id] = CivProfile(civ_type, getattr(civ_type, "leaderProfile", None))
+        self._profiles = profiles
+        self._missing = set()
+
+    def get(self, civ_type_id: int) -> Optional[CivProfile]:
+        return self._profiles.get(civ_type_id)
+
+    async def fetch(self, civ_type_id: int) -> Optional[CivProfile]:
+        """캐시에서 프로필을 조회하고, 처음 보는 ID만 DB에서 한 번 읽습니다."""
+        profile = self._profiles.get(civ_type_id)
+        if profile is not None or civ_type_id in self._missing:
+            self.stats["hits"] += 1
+            return profile
+
+        self.stats["misses"] += 1
+        async with self._lock:
+            # 대기하는 동안 다른 요청이 적재했을 수 있음
+            profile = self._profiles.get(civ_type_id)
+            if profile is not None or civ_type_id in self._missing:
+                return profile
+            civ_type = await self.db.civtype.find_unique(
+                where={"id": civ_type_id},
+                include={"leaderProfile": True}
+            )
+            if civ_type is None:
+                self._missing.add(civ_type_id)
+                return None
+            return self.update(civ_type, civ_type.leaderProfile)
+
+    def update(self, civ_type: Any, leader_profile: Any = None) -> CivProfile:
+        """생성/수정된 문명 타입으로 캐시 항목을 교체합니다."""
+        if leader_profile is None:
+            leader_profile = getattr(civ_type, "leaderProfile", None)
+        profile = CivProfile(civ_type, leader_profile)
+        self._profiles[civ_type.id] = profile
+        self._missing.discard(civ_type.id)
+        return profile
+
+    def invalidate(self, civ_type_id: Optional[int] = None) -> None:
+        """특정 문명 타입(또는 전체)의 캐시를 무효화합니다. 다음 조회 시 다시 읽습니다."""
+        if civ_type_id is None:
+            self._profiles = {}
+            self._missing = set()
+            self.loaded = False
+            return
+        self._profiles.pop(civ_type_id, None)
+        self._missing.discard(civ_type_id)
+
+
+civ_profiles = CivProfileCache(prisma)
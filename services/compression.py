@@ -0,0 +1,192 @@
+import gzip
+import os
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+import anyio
+
+try:
+    import brotli
+except ImportError:  # 선택 의존성: 없으면 gzip만 사용
+    brotli = None
+
+# 응답 압축 ASGI 미들웨어 (Accept-Encoding 협상: br > gzip)
+# - JSON/텍스트 응답 중 RESPONSE_COMPRESSION_MIN_SIZE 바이트 이상만 압축 (작은 응답은 압축 비용이 더 큼)
+# - ETag가 있는 응답(게임 상태, 정적 카탈로그 등)은 (ETag, 인코딩)별로 한 번만 압축해 LRU 캐시에서 재사용
+#   ETag가 같으면 본문도 같으므로 캐시 키로 충분함 (압축 본문은 약한 ETag로 바꿔서 내려줌)
+# - 캐시에 없는 큰 본문(RESPONSE_COMPRESSION_THREAD_MIN_SIZE 이상, 예: ETag 없는 /map/data)은 워커 스레드에서 압축
+#   (gzip/brotli는 압축 중 GIL을 놓으므로 이벤트 루프가 다른 요청을 계속 처리)
+# - 스트리밍 응답(본문이 여러 조각)과 이미 인코딩된 응답은 그대로 통과
+# brotli 패키지가 없으면 gzip만 협상합니다.
+
+RESPONSE_COMPRESSION = os.getenv("RESPONSE_COMPRESSION", "true").lower() == "true"
+RESPONSE_COMPRESSION_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_MIN_SIZE", "1024"))
+RESPONSE_GZIP_LEVEL = int(os.getenv("RESPONSE_GZIP_LEVEL", "6"))
+RESPONSE_BROTLI_QUALITY = int(os.getenv("RESPONSE_BROTLI_QUALITY", "5"))
+# 이 크기 이상이면 이벤트 루프 대신 스레드에서 압축 (바이트)
+RESPONSE_COMPRESSION_THREAD_MIN_SIZE = int(os.getenv("RESPONSE_COMPRESSION_THREAD_MIN_SIZE", str(64 * 1024)))
+# 미리 압축한 본문 캐시 한도 (바이트)
+RESPONSE_COMPRESSION_CACHE_BYTES = int(os.getenv("RESPONSE_COMPRESSION_CACHE_BYTES", str(32 * 1024 * 1024)))
+
+COMPRESSIBLE_TYPES = ("application/json", "text/", "application/javascript", "application/xml")
+
+
+def supported_encodings() -> Tuple[str, ...]:
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def negotiate(accept_encoding: str, available: Tuple[str, ...] = None) -> Optional[str]:
+    """Accept-Encoding에서 사용할 인코딩을 고릅니다. (q값이 같으면 br 우선, 없으면 None)"""
+    available = available or supported_encodings()
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        name = name.strip().lower()
+        if not name:
+            continue
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        weights[name] = quality
+    best, best_quality = None, 0.0
+    for encoding in available:
+        quality = weights.get(encoding, weights.get("*", 0.0))
+        if quality > best_quality:
+            best, best_quality = encoding, quality
+    return best
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=RESPONSE_BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=RESPONSE_GZIP_LEVEL, mtime=0)
+
+
+class PrecompressedCache:
+    """(ETag, 인코딩) → 압축 본문 (전체 크기 max_bytes 이내 LRU)"""
+
+    def __init__(self, max_bytes: int = RESPONSE_COMPRESSION_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[Tuple[str, str], bytes]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "compressed": 0, "threaded": 0, "skipped": 0, "bytes_in": 0, "bytes_out": 0}
+
+    def get(self, key: Tuple[str, str]) -> Optional[bytes]:
+        body = self._entries.get(key)
+        if body is None:
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return body
+
+    def put(self, key: Tuple[str, str], body: bytes) -> None:
+        if len(body) > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self.size -= len(previous)
+        self._entries[key] = body
+        self.size += len(body)
+        while self.size > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self.size -= len(evicted)
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self.size = 0
+
+
+compression_cache = PrecompressedCache()
+
+
+def _header(headers: List[Tuple[bytes, bytes]], name: bytes) -> Optional[bytes]:
+    for key, value in headers:
+        if key.lower() == name:
+            return value
+    return None
+
+
+class CompressionMiddleware:
+    def __init__(self, app, minimum_size: int = RESPONSE_COMPRESSION_MIN_SIZE,
+                 cache: PrecompressedCache = compression_cache,
+                 thread_min_size: int = RESPONSE_COMPRESSION_THREAD_MIN_SIZE):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.cache = cache
+        self.thread_min_size = thread_min_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = dict(scope.get("headers") or [])
+        encoding = negotiate(request_headers.get(b"accept-encoding", b"").decode("latin-1"))
+
+        start_message = None
+
+        async def send_compressed(message):
+            nonlocal start_message
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] != "http.response.body" or start_message is None:
+                await send(message)
+                return
+            if message.get("more_body", False):
+                # 스트리밍 응답은 압축하지 않고 그대로 전달
+                await send(start_message)
+                start_message = None
+                await send(message)
+                return
+            start, start_message = start_message, None
+            await self._send_body(start, message.get("body", b""), encoding, send)
+
+        await self.app(scope, receive, send_compressed)
+
+    async def _send_body(self, start, body: bytes, encoding: Optional[str], send) -> None:
+        headers = list(start.get("headers") or [])
+        content_type = (_header(headers, b"content-type") or b"").decode("latin-1")
+        compressible = (
+            200 <= start["status"] < 300 and start["status"] != 204
+            and content_type.startswith(COMPRESSIBLE_TYPES)
+            and _header(headers, b"content-encoding") is None
+            and len(body) >= self.minimum_size
+        )
+        if compressible:
+            headers.append((b"vary", b"Accept-Encoding"))
+        if not compressible or encoding is None:
+            self.cache.stats["skipped"] += 1
+            await send({**start, "headers": headers})
+            await send({"type": "http.response.body", "body": body})
+            return
+
+        etag = _header(headers, b"etag")
+        compressed = None
+        key = None
+        if etag is not None:
+            key = (etag.decode("latin-1"), encoding)
+            compressed = self.cache.get(key)
+        if compressed is None:
+            if len(body) >= self.thread_min_size:
+                compressed = await anyio.to_thread.run_sync(compress, body, encoding)
+                self.cache.stats["threaded"] += 1
+            else:
+                compressed = compress(body, encoding)
+            self.cache.stats["compressed"] += 1
+            if key is not None:
+                self.cache.put(key, compressed)
+        self.cache.stats["bytes_in"] += len(body)
+        self.cache.stats["bytes_out"] += len(compressed)
+
+        headers = [(name, value) for name, value in headers if name.lower() not in (b"content-length", b"etag")]
+        if etag is not None:
+            # 압축 본문은 원본과 바이트가 다르므로 약한 ETag로 (If-None-Match 비교는 그대로 동작)
+            headers.append((b"etag", etag if etag.startswith(b"W/") else b"W/" + etag))
+        headers += [(b"content-encoding", encoding.encode()), (b"content-length", str(len(compressed)).encode())]
+        await send({**start, "headers": headers})
+        await send({"type": "http.response.body", "body": compressed})
@@ -0,0 +1,409 @@
+import asyncio
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type
+
+from prisma import Json
+
+# 외교 세션 저장소
+# - 읽기: 프로세스 내 LRU 캐시 → 없으면 DiplomacySession/DiplomacyAction 테이블에서 읽어 캐시에 적재 (read-through)
+# - 쓰기: 캐시만 갱신하고 dirty로 표시, 백그라운드 작업이 주기적으로 묶어서 DB에 반영 (write-behind)
+# - TTL이 지난 항목과 용량 초과 항목은 DB 반영이 끝난 뒤에 캐시에서 제거
+# - 세션은 자기 게임(game_id) 안에서만 AI/플레이어 GameCiv와 연결
+#   (게임 문명과 연결하지 못한 새 세션은 다음 주기에 다시 시도하고, max_resolve_attempts번 실패하면 로그를 남기고 버림)
+# - 플레이어 키 → 세션 키 보조 인덱스를 캐시와 함께 유지하고, DB에는 playerKey 컬럼(인덱스)으로 저장
+# - 관계 점수는 마지막으로 DB와 맞춘 값과의 차이만큼 DB에서 증감(increment)하므로 여러 워커의 변경이 합산됨
+# 워커 간 동기화는 없습니다. 세션 상태(state)는 마지막에 쓴 워커의 값이 남고,
+# 다른 워커의 캐시는 TTL이 지나 DB에서 다시 읽을 때까지 이전 값을 봅니다.
+
+# 세션 행과 함께 읽는 대화 기록 (세션 상태 복원용)
+_SESSION_INCLUDE = {"diplomacyActions": {"order_by": {"id": "asc"}}}
+
+
+class _CacheEntry:
+    __slots__ = (
+        "session", "memory", "last_access", "dirty", "db_id", "pending_actions",
+        "synced_score", "resolve_failures",
+    )
+
+    def __init__(self, session: Any, db_id: Optional[int] = None):
+        self.session = session
+        self.memory = None
+        self.last_access = time.monotonic()
+        self.dirty = False
+        self.db_id = db_id
+        self.pending_actions: List[Dict[str, Any]] = []
+        # DB에 반영된(또는 DB에서 읽은) 관계 점수, 다음 반영 시 차이만큼 증감
+        self.synced_score = session.relationship_score
+        self.resolve_failures = 0
+
+
+class DiplomacySessionStore:
+    """LRU 캐시 + write-behind 방식의 외교 세션 저장소"""
+
+    def __init__(
+        self,
+        db,
+        session_model: Type,
+        player_key: Callable[[Any], str],
+        max_entries: int = 1000,
+        ttl: float = 1800.0,
+        flush_interval: float = 2.0,
+        batch_size: int = 50,
+        max_resolve_attempts: int = 5,
+    ):
+        self.db = db
+        self.session_model = session_model
+        self.player_key = player_key
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.max_resolve_attempts = max_resolve_attempts
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._dirty: "OrderedDict[str, None]" = OrderedDict()
+        self._by_player: Dict[str, Set[str]] = {}
+        self._flush_task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.stats = {"hits": 0, "misses": 0, "unresolved_dropped": 0}
+
+    # ---- 캐시 조회 ----
+
+    def _touch(self, session_id: str, entry: _CacheEntry) -> None:
+        entry.last_access = time.monotonic()
+        self._entries.move_to_end(session_id)
+
+    async def get(self, session_id: str) -> Optional[Any]:
+        """세션을 조회합니다. 캐시에 없으면 DB에서 읽어 캐시에 적재합니다."""
+        entry = self._entries.get(session_id)
+        if entry is not None:
+            self._touch(session_id, entry)
+            self.stats["hits"] += 1
+            return entry.session
+
+        self.stats["misses"] += 1
+        entry = await self._load(session_id)
+        if entry is None:
+            return None
+        # 로드 중 다른 요청이 먼저 적재했다면 기존 항목 사용
+        existing = self._entries.get(session_id)
+        if existing is not None:
+            self._touch(session_id, existing)
+            return existing.session
+        self._insert(session_id, entry)
+        self._evict_overflow()
+        return entry.session
+
+    async def exists(self, session_id: str) -> bool:
+        return await self.get(session_id) is not None
+
+    def memory_for(self, session_id: str, factory: Callable[[Any], Any]) -> Any:
+        """세션과 수명을 같이하는 대화 메모리 객체를 가져오거나 생성합니다."""
+        entry = self._entries.get(session_id)
+        if entry is None:
+            return factory(None)
+        if entry.memory is None:
+            entry.memory = factory(entry.session)
+        return entry.memory
+
+    def cached_items(self):
+        return list(self._entries.items())
+
+    def _unsaved_keys(self, player_key: str) -> List[str]:
+        """캐시에만 있고 아직 DB에 생성되지 않은 플레이어의 세션 키 (정렬됨)"""
+        return sorted(
+            session_id for session_id in self._by_player.get(player_key, ())
+            if self._entries[session_id].db_id is None
+        )
+
+    async def find_for_player(
+        self, player_key: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Tuple[int, Dict[str, Any]]:
+        """플레이어의 세션을 페이지 단위로 조회합니다. (전체 개수, {세션 키: 세션})
+        아직 DB에 없는 세션이 먼저 오고, 이어서 DB 세션이 sessionKey 순으로 옵니다.
+        DB에서는 해당 페이지의 행만 한 번에 읽고, 이미 캐시에 있는 세션은 캐시 값을 사용합니다."""
+        unsaved = self._unsaved_keys(player_key)
+        page_keys = unsaved[offset:] if limit is None else unsaved[offset:offset + limit]
+        where: Dict[str, Any] = {"playerKey": player_key}
+        if unsaved:
+            where["NOT"] = {"sessionKey": {"in": unsaved}}
+
+        take = None if limit is None else limit - len(page_keys)
+        rows = []
+        if take is None or take > 0:
+            rows = await self.db.diplomacysession.find_many(
+                where=where,
+                order={"sessionKey": "asc"},
+                skip=max(offset - len(unsaved), 0),
+                take=take,
+                include=_SESSION_INCLUDE
+            )
+        total = len(unsaved) + await self.db.diplomacysession.count(where=where)
+
+        result = {session_id: self._entries[session_id].session for session_id in page_keys}
+        for row in rows:
+            session_id = row.sessionKey
+            entry = self._entries.get(session_id)
+            if entry is not None:
+                # 캐시 값이 DB보다 최신일 수 있음 (write-behind)
+                self._touch(session_id, entry)
+                self.stats["hits"] += 1
+            else:
+                entry = self._entry_from_row(row)
+                if entry is None:
+                    continue
+                self.stats["misses"] += 1
+                self._insert(session_id, entry)
+            result[session_id] = entry.session
+        self._evict_overflow()
+        return total, result
+
+    # ---- 쓰기 ----
+
+    def put(self, session: Any, action: Optional[Dict[str, Any]] = None) -> None:
+        """세션을 캐시에 저장하고 DB 반영 대상으로 표시합니다. action은 DiplomacyAction으로 기록됩니다."""
+        session_id = session.session_id
+        entry = self._entries.get(session_id)
+        if entry is None:
+            entry = _CacheEntry(session)
+            self._insert(session_id, entry)
+        else:
+            entry.session = session
+        if action:
+            entry.pending_actions.append(action)
+        entry.dirty = True
+        self._dirty[session_id] = None
+        self._touch(session_id, entry)
+        self._evict_overflow()
+
+    # ---- 축출 ----
+
+    def _insert(self, session_id: str, entry: _CacheEntry) -> None:
+        self._entries[session_id] = entry
+        self._by_player.setdefault(self.player_key(entry.session), set()).add(session_id)
+
+    def _drop(self, session_id: str) -> None:
+        entry = self._entries.pop(session_id, None)
+        if entry is None:
+            return
+        key = self.player_key(entry.session)
+        sessions = self._by_player.get(key)
+        if sessions is not None:
+            sessions.discard(session_id)
+            if not sessions:
+                del self._by_player[key]
+
+    def _evict_overflow(self) -> None:
+        # DB에 반영되지 않은 항목은 다음 flush 이후에 제거
+        if len(self._entries) <= self.max_entries:
+            return
+        for session_id in list(self._entries.keys()):
+            if len(self._entries) <= self.max_entries:
+                break
+            if not self._entries[session_id].dirty:
+                self._drop(session_id)
+
+    def evict_expired(self) -> int:
+        now = time.monotonic()
+        expired = [
+            session_id for session_id, entry in self._entries.items()
+            if not entry.dirty and now - entry.last_access > self.ttl
+        ]
+        for session_id in expired:
+            self._drop(session_id)
+        return len(expired)
+
+    # ---- DB 입출력 ----
+
+    async def _load(self, session_id: str) -> Optional[_CacheEntry]:
+        row = await self.db.diplomacysession.find_unique(
+            where={"sessionKey": session_id},
+            include=_SESSION_INCLUDE
+        )
+        return self._entry_from_row(row)
+
+    def _entry_from_row(self, row: Any) -> Optional[_CacheEntry]:
+        if not row or not row.state:
+            return None
+
+        state = dict(row.state)
+        messages = []
+        for action in row.diplomacyActions or []:
+            if action.actionType == "conversation" and isinstance(action.terms, dict):
+                messages.extend(action.terms.get("messages", []))
+        state["messages"] = messages
+        # 여러 워커의 증감이 합산되어 상한을 넘을 수 있으므로 읽을 때 제한
+        state["relationship_score"] = min(row.relationshipScore, 100)
+        return _CacheEntry(self.session_model(**state), db_id=row.sessionId)
+
+    async def _resolve_civs(self, session: Any) -> Optional[Dict[str, Any]]:
+        """세션의 게임 안에서 상대 문명(CivType ID)의 AI GameCiv와 플레이어 GameCiv를 찾습니다.
+        CivType은 여러 게임이 공유하므로 게임 ID 없이는 연결하지 않습니다."""
+        game_id = getattr(session, "game_id", None)
+        if game_id is None:
+            return None
+        ai_civ = await self.db.gameciv.find_first(
+            where={"gameId": int(game_id), "civTypeId": session.civilization_id, "isPlayer": False},
+            include={"civType": True}
+        )
+        if not ai_civ:
+            return None
+        player_civ = await self.db.gameciv.find_first(
+            where={"gameId": int(game_id), "isPlayer": True}
+        )
+        if not player_civ:
+            return None
+        return {
+            "aiCivId": ai_civ.id,
+            "gameCivId": player_civ.id,
+            "personality": ai_civ.civType.personality if ai_civ.civType else "Diplomat",
+        }
+
+    def _state_of(self, session: Any) -> Dict[str, Any]:
+        # 메시지는 DiplomacyAction에 누적 저장하므로 상태에서 제외
+        return session.model_dump(exclude={"messages", "relationship_score"})
+
+    async def flush(self) -> int:
+        """dirty 세션을 batch_size 단위로 DB에 반영합니다. 반영한 세션 수를 반환합니다."""
+        async with self._flush_lock:
+            flushed = 0
+            deferred: List[str] = []
+            while self._dirty:
+                batch_ids = []
+                while self._dirty and len(batch_ids) < self.batch_size:
+                    session_id, _ = self._dirty.popitem(last=False)
+                    batch_ids.append(session_id)
+
+                # 캐시 항목을 먼저 비운 뒤 기록하므로, 기록 중 들어온 변경은 다음 배치로 넘어감
+                work = []
+                for session_id in batch_ids:
+                    entry = self._entries.get(session_id)
+                    if entry is None:
+                        continue
+                    actions, entry.pending_actions = entry.pending_actions, []
+                    entry.dirty = False
+                    score = entry.session.relationship_score
+                    delta, entry.synced_score = score - entry.synced_score, score
+                    work.append((session_id, entry, entry.session, actions, delta))
+
+                created: Set[str] = set()
+                try:
+                    unresolved = await self._write_batch(work, created)
+                except Exception as e:
+                    print(f"외교 세션 DB 반영 실패, 다음 주기에 재시도: {str(e)}")
+                    for session_id, entry, _, actions, delta in work:
+                        # 이미 생성된 행은 현재 점수로 만들어졌으므로 점수 차이는 되돌리지 않음
+                        self._restore(entry, actions, 0 if session_id in created else delta)
+                        self._dirty[session_id] = None
+                    break
+                # 게임 문명과 연결하지 못한 세션은 다음 주기에 다시 시도하고, 계속 실패하면 버림
+                for session_id, entry, _, actions, delta in unresolved:
+                    entry.resolve_failures += 1
+                    if entry.resolve_failures >= self.max_resolve_attempts:
+                        print(f"외교 세션 {session_id}을(를) 게임 문명과 {entry.resolve_failures}번 연결하지 못해 버립니다 (game_id={getattr(entry.session, 'game_id', None)})")
+                        self._drop(session_id)
+                        self.stats["unresolved_dropped"] += 1
+                        continue
+                    self._restore(entry, actions, delta)
+                    deferred.append(session_id)
+                flushed += len(work) - len(unresolved)
+            for session_id in deferred:
+                self._dirty[session_id] = None
+            if deferred:
+                print(f"외교 세션 {len(deferred)}개를 게임 문명과 연결하지 못해 DB 반영을 미룹니다: {deferred[:5]}")
+            return flushed
+
+    @staticmethod
+    def _restore(entry: _CacheEntry, actions: List[Dict[str, Any]], delta: int) -> None:
+        """반영하지 못한 작업을 캐시 항목에 되돌려 다음 주기에 다시 반영하게 합니다."""
+        entry.pending_actions = actions + entry.pending_actions
+        entry.synced_score -= delta
+        entry.dirty = True
+
+    async def _write_batch(self, work, created: Set[str]) -> List[Tuple[str, _CacheEntry, Any, List[Dict[str, Any]], int]]:
+        """work를 DB에 반영하고, 게임 문명과 연결하지 못해 반영하지 않은 항목을 반환합니다.
+        이번에 새로 생성한 세션 키는 created에 담습니다."""
+        unresolved = []
+        # 처음 저장되는 세션은 생성된 ID가 필요하므로 개별 생성
+        for item in work:
+            session_id, entry, session, actions, delta = item
+            if entry.db_id is not None:
+                continue
+            civs = await self._resolve_civs(session)
+            if civs is None:
+                unresolved.append(item)
+                continue
+            row = await self.db.diplomacysession.upsert(
+                where={"sessionKey": session_id},
+                data={
+                    "create": {
+                        "sessionKey": session_id,
+                        "playerKey": self.player_key(session),
+                        "aiCivId": civs["aiCivId"],
+                        "gameCivId": civs["gameCivId"],
+                        "personality": civs["personality"],
+                        "relationshipScore": entry.synced_score,
+                        "state": Json(self._state_of(session)),
+                    },
+                    # 다른 워커가 먼저 만든 행이면 이 워커의 점수 변화만 더함
+                    "update": {
+                        "relationshipScore": {"increment": delta},
+                        "state": Json(self._state_of(session)),
+                    },
+                }
+            )
+            entry.db_id = row.sessionId
+            created.add(session_id)
+
+        # 나머지 갱신과 대화 기록은 하나의 배치로 전송
+        async with self.db.batch_() as batcher:
+            for session_id, entry, session, actions, delta in work:
+                if entry.db_id is None:
+                    continue
+                if session_id not in created:
+                    data: Dict[str, Any] = {"state": Json(self._state_of(session))}
+                    if delta:
+                        data["relationshipScore"] = {"increment": delta}
+                    batcher.diplomacysession.update(where={"sessionId": entry.db_id}, data=data)
+                if actions:
+                    batcher.diplomacyaction.create_many(
+                        data=[
+                            {
+                                "sessionId": entry.db_id,
+                                "turn": action.get("turn", 0),
+                                "actionType": action.get("actionType", "conversation"),
+                                "delta": action.get("delta", 0),
+                                "newScore": action.get("newScore", session.relationship_score),
+                                "terms": Json(action.get("terms", {})),
+                            }
+                            for action in actions
+                        ]
+                    )
+        return unresolved
+
+    # ---- 백그라운드 작업 ----
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+                self.evict_expired()
+                self._evict_overflow()
+            except Exception as e:
+                print(f"외교 세션 저장소 주기 작업 오류: {str(e)}")
+
+    def start(self) -> None:
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """백그라운드 작업을 멈추고 남은 변경 사항을 모두 DB에 반영합니다."""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush()
@@ -0,0 +1,86 @@
+import json
+import os
+from typing import Any, Dict, Optional
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, Response
+
+try:
+    import orjson
+except ImportError:  # 선택 의존성: 없으면 표준 json으로 같은 규칙을 적용
+    orjson = None
+
+# 큰 응답(/map/data, /games/{id}, 연구 상태)용 빠른 JSON 렌더링 (FAST_JSON_RESPONSES=true일 때만)
+# - 기본 경로는 jsonable_encoder로 응답 전체를 한 번 복사한 뒤 json.dumps로 다시 직렬화함
+#   → 빠른 경로는 복사 없이 바로 bytes로 직렬화 (orjson이 있으면 orjson, 없으면 표준 json)
+# - datetime/date/Enum/UUID는 그대로 직렬화 (jsonable_encoder와 같은 ISO 8601 문자열)
+# - Pydantic(Prisma) 모델은 model_dump(), 그 밖의 타입은 jsonable_encoder로 변환
+# - 2^53을 넘는 정수(BigInt ID 등)는 JavaScript에서 정밀도를 잃으므로 문자열로 직렬화
+# 꺼져 있으면 respond()/encodable()은 기존 동작(FastAPI 기본 직렬화)을 그대로 유지합니다.
+
+FAST_JSON_RESPONSES = os.getenv("FAST_JSON_RESPONSES", "false").lower() == "true"
+
+JS_MAX_SAFE_INTEGER = 2 ** 53 - 1
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS | orjson.OPT_STRICT_INTEGER
+
+
+def _default(value: Any) -> Any:
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    return jsonable_encoder(value)
+
+
+def js_safe(value: Any) -> Any:
+    """2^53을 넘는 정수를 문자열로 바꿉니다. 바꿀 것이 없는 컨테이너는 새로 만들지 않습니다."""
+    if isinstance(value, int) and not isinstance(value, bool):
+        return str(value) if abs(value) > JS_MAX_SAFE_INTEGER else value
+    if isinstance(value, dict):
+        converted = {key: js_safe(item) for key, item in value.items()}
+        return value if all(converted[key] is item for key, item in value.items()) else converted
+    if isinstance(value, (list, tuple)):
+        converted = [js_safe(item) for item in value]
+        return value if all(new is old for new, old in zip(converted, value)) else converted
+    if hasattr(value, "model_dump"):
+        return js_safe(value.model_dump())
+    return value
+
+
+def dumps(content: Any, sort_keys: bool = False) -> bytes:
+    """응답 본문 bytes (공백 없는 UTF-8 JSON)"""
+    if orjson is not None:
+        options = _ORJSON_OPTIONS | (orjson.OPT_SORT_KEYS if sort_keys else 0)
+        try:
+            return orjson.dumps(content, default=_default, option=options)
+        except orjson.JSONEncodeError:
+            # 53비트를 넘는 정수가 있을 때만 문자열로 바꾼 사본으로 다시 직렬화
+            return orjson.dumps(js_safe(content), default=_default, option=options)
+    return json.dumps(js_safe(content), default=_default, ensure_ascii=False, separators=(",", ":"),
+                      sort_keys=sort_keys).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def json_bytes_response(body: bytes, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Response:
+    """이미 직렬화한 본문으로 응답 (캐시된 본문 재사용)"""
+    return Response(content=body, status_code=status_code, headers=headers, media_type="application/json")
+
+
+def respond(content: Any, status_code: int = 200, headers: Optional[Dict[str, str]] = None) -> Any:
+    """빠른 경로가 켜져 있으면 FastJSONResponse, 꺼져 있으면 content를 그대로 반환(기본 직렬화)"""
+    if FAST_JSON_RESPONSES:
+        return FastJSONResponse(content=content, status_code=status_code, headers=headers)
+    if status_code != 200 or headers:
+        return JSONResponse(content=jsonable_encoder(content), status_code=status_code, headers=headers)
+    return content
+
+
+def encodable(content: Any) -> Any:
+    """JSON 호환 값으로 변환 (빠른 경로에서는 직렬화할 때 변환하므로 복사하지 않음)"""
+    return content if FAST_JSON_RESPONSES else jsonable_encoder(content)
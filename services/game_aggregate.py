@@ -0,0 +1,303 @@
+import asyncio
+import contextvars
+from typing import Any, Dict, List, Optional, Tuple
+
+from db.client import prisma
+from services.game_catalog import GameCatalog, game_catalog
+
+# 게임 집계(aggregate) 로더
+# - 게임 하나의 문명/도시/유닛/건물/기술/큐 전체를 문명·도시 수와 무관한 고정 횟수의 find_many로 읽음
+#   (1차: 게임 + 문명, 2차: 도시/유닛/건물/기술/연구 큐 동시 조회, 3차: 도시 건설 큐)
+# - 건물/기술 이름과 비용은 게임 카탈로그(game_catalog)에서 채워서 관계 include 없이 조회
+# - 결과는 __slots__ 객체(CivState / CityState / UnitState / ResearchState)로 보관
+# - 요청 범위 메모: begin_scope()로 시작한 요청 안에서는 같은 게임을 다시 읽지 않음
+#   (상태를 바꾼 코드는 invalidate(game_id)를 호출해야 같은 요청의 다음 조회가 새 값을 읽음)
+# end_turn(AI 문명 데이터) / get_game_state / get_map_data / 게임 요약이 모두 이 로더를 사용합니다.
+
+_scope: contextvars.ContextVar[Optional[Dict[int, "GameAggregate"]]] = contextvars.ContextVar(
+    "game_aggregate_scope", default=None
+)
+
+
+def begin_scope() -> contextvars.Token:
+    """요청 범위 메모를 시작합니다. (미들웨어에서 요청마다 호출)"""
+    return _scope.set({})
+
+
+def end_scope(token: contextvars.Token) -> None:
+    _scope.reset(token)
+
+
+class BuildProgress:
+    """진행 중인 건설/연구 (대상 ID, 진행도)"""
+    __slots__ = ("item_id", "progress")
+
+    def __init__(self, item_id: int, progress: Optional[int]):
+        self.item_id = item_id
+        self.progress = progress
+
+
+class CityState:
+    __slots__ = ("id", "civ_id", "name", "q", "r", "population", "food", "production", "created_turn",
+                 "buildings", "in_progress", "queue")
+
+    def __init__(self, row: Any):
+        self.id = row.id
+        self.civ_id = row.gameCivId
+        self.name = row.name
+        self.q = row.q
+        self.r = row.r
+        self.population = row.population
+        self.food = row.food
+        self.production = row.production
+        self.created_turn = row.createdTurn
+        # 완성된 건물 ID (완성 순), 건설 중인 건물, 건설 큐 건물 ID (queuePosition 순)
+        self.buildings: List[int] = []
+        self.in_progress: Optional[BuildProgress] = None
+        self.queue: List[int] = []
+
+
+class UnitState:
+    __slots__ = ("id", "civ_id", "unit_type_id", "q", "r", "hp", "moved", "promotion_level", "created_turn")
+
+    def __init__(self, row: Any):
+        self.id = row.id
+        self.civ_id = row.gameCivId
+        self.unit_type_id = row.unitTypeId
+        self.q = row.q
+        self.r = row.r
+        self.hp = row.hp
+        self.moved = row.moved
+        self.promotion_level = row.promotionLevel
+        self.created_turn = row.createdTurn
+
+
+class ResearchState:
+    __slots__ = ("completed", "in_progress", "queue")
+
+    def __init__(self):
+        self.completed: List[int] = []
+        self.in_progress: Optional[BuildProgress] = None
+        self.queue: List[int] = []
+
+
+class CivState:
+    __slots__ = ("id", "game_id", "name", "leader", "personality", "is_player", "gold", "science", "culture",
+                 "food", "production", "start_q", "start_r", "cities", "units", "research")
+
+    def __init__(self, row: Any):
+        civ_type = getattr(row, "civType", None)
+        self.id = row.id
+        self.game_id = row.gameId
+        self.name = civ_type.name if civ_type else f"문명 {row.id}"
+        self.leader = civ_type.leaderName if civ_type else "알 수 없는 지도자"
+        self.personality = str(civ_type.personality) if civ_type else None
+        self.is_player = row.isPlayer
+        self.gold = row.gold
+        self.science = row.science
+        self.culture = row.culture
+        self.food = row.food
+        self.production = row.production
+        self.start_q = row.startQ
+        self.start_r = row.startR
+        self.cities: List[CityState] = []
+        self.units: List[UnitState] = []
+        self.research = ResearchState()
+
+
+class GameAggregate:
+    __slots__ = ("game", "civs", "civ_by_id", "city_by_id", "catalog")
+
+    def __init__(self, game: Any, civs: List[CivState], catalog: GameCatalog):
+        self.game = game
+        self.civs = civs
+        self.civ_by_id: Dict[int, CivState] = {civ.id: civ for civ in civs}
+        self.city_by_id: Dict[int, CityState] = {city.id: city for civ in civs for city in civ.cities}
+        self.catalog = catalog
+
+    @property
+    def player_civ(self) -> Optional[CivState]:
+        player_civ_id = getattr(self.game, "playerCivId", None)
+        if player_civ_id is not None and int(player_civ_id) in self.civ_by_id:
+            return self.civ_by_id[int(player_civ_id)]
+        return next((civ for civ in self.civs if civ.is_player), None)
+
+    def ai_civs(self) -> List[CivState]:
+        return [civ for civ in self.civs if not civ.is_player]
+
+    def civ(self, civ_id: Any) -> Optional[CivState]:
+        return self.civ_by_id.get(int(civ_id))
+
+    def player_resources(self) -> Dict[str, int]:
+        """플레이어 재화 (식량/생산력은 도시 합계, 도시가 없으면 문명 값)"""
+        civ = self.player_civ
+        if civ is None:
+            return {"gold": 0, "science": 0, "culture": 0, "food": 0, "production": 0}
+        return {
+            "gold": civ.gold,
+            "science": civ.science,
+            "culture": civ.culture,
+            "food": sum(city.food for city in civ.cities) if civ.cities else civ.food,
+            "production": sum(city.production for city in civ.cities) if civ.cities else civ.production,
+        }
+
+    def civ_data(self, civ_id: Any) -> Dict[str, Any]:
+        """AI 의사결정/프롬프트용 문명 상세 데이터 (AI 엔진/계획기 입력 형식)"""
+        civ = self.civ(civ_id)
+        if civ is None:
+            return {}
+        buildings = self.catalog.building_by_id
+        technologies = self.catalog.technology_by_id
+
+        def building_attr(building_id: int, name: str) -> Any:
+            building = buildings.get(building_id)
+            return getattr(building, name, None) if building else None
+
+        def tech_entry(tech_id: int) -> Dict[str, Any]:
+            tech = technologies.get(tech_id)
+            return {"id": tech_id, "name": tech.name if tech else None, "required": tech.researchCost if tech else None}
+
+        city_data = []
+        for city in civ.cities:
+            in_progress = city.in_progress
+            city_data.append({
+                "id": city.id,
+                "name": city.name,
+                "population": city.population,
+                "buildings": [
+                    {"id": building_id, "name": building_attr(building_id, "name"),
+                     "type": building_attr(building_id, "category")}
+                    for building_id in city.buildings
+                ],
+                "in_progress": {
+                    "building": building_attr(in_progress.item_id, "name"),
+                    "progress": in_progress.progress,
+                    "required": building_attr(in_progress.item_id, "buildTime"),
+                } if in_progress else None,
+                "queue": [{"id": building_id} for building_id in city.queue],
+            })
+
+        research = civ.research
+        in_progress_tech = None
+        if research.in_progress:
+            tech = tech_entry(research.in_progress.item_id)
+            in_progress_tech = {"id": tech["id"], "name": tech["name"], "progress": research.in_progress.progress,
+                                "required": tech["required"]}
+        return {
+            "id": civ.id,
+            "name": civ.name,
+            "leader": civ.leader,
+            "personality": civ.personality,
+            "cities": city_data,
+            "research": {
+                "completed": [tech_entry(tech_id) for tech_id in research.completed],
+                "in_progress": in_progress_tech,
+                "queue": [{"id": tech_id} for tech_id in research.queue],
+            },
+            "resources": {
+                "gold": civ.gold,
+                "science": civ.science,
+                "culture": civ.culture,
+            },
+        }
+
+
+class GameAggregateLoader:
+    def __init__(self, db, catalog: GameCatalog):
+        self.db = db
+        self.catalog = catalog
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def load(self, game_id: Any, game: Any = None) -> Optional[GameAggregate]:
+        """게임 전체 상태를 읽습니다. 이미 조회한 게임 행이 있으면 game으로 넘겨 조회를 줄입니다."""
+        key = int(game_id)
+        memo = _scope.get()
+        if memo is not None and key in memo:
+            self.stats["hits"] += 1
+            return memo[key]
+        self.stats["misses"] += 1
+        aggregate = await self._fetch(key, game)
+        if memo is not None and aggregate is not None:
+            memo[key] = aggregate
+        return aggregate
+
+    async def for_civ(self, civ_id: Any) -> Optional[GameAggregate]:
+        """문명이 속한 게임의 집계 (같은 요청에서 이미 읽은 게임이면 조회 없음)"""
+        memo = _scope.get()
+        if memo:
+            for aggregate in memo.values():
+                if int(civ_id) in aggregate.civ_by_id:
+                    self.stats["hits"] += 1
+                    return aggregate
+        civ = await self.db.gameciv.find_unique(where={"id": civ_id})
+        if not civ:
+            return None
+        return await self.load(civ.gameId)
+
+    def invalidate(self, game_id: Any) -> None:
+        memo = _scope.get()
+        if memo is not None:
+            memo.pop(int(game_id), None)
+
+    async def _fetch(self, game_id: int, game: Any) -> Optional[GameAggregate]:
+        catalog = await self.catalog.ensure_loaded()
+        civs_query = self.db.gameciv.find_many(where={"gameId": game_id}, include={"civType": True},
+                                               order={"id": "asc"})
+        if game is None:
+            game, civ_rows = await asyncio.gather(self.db.game.find_unique(where={"id": game_id}), civs_query)
+        else:
+            civ_rows = await civs_query
+        if not game:
+            return None
+
+        civs = [CivState(row) for row in civ_rows]
+        civ_by_id = {civ.id: civ for civ in civs}
+        if civs:
+            await self._fetch_children(civ_by_id)
+        return GameAggregate(game, civs, catalog)
+
+    async def _fetch_children(self, civ_by_id: Dict[int, CivState]) -> None:
+        by_civ = {"gameCivId": {"in": list(civ_by_id)}}
+        active = {"in": ["completed", "in_progress"]}
+        cities, units, buildings, techs, research_queue = await asyncio.gather(
+            self.db.city.find_many(where=by_civ, order={"id": "asc"}),
+            self.db.gameunit.find_many(where=by_civ, order={"id": "asc"}),
+            self.db.playerbuilding.find_many(where={**by_civ, "status": active}, order={"id": "asc"}),
+            self.db.gamecivtechnology.find_many(where={**by_civ, "status": active}, order={"id": "asc"}),
+            self.db.researchqueue.find_many(where=by_civ, order={"queuePosition": "asc"}),
+        )
+
+        city_by_id: Dict[int, CityState] = {}
+        for row in cities:
+            city = CityState(row)
+            city_by_id[city.id] = city
+            civ_by_id[city.civ_id].cities.append(city)
+        for row in units:
+            civ_by_id[row.gameCivId].units.append(UnitState(row))
+        for row in buildings:
+            city = city_by_id.get(row.cityId)
+            if city is None:
+                continue
+            if row.status == "completed":
+                city.buildings.append(row.buildingId)
+            elif city.in_progress is None:
+                city.in_progress = BuildProgress(row.buildingId, getattr(row, "progressPoints", None))
+        for row in techs:
+            research = civ_by_id[row.gameCivId].research
+            if row.status == "completed":
+                research.completed.append(row.techId)
+            elif research.in_progress is None:
+                research.in_progress = BuildProgress(row.techId, row.progressPoints)
+        for row in research_queue:
+            civ_by_id[row.gameCivId].research.queue.append(row.techId)
+
+        if city_by_id:
+            build_queue = await self.db.buildqueue.find_many(
+                where={"cityId": {"in": list(city_by_id)}},
+                order={"queuePosition": "asc"},
+            )
+            for row in build_queue:
+                city_by_id[row.cityId].queue.append(row.buildingId)
+
+
+game_aggregates = GameAggregateLoader(prisma, game_catalog)
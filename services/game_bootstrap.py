@@ -0,0 +1,250 @@
+import math
+import os
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+from db.client import prisma
+from services.civ_profiles import civ_profiles
+from services.snapshot_store import TurnSnapshotStore, snapshot_store
+
+# 새 게임 초기 월드 생성
+# - 지형/도시/유닛/기술 상태를 메모리에서 먼저 만든 뒤 하나의 트랜잭션 안에서 create_many로 기록
+# - 중간에 실패하면 트랜잭션 전체가 롤백되어 반쯤 만들어진 게임이 남지 않음
+# - 문명 타입(CivType)은 게임마다 새로 만듦 (외교 세션이 CivType ID로 구분되므로 게임 간에 공유하지 않음)
+# - 시작 유닛 타입과 1시대 기술 목록은 정적 카탈로그라서 처음 한 번만 조회
+
+MAP_RADIUS = 10
+TURN_LIMIT = 50
+START_YEAR = 1000
+START_ERA = "Medieval"
+BOOTSTRAP_TX_TIMEOUT_MS = int(os.getenv("BOOTSTRAP_TX_TIMEOUT_MS", "15000"))
+
+# 첫 번째가 플레이어 문명
+CIV_TYPES = [
+    {"name": "한국", "leaderName": "세종대왕", "personality": "Diplomat"},
+    {"name": "일본", "leaderName": "오다 노부나가", "personality": "Warlike"},
+    {"name": "중국", "leaderName": "무측천", "personality": "Diplomat"},
+    {"name": "몽골", "leaderName": "칭기스 칸", "personality": "Warlike"},
+    {"name": "러시아", "leaderName": "예카테리나", "personality": "Trader"},
+    {"name": "로마", "leaderName": "아우구스투스", "personality": "Warlike"},
+    {"name": "이집트", "leaderName": "클레오파트라", "personality": "Trader"},
+]
+PLAYER_CITY_NAME = "서울"
+AI_CITY_NAMES = ["도쿄", "베이징", "울란바토르", "모스크바", "로마", "알렉산드리아"]
+TERRAIN_TYPES = ["Plains", "Grassland", "Hills", "Forest", "Desert", "Mountain"]
+RESOURCE_TYPES = ["Food", "Production", "Gold", "Science"]
+INITIAL_RESOURCES = {"gold": 30, "science": 5, "culture": 0}
+INITIAL_CITY = {"population": 1, "createdTurn": 1, "food": 20, "production": 10}
+PLAYER_TREE_TYPE = "군사"
+CITY_SIGHT_RANGE = 2
+
+
+def generate_tiles(radius: int, rng: random.Random) -> List[Dict[str, Any]]:
+    """지형과 자원(20% 확률)을 무작위로 배치한 타일 목록"""
+    tiles = []
+    for q in range(-radius, radius + 1):
+        for r in range(-radius, radius + 1):
+            s = -q - r
+            if abs(q) + abs(r) + abs(s) <= 2 * radius:
+                terrain = rng.choice(TERRAIN_TYPES)
+                resource = rng.choice(RESOURCE_TYPES) if rng.random() < 0.2 else "NoResource"
+                tiles.append({"q": q, "r": r, "terrain": terrain, "resource": resource})
+    return tiles
+
+
+def hex_tile_count(radius: int) -> int:
+    return 3 * radius * (radius + 1) + 1
+
+
+def ai_start_positions(count: int, distance: int = 15) -> List[Tuple[int, int]]:
+    """AI 문명 시작 위치 (플레이어와 14헥스 이상 떨어지도록 원형 배치)"""
+    positions = []
+    for i in range(1, count + 1):
+        angle = (2 * math.pi * i) / 6
+        positions.append((int(distance * math.cos(angle)), int(distance * math.sin(angle))))
+    return positions
+
+
+def sight_area(center: Tuple[int, int], sight: int) -> Set[Tuple[int, int]]:
+    q0, r0 = center
+    visible = {center}
+    for dq in range(-sight, sight + 1):
+        for dr in range(max(-sight, -dq - sight), min(sight, -dq + sight) + 1):
+            visible.add((q0 + dq, r0 + dr))
+    return visible
+
+
+def initial_snapshot_state(
+    tiles: List[Dict[str, Any]],
+    player_civ_id: Any,
+    player_civ_type: Dict[str, Any],
+) -> Dict[str, Any]:
+    """1턴 TurnSnapshot 상태 (플레이어 도시 주변 시야만 공개)"""
+    visible = sight_area((0, 0), CITY_SIGHT_RANGE)
+    observed = [tile for tile in tiles if (tile["q"], tile["r"]) in visible]
+    player_resources = {**INITIAL_RESOURCES, "food": 20, "production": 10}
+    return {
+        "observedMap": {"tiles": observed},
+        "researchState": {"current": None, "queue": []},
+        "productionState": {"current": None, "queue": []},
+        "diplomacyState": {"relations": {}},
+        "resourceState": {"gold": 30, "science": 20, "food": 30, "production": 20, "culture": 0},
+        "stateData": {
+            "turn": 1,
+            "year": START_YEAR,
+            "era": START_ERA,
+            "player_civ": {
+                "id": player_civ_id,
+                "name": player_civ_type["name"],
+                "leader": player_civ_type["leaderName"],
+            },
+            "cities": [],
+            "units": [],
+            "resources": dict(player_resources),
+        },
+        "playerResources": player_resources,
+    }
+
+
+class BootstrapResult:
+    __slots__ = ("game", "player_civ", "ai_civs", "civ_types", "tile_count")
+
+    def __init__(self, game: Any, player_civ: Any, ai_civs: List[Any], civ_types: List[Any], tile_count: int):
+        self.game = game
+        self.player_civ = player_civ
+        self.ai_civs = ai_civs
+        self.civ_types = civ_types
+        self.tile_count = tile_count
+
+
+class GameBootstrapper:
+    def __init__(
+        self,
+        db,
+        store: TurnSnapshotStore,
+        map_radius: int = MAP_RADIUS,
+        turn_limit: int = TURN_LIMIT,
+    ):
+        self.db = db
+        self.store = store
+        self.map_radius = map_radius
+        self.turn_limit = turn_limit
+        self._catalog: Optional[Dict[str, Any]] = None
+
+    async def _load_catalog(self) -> Dict[str, Any]:
+        if self._catalog is None:
+            warrior = await self.db.unittype.find_first(where={"category": "Melee", "era": START_ERA})
+            scout = await self.db.unittype.find_first(where={"category": "Civilian", "era": START_ERA})
+            techs = await self.db.technology.find_many(where={"era": START_ERA})
+            self._catalog = {"warrior": warrior, "scout": scout, "tech_ids": [tech.id for tech in techs]}
+        return self._catalog
+
+    async def _civ_types(self, tx) -> List[Any]:
+        """CIV_TYPES 순서대로 이 게임의 CivType 행을 만듭니다.
+        외교 세션 ID(dipl_{플레이어}_{civTypeId})가 CivType 기준이므로 게임끼리 행을 공유하지 않습니다."""
+        return [await tx.civtype.create(data=civ) for civ in CIV_TYPES]
+
+    async def create(
+        self,
+        user_name_hash: str,
+        rng: Optional[random.Random] = None,
+        map_radius: Optional[int] = None,
+        pooled: bool = False,
+    ) -> BootstrapResult:
+        """새 게임의 초기 월드를 한 트랜잭션으로 생성합니다. 실패하면 아무것도 남기지 않습니다.
+
+        pooled=True면 사용자 없이 게임 풀용 미배정 게임으로 만듭니다.
+        """
+        rng = rng or random.Random()
+        map_radius = map_radius or self.map_radius
+        catalog = await self._load_catalog()
+
+        # 메모리에서 먼저 월드 구성
+        tiles = generate_tiles(map_radius, rng)
+        positions = [(0, 0)] + ai_start_positions(len(CIV_TYPES) - 1)
+        scouts = [True] + [rng.random() < 0.5 for _ in CIV_TYPES[1:]]
+        city_names = [PLAYER_CITY_NAME] + AI_CITY_NAMES
+
+        async with self.db.tx(timeout=timedelta(milliseconds=BOOTSTRAP_TX_TIMEOUT_MS)) as tx:
+            game = await tx.game.create(
+                data={
+                    "userName": user_name_hash,
+                    "mapRadius": map_radius,
+                    "turnLimit": self.turn_limit,
+                    "createdAt": datetime.now(),
+                    "year": START_YEAR,
+                    "currentTurn": 1,
+                    "pooled": pooled,
+                }
+            )
+            civ_types = await self._civ_types(tx)
+
+            await tx.gameciv.create_many(
+                data=[
+                    {
+                        "gameId": game.id,
+                        "civTypeId": civ_type.id,
+                        "isPlayer": index == 0,
+                        "startQ": positions[index][0],
+                        "startR": positions[index][1],
+                        **INITIAL_RESOURCES,
+                    }
+                    for index, civ_type in enumerate(civ_types)
+                ]
+            )
+            # create_many는 ID를 돌려주지 않으므로 게임 기준으로 다시 조회 (게임 안에서 civTypeId는 고유)
+            civ_rows = await tx.gameciv.find_many(where={"gameId": game.id})
+            civ_by_type = {row.civTypeId: row for row in civ_rows}
+            civs = [civ_by_type[civ_type.id] for civ_type in civ_types]
+
+            await tx.maptile.create_many(data=[{"gameId": game.id, **tile} for tile in tiles])
+
+            await tx.city.create_many(
+                data=[
+                    {"gameCivId": civ.id, "name": city_names[index], "q": civ.startQ, "r": civ.startR, **INITIAL_CITY}
+                    for index, civ in enumerate(civs)
+                ]
+            )
+
+            units = []
+            for index, civ in enumerate(civs):
+                for unit_type, enabled in ((catalog["warrior"], True), (catalog["scout"], scouts[index])):
+                    if unit_type is not None and enabled:
+                        units.append({
+                            "gameCivId": civ.id,
+                            "unitTypeId": unit_type.id,
+                            "q": civ.startQ,
+                            "r": civ.startR,
+                            "hp": 100,
+                            "createdTurn": 1,
+                            "moved": False,
+                        })
+            if units:
+                await tx.gameunit.create_many(data=units)
+
+            await tx.treeselection.create(
+                data={"gameCivId": civs[0].id, "treeType": PLAYER_TREE_TYPE, "isMain": True}
+            )
+
+            if catalog["tech_ids"]:
+                await tx.gamecivtechnology.create_many(
+                    data=[
+                        {"gameCivId": civ.id, "techId": tech_id, "status": "available", "progressPoints": 0}
+                        for civ in civs
+                        for tech_id in catalog["tech_ids"]
+                    ]
+                )
+
+            state = initial_snapshot_state(tiles, civs[0].id, CIV_TYPES[0])
+            await tx.turnsnapshot.create(
+                data=self.store.keyframe_row(game.id, 1, civs[0].id, state, year=game.year)
+            )
+
+        # 커밋된 뒤에만 프로필 캐시 갱신 (외교 처리 시 DB 조회 없이 사용)
+        for civ_type in civ_types:
+            civ_profiles.update(civ_type)
+        return BootstrapResult(game, civs[0], civs[1:], civ_types, len(tiles))
+
+
+game_bootstrapper = GameBootstrapper(prisma, snapshot_store)
@@ -0,0 +1,70 @@
+import asyncio
+from typing import Any, Dict, List, Optional, Set
+
+from db.client import prisma
+
+# 정적 게임 카탈로그 캐시 (건물 / 유닛 타입 / 기술 / 기술 선행 관계)
+# - 서버 시작 시(또는 처음 필요할 때) 테이블별 find_many 한 번씩으로 전체를 읽어 보관
+# - 카탈로그는 시드 데이터라서 게임 중에는 바뀌지 않음 → 수정하는 코드는 invalidate() 호출
+# AI 의사결정처럼 턴마다 반복되는 경로에서는 카탈로그 조회를 위해 DB를 읽지 않습니다.
+
+
+class GameCatalog:
+    def __init__(self, db):
+        self.db = db
+        self.buildings: List[Any] = []
+        self.unit_types: List[Any] = []
+        self.technologies: List[Any] = []
+        self.building_by_id: Dict[int, Any] = {}
+        self.unit_type_by_id: Dict[int, Any] = {}
+        self.technology_by_id: Dict[int, Any] = {}
+        # 기술 ID → 선행 기술 ID 집합
+        self.prerequisites: Dict[int, Set[int]] = {}
+        self.version = 0
+        self.loaded = False
+        self._lock = asyncio.Lock()
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def preload(self) -> int:
+        """카탈로그 전체를 다시 읽습니다. 적재한 행 수를 반환합니다."""
+        buildings = await self.db.building.find_many(order={"id": "asc"})
+        unit_types = await self.db.unittype.find_many(order={"id": "asc"})
+        technologies = await self.db.technology.find_many(order={"id": "asc"})
+        prerequisites = await self.db.prerequisite.find_many()
+        self.load(buildings, unit_types, technologies, prerequisites)
+        return len(buildings) + len(unit_types) + len(technologies)
+
+    def load(self, buildings: List[Any], unit_types: List[Any], technologies: List[Any], prerequisites: List[Any]) -> None:
+        self.buildings = list(buildings)
+        self.unit_types = list(unit_types)
+        self.technologies = list(technologies)
+        self.building_by_id = {row.id: row for row in self.buildings}
+        self.unit_type_by_id = {row.id: row for row in self.unit_types}
+        self.technology_by_id = {row.id: row for row in self.technologies}
+        graph: Dict[int, Set[int]] = {}
+        for row in prerequisites:
+            graph.setdefault(row.techId, set()).add(row.prereqId)
+        self.prerequisites = graph
+        self.version += 1
+        self.loaded = True
+
+    async def ensure_loaded(self) -> "GameCatalog":
+        """적재되어 있으면 DB를 읽지 않고 바로 반환합니다."""
+        if self.loaded:
+            self.stats["hits"] += 1
+            return self
+        self.stats["misses"] += 1
+        async with self._lock:
+            # 대기하는 동안 다른 요청이 적재했을 수 있음
+            if not self.loaded:
+                await self.preload()
+        return self
+
+    def invalidate(self) -> None:
+        self.loaded = False
+
+    def technology(self, tech_id: int) -> Optional[Any]:
+        return self.technology_by_id.get(tech_id)
+
+
+game_catalog = GameCatalog(prisma)
@@ -0,0 +1,158 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from db.client import prisma
+from services.game_bootstrap import (
+    MAP_RADIUS, BootstrapResult, GameBootstrapper, game_bootstrapper, hex_tile_count,
+)
+
+# 미리 생성해 둔 게임 풀 (새 게임 생성 즉시 응답)
+# - 백그라운드 작업이 맵 반경별로 목표 개수만큼 미배정 게임(pooled=true)을 만들어 둠
+# - claim()은 풀의 게임 하나를 update_many 한 번(pooled=true 조건부)으로 사용자에게 배정
+#   → 동시에 같은 게임을 잡으면 한쪽만 성공하고 다른 쪽은 다음 게임으로 재시도
+# - 배정 후에는 보충을 깨우기만 하고 바로 응답 (보충은 요청 경로 밖에서 실행)
+# - 반경별 목표 개수와 전체 상한(GAME_POOL_MAX_TOTAL)으로 제한되어 유휴 서버에서도 DB가 계속 늘어나지 않음
+# GAME_POOL_SIZES 형식: "반경:개수,반경:개수" (예: "10:4,6:2"), 비우면 풀을 사용하지 않음
+
+GAME_POOL_SIZES = os.getenv("GAME_POOL_SIZES", f"{MAP_RADIUS}:2")
+GAME_POOL_MAX_TOTAL = int(os.getenv("GAME_POOL_MAX_TOTAL", "20"))
+GAME_POOL_REFILL_INTERVAL = float(os.getenv("GAME_POOL_REFILL_INTERVAL", "60"))
+GAME_POOL_CLAIM_RETRIES = int(os.getenv("GAME_POOL_CLAIM_RETRIES", "3"))
+
+
+def parse_pool_sizes(value: str) -> Dict[int, int]:
+    """"10:4,6:2" → {10: 4, 6: 2} (잘못된 항목은 무시)"""
+    sizes: Dict[int, int] = {}
+    for item in value.split(","):
+        radius, _, count = item.strip().partition(":")
+        try:
+            if int(radius) > 0 and int(count) > 0:
+                sizes[int(radius)] = int(count)
+        except ValueError:
+            print(f"GAME_POOL_SIZES 항목을 무시합니다: {item!r}")
+    return sizes
+
+
+class GamePool:
+    def __init__(
+        self,
+        db,
+        bootstrapper: GameBootstrapper,
+        sizes: Optional[Dict[int, int]] = None,
+        max_total: int = GAME_POOL_MAX_TOTAL,
+        refill_interval: float = GAME_POOL_REFILL_INTERVAL,
+        claim_retries: int = GAME_POOL_CLAIM_RETRIES,
+    ):
+        self.db = db
+        self.bootstrapper = bootstrapper
+        self.sizes = parse_pool_sizes(GAME_POOL_SIZES) if sizes is None else dict(sizes)
+        self.max_total = max(0, max_total)
+        self.refill_interval = refill_interval
+        self.claim_retries = max(1, claim_retries)
+        self._wakeup = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"hits": 0, "misses": 0, "conflicts": 0, "created": 0, "errors": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self.sizes) and self.max_total > 0
+
+    # ---- 배정 ----
+
+    async def claim(self, user_name_hash: str, map_radius: int = MAP_RADIUS) -> Optional[BootstrapResult]:
+        """풀의 게임 하나를 사용자에게 배정합니다. 풀이 비었으면 None (호출자가 직접 생성)."""
+        if not self.enabled or map_radius not in self.sizes:
+            return None
+        try:
+            for _ in range(self.claim_retries):
+                candidate = await self.db.game.find_first(
+                    where={"pooled": True, "mapRadius": map_radius},
+                    order={"id": "asc"}
+                )
+                if candidate is None:
+                    break
+                now = datetime.now()
+                claimed = await self.db.game.update_many(
+                    where={"id": candidate.id, "pooled": True},
+                    data={"pooled": False, "userName": user_name_hash, "claimedAt": now, "createdAt": now}
+                )
+                if claimed:
+                    self.stats["hits"] += 1
+                    return await self._result(candidate.id)
+                # 다른 요청이 먼저 가져감
+                self.stats["conflicts"] += 1
+            self.stats["misses"] += 1
+            return None
+        finally:
+            self.refill()
+
+    async def _result(self, game_id: int) -> BootstrapResult:
+        game = await self.db.game.find_unique(where={"id": game_id})
+        civs = await self.db.gameciv.find_many(
+            where={"gameId": game_id},
+            include={"civType": True},
+            order={"id": "asc"}
+        )
+        player = next(civ for civ in civs if civ.isPlayer)
+        ai_civs = [civ for civ in civs if not civ.isPlayer]
+        civ_types = [civ.civType for civ in [player] + ai_civs]
+        return BootstrapResult(game, player, ai_civs, civ_types, hex_tile_count(game.mapRadius))
+
+    # ---- 보충 ----
+
+    def refill(self) -> None:
+        """보충 작업을 깨웁니다. (기다리지 않음)"""
+        self._wakeup.set()
+
+    async def fill_once(self) -> int:
+        """반경별 부족분을 채웁니다. 전체 상한을 넘지 않으며 만든 게임 수를 반환합니다."""
+        if not self.enabled:
+            return 0
+        counts = {
+            radius: await self.db.game.count(where={"pooled": True, "mapRadius": radius})
+            for radius in self.sizes
+        }
+        total = sum(counts.values())
+        created = 0
+        for radius, target in self.sizes.items():
+            missing = max(0, target - counts[radius])
+            for _ in range(missing):
+                if total >= self.max_total:
+                    return created
+                # 한 번에 하나씩 생성해 요청 처리와 DB를 오래 점유하지 않음
+                await self.bootstrapper.create("", map_radius=radius, pooled=True)
+                total += 1
+                created += 1
+                self.stats["created"] += 1
+        return created
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.fill_once()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"게임 풀 보충 오류: {str(e)}")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.refill_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+
+    def start(self) -> None:
+        if self._task is None and self.enabled:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+game_pool = GamePool(prisma, game_bootstrapper)
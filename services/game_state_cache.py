@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from services import fast_json
+
+# GET /game/{game_id} 읽기 모델 캐시
+# - 게임별 응답 본문을 (game_id, turn, version) 키로 프로세스 내에 보관
+# - 턴 커밋(end_turn, 스냅샷 저장/수정)이 invalidate()로 게임 버전을 올리면 이전 키는 더 이상 조회되지 않음
+# - 조회 도중 버전이 바뀌면 이전 버전 키로 저장되므로 오래된 응답이 새 버전으로 보이지 않음
+# - 버전은 무효화마다 하나씩 올라가는 프로세스 전체 카운터 값이고, 최근 무효화한 게임 max_entries개만 기록
+#   (기록에서 밀려난 게임은 밀려난 버전 중 가장 큰 값을 버전으로 보므로 이전 버전 키가 다시 유효해지지 않음)
+# - ETag는 응답 본문 해시라서 워커가 달라도(재시작 후에도) 같은 상태면 같은 값
+#   (본문에 조회 시각 같은 요청마다 바뀌는 값을 넣지 않음: meta.created_at은 스냅샷 생성 시각)
+# - FAST_JSON_RESPONSES=true면 저장할 때 본문을 한 번 직렬화해 두고 캐시 적중 시 그 bytes를 그대로 응답
+# 워커 간 무효화는 전달되지 않으므로 GAME_STATE_CACHE_TTL 범위로 지연이 제한됩니다.
+
+GAME_STATE_CACHE_SIZE = int(os.getenv("GAME_STATE_CACHE_SIZE", "1000"))
+GAME_STATE_CACHE_TTL = float(os.getenv("GAME_STATE_CACHE_TTL", "30"))
+
+CacheKey = Tuple[str, Optional[int], int]
+
+
+class CachedGameState:
+    __slots__ = ("payload", "etag", "expires_at", "body")
+
+    def __init__(self, payload: Dict[str, Any], etag: str, expires_at: float, body: Optional[bytes] = None):
+        self.payload = payload
+        self.etag = etag
+        self.expires_at = expires_at
+        # 미리 직렬화한 응답 본문 (빠른 JSON 경로에서만)
+        self.body = body
+
+
+def body_etag(game_id: Any, turn: Optional[int], body: bytes) -> str:
+    digest = hashlib.sha1(body).hexdigest()[:20]
+    return f'W/"{game_id}-{turn if turn is not None else "current"}-{digest}"'
+
+
+def make_etag(game_id: Any, turn: Optional[int], payload: Dict[str, Any]) -> str:
+    body = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return body_etag(game_id, turn, body.encode("utf-8"))
+
+
+def _opaque_tag(etag: str) -> str:
+    return etag[2:] if etag.startswith("W/") else etag
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """If-None-Match 헤더(쉼표 구분 목록, *)가 etag와 일치하는지 확인합니다."""
+    if not if_none_match:
+        return False
+    # If-None-Match는 약한 비교 (W/ 유무는 무시, 압축 응답은 약한 ETag로 나감)
+    candidates = {_opaque_tag(value.strip()) for value in if_none_match.split(",")}
+    return "*" in candidates or _opaque_tag(etag) in candidates
+
+
+class GameStateCache:
+    def __init__(self, max_entries: int = GAME_STATE_CACHE_SIZE, ttl: float = GAME_STATE_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._versions: "OrderedDict[str, int]" = OrderedDict()
+        self._clock = 0
+        # 기록에서 밀려난 게임들의 버전 (기록에 없는 게임의 버전)
+        self._floor = 0
+        self._entries: "OrderedDict[CacheKey, CachedGameState]" = OrderedDict()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+    def version(self, game_id: Any) -> int:
+        return self._versions.get(str(game_id), self._floor)
+
+    def key(self, game_id: Any, turn: Optional[int]) -> CacheKey:
+        """turn이 None이면 게임의 현재 턴을 뜻합니다."""
+        return (str(game_id), turn, self.version(game_id))
+
+    def get(self, key: CacheKey) -> Optional[CachedGameState]:
+        entry = self._entries.get(key)
+        if entry is None or entry.expires_at < time.monotonic() or key[2] != self.version(key[0]):
+            if entry is not None:
+                del self._entries[key]
+            self.stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats["hits"] += 1
+        return entry
+
+    def put(self, key: CacheKey, payload: Dict[str, Any]) -> CachedGameState:
+        expires_at = time.monotonic() + self.ttl
+        if fast_json.FAST_JSON_RESPONSES:
+            # 키 정렬 본문 하나로 응답과 ETag를 함께 만듦 (직렬화 1회)
+            body = fast_json.dumps(payload, sort_keys=True)
+            entry = CachedGameState(payload, body_etag(key[0], key[1], body), expires_at, body)
+        else:
+            entry = CachedGameState(payload, make_etag(key[0], key[1], payload), expires_at)
+        # 조회 중에 무효화되었다면 저장하지 않음 (응답에는 그대로 사용)
+        if key[2] == self.version(key[0]):
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    def invalidate(self, game_id: Any) -> None:
+        """턴 커밋 후 호출: 게임 버전을 올리고 해당 게임의 캐시 항목을 제거합니다."""
+        game_key = str(game_id)
+        self._clock += 1
+        self._versions[game_key] = self._clock
+        self._versions.move_to_end(game_key)
+        while len(self._versions) > self.max_entries:
+            # 가장 오래전에 무효화한 게임부터 기록에서 제거 (기록에 없는 게임의 캐시 항목도 함께 무효화됨)
+            _, pruned = self._versions.popitem(last=False)
+            self._floor = max(self._floor, pruned)
+        for key in [key for key in self._entries if key[0] == game_key]:
+            del self._entries[key]
+        self.stats["invalidations"] += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+game_state_cache = GameStateCache()
@@ -0,0 +1,163 @@
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+# 엔진 내부용 열(column) 기반 헥스 타일 맵
+# - 반경 R 육각 맵을 (q, r) → 밀집 인덱스(q 열 우선, 타일 생성 순서와 같음)로 펼쳐 지형/자원 코드를 array('B')에 보관
+#   (타일마다 Prisma/Pydantic 객체를 만들지 않아 10k 타일에서도 수백 KB 수준)
+# - 지형/자원 문자열은 한 번만 저장하고 타일에는 1바이트 코드만 둠 (코드 0 = 타일 없음 / 자원 없음)
+# - 시야 계산은 bytearray 마스크로, 좌표 조회는 dict 없이 열 오프셋 계산으로 O(1)
+# Pydantic 모델(models/hexmap.py)은 API 응답 경계에서만 사용합니다.
+
+_TILE_COLUMNS_SQL = "SELECT `q`, `r`, `terrain`, `resource` FROM `MapTile` WHERE `gameId` = ?"
+
+
+def _field(row: Any, name: str) -> Any:
+    return row[name] if isinstance(row, dict) else getattr(row, name)
+
+
+class TileGrid:
+    __slots__ = ("radius", "q", "r", "terrain", "resource", "_column_start", "_terrain_names", "_resource_names",
+                 "_terrain_codes", "_resource_codes", "count")
+
+    def __init__(self, radius: int):
+        self.radius = radius
+        # q 열마다 첫 칸의 밀집 인덱스 (열 q의 r 범위는 max(-R, -q-R) .. min(R, -q+R))
+        self._column_start = array("l")
+        # 밀집 인덱스별 좌표 (순회할 때 좌표 계산 없이 zip으로 읽음)
+        self.q = array("h")
+        self.r = array("h")
+        total = 0
+        for q in range(-radius, radius + 1):
+            self._column_start.append(total)
+            rows = range(max(-radius, -q - radius), min(radius, -q + radius) + 1)
+            self.q.extend([q] * len(rows))
+            self.r.extend(rows)
+            total += len(rows)
+        self.terrain = array("B", bytes(total))
+        self.resource = array("B", bytes(total))
+        self._terrain_names: List[Optional[str]] = [None]
+        self._resource_names: List[Optional[str]] = [None]
+        self._terrain_codes: Dict[str, int] = {}
+        self._resource_codes: Dict[str, int] = {}
+        self.count = 0
+
+    @classmethod
+    def from_rows(cls, rows: Sequence[Any]) -> "TileGrid":
+        """MapTile 행(객체 또는 dict) 목록으로 만듭니다. 반경은 좌표에서 계산합니다."""
+        radius = 0
+        for row in rows:
+            q, r = _field(row, "q"), _field(row, "r")
+            radius = max(radius, abs(q), abs(r), abs(q + r))
+        grid = cls(radius)
+        for row in rows:
+            grid.set(_field(row, "q"), _field(row, "r"), _field(row, "terrain"), _field(row, "resource"))
+        return grid
+
+    @classmethod
+    async def load(cls, db, game_id: Any) -> "TileGrid":
+        """게임의 타일을 모델 객체 없이 열 4개만 읽어 만듭니다."""
+        rows = await db.query_raw(_TILE_COLUMNS_SQL, int(game_id))
+        return cls.from_rows(rows)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __contains__(self, coord: Tuple[int, int]) -> bool:
+        index = self.index(*coord)
+        return index >= 0 and self.terrain[index] != 0
+
+    def index(self, q: int, r: int) -> int:
+        """(q, r)의 밀집 인덱스 (맵 밖이면 -1)"""
+        radius = self.radius
+        if not (-radius <= r <= radius and -radius <= q <= radius and -radius <= q + r <= radius):
+            return -1
+        return self._column_start[q + radius] + r - max(-radius, -q - radius)
+
+    def _code(self, value: Optional[str], names: List[Optional[str]], codes: Dict[str, int]) -> int:
+        if value is None:
+            return 0
+        code = codes.get(value)
+        if code is None:
+            if len(names) > 255:
+                raise ValueError(f"코드는 255종까지 지원합니다: {value}")
+            code = len(names)
+            codes[value] = code
+            names.append(value)
+        return code
+
+    def set(self, q: int, r: int, terrain: str, resource: Optional[str] = None) -> None:
+        index = self.index(q, r)
+        if index < 0:
+            raise ValueError(f"맵 반경 {self.radius} 밖의 좌표입니다: ({q}, {r})")
+        if self.terrain[index] == 0:
+            self.count += 1
+        self.terrain[index] = self._code(terrain, self._terrain_names, self._terrain_codes)
+        self.resource[index] = self._code(resource, self._resource_names, self._resource_codes)
+
+    def terrain_at(self, q: int, r: int) -> Optional[str]:
+        index = self.index(q, r)
+        return self._terrain_names[self.terrain[index]] if index >= 0 else None
+
+    def resource_at(self, q: int, r: int) -> Optional[str]:
+        index = self.index(q, r)
+        return self._resource_names[self.resource[index]] if index >= 0 else None
+
+    def cells(self) -> Iterator[Tuple[int, int, int, Optional[str], Optional[str]]]:
+        """(인덱스, q, r, 지형, 자원)을 q 열 순서로 순회합니다."""
+        terrain_names, resource_names = self._terrain_names, self._resource_names
+        for index, (q, r, terrain, resource) in enumerate(zip(self.q, self.r, self.terrain, self.resource)):
+            if terrain:
+                yield index, q, r, terrain_names[terrain], resource_names[resource]
+
+    def sight_mask(self, centers: Iterable[Tuple[int, int]], sight: int) -> bytearray:
+        """centers 각각에서 sight 헥스 안의 타일을 1로 표시한 마스크"""
+        radius = self.radius
+        column_start = self._column_start
+        mask = bytearray(len(self.terrain))
+        for q0, r0 in centers:
+            for q in range(max(-radius, q0 - sight), min(radius, q0 + sight) + 1):
+                dq = q - q0
+                # 같은 q 열에서 시야 안의 r은 연속 구간 → 열 범위로 자른 뒤 슬라이스로 표시
+                column_low = max(-radius, -q - radius)
+                low = max(r0 + max(-sight, -dq - sight), column_low)
+                high = min(r0 + min(sight, -dq + sight), min(radius, -q + radius))
+                if low <= high:
+                    start = column_start[q + radius] + low - column_low
+                    mask[start:start + high - low + 1] = b"\x01" * (high - low + 1)
+        return mask
+
+    def mask_of(self, coords: Iterable[Tuple[int, int]]) -> bytearray:
+        mask = bytearray(len(self.terrain))
+        index = self.index
+        for q, r in coords:
+            position = index(q, r)
+            if position >= 0:
+                mask[position] = 1
+        return mask
+
+    def tiles(self, mask: Optional[bytearray] = None) -> List[Dict[str, Any]]:
+        """응답용 타일 dict 목록 (mask가 있으면 표시된 타일만)"""
+        terrain_names, resource_names = self._terrain_names, self._resource_names
+        if mask is None:
+            mask = self.terrain
+        return [
+            {"q": q, "r": r, "terrain": terrain_names[terrain], "resource": resource_names[resource]}
+            for q, r, terrain, resource, shown in zip(self.q, self.r, self.terrain, self.resource, mask)
+            if terrain and shown
+        ]
+
+    def exploration_tiles(self, visible_mask: bytearray, explored_mask: bytearray) -> List[Dict[str, Any]]:
+        """맵 응답용 타일 dict 목록 (exploration: visible / explored / unexplored)"""
+        terrain_names, resource_names = self._terrain_names, self._resource_names
+        labels = ("unexplored", "explored", "visible", "visible")
+        return [
+            {"q": q, "r": r, "terrain": terrain_names[terrain], "resource": resource_names[resource],
+             "exploration": labels[visible << 1 | explored]}
+            for q, r, terrain, resource, visible, explored
+            in zip(self.q, self.r, self.terrain, self.resource, visible_mask, explored_mask)
+            if terrain
+        ]
+
+    def nbytes(self) -> int:
+        columns = (self.q, self.r, self.terrain, self.resource, self._column_start)
+        return sum(column.itemsize * len(column) for column in columns)
@@ -0,0 +1,85 @@
+import random
+import re
+from typing import Dict, FrozenSet, Iterable, Optional, Tuple, Union
+
+# 다중 키워드 매처
+# 카테고리별 키워드 목록을 하나의 정규식으로 컴파일해 메시지를 한 번만 훑어 모든 적중을 찾습니다.
+# - 각 위치에서 가장 긴 키워드를 찾는 lookahead 패턴을 사용하므로 겹치는 키워드도 모두 찾음
+# - 짧은 키워드가 긴 키워드 안에 포함된 경우("적" ⊂ "적대")는 미리 계산한 포함 관계로 보충
+# 결과는 기존 `keyword in content` 검사와 동일하게 "메시지에 등장한 키워드 집합"입니다.
+
+Weight = Union[int, float, Tuple[int, int]]
+
+
+class KeywordHits:
+    """메시지 하나에 대한 카테고리별 적중 키워드"""
+
+    __slots__ = ("by_category",)
+
+    def __init__(self, by_category: Dict[str, FrozenSet[str]]):
+        self.by_category = by_category
+
+    def get(self, category: str) -> FrozenSet[str]:
+        return self.by_category.get(category, frozenset())
+
+    def count(self, category: str) -> int:
+        return len(self.by_category.get(category, ()))
+
+    def __bool__(self) -> bool:
+        return any(self.by_category.values())
+
+
+class KeywordMatcher:
+    def __init__(self, categories: Dict[str, Iterable[str]], weights: Optional[Dict[str, Weight]] = None):
+        self.categories = {name: frozenset(words) for name, words in categories.items()}
+        self.weights = dict(weights or {})
+
+        keywords = set()
+        for words in self.categories.values():
+            keywords.update(words)
+        # 같은 위치에서 가장 긴 키워드가 먼저 선택되도록 길이 역순 정렬
+        ordered = sorted(keywords, key=lambda word: (-len(word), word))
+        self._pattern = re.compile("(?=(" + "|".join(re.escape(word) for word in ordered) + "))") if ordered else None
+
+        # 키워드가 등장하면 함께 등장한 것으로 보는 키워드들 (자기 자신 포함)
+        self._implied = {
+            word: frozenset(other for other in keywords if other in word)
+            for word in keywords
+        }
+        # 키워드 → 속한 카테고리
+        self._owners: Dict[str, Tuple[str, ...]] = {
+            word: tuple(name for name, words in self.categories.items() if word in words)
+            for word in keywords
+        }
+
+    def keywords_in(self, text: str) -> FrozenSet[str]:
+        if self._pattern is None or not text:
+            return frozenset()
+        found = set()
+        for match in self._pattern.finditer(text):
+            word = match.group(1)
+            if word not in found:
+                found.update(self._implied[word])
+        return frozenset(found)
+
+    def match(self, text: str) -> KeywordHits:
+        """텍스트를 한 번 훑어 카테고리별 적중 키워드를 반환합니다."""
+        by_category: Dict[str, set] = {}
+        for word in self.keywords_in(text.lower()):
+            for name in self._owners[word]:
+                by_category.setdefault(name, set()).add(word)
+        return KeywordHits({name: frozenset(words) for name, words in by_category.items()})
+
+    def score(self, hits: KeywordHits, rng=random) -> float:
+        """적중 키워드마다 카테고리 가중치를 더합니다. 가중치가 (최소, 최대) 범위이면 무작위 정수를 사용합니다."""
+        total = 0
+        for name, words in hits.by_category.items():
+            weight = self.weights.get(name)
+            if weight is None:
+                continue
+            for _ in words:
+                if isinstance(weight, tuple):
+                    total += rng.randint(*weight)
+                else:
+                    total += weight
+        return total
@@ -0,0 +1,343 @@
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional, Tuple
+
+import httpx
+
+from services.metrics import LLM_REQUEST_DURATION, LLM_REQUESTS
+
+# LLM 프로바이더 라우터
+# - 프로바이더별 상태(지연 시간, 성공/실패) 추적
+# - 연속 실패 시 회로 차단기(circuit breaker)로 해당 프로바이더를 잠시 건너뜀
+# - 1순위 프로바이더가 지연 시간 백분위 임계값을 넘기면 2순위에 헤지 요청을 보내고 먼저 도착한 응답 사용
+
+
+class LLMUnavailableError(Exception):
+    """사용 가능한 LLM 프로바이더가 없거나 모두 실패한 경우 발생합니다."""
+
+
+@dataclass
+class LLMRequest:
+    """프로바이더에 공통으로 전달되는 요청 모델"""
+    system: str
+    messages: List[Tuple[str, str]] = field(default_factory=list)  # (role, content), role: user/assistant
+    temperature: float = 0.7
+    top_p: float = 0.8
+    top_k: int = 40
+    max_tokens: int = 500
+
+
+@dataclass
+class LLMResult:
+    text: str
+    provider: str
+    latency: float
+    hedged: bool = False
+
+
+class LLMProvider:
+    """LLM 프로바이더 기본 클래스"""
+    name = "base"
+
+    async def generate(self, request: LLMRequest) -> str:
+        raise NotImplementedError
+
+
+class GeminiProvider(LLMProvider):
+    """Gemini REST API 프로바이더"""
+    name = "gemini"
+
+    def __init__(self, model: Optional[str] = None, api_key: Optional[str] = None,
+                 api_url: Optional[str] = None, timeout: float = 30.0):
+        self.model = model or os.getenv("GEMINI_MODEL", "gemini-pro")
+        self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
+        self.api_url = (api_url or os.getenv("GEMINI_API_URL", "https://generativelanguage.googleapis.com/v1beta/models")).rstrip("/")
+        self.timeout = timeout
+
+    async def generate(self, request: LLMRequest) -> str:
+        if not self.api_key:
+            raise LLMUnavailableError("GOOGLE_API_KEY 환경 변수가 설정되지 않았습니다.")
+
+        # Gemini는 system 메시지를 따로 받지 않으므로 하나의 프롬프트로 합침
+        lines = [request.system]
+        for role, content in request.messages:
+            prefix = "플레이어" if role == "user" else "AI"
+            lines.append(f"{prefix}: {content}")
+        prompt = "\n\n".join(lines)
+
+        request_data = {
+            "contents": [{"parts": [{"text": prompt}]}],
+            "generationConfig": {
+                "temperature": request.temperature,
+                "topK": request.top_k,
+                "topP": request.top_p,
+                "maxOutputTokens": request.max_tokens
+            }
+        }
+
+        async with httpx.AsyncClient(timeout=self.timeout) as client:
+            response = await client.post(
+                f"{self.api_url}/{self.model}:generateContent",
+                params={"key": self.api_key},
+                json=request_data
+            )
+        if response.status_code != 200:
+            raise RuntimeError(f"Gemini API 오류: {response.status_code} - {response.text}")
+
+        result = response.json()
+        text = result["candidates"][0]["content"]["parts"][0]["text"]
+        if not text or not text.strip():
+            raise RuntimeError("Gemini 응답이 비어있습니다.")
+        return text
+
+
+class OllamaProvider(LLMProvider):
+    """Ollama(LangChain ChatOllama) 프로바이더"""
+    name = "ollama"
+
+    def __init__(self, model: Optional[str] = None, base_url: Optional[str] = None):
+        self.model = model or os.getenv("OLLAMA_MODEL", "eeve-korean-10.8b")
+        self.base_url = base_url or os.getenv("OLLAMA_URL", "http://localhost:11434")
+
+    async def generate(self, request: LLMRequest) -> str:
+        from langchain_core.messages import SystemMessage, HumanMessage, AIMessage
+        from langchain_ollama import ChatOllama
+
+        langchain_messages = [SystemMessage(content=request.system)]
+        for role, content in request.messages:
+            if role == "user":
+                langchain_messages.append(HumanMessage(content=content))
+            else:
+                langchain_messages.append(AIMessage(content=content))
+
+        chat_model = ChatOllama(
+            model=self.model,
+            base_url=self.base_url,
+            temperature=request.temperature,
+            top_p=request.top_p,
+            top_k=request.top_k,
+            num_predict=request.max_tokens,
+        )
+        # invoke는 이벤트 루프를 막으므로 비동기 호출 사용
+        response = await chat_model.ainvoke(langchain_messages)
+        if not response.content:
+            raise RuntimeError("Ollama 응답에 텍스트가 없습니다.")
+        return response.content
+
+
+class CircuitBreaker:
+    """연속 실패 횟수 기반 회로 차단기 (closed → open → half_open)"""
+
+    def __init__(self, failure_threshold: int = 3, recovery_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probe_in_flight = False
+
+    def allow_request(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self.opened_at >= self.recovery_timeout:
+                # 복구 시간이 지나면 한 번의 시험 요청만 허용
+                self.state = "half_open"
+                self._probe_in_flight = True
+                return True
+            return False
+        # half_open: 시험 요청이 끝날 때까지 추가 요청 차단
+        if not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    def release_probe(self):
+        """결과 없이 끝난(취소된) 시험 요청의 슬롯을 반환합니다."""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+class ProviderHealth:
+    """프로바이더별 최근 지연 시간과 성공/실패 통계"""
+
+    def __init__(self, window: int = 100):
+        self.latencies: Deque[float] = deque(maxlen=window)
+        self.successes = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+    def record_success(self, latency: float):
+        self.successes += 1
+        self.latencies.append(latency)
+
+    def record_failure(self, error: Exception):
+        self.failures += 1
+        self.last_error = str(error)
+
+    def percentile(self, q: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        index = min(len(ordered) - 1, int(q * len(ordered)))
+        return ordered[index]
+
+
+class LLMRouter:
+    """우선순위 순서의 프로바이더 목록으로 요청을 라우팅합니다."""
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedge: bool = True,
+        hedge_quantile: float = 0.95,
+        hedge_min_samples: int = 20,
+        hedge_default_delay: float = 5.0,
+        failure_threshold: int = 3,
+        recovery_timeout: float = 30.0,
+        request_timeout: float = 30.0,
+    ):
+        if not providers:
+            raise ValueError("프로바이더가 최소 하나 필요합니다.")
+        self.providers = providers
+        self.hedge = hedge
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_default_delay = hedge_default_delay
+        self.request_timeout = request_timeout
+        self.breakers: Dict[str, CircuitBreaker] = {
+            p.name: CircuitBreaker(failure_threshold, recovery_timeout) for p in providers
+        }
+        self.health: Dict[str, ProviderHealth] = {p.name: ProviderHealth() for p in providers}
+
+    def hedge_delay(self, provider: LLMProvider) -> float:
+        """헤지 요청을 보내기 전 대기 시간 (최근 지연 시간 백분위 기반)"""
+        health = self.health[provider.name]
+        if len(health.latencies) < self.hedge_min_samples:
+            return self.hedge_default_delay
+        return health.percentile(self.hedge_quantile)
+
+    def health_snapshot(self) -> Dict[str, Dict]:
+        snapshot = {}
+        for provider in self.providers:
+            health = self.health[provider.name]
+            breaker = self.breakers[provider.name]
+            snapshot[provider.name] = {
+                "state": breaker.state,
+                "successes": health.successes,
+                "failures": health.failures,
+                "p50": health.percentile(0.5),
+                "p95": health.percentile(0.95),
+                "last_error": health.last_error,
+            }
+        return snapshot
+
+    async def _call(self, provider: LLMProvider, request: LLMRequest) -> Tuple[str, float]:
+        started = time.monotonic()
+        try:
+            text = await asyncio.wait_for(provider.generate(request), timeout=self.request_timeout)
+        except asyncio.CancelledError:
+            # 헤지 경쟁에서 진 요청은 실패로 기록하지 않음
+            self.breakers[provider.name].release_probe()
+            LLM_REQUESTS.inc(provider=provider.name, outcome="cancelled")
+            raise
+        except Exception as e:
+            self.health[provider.name].record_failure(e)
+            self.breakers[provider.name].record_failure()
+            LLM_REQUESTS.inc(provider=provider.name, outcome="timeout" if isinstance(e, asyncio.TimeoutError) else "error")
+            raise
+        latency = time.monotonic() - started
+        LLM_REQUEST_DURATION.observe(latency, provider=provider.name)
+        LLM_REQUESTS.inc(provider=provider.name, outcome="success")
+        self.health[provider.name].record_success(latency)
+        self.breakers[provider.name].record_success()
+        return text, latency
+
+    async def generate(self, request: LLMRequest) -> LLMResult:
+        """회로가 열리지 않은 프로바이더를 순서대로 사용하며, 느린 경우 다음 프로바이더로 헤지합니다."""
+        errors: List[str] = []
+        pending: Dict[asyncio.Task, LLMProvider] = {}
+        remaining = list(self.providers)
+        launched: List[LLMProvider] = []
+        started = time.monotonic()
+
+        def launch() -> bool:
+            # 회로가 열린 프로바이더는 건너뛰고 다음 프로바이더 요청 시작
+            while remaining:
+                provider = remaining.pop(0)
+                if self.breakers[provider.name].allow_request():
+                    launched.append(provider)
+                    pending[asyncio.create_task(self._call(provider, request))] = provider
+                    return True
+            return False
+
+        if not launch():
+            raise LLMUnavailableError("모든 LLM 프로바이더의 회로가 열려 있습니다.")
+
+        try:
+            while pending:
+                # 예비 프로바이더가 남아 있으면 가장 최근 프로바이더의 헤지 지연 시간까지만 대기
+                timeout = None
+                if self.hedge and remaining:
+                    timeout = self.hedge_delay(launched[-1])
+
+                done, _ = await asyncio.wait(pending.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+
+                if not done:
+                    # 임계 시간 초과: 다음 프로바이더로 헤지 요청 (없으면 계속 대기)
+                    if not launch():
+                        remaining.clear()
+                    continue
+
+                for task in done:
+                    provider = pending.pop(task)
+                    try:
+                        text, _ = task.result()
+                    except Exception as e:
+                        errors.append(f"{provider.name}: {e}")
+                        continue
+                    return LLMResult(
+                        text=text,
+                        provider=provider.name,
+                        latency=time.monotonic() - started,
+                        hedged=len(launched) > 1,
+                    )
+
+                # 실패한 경우 대기 중인 요청이 없으면 즉시 다음 프로바이더로 폴백
+                if not pending:
+                    launch()
+        finally:
+            for task in pending:
+                task.cancel()
+
+        raise LLMUnavailableError("모든 LLM 프로바이더 호출이 실패했습니다: " + "; ".join(errors))
+
+
+def build_llm_router(primary: str = "gemini", gemini_model: Optional[str] = None) -> LLMRouter:
+    """환경 변수 설정으로 기본 라우터를 생성합니다. primary 프로바이더가 1순위가 됩니다."""
+    gemini = GeminiProvider(model=gemini_model or os.getenv("GEMINI_MODEL", "gemini-pro"))
+    ollama = OllamaProvider()
+    providers: List[LLMProvider] = [gemini, ollama] if primary == "gemini" else [ollama, gemini]
+    return LLMRouter(
+        providers,
+        hedge=os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true",
+        hedge_quantile=float(os.getenv("LLM_HEDGE_QUANTILE", "0.95")),
+        hedge_default_delay=float(os.getenv("LLM_HEDGE_DEFAULT_DELAY", "5.0")),
+        failure_threshold=int(os.getenv("LLM_BREAKER_FAILURES", "3")),
+        recovery_timeout=float(os.getenv("LLM_BREAKER_RECOVERY", "30.0")),
+        request_timeout=float(os.getenv("LLM_REQUEST_TIMEOUT", "30.0")),
+    )
@@ -0,0 +1,271 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, Optional, Tuple
+
+# Prometheus 텍스트 포맷(0.0.4) 지표 수집기 (외부 의존성 없음)
+# - Counter / Gauge / Histogram, 레이블은 키워드 인자로 지정
+# - 핫 패스 비용은 dict 갱신과 bisect 한 번 정도 (잠금 없음: 단일 이벤트 루프 기준)
+# - 캐시 적중률, 커넥션 풀처럼 이미 다른 곳에서 집계하는 값은 on_collect 콜백으로 /metrics 요청 때만 읽음
+
+LabelKey = Tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Dict[str, str]) -> LabelKey:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def _labels(self, key: LabelKey, extra: str = "") -> str:
+        parts = [f'{name}="{_escape(value)}"' for name, value in zip(self.labelnames, key)]
+        if extra:
+            parts.append(extra)
+        return "{" + ",".join(parts) + "}" if parts else ""
+
+    def header(self) -> List[str]:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def set_total(self, value: float, **labels: str) -> None:
+        """다른 곳에서 누적한 값을 그대로 반영합니다. (on_collect 콜백용)"""
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[LabelKey, float] = {}
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{self._labels(key)} {_format_value(value)}" for key, value in self._values.items()]
+
+
+class _Timer:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: "Histogram", labels: Dict[str, str]):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class StageTimer:
+    """구간별 시간 측정: mark(stage)는 직전 mark(또는 생성) 이후 경과 시간을 stage 레이블로 기록"""
+
+    __slots__ = ("histogram", "label", "last")
+
+    def __init__(self, histogram: "Histogram", label: str):
+        self.histogram = histogram
+        self.label = label
+        self.last = time.perf_counter()
+
+    def mark(self, stage: str) -> float:
+        now = time.perf_counter()
+        elapsed = now - self.last
+        self.last = now
+        self.histogram.observe(elapsed, **{self.label: stage})
+        return elapsed
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 레이블별 [버킷별 개수(비누적)..., +Inf 개수], 합계
+        self._counts: Dict[LabelKey, List[int]] = {}
+        self._sums: Dict[LabelKey, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    def time(self, **labels: str) -> _Timer:
+        """with 블록 실행 시간을 기록합니다."""
+        return _Timer(self, labels)
+
+    def stages(self, label: str = "stage") -> StageTimer:
+        return StageTimer(self, label)
+
+    def summary(self, **labels: str) -> Tuple[int, float, List[int]]:
+        """레이블 하나의 (관측 수, 합계, 버킷별 개수(비누적, 마지막은 +Inf))"""
+        key = self._key(labels)
+        counts = self._counts.get(key) or [0] * (len(self.buckets) + 1)
+        return sum(counts), self._sums.get(key, 0.0), list(counts)
+
+    def clear(self) -> None:
+        self._counts.clear()
+        self._sums.clear()
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{self._labels(key, le)} {cumulative}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_format_value(self._sums[key])}")
+            lines.append(f"{self.name}_count{self._labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+
+    def register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"이미 등록된 지표입니다: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Optional[Tuple[float, ...]] = None,
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets or DEFAULT_BUCKETS))
+
+    def on_collect(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """/metrics 요청 때마다 호출할 콜백을 등록합니다. (데코레이터로 사용 가능)"""
+        self._collectors.append(callback)
+        return callback
+
+    def render(self) -> str:
+        for callback in self._collectors:
+            try:
+                callback()
+            except Exception as e:
+                print(f"지표 수집 콜백 오류: {str(e)}")
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            samples = metric.samples()
+            if samples:
+                lines.extend(metric.header())
+                lines.extend(samples)
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+# ---- 게임 서버 지표 ----
+
+HTTP_REQUEST_DURATION = registry.histogram(
+    "http_request_duration_seconds", "HTTP 요청 처리 시간", ("method", "route", "status")
+)
+TURN_STAGE_DURATION = registry.histogram(
+    "turn_stage_duration_seconds", "턴 종료 처리 단계별 시간", ("stage",)
+)
+AI_DECISION_DURATION = registry.histogram(
+    "ai_decision_duration_seconds", "한 게임의 AI 문명 의사결정(턴 계획) 생성 시간", ("engine",)
+)
+LLM_REQUEST_DURATION = registry.histogram(
+    "llm_request_duration_seconds", "LLM 프로바이더 호출 시간", ("provider",),
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0),
+)
+LLM_REQUESTS = registry.counter(
+    "llm_requests_total", "LLM 프로바이더 호출 수", ("provider", "outcome")
+)
+CACHE_REQUESTS = registry.counter(
+    "cache_requests_total", "프로세스 내 캐시 조회 수", ("cache", "result")
+)
+WEBSOCKET_CONNECTIONS = registry.gauge(
+    "websocket_connections", "현재 WebSocket 연결 수", ("manager",)
+)
+DB_POOL_CONNECTIONS = registry.gauge(
+    "db_pool_connections", "DB 커넥션 풀 상태", ("state",)
+)
+DB_POOL_ACQUIRED = registry.counter(
+    "db_pool_acquired_total", "DB 커넥션 풀 슬롯 획득 수"
+)
+DB_POOL_TIMEOUTS = registry.counter(
+    "db_pool_timeouts_total", "DB 커넥션 풀 대기 시간 초과 수"
+)
+DB_QUERIES_PER_REQUEST = registry.histogram(
+    "db_queries_per_request", "요청당 DB 쿼리 수", ("route",),
+    buckets=(1, 2, 5, 10, 20, 50, 100, 200, 500, 1000),
+)
+DB_TIME_PER_REQUEST = registry.histogram(
+    "db_time_per_request_seconds", "요청당 DB 쿼리 시간 합계", ("route",),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+AI_PLAN_DECISIONS = registry.counter(
+    "ai_plan_decisions_total", "AI 턴 계획 결정 출처별 문명 수", ("source",)
+)
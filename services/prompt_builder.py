@@ -0,0 +1,201 @@
+import json
+import math
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Sequence, Tuple
+
+# LLM 프롬프트용 압축 상태 요약(digest)
+# - 키는 짧은 약어로 바꾸고, None/빈 값은 생략하며, 키 정렬 + 공백 없는 JSON으로 항상 같은 문자열을 만듦
+#   (같은 상태면 같은 프롬프트 → 프로바이더 프롬프트 캐시와 상태 지문 캐시에 유리)
+# - StateMemory는 키(문명/채팅)별 직전 상태를 기억해 이번 턴에 바뀐 부분(delta)만 뽑음
+# - 토큰 예산을 넘는 목록은 뒤쪽 항목부터 "+N"으로 생략 (상위 K개 선택은 호출하는 쪽에서 점수 순으로)
+# 토큰 수는 토크나이저 없이 추정합니다. (ASCII 4글자당 1토큰, 한글 등 비ASCII 1글자당 1토큰)
+
+ABBREVIATIONS = {
+    "buildings": "bld",
+    "build_queue": "bq",
+    "cities": "cty",
+    "completed": "done",
+    "culture": "cul",
+    "food": "fd",
+    "gold": "gld",
+    "in_progress": "wip",
+    "leader": "ldr",
+    "name": "nm",
+    "personality": "per",
+    "player_civ": "pc",
+    "population": "pop",
+    "production": "prd",
+    "progress": "prg",
+    "queue": "q",
+    "required": "req",
+    "research": "rs",
+    "resources": "res",
+    "science": "sci",
+    "turn": "t",
+    "type": "ty",
+    "units": "un",
+}
+
+
+def abbreviate(value: Any) -> Any:
+    """키를 약어로 바꾸고 None/빈 값을 제거합니다."""
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            item = abbreviate(item)
+            if item is None or item == [] or item == {}:
+                continue
+            result[ABBREVIATIONS.get(key, key)] = item
+        return result
+    if isinstance(value, (list, tuple)):
+        return [abbreviate(item) for item in value]
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+def compact_json(value: Any) -> str:
+    return json.dumps(abbreviate(value), ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def estimate_tokens(text: str) -> int:
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return math.ceil(ascii_chars / 4) + (len(text) - ascii_chars)
+
+
+def _by_id(items: Sequence[Any]) -> Optional[Dict[Any, Any]]:
+    if items and all(isinstance(item, dict) and "id" in item for item in items):
+        return {item["id"]: item for item in items}
+    return None
+
+
+def diff_state(previous: Any, current: Any) -> Any:
+    """previous → current에서 바뀐 부분만 반환합니다. 바뀐 것이 없으면 None.
+
+    - dict: 바뀐 키만 (삭제된 키는 None 값)
+    - id가 있는 dict 목록: {"+": 새 항목, "-": 사라진 id, "~": 바뀐 항목(id + 바뀐 필드)}
+    - 값 목록: {"+": 추가된 값, "-": 사라진 값}
+    - 숫자: 변화량 문자열 ("+3", "-2")
+    - 그 외: 새 값
+    """
+    if previous == current:
+        return None
+    if isinstance(previous, dict) and isinstance(current, dict):
+        changes = {}
+        for key in sorted(set(previous) | set(current), key=str):
+            if key not in current:
+                changes[key] = None
+                continue
+            change = diff_state(previous.get(key), current[key]) if key in previous else current[key]
+            if change is not None:
+                changes[key] = change
+        return changes or None
+    if isinstance(previous, list) and isinstance(current, list):
+        old, new = _by_id(previous), _by_id(current)
+        if old is None or new is None:
+            if all(isinstance(item, (str, int, float)) for item in previous + current):
+                # 값 목록은 추가/삭제된 값만
+                added = [item for item in current if item not in previous]
+                removed = [item for item in previous if item not in current]
+                return {key: items for key, items in (("+", added), ("-", removed)) if items} or None
+            return current
+        changes: Dict[str, Any] = {}
+        added = [item for item_id, item in new.items() if item_id not in old]
+        removed = [item_id for item_id in old if item_id not in new]
+        modified = []
+        for item_id, item in new.items():
+            if item_id in old:
+                change = diff_state(old[item_id], item)
+                if change:
+                    modified.append({"id": item_id, **change})
+        if added:
+            changes["+"] = added
+        if removed:
+            changes["-"] = removed
+        if modified:
+            changes["~"] = modified
+        return changes or None
+    if (isinstance(previous, (int, float)) and isinstance(current, (int, float))
+            and not isinstance(previous, bool) and not isinstance(current, bool)):
+        delta = current - previous
+        return f"{delta:+g}"
+    return current
+
+
+class StateMemory:
+    """키별 직전 상태 (LRU, 최대 max_entries개)"""
+
+    def __init__(self, max_entries: int = 4096):
+        self.max_entries = max_entries
+        self._states: "OrderedDict[Hashable, Any]" = OrderedDict()
+
+    def delta(self, key: Hashable, state: Any) -> Tuple[Any, bool]:
+        """직전 상태 대비 변경분을 반환하고 현재 상태를 기억합니다. → (변경분, 직전 상태가 있었는지)"""
+        previous = self._states.get(key)
+        known = key in self._states
+        self._states[key] = state
+        self._states.move_to_end(key)
+        while len(self._states) > self.max_entries:
+            self._states.popitem(last=False)
+        return (diff_state(previous, state) if known else None), known
+
+    def forget(self, key: Hashable) -> None:
+        self._states.pop(key, None)
+
+
+def fit_lines(lines: Sequence[str], budget: int, separator: str = "\n") -> str:
+    """앞에서부터 토큰 예산 안에 들어가는 줄만 남기고, 잘린 줄 수는 "+N"으로 표시합니다."""
+    kept: List[str] = []
+    used = 0
+    for index, line in enumerate(lines):
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget and kept:
+            kept.append(f"+{len(lines) - index}")
+            break
+        kept.append(line)
+        used += cost
+    return separator.join(kept)
+
+
+# ---- 상담가(advisor) 채팅 컨텍스트 ----
+
+ADVISOR_TOP_CITIES = 8
+ADVISOR_CONTEXT_TOKENS = 300
+
+
+def advisor_digest(game_state: Dict[str, Any], top_cities: int = ADVISOR_TOP_CITIES) -> Dict[str, Any]:
+    """상담가 프롬프트에 필요한 값만 뽑은 요약 (도시는 인구 상위 top_cities개)"""
+    player_civ = game_state.get("player_civ") or {}
+    in_progress = (player_civ.get("research") or {}).get("in_progress") or {}
+    cities = sorted(player_civ.get("cities") or [], key=lambda city: -(city.get("population") or 0))
+    return {
+        "turn": game_state.get("turn"),
+        "era": game_state.get("era"),
+        "civ": player_civ.get("name"),
+        "research": in_progress.get("name"),
+        "city_count": len(cities),
+        "cities": [
+            {
+                "name": city.get("name"),
+                "population": city.get("population"),
+                "build": (city.get("in_progress") or {}).get("building"),
+            }
+            for city in cities[:top_cities]
+        ],
+    }
+
+
+def advisor_context(
+    game_state: Dict[str, Any],
+    memory: Optional[StateMemory] = None,
+    key: Optional[Hashable] = None,
+    budget: int = ADVISOR_CONTEXT_TOKENS,
+) -> str:
+    """상담가 시스템 프롬프트에 넣을 현재 상태 요약과 직전 메시지 이후 변화"""
+    digest = advisor_digest(game_state)
+    lines = ["현재 게임 상태(약어: t=턴, nm=이름, pop=인구, build=건설 중):", compact_json(digest)]
+    if memory is not None and key is not None:
+        change, _ = memory.delta(key, digest)
+        if change:
+            lines += ["직전 메시지 이후 변화:", compact_json(change)]
+    return fit_lines(lines, budget)
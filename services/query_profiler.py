@@ -0,0 +1,164 @@
+import contextvars
+import os
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from services.metrics import DB_QUERIES_PER_REQUEST, DB_TIME_PER_REQUEST, Histogram
+
+# 요청별 DB 쿼리 프로파일러
+# - instrument(prisma): Prisma 클라이언트의 _execute를 감싸서 모든 모델/raw 쿼리의 횟수와 시간을 기록
+# - 기록은 요청마다 contextvar에 담긴 RequestQueryStats로 모이고, 미들웨어가 응답 후 라우트별 히스토그램에 합산
+#   (히스토그램은 services/metrics.py 지표라서 /metrics에도 route 레이블로 노출됨)
+# - DB_QUERY_DEBUG_HEADERS=true면 응답 헤더로 쿼리 수/DB 시간/가장 느린 쿼리를 내려줌
+# - DB_SLOW_QUERY_MS 이상 걸린 쿼리는 로그로 출력
+# 쿼리 이름은 "모델.연산(where 키)" 형태라서 같은 이름이 한 요청에 반복되면 N+1 루프입니다.
+
+DB_QUERY_DEBUG_HEADERS = os.getenv("DB_QUERY_DEBUG_HEADERS", "false").lower() == "true"
+DB_SLOW_QUERY_MS = float(os.getenv("DB_SLOW_QUERY_MS", "200"))
+DB_SLOWEST_PER_REQUEST = int(os.getenv("DB_SLOWEST_PER_REQUEST", "5"))
+
+_current: contextvars.ContextVar[Optional["RequestQueryStats"]] = contextvars.ContextVar(
+    "request_query_stats", default=None
+)
+
+
+def statement_name(kwargs: Dict[str, Any]) -> str:
+    """_execute 인자에서 "모델.연산(where 키)" 이름을 만듭니다. (값은 포함하지 않음)"""
+    model = kwargs.get("model")
+    method = kwargs.get("method", "query")
+    name = f"{model.__name__}.{method}" if model is not None else str(method)
+    arguments = kwargs.get("arguments") or {}
+    where = arguments.get("where") if isinstance(arguments, dict) else None
+    if isinstance(where, dict) and where:
+        name += f"({','.join(sorted(where))})"
+    return name
+
+
+class RequestQueryStats:
+    __slots__ = ("count", "db_time", "slowest", "statements")
+
+    def __init__(self):
+        self.count = 0
+        self.db_time = 0.0
+        self.slowest: List[Tuple[float, str]] = []
+        self.statements: Dict[str, int] = {}
+
+    def record(self, name: str, elapsed: float) -> None:
+        self.count += 1
+        self.db_time += elapsed
+        self.statements[name] = self.statements.get(name, 0) + 1
+        if len(self.slowest) < DB_SLOWEST_PER_REQUEST or elapsed > self.slowest[-1][0]:
+            self.slowest.append((elapsed, name))
+            self.slowest.sort(reverse=True)
+            del self.slowest[DB_SLOWEST_PER_REQUEST:]
+
+    def repeated(self, threshold: int = 5) -> Dict[str, int]:
+        """한 요청에서 threshold번 이상 반복된 쿼리 (N+1 후보)"""
+        return {name: count for name, count in self.statements.items() if count >= threshold}
+
+    def headers(self) -> Dict[str, str]:
+        return {
+            "X-DB-Query-Count": str(self.count),
+            "X-DB-Time-Ms": f"{self.db_time * 1000:.1f}",
+            "X-DB-Slowest": "; ".join(f"{name}={elapsed * 1000:.1f}ms" for elapsed, name in self.slowest),
+        }
+
+
+def begin_request() -> Tuple[RequestQueryStats, contextvars.Token]:
+    stats = RequestQueryStats()
+    return stats, _current.set(stats)
+
+
+def end_request(token: contextvars.Token) -> None:
+    _current.reset(token)
+
+
+def current_stats() -> Optional[RequestQueryStats]:
+    return _current.get()
+
+
+def instrument(client: Any) -> Any:
+    """Prisma 클라이언트의 _execute를 감싸 쿼리 시간을 기록합니다. 두 번 호출해도 한 번만 감쌉니다."""
+    original = getattr(client, "_execute", None)
+    if original is None or getattr(original, "_query_profiled", False):
+        return client
+
+    async def profiled_execute(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return await original(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            name = statement_name(kwargs)
+            stats = _current.get()
+            if stats is not None:
+                stats.record(name, elapsed)
+            if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+                print(f"느린 쿼리 {elapsed * 1000:.1f}ms: {name}")
+
+    profiled_execute._query_profiled = True
+    client._execute = profiled_execute
+    return client
+
+
+def _histogram_dict(histogram: Histogram, route: str, scale: float = 1.0) -> Dict[str, Any]:
+    """라우트 하나의 히스토그램 요약 (scale: 표시 단위 변환, 초 → ms면 1000)"""
+    total, value_sum, counts = histogram.summary(route=route)
+    labels = [f"le_{bound * scale:g}" for bound in histogram.buckets] + ["le_inf"]
+    return {
+        "count": total,
+        "sum": round(value_sum * scale, 3),
+        "mean": round(value_sum * scale / total, 3) if total else 0,
+        "buckets": dict(zip(labels, counts)),
+    }
+
+
+class RouteQueryMetrics:
+    """라우트(경로 템플릿)별 요청당 쿼리 수/DB 시간 히스토그램"""
+
+    def __init__(
+        self,
+        queries: Histogram = DB_QUERIES_PER_REQUEST,
+        db_time: Histogram = DB_TIME_PER_REQUEST,
+        top_statements: int = 10,
+    ):
+        self.queries = queries
+        self.db_time = db_time
+        self.top_statements = top_statements
+        self._routes: Dict[str, Dict[str, Any]] = {}
+
+    def observe(self, route: str, stats: RequestQueryStats) -> None:
+        entry = self._routes.get(route)
+        if entry is None:
+            entry = self._routes[route] = {"statements": {}, "slowest": []}
+        self.queries.observe(stats.count, route=route)
+        self.db_time.observe(stats.db_time, route=route)
+        for name, count in stats.statements.items():
+            entry["statements"][name] = entry["statements"].get(name, 0) + count
+        slowest = entry["slowest"] + [(elapsed * 1000, name) for elapsed, name in stats.slowest]
+        slowest.sort(reverse=True)
+        entry["slowest"] = slowest[:self.top_statements]
+
+    def snapshot(self) -> Dict[str, Any]:
+        result = {}
+        for route, entry in sorted(self._routes.items()):
+            requests = self.queries.summary(route=route)[0] or 1
+            top = sorted(entry["statements"].items(), key=lambda item: -item[1])[:self.top_statements]
+            result[route] = {
+                "queries": _histogram_dict(self.queries, route),
+                "db_time_ms": _histogram_dict(self.db_time, route, scale=1000),
+                "top_statements": [
+                    {"statement": name, "total": count, "per_request": round(count / requests, 2)}
+                    for name, count in top
+                ],
+                "slowest": [{"statement": name, "ms": round(ms, 2)} for ms, name in entry["slowest"]],
+            }
+        return result
+
+    def reset(self) -> None:
+        self._routes.clear()
+        self.queries.clear()
+        self.db_time.clear()
+
+
+route_query_metrics = RouteQueryMetrics()
@@ -0,0 +1,160 @@
+import copy
+import json
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+# 선택 의존성: 콜드 스냅샷 압축용
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# TurnSnapshot 델타 인코딩
+# 키프레임 턴은 전체 상태를 저장하고, 나머지 턴은 직전 키프레임 대비 변경분만 JSON Patch(RFC 6902) 부분집합으로 저장합니다.
+# - 델타는 항상 키프레임 기준이므로 어떤 턴이든 "키프레임 1개 + 델타 1개"로 복원됨
+# - 중간 턴을 지우거나 고쳐도 다른 턴의 델타에 영향이 없음
+# 사용하는 연산: add / remove / replace (경로는 JSON Pointer, 리스트 끝 추가는 "-")
+
+SNAPSHOT_FIELDS = (
+    "observedMap",
+    "researchState",
+    "productionState",
+    "diplomacyState",
+    "resourceState",
+    "stateData",
+    "playerResources",
+)
+
+Patch = List[Dict[str, Any]]
+
+
+def normalize(value: Any) -> Any:
+    """JSON 문자열로 저장된 값은 파싱해서 반환합니다."""
+    if isinstance(value, str):
+        try:
+            return json.loads(value)
+        except ValueError:
+            return value
+    return value
+
+
+def _escape(key: Any) -> str:
+    return str(key).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def diff(old: Any, new: Any, path: str = "") -> Patch:
+    """old를 new로 바꾸는 패치를 생성합니다."""
+    if old == new:
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: Patch = []
+        for key, old_value in old.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in new:
+                ops.append({"op": "remove", "path": child})
+            else:
+                ops.extend(diff(old_value, new[key], child))
+        for key, new_value in new.items():
+            if key not in old:
+                ops.append({"op": "add", "path": f"{path}/{_escape(key)}", "value": new_value})
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        # 앞부분이 같고 뒤에 추가된 경우(탐색 타일 누적 등)는 추가분만 기록
+        if len(new) > len(old) and new[:len(old)] == old:
+            return [{"op": "add", "path": f"{path}/-", "value": item} for item in new[len(old):]]
+        # 길이가 같으면 원소 단위로 비교
+        if len(new) == len(old):
+            ops = []
+            for index, (old_item, new_item) in enumerate(zip(old, new)):
+                ops.extend(diff(old_item, new_item, f"{path}/{index}"))
+            # 원소 변경이 많으면 리스트 전체 교체가 더 작음
+            if len(ops) > len(new) // 2 + 1:
+                return [{"op": "replace", "path": path, "value": new}]
+            return ops
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def apply_patch(doc: Any, patch: Patch, in_place: bool = False) -> Any:
+    """패치를 적용한 문서를 반환합니다. in_place가 False면 원본을 복사해서 적용합니다."""
+    if not patch:
+        return doc
+    if not in_place:
+        doc = copy.deepcopy(doc)
+    for op in patch:
+        path = op["path"]
+        if path == "":
+            if op["op"] == "remove":
+                doc = None
+            else:
+                doc = copy.deepcopy(op["value"]) if in_place else op["value"]
+            continue
+        tokens = [_unescape(token) for token in path.split("/")[1:]]
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+        last = tokens[-1]
+        value = op.get("value")
+        if isinstance(parent, list):
+            if last == "-":
+                parent.append(value)
+            elif op["op"] == "add":
+                parent.insert(int(last), value)
+            elif op["op"] == "remove":
+                del parent[int(last)]
+            else:
+                parent[int(last)] = value
+        else:
+            if op["op"] == "remove":
+                parent.pop(last, None)
+            else:
+                parent[last] = value
+    return doc
+
+
+def encode_delta(keyframe: Dict[str, Any], state: Dict[str, Any]) -> Dict[str, Patch]:
+    """필드별로 키프레임 대비 변경분을 계산합니다. 변경이 없는 필드는 생략합니다."""
+    delta = {}
+    for field in SNAPSHOT_FIELDS:
+        patch = diff(normalize(keyframe.get(field)), normalize(state.get(field)))
+        if patch:
+            delta[field] = patch
+    return delta
+
+
+def decode_delta(keyframe: Dict[str, Any], delta: Optional[Dict[str, Patch]]) -> Dict[str, Any]:
+    """키프레임에 델타를 적용해 전체 상태를 복원합니다."""
+    delta = delta or {}
+    state = {}
+    for field in SNAPSHOT_FIELDS:
+        base = normalize(keyframe.get(field))
+        patch = delta.get(field)
+        state[field] = apply_patch(base, patch) if patch else base
+    return state
+
+
+# ---- 콜드 스냅샷 압축 ----
+# zstandard가 설치되어 있으면 zstd, 없으면 표준 라이브러리 zlib으로 압축합니다.
+
+
+def compress_state(state: Dict[str, Any], level: int = 10) -> Tuple[str, bytes]:
+    """전체 상태를 압축합니다. (인코딩 이름, 압축 바이트)"""
+    raw = json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=level).compress(raw)
+    return "zlib", zlib.compress(raw, min(level, 9))
+
+
+def decompress_state(encoding: str, data: bytes) -> Dict[str, Any]:
+    if encoding == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd로 압축된 스냅샷을 읽으려면 zstandard 패키지가 필요합니다.")
+        raw = zstandard.ZstdDecompressor().decompress(data)
+    elif encoding == "zlib":
+        raw = zlib.decompress(data)
+    else:
+        raise ValueError(f"알 수 없는 스냅샷 압축 방식: {encoding}")
+    return json.loads(raw.decode("utf-8"))
@@ -0,0 +1,177 @@
+import asyncio
+import os
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from prisma import Json
+
+from db.client import prisma
+from services.snapshot_store import SnapshotState, TurnSnapshotStore, compressed_columns, snapshot_store
+
+# TurnSnapshot 보존 정책 작업 (요청 경로 밖에서 주기적으로 실행)
+# - 게임의 최근 SNAPSHOT_KEEP_FULL_TURNS 턴은 그대로 유지
+# - 그보다 오래된(콜드) 턴은 SNAPSHOT_THIN_EVERY 턴마다 하나만 남기고 삭제 (1턴은 항상 유지)
+# - 남긴 콜드 턴은 독립 키프레임으로 바꾸고 zstd(없으면 zlib)로 압축 → 읽을 때 snapshot_store가 자동 해제
+# - 최근 턴의 델타가 참조하는 콜드 키프레임은 삭제하지 않음
+# 한 번에 처리하는 게임 수와 행 수는 제한되며, 처리한 행은 retainedAt으로 표시해 다시 다루지 않습니다.
+
+SNAPSHOT_KEEP_FULL_TURNS = int(os.getenv("SNAPSHOT_KEEP_FULL_TURNS", "20"))
+SNAPSHOT_THIN_EVERY = int(os.getenv("SNAPSHOT_THIN_EVERY", "5"))
+SNAPSHOT_COMPRESS = os.getenv("SNAPSHOT_COMPRESS", "true").lower() == "true"
+SNAPSHOT_RETENTION_BATCH = int(os.getenv("SNAPSHOT_RETENTION_BATCH", "100"))
+SNAPSHOT_RETENTION_GAMES = int(os.getenv("SNAPSHOT_RETENTION_GAMES", "20"))
+SNAPSHOT_RETENTION_INTERVAL = float(os.getenv("SNAPSHOT_RETENTION_INTERVAL", "600"))
+
+
+class SnapshotRetentionJob:
+    def __init__(
+        self,
+        db,
+        store: TurnSnapshotStore,
+        keep_full_turns: int = SNAPSHOT_KEEP_FULL_TURNS,
+        thin_every: int = SNAPSHOT_THIN_EVERY,
+        compress: bool = SNAPSHOT_COMPRESS,
+        batch_size: int = SNAPSHOT_RETENTION_BATCH,
+        games_per_run: int = SNAPSHOT_RETENTION_GAMES,
+        interval: float = SNAPSHOT_RETENTION_INTERVAL,
+    ):
+        self.db = db
+        self.store = store
+        self.keep_full_turns = max(1, keep_full_turns)
+        self.thin_every = max(1, thin_every)
+        self.compress = compress
+        self.batch_size = max(1, batch_size)
+        self.games_per_run = max(1, games_per_run)
+        self.interval = interval
+        self._cursor = 0
+        self._task: Optional[asyncio.Task] = None
+        self.stats = {"runs": 0, "deleted": 0, "compacted": 0, "errors": 0}
+
+    def _keep(self, turn: int) -> bool:
+        return turn == 1 or turn % self.thin_every == 0
+
+    # ---- 게임 단위 처리 ----
+
+    async def apply(self, game_id: Any) -> Dict[str, int]:
+        """게임 하나에 보존 정책을 적용합니다. (최대 batch_size 행 + 키프레임 구간 하나)"""
+        result = {"deleted": 0, "compacted": 0}
+        latest = await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id},
+            order={"turnNumber": "desc"}
+        )
+        if latest is None:
+            return result
+        cutoff = latest.turnNumber - self.keep_full_turns
+        if cutoff <= 1:
+            return result
+
+        # 최근 턴 델타가 참조하는 키프레임은 유지
+        hot_deltas = await self.db.turnsnapshot.find_many(
+            where={"gameId": game_id, "isKeyframe": False, "turnNumber": {"gte": cutoff}}
+        )
+        referenced = {row.keyframeTurn for row in hot_deltas}
+
+        # 같은 키프레임을 쓰는 행은 한 배치에서 함께 처리해야 키프레임을 안전하게 지울 수 있음
+        take = self.batch_size + self.store.keyframe_interval
+        rows = await self.db.turnsnapshot.find_many(
+            where={"gameId": game_id, "turnNumber": {"lt": cutoff}, "retainedAt": None},
+            order={"turnNumber": "asc"},
+            take=take
+        )
+        if not rows:
+            return result
+        groups: Dict[int, List[Any]] = {}
+        for row in rows:
+            groups.setdefault(row.keyframeTurn if row.keyframeTurn is not None else row.turnNumber, []).append(row)
+        if len(rows) == take and len(groups) > 1:
+            # 잘렸을 수 있는 마지막 구간은 다음 실행으로 미룸
+            groups.pop(max(groups))
+
+        now = datetime.now()
+        delete_ids = []
+        updates = []
+        for keyframe_turn, members in groups.items():
+            keyframe_row = next((row for row in members if row.isKeyframe), None)
+            for row in members:
+                keep = self._keep(row.turnNumber) or (row.isKeyframe and row.turnNumber in referenced)
+                if not keep:
+                    delete_ids.append(row.id)
+                    continue
+                snapshot: SnapshotState = await self.store.restore(row, keyframe_row)
+                columns = (
+                    compressed_columns(snapshot.state()) if self.compress
+                    else self.store.keyframe_columns(snapshot.state())
+                )
+                columns.update({
+                    "isKeyframe": True,
+                    "keyframeTurn": row.turnNumber,
+                    "delta": Json(None),
+                    "retainedAt": now,
+                })
+                updates.append((row.id, columns))
+
+        # 독립 키프레임으로 바꾼 뒤 삭제 (중간에 실패해도 남은 델타가 깨지지 않도록)
+        if updates:
+            async with self.db.batch_() as batcher:
+                for row_id, columns in updates:
+                    batcher.turnsnapshot.update(where={"id": row_id}, data=columns)
+        if delete_ids:
+            await self.db.turnsnapshot.delete_many(where={"id": {"in": delete_ids}})
+
+        result["deleted"] = len(delete_ids)
+        result["compacted"] = len(updates)
+        return result
+
+    # ---- 주기 실행 ----
+
+    async def run_once(self) -> Dict[str, int]:
+        """다음 게임 묶음(games_per_run개)에 정책을 적용합니다. 마지막 게임 이후에는 처음부터 다시."""
+        games = await self.db.game.find_many(
+            where={"id": {"gt": self._cursor}},
+            order={"id": "asc"},
+            take=self.games_per_run
+        )
+        if not games:
+            self._cursor = 0
+            return {"deleted": 0, "compacted": 0}
+
+        total = {"deleted": 0, "compacted": 0}
+        for game in games:
+            try:
+                result = await self.apply(game.id)
+                total["deleted"] += result["deleted"]
+                total["compacted"] += result["compacted"]
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"스냅샷 보존 작업 오류 (게임 ID {game.id}): {str(e)}")
+            self._cursor = game.id
+
+        self.stats["runs"] += 1
+        self.stats["deleted"] += total["deleted"]
+        self.stats["compacted"] += total["compacted"]
+        return total
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.run_once()
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"스냅샷 보존 작업 주기 오류: {str(e)}")
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+
+snapshot_retention = SnapshotRetentionJob(prisma, snapshot_store)
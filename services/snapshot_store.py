@@ -0,0 +1,241 @@
+import os
+from typing import Any, Callable, Dict, List, Optional
+
+from prisma import Base64, Json
+
+from db.client import prisma
+from services.snapshot_codec import (
+    SNAPSHOT_FIELDS,
+    compress_state,
+    decode_delta,
+    decompress_state,
+    encode_delta,
+    normalize,
+)
+
+# TurnSnapshot 저장/복원 API
+# - KEYFRAME_INTERVAL 턴마다 전체 상태(키프레임)를 저장하고, 그 사이 턴은 키프레임 대비 델타만 저장
+# - 어떤 턴이든 키프레임 + 해당 턴 델타 2개 행으로 복원
+# - 보존 작업이 압축한 콜드 행(compression/compressedState)은 읽을 때 자동으로 압축 해제
+# TurnSnapshot을 읽고 쓰는 코드는 이 모듈을 통해야 합니다. (델타 행의 상태 컬럼은 비어 있음)
+
+SNAPSHOT_KEYFRAME_INTERVAL = int(os.getenv("SNAPSHOT_KEYFRAME_INTERVAL", "10"))
+
+
+class SnapshotState:
+    """복원된 턴 스냅샷 (TurnSnapshot 행과 같은 속성 이름 사용)"""
+
+    __slots__ = ("id", "gameId", "civId", "turnNumber", "year", "createdAt", "isKeyframe") + SNAPSHOT_FIELDS
+
+    def __init__(self, row: Any, state: Dict[str, Any]):
+        self.id = row.id
+        self.gameId = row.gameId
+        self.civId = row.civId
+        self.turnNumber = row.turnNumber
+        self.year = getattr(row, "year", None)
+        self.createdAt = getattr(row, "createdAt", None)
+        self.isKeyframe = row.isKeyframe
+        for field in SNAPSHOT_FIELDS:
+            setattr(self, field, state.get(field))
+
+    def state(self) -> Dict[str, Any]:
+        return {field: getattr(self, field) for field in SNAPSHOT_FIELDS}
+
+
+def _json(value: Any) -> Json:
+    return Json(normalize(value))
+
+
+def row_state(row: Any) -> Dict[str, Any]:
+    """키프레임 행의 전체 상태 (압축된 행은 압축 해제)"""
+    if row is None:
+        return {}
+    if getattr(row, "compression", None):
+        return decompress_state(row.compression, row.compressedState.decode())
+    return {field: normalize(getattr(row, field, None)) for field in SNAPSHOT_FIELDS}
+
+
+def compressed_columns(state: Dict[str, Any]) -> Dict[str, Any]:
+    """상태를 압축 컬럼에 저장하고 JSON 상태 컬럼은 비웁니다."""
+    encoding, data = compress_state(state)
+    columns: Dict[str, Any] = {field: Json(None) for field in SNAPSHOT_FIELDS}
+    columns.update({"compression": encoding, "compressedState": Base64.encode(data)})
+    return columns
+
+
+class TurnSnapshotStore:
+    def __init__(self, db, keyframe_interval: int = SNAPSHOT_KEYFRAME_INTERVAL):
+        self.db = db
+        self.keyframe_interval = max(1, keyframe_interval)
+        self._listeners: List[Callable[[Any], None]] = []
+
+    def on_change(self, callback: Callable[[Any], None]) -> None:
+        """턴 상태가 저장/수정될 때 game_id로 호출할 콜백을 등록합니다. (읽기 캐시 무효화 등)"""
+        self._listeners.append(callback)
+
+    def _notify(self, game_id: Any) -> None:
+        for callback in self._listeners:
+            callback(game_id)
+
+    # ---- 조회 ----
+
+    async def _keyframe_for(self, game_id: Any, turn: int):
+        return await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id, "isKeyframe": True, "turnNumber": {"lte": turn}},
+            order={"turnNumber": "desc"}
+        )
+
+    async def restore(self, row: Any, keyframe: Any = None) -> SnapshotState:
+        if row.isKeyframe:
+            return SnapshotState(row, row_state(row))
+        if keyframe is None or keyframe.turnNumber != row.keyframeTurn:
+            keyframe = await self.db.turnsnapshot.find_first(
+                where={"gameId": row.gameId, "isKeyframe": True, "turnNumber": row.keyframeTurn}
+            )
+        return SnapshotState(row, decode_delta(row_state(keyframe), row.delta))
+
+    async def load(self, game_id: Any, turn: int) -> Optional[SnapshotState]:
+        """지정한 턴의 전체 상태를 복원합니다."""
+        row = await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id, "turnNumber": turn}
+        )
+        if row is None:
+            return None
+        return await self.restore(row)
+
+    async def latest(self, game_id: Any) -> Optional[SnapshotState]:
+        """가장 최근 턴의 상태를 복원합니다."""
+        row = await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id},
+            order={"turnNumber": "desc"}
+        )
+        if row is None:
+            return None
+        return await self.restore(row)
+
+    async def load_range(self, game_id: Any, start: int, end: int) -> List[SnapshotState]:
+        """start~end 턴의 상태를 순서대로 복원합니다. (키프레임은 한 번씩만 조회)"""
+        rows = await self.db.turnsnapshot.find_many(
+            where={"gameId": game_id, "turnNumber": {"gte": start, "lte": end}},
+            order={"turnNumber": "asc"}
+        )
+        keyframes = {row.turnNumber: row for row in rows if row.isKeyframe}
+        result = []
+        for row in rows:
+            keyframe = keyframes.get(row.keyframeTurn) if not row.isKeyframe else None
+            if not row.isKeyframe and keyframe is None:
+                keyframe = await self._keyframe_for(game_id, row.turnNumber)
+                if keyframe is not None:
+                    keyframes[keyframe.turnNumber] = keyframe
+            result.append(await self.restore(row, keyframe))
+        return result
+
+    # ---- 저장 ----
+
+    def keyframe_columns(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        # 모든 상태 필드를 명시적으로 기록 (값이 없는 필드도 null로 덮어써서 교체/수정 시 이전 값이 남지 않도록), 압축 상태는 해제
+        columns: Dict[str, Any] = {field: _json(state.get(field)) for field in SNAPSHOT_FIELDS}
+        columns.update({"compression": None, "compressedState": None})
+        return columns
+
+    def _delta_columns(self, keyframe: Any, state: Dict[str, Any]) -> Dict[str, Any]:
+        # 델타 행은 상태 컬럼을 비워 두고 delta만 저장
+        return {"delta": Json(encode_delta(row_state(keyframe), state))}
+
+    def keyframe_row(
+        self,
+        game_id: Any,
+        turn: int,
+        civ_id: Any,
+        state: Dict[str, Any],
+        year: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """키프레임 행 생성 데이터 (게임 초기화처럼 다른 트랜잭션 안에서 첫 스냅샷을 만들 때 사용)"""
+        data: Dict[str, Any] = {"gameId": game_id, "turnNumber": turn, "civId": civ_id}
+        if year is not None:
+            data["year"] = year
+        data.update(self.keyframe_columns(state))
+        data.update({"isKeyframe": True, "keyframeTurn": turn})
+        return data
+
+    async def save(
+        self,
+        game_id: Any,
+        turn: int,
+        civ_id: Any,
+        state: Dict[str, Any],
+        year: Optional[int] = None,
+    ) -> SnapshotState:
+        """턴 상태를 저장합니다. 같은 턴이 이미 있으면 교체합니다."""
+        existing = await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id, "turnNumber": turn}
+        )
+        if existing is not None:
+            return await self.update(game_id, turn, state, replace=True)
+
+        keyframe = await self._keyframe_for(game_id, turn)
+        if keyframe is None or turn - keyframe.turnNumber >= self.keyframe_interval:
+            data = self.keyframe_row(game_id, turn, civ_id, state, year)
+        else:
+            data = {"gameId": game_id, "turnNumber": turn, "civId": civ_id}
+            if year is not None:
+                data["year"] = year
+            data.update(self._delta_columns(keyframe, state))
+            data.update({"isKeyframe": False, "keyframeTurn": keyframe.turnNumber})
+
+        row = await self.db.turnsnapshot.create(data=data)
+        self._notify(game_id)
+        return SnapshotState(row, {field: normalize(state.get(field)) for field in SNAPSHOT_FIELDS})
+
+    async def update(
+        self,
+        game_id: Any,
+        turn: int,
+        changes: Dict[str, Any],
+        replace: bool = False,
+    ) -> Optional[SnapshotState]:
+        """턴 상태의 일부 필드를 수정합니다. replace=True면 주어진 상태로 전체를 교체합니다.
+
+        키프레임을 수정하면 같은 구간의 델타를 새 키프레임 기준으로 다시 인코딩합니다.
+        """
+        row = await self.db.turnsnapshot.find_first(
+            where={"gameId": game_id, "turnNumber": turn}
+        )
+        if row is None:
+            return None
+        current = await self.restore(row)
+        if replace:
+            state = {field: normalize(changes.get(field)) for field in SNAPSHOT_FIELDS}
+        else:
+            state = current.state()
+            state.update({field: normalize(value) for field, value in changes.items() if field in SNAPSHOT_FIELDS})
+
+        if not row.isKeyframe:
+            keyframe = await self.db.turnsnapshot.find_first(
+                where={"gameId": game_id, "isKeyframe": True, "turnNumber": row.keyframeTurn}
+            )
+            await self.db.turnsnapshot.update(
+                where={"id": row.id},
+                data=self._delta_columns(keyframe, state)
+            )
+            self._notify(game_id)
+            return SnapshotState(row, state)
+
+        # 키프레임 변경: 의존하는 델타를 먼저 전체 상태로 복원한 뒤 새 기준으로 재인코딩
+        dependents = await self.db.turnsnapshot.find_many(
+            where={"gameId": game_id, "isKeyframe": False, "keyframeTurn": turn}
+        )
+        restored = [(dependent, await self.restore(dependent, row)) for dependent in dependents]
+
+        async with self.db.batch_() as batcher:
+            batcher.turnsnapshot.update(where={"id": row.id}, data=self.keyframe_columns(state))
+            for dependent, snapshot in restored:
+                batcher.turnsnapshot.update(
+                    where={"id": dependent.id},
+                    data={"delta": Json(encode_delta(state, snapshot.state()))}
+                )
+        self._notify(game_id)
+        return SnapshotState(row, state)
+
+
+snapshot_store = TurnSnapshotStore(prisma)
@@ -0,0 +1,116 @@
+import asyncio
+import os
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set
+
+# 게임 요약(GameSummary) 생성 백그라운드 작업 큐
+# - end_turn은 submit()만 호출하고 바로 응답 (요약 생성은 요청 경로 밖에서 실행)
+# - 같은 게임의 대기 중인 요청은 가장 최근 턴 하나로 합쳐서 upsert 한 번만 실행
+# - 동시에 처리하는 게임 수는 워커 수(concurrency)로 제한하고, 한 게임은 한 워커만 처리
+# - 예외(일시적 오류)만 지수 백오프로 재시도, 그 사이 더 최근 턴이 들어오면 재시도 대신 새 턴 처리
+# - 핸들러가 False를 반환하면 요약할 데이터가 없다는 뜻이므로 재시도하지 않고 건너뜀 (skipped)
+
+SUMMARY_WORKER_CONCURRENCY = int(os.getenv("SUMMARY_WORKER_CONCURRENCY", "2"))
+SUMMARY_WORKER_RETRIES = int(os.getenv("SUMMARY_WORKER_RETRIES", "3"))
+SUMMARY_WORKER_RETRY_DELAY = float(os.getenv("SUMMARY_WORKER_RETRY_DELAY", "1.0"))
+SUMMARY_WORKER_MAX_PENDING = int(os.getenv("SUMMARY_WORKER_MAX_PENDING", "10000"))
+
+SummaryHandler = Callable[[str, int], Awaitable[Any]]
+
+
+class SummaryWorker:
+    def __init__(
+        self,
+        handler: SummaryHandler,
+        concurrency: int = SUMMARY_WORKER_CONCURRENCY,
+        max_retries: int = SUMMARY_WORKER_RETRIES,
+        retry_delay: float = SUMMARY_WORKER_RETRY_DELAY,
+        max_pending: int = SUMMARY_WORKER_MAX_PENDING,
+    ):
+        self.handler = handler
+        self.concurrency = max(1, concurrency)
+        self.max_retries = max(0, max_retries)
+        self.retry_delay = retry_delay
+        self.max_pending = max_pending
+        self._pending: Dict[str, int] = {}
+        self._running: Set[str] = set()
+        self._queue: "asyncio.Queue[str]" = asyncio.Queue()
+        self._workers: List[asyncio.Task] = []
+        self.stats = {"submitted": 0, "coalesced": 0, "processed": 0, "skipped": 0, "retries": 0, "failed": 0, "dropped": 0}
+
+    def submit(self, game_id: Any, turn: int) -> bool:
+        """게임의 요약 생성을 예약합니다. 큐가 가득 차면 False."""
+        key = str(game_id)
+        self.stats["submitted"] += 1
+        if key in self._pending:
+            self._pending[key] = max(self._pending[key], turn)
+            self.stats["coalesced"] += 1
+            return True
+        if len(self._pending) >= self.max_pending:
+            self.stats["dropped"] += 1
+            print(f"요약 작업 큐가 가득 차서 요청을 버립니다. (게임 ID {key}, 턴 {turn})")
+            return False
+        self._pending[key] = turn
+        # 처리 중인 게임은 끝난 뒤 다시 큐에 넣음
+        if key not in self._running:
+            self._queue.put_nowait(key)
+        return True
+
+    def pending(self) -> int:
+        return len(self._pending)
+
+    async def join(self) -> None:
+        """큐에 들어간 작업이 모두 끝날 때까지 기다립니다."""
+        await self._queue.join()
+
+    async def _process(self, key: str, turn: int) -> None:
+        for attempt in range(self.max_retries + 1):
+            try:
+                if await self.handler(key, turn) is False:
+                    self.stats["skipped"] += 1
+                    return
+                self.stats["processed"] += 1
+                return
+            except Exception as e:
+                error = str(e)
+            if key in self._pending:
+                # 더 최근 턴이 대기 중이면 이 턴은 재시도하지 않음
+                return
+            if attempt < self.max_retries:
+                self.stats["retries"] += 1
+                await asyncio.sleep(self.retry_delay * (2 ** attempt))
+        self.stats["failed"] += 1
+        print(f"게임 요약 생성 실패 (게임 ID {key}, 턴 {turn}): {error}")
+
+    async def _run(self) -> None:
+        while True:
+            key = await self._queue.get()
+            try:
+                turn = self._pending.pop(key, None)
+                if turn is None:
+                    continue
+                self._running.add(key)
+                try:
+                    await self._process(key, turn)
+                finally:
+                    self._running.discard(key)
+                    if key in self._pending:
+                        self._queue.put_nowait(key)
+            finally:
+                self._queue.task_done()
+
+    def start(self) -> None:
+        if not self._workers:
+            self._workers = [asyncio.create_task(self._run()) for _ in range(self.concurrency)]
+
+    async def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """대기 중인 작업을 timeout까지 처리한 뒤 워커를 종료합니다."""
+        if not self._workers:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            print(f"요약 작업 {len(self._pending)}건을 처리하지 못하고 종료합니다.")
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
@@ -0,0 +1,124 @@
+import asyncio
+import os
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from prisma import Json
+from prisma.errors import UniqueViolationError
+
+from db.client import prisma
+
+# 턴 종료 동시성 제어
+# - 같은 프로세스 안에서는 게임별 asyncio.Lock으로 턴 종료를 한 번에 하나씩 처리
+# - 워커가 여러 개여도 작업 전에 턴을 선점(claim): Game.version 조건부 증가 + 처리 중 TurnCommit 행 삽입을
+#   한 트랜잭션으로 실행 → 선점에 실패한 요청은 아무것도 쓰지 않고 409
+# - 처리 결과는 선점한 TurnCommit 행에 저장하고, 같은 게임에서 같은 키로 재시도하면 저장된 응답을 반환 (조회 1회)
+# - 처리 중 실패하면 선점을 해제해 재시도할 수 있고, 워커가 죽어 남은 선점은 TURN_CLAIM_TIMEOUT초 후 다시 선점 가능
+
+TURN_CLAIM_TIMEOUT = float(os.getenv("TURN_CLAIM_TIMEOUT", "300"))
+
+
+class TurnConflictError(Exception):
+    """다른 요청이 같은 게임의 턴을 먼저 커밋한 경우"""
+
+
+class GameTurnLocks:
+    """게임별 비동기 잠금 (기다리는 요청이 없으면 정리)"""
+
+    def __init__(self):
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._holders: Dict[str, int] = {}
+
+    @asynccontextmanager
+    async def hold(self, game_id: Any):
+        key = str(game_id)
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._holders[key] = self._holders.get(key, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self._holders[key] -= 1
+            if not self._holders[key]:
+                del self._holders[key]
+                del self._locks[key]
+
+    def locked(self, game_id: Any) -> bool:
+        lock = self._locks.get(str(game_id))
+        return lock is not None and lock.locked()
+
+
+class TurnCommitLog:
+    def __init__(self, db, claim_timeout: float = TURN_CLAIM_TIMEOUT):
+        self.db = db
+        self.claim_timeout = claim_timeout
+
+    def _stale_before(self) -> datetime:
+        return datetime.now() - timedelta(seconds=self.claim_timeout)
+
+    async def find(self, game_id: Any, turn: int, idempotency_key: str) -> Optional[Any]:
+        """같은 게임에서 같은 멱등성 키 또는 같은 턴으로 선점/커밋된 결과를 조회합니다."""
+        return await self.db.turncommit.find_first(
+            where={
+                "gameId": int(game_id),
+                "OR": [
+                    {"idempotencyKey": idempotency_key},
+                    {"turn": turn},
+                ],
+            }
+        )
+
+    def expired(self, commit: Any) -> bool:
+        """완료되지 않은 채 TURN_CLAIM_TIMEOUT이 지난 선점 (처리하던 워커가 중단됨)"""
+        if commit.completedAt is not None:
+            return False
+        created_at = commit.createdAt
+        if created_at.tzinfo is not None:
+            # DB 값(UTC)을 로컬 시각으로 맞춰 비교
+            created_at = created_at.astimezone().replace(tzinfo=None)
+        return created_at < self._stale_before()
+
+    async def claim(self, game_id: Any, turn: int, idempotency_key: str, expected_version: int) -> Any:
+        """작업 전에 턴을 선점합니다. 버전이 바뀌었거나 이미 선점/커밋되었으면 TurnConflictError."""
+        try:
+            async with self.db.tx() as tx:
+                # 중단된 워커가 남긴 오래된 선점은 정리하고 다시 선점
+                await tx.turncommit.delete_many(
+                    where={
+                        "gameId": int(game_id),
+                        "turn": turn,
+                        "completedAt": None,
+                        "createdAt": {"lt": self._stale_before()},
+                    }
+                )
+                updated = await tx.game.update_many(
+                    where={"id": int(game_id), "version": expected_version},
+                    data={"version": {"increment": 1}}
+                )
+                if updated == 0:
+                    raise TurnConflictError(f"게임 {game_id}의 상태가 다른 요청으로 변경되었습니다.")
+                return await tx.turncommit.create(
+                    data={
+                        "gameId": int(game_id),
+                        "turn": turn,
+                        "idempotencyKey": idempotency_key,
+                    }
+                )
+        except UniqueViolationError:
+            raise TurnConflictError(f"게임 {game_id}의 턴 {turn}은 이미 다른 요청이 처리했거나 처리 중입니다.")
+
+    async def complete(self, claim: Any, response: Dict[str, Any]) -> None:
+        """선점한 턴에 처리 결과를 저장합니다. (이후 같은 키의 재시도는 이 응답을 받음)"""
+        await self.db.turncommit.update(
+            where={"id": claim.id},
+            data={"response": Json(response), "completedAt": datetime.now()}
+        )
+
+    async def release(self, claim: Any) -> None:
+        """처리 중 실패한 선점을 해제합니다. (게임 버전은 이미 올라갔으므로 재시도는 새 버전으로 선점)"""
+        await self.db.turncommit.delete_many(where={"id": claim.id, "completedAt": None})
+
+
+turn_locks = GameTurnLocks()
+turn_commits = TurnCommitLog(prisma)
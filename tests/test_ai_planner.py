@@ -0,0 +1,196 @@
+"""
+AI 턴 계획기 테스트
+
+가짜 프로바이더(tools/fake_llm.py)를 넣은 LLM 라우터로 LLM 모드 계획기를 시험합니다.
+응답은 가짜 LLM 서버와 같은 방식(tools/fake_llm_server.make_plans)으로 프롬프트의 후보 안에서 고릅니다.
+- 검증에 실패한 문명만 규칙 기반 결정으로 대체
+- 예산 시간을 넘기면 규칙 기반 결정으로 응답하고, 늦게 온 응답은 캐시에만 반영
+- 같은 상태(지문)의 계획 캐시, 진행 중인 요청 합류, 배치 묶음
+"""
+import asyncio
+import json
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.ai_engine import RuleBasedAIEngine  # noqa: E402
+from services.ai_planner import AITurnPlanner, PlanValidationError, extract_json, parse_plans, validate_civ_plan  # noqa: E402
+from services.game_catalog import GameCatalog  # noqa: E402
+from services.llm_router import LLMRouter  # noqa: E402
+from tools.bench_turns import seed_game  # noqa: E402
+from tools.fake_db import FakePrisma  # noqa: E402
+from tools.fake_llm import FakeProvider  # noqa: E402
+from tools.fake_llm_server import make_plans  # noqa: E402
+
+
+def _civ(civ_id, personality="Warlike"):
+    return {
+        "id": civ_id,
+        "name": f"Civ {civ_id}",
+        "personality": personality,
+        "cities": [{"id": civ_id * 10, "name": f"City {civ_id}", "population": 3,
+                    "buildings": [], "in_progress": None, "queue": []}],
+        "research": {"completed": [], "in_progress": None, "queue": []},
+        "resources": {"gold": 50, "science": 10, "culture": 5},
+    }
+
+
+def _respond(request):
+    """프롬프트의 후보 안에서 계획을 고르는 응답"""
+    return json.dumps({"plans": make_plans(extract_json(request.messages[0][1]), random.Random(0))})
+
+
+@pytest.fixture
+def catalog():
+    db = FakePrisma()
+    seed_game(db, civs=2, cities=0, units=0, rng=random.Random(1))
+    catalog = GameCatalog(db)
+    asyncio.run(catalog.preload())
+    return catalog
+
+
+def _planner(catalog, provider, **kwargs):
+    kwargs.setdefault("budget_ms", 1000)
+    kwargs.setdefault("batch_window_ms", 1)
+    engine = RuleBasedAIEngine(catalog, jitter=0.0)
+    router = LLMRouter([provider], hedge=False)
+    return AITurnPlanner(engine, catalog, mode="llm", router=router, **kwargs)
+
+
+def _run(planner, coro_fn):
+    async def main():
+        try:
+            return await coro_fn()
+        finally:
+            await planner.stop()
+    return asyncio.run(main())
+
+
+def test_validate_civ_plan_rejects_unknown_city_and_item(catalog):
+    engine = RuleBasedAIEngine(catalog, jitter=0.0)
+    options = engine.options(_civ(2))
+    building_id = options["cities"][20][0]
+
+    valid = validate_civ_plan(
+        {"cities": [{"city_id": "20", "build": {"type": "building", "id": str(building_id)}}], "research": None},
+        options, catalog,
+    )
+    assert valid["cities"] == [{"city_id": 20, "build": {"type": "building", "id": building_id,
+                                                         "name": catalog.building_by_id[building_id].name}}]
+
+    with pytest.raises(PlanValidationError):
+        validate_civ_plan({"cities": [{"city_id": 99, "build": {"type": "building", "id": building_id}}]},
+                          options, catalog)
+    with pytest.raises(PlanValidationError):
+        validate_civ_plan({"cities": [{"city_id": 20, "build": {"type": "unit", "id": -1}}]}, options, catalog)
+    with pytest.raises(PlanValidationError):
+        validate_civ_plan({"research": {"tech_id": -1}}, options, catalog)
+
+
+def test_parse_plans_keeps_valid_civs_and_marks_invalid_ones(catalog):
+    engine = RuleBasedAIEngine(catalog, jitter=0.0)
+    expected = {"1": engine.options(_civ(1)), "2": engine.options(_civ(2))}
+    text = "계획입니다.\n```json\n" + json.dumps({"plans": [
+        {"civ_id": 1, "cities": [], "research": {"tech_id": expected["1"]["techs"][0]}},
+        {"civ_id": 2, "cities": [], "research": {"tech_id": -1}},
+        {"civ_id": 3, "cities": [], "research": None},
+    ]}) + "\n```"
+
+    results = parse_plans(text, expected, catalog)
+
+    assert results["1"]["research"]["tech_id"] == expected["1"]["techs"][0]
+    assert isinstance(results["2"], PlanValidationError)
+    assert "3" not in results
+    with pytest.raises(PlanValidationError):
+        parse_plans('{"plans": ', expected, catalog)
+
+
+def test_invalid_plan_falls_back_for_that_civ_only(catalog):
+    def respond(request):
+        plans = json.loads(_respond(request))["plans"]
+        for plan in plans:
+            if plan["civ_id"] == 2:
+                plan["research"] = {"tech_id": -1}
+        return json.dumps({"plans": plans})
+
+    provider = FakeProvider("fake", text=respond)
+    planner = _planner(catalog, provider)
+    civs = [_civ(1), _civ(2, "Trader")]
+
+    results = _run(planner, lambda: planner.plan(civs, turn=1))
+
+    assert provider.calls == 1
+    assert results["2"] == planner.engine.decide_loaded(civs[1])
+    assert results["1"]["cities"] and results["1"]["research"] is not None
+    assert (planner.stats["llm"], planner.stats["fallback"], planner.stats["invalid"]) == (1, 1, 1)
+
+
+def test_same_state_reuses_cached_plan(catalog):
+    provider = FakeProvider("fake", text=_respond)
+    planner = _planner(catalog, provider)
+
+    async def twice():
+        first = await planner.plan([_civ(1)], turn=1)
+        second = await planner.plan([_civ(1)], turn=1)
+        return first, second
+
+    first, second = _run(planner, twice)
+
+    assert first == second
+    assert provider.calls == 1
+    assert (planner.stats["misses"], planner.stats["hits"]) == (1, 1)
+
+
+def test_budget_timeout_falls_back_and_late_response_fills_cache(catalog):
+    provider = FakeProvider("fake", text=_respond, latency=0.2)
+    planner = _planner(catalog, provider, budget_ms=20)
+    civ = _civ(1)
+
+    async def scenario():
+        timed_out = await planner.plan([civ], turn=1)
+        # 늦게 도착한 응답은 캐시에 반영되어 다음 턴(같은 상태)에 사용
+        await asyncio.sleep(0.3)
+        cached = await planner.plan([civ], turn=1)
+        return timed_out, cached
+
+    timed_out, cached = _run(planner, scenario)
+
+    assert timed_out["1"] == planner.engine.decide_loaded(civ)
+    assert planner.stats["fallback"] == 1
+    assert planner.stats["hits"] == 1
+    assert provider.calls == 1
+    assert cached["1"]["research"] is not None
+
+
+def test_concurrent_requests_for_same_state_share_one_call(catalog):
+    provider = FakeProvider("fake", text=_respond, latency=0.05)
+    planner = _planner(catalog, provider)
+
+    async def together():
+        return await asyncio.gather(planner.plan([_civ(1)], turn=1), planner.plan([_civ(1)], turn=1))
+
+    first, second = _run(planner, together)
+
+    assert first == second
+    assert provider.calls == 1
+    assert planner.stats["llm"] == 2
+
+
+def test_civs_are_batched_into_requests(catalog):
+    provider = FakeProvider("fake", text=_respond)
+    planner = _planner(catalog, provider, batch_size=2, batch_window_ms=20)
+    civs = [_civ(civ_id) for civ_id in (1, 2, 3)]
+
+    async def from_three_games():
+        # 서로 다른 요청(게임)에서 같은 배치 창 안에 들어온 문명들
+        return await asyncio.gather(*(planner.plan([civ], turn=1) for civ in civs))
+
+    results = _run(planner, from_three_games)
+
+    assert [set(result) for result in results] == [{"1"}, {"2"}, {"3"}]
+    assert planner.stats["requests"] == provider.calls == 2
+    assert planner.stats["llm"] == 3
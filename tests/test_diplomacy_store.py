@@ -0,0 +1,85 @@
+"""
+외교 세션 저장소 테스트
+
+인메모리 DB 대체 클라이언트(tools/fake_db.py)로 write-behind 반영을 확인합니다.
+- 게임 문명과 연결할 수 없는 세션은 max_resolve_attempts번 시도한 뒤 캐시에서 버려야 합니다.
+- 두 워커가 같은 세션의 관계 점수를 바꾸면 DB에는 두 변경이 모두 합산되어야 합니다.
+"""
+import asyncio
+import os
+import sys
+from typing import Optional
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.diplomacy_store import DiplomacySessionStore  # noqa: E402
+from tools.fake_db import FakePrisma  # noqa: E402
+
+
+class _Session(BaseModel):
+    session_id: str
+    civilization_id: int
+    game_id: Optional[int] = None
+    player_name: str
+    relationship_score: int
+
+
+def _store(db: FakePrisma, **kwargs) -> DiplomacySessionStore:
+    return DiplomacySessionStore(db, session_model=_Session, player_key=lambda s: s.player_name, **kwargs)
+
+
+def _seed(db: FakePrisma) -> None:
+    db.civtype.insert({"id": 1, "name": "Rome", "personality": "Conqueror"})
+    db.game.insert({"id": 1, "currentTurn": 3})
+    db.gameciv.insert({"id": 10, "gameId": 1, "civTypeId": 2, "isPlayer": True})
+    db.gameciv.insert({"id": 11, "gameId": 1, "civTypeId": 1, "isPlayer": False})
+
+
+def test_unresolved_session_is_dropped_after_max_attempts():
+    db = FakePrisma()
+    _seed(db)
+    store = _store(db, max_resolve_attempts=3)
+    # 게임 2에는 GameCiv가 없어 연결할 수 없음
+    store.put(_Session(session_id="dipl_p_1", civilization_id=1, game_id=2, player_name="p", relationship_score=30))
+
+    async def main():
+        for _ in range(2):
+            assert await store.flush() == 0
+            assert "dipl_p_1" in dict(store.cached_items())
+        assert await store.flush() == 0
+
+    asyncio.run(main())
+
+    assert store.cached_items() == []
+    assert store.stats["unresolved_dropped"] == 1
+    assert not store._dirty
+    assert db.diplomacysession.rows == {}
+
+
+def test_relationship_score_changes_from_two_workers_are_summed():
+    db = FakePrisma()
+    _seed(db)
+
+    async def main():
+        first = _store(db)
+        first.put(_Session(session_id="dipl_p_1", civilization_id=1, game_id=1, player_name="p", relationship_score=30))
+        assert await first.flush() == 1
+
+        # 다른 워커가 DB에서 같은 세션을 읽음
+        second = _store(db)
+        session_a = await first.get("dipl_p_1")
+        session_b = await second.get("dipl_p_1")
+        session_a.relationship_score += 5
+        session_b.relationship_score += 10
+        first.put(session_a)
+        second.put(session_b)
+        await first.flush()
+        await second.flush()
+
+    asyncio.run(main())
+
+    (row,) = db.diplomacysession.rows.values()
+    assert row["relationshipScore"] == 45
+    assert row["aiCivId"] == 11 and row["gameCivId"] == 10
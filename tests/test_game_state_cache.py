@@ -0,0 +1,65 @@
+"""
+게임 상태 읽기 모델 캐시 테스트
+
+- 게임 버전 기록은 max_entries개로 제한되고, 기록에서 밀려나도 이전 버전 키로 저장/조회되지 않아야 합니다.
+- ETag는 응답 본문 해시라서 다른 캐시(워커)에서 같은 상태를 만들면 같은 값이어야 합니다.
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.game_state_cache import GameStateCache  # noqa: E402
+
+
+def test_versions_are_bounded():
+    cache = GameStateCache(max_entries=3)
+    for game_id in range(100):
+        cache.invalidate(game_id)
+
+    assert len(cache._versions) == 3
+    assert list(cache._versions) == ["97", "98", "99"]
+
+
+def test_pruned_game_does_not_accept_stale_key():
+    cache = GameStateCache(max_entries=2)
+    # 게임 1 조회 시작 (이전 버전 키)
+    stale_key = cache.key(1, None)
+    cache.invalidate(1)
+    # 다른 게임들의 무효화로 게임 1이 버전 기록에서 밀려남
+    cache.invalidate(2)
+    cache.invalidate(3)
+    assert "1" not in cache._versions
+
+    cache.put(stale_key, {"turn": 1})
+    assert cache.get(stale_key) is None
+
+    fresh_key = cache.key(1, None)
+    assert fresh_key != stale_key
+    cache.put(fresh_key, {"turn": 2})
+    assert cache.get(fresh_key).payload == {"turn": 2}
+
+
+def test_invalidate_drops_only_that_game():
+    cache = GameStateCache()
+    cache.put(cache.key(1, None), {"turn": 1})
+    cache.put(cache.key(2, None), {"turn": 1})
+
+    cache.invalidate(1)
+
+    assert cache.get(cache.key(1, None)) is None
+    assert cache.get(cache.key(2, None)).payload == {"turn": 1}
+
+
+def test_etag_is_same_across_workers_for_same_state():
+    worker_a, worker_b = GameStateCache(), GameStateCache()
+    # 워커마다 무효화 횟수가 달라도 같은 본문이면 같은 ETag
+    for _ in range(3):
+        worker_a.invalidate(1)
+
+    payload = {"turn": 4, "cities": [{"id": 1}]}
+    etag_a = worker_a.put(worker_a.key(1, None), payload).etag
+    etag_b = worker_b.put(worker_b.key(1, None), dict(payload)).etag
+
+    assert etag_a == etag_b
+    assert etag_a != worker_b.put(worker_b.key(1, None), {"turn": 5, "cities": []}).etag
@@ -0,0 +1,126 @@
+"""
+LLM 프로바이더 라우터 테스트
+
+가짜 프로바이더(tools/fake_llm.py)로 회로 차단기 상태 전이, 지연 시 헤지 요청,
+헤지 경쟁에서 진 호출의 취소, 모든 회로가 열렸을 때의 LLMUnavailableError를 확인합니다.
+"""
+import asyncio
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.llm_router import CircuitBreaker, LLMRequest, LLMRouter, LLMUnavailableError  # noqa: E402
+from tools.fake_llm import FakeProvider  # noqa: E402
+
+REQUEST = LLMRequest(system="테스트")
+
+
+def _expire(breaker: CircuitBreaker) -> None:
+    # 복구 시간이 지난 것처럼 열린 시각을 앞당김
+    breaker.opened_at -= breaker.recovery_timeout + 1
+
+
+def test_breaker_opens_after_threshold_and_recovers_through_half_open():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=30.0)
+
+    breaker.record_failure()
+    assert breaker.state == "closed" and breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+    _expire(breaker)
+    # 복구 시간이 지나면 시험 요청 하나만 허용
+    assert breaker.allow_request()
+    assert breaker.state == "half_open"
+    assert not breaker.allow_request()
+
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert breaker.consecutive_failures == 0
+    assert breaker.allow_request()
+
+
+def test_half_open_probe_failure_reopens_breaker():
+    breaker = CircuitBreaker(failure_threshold=3, recovery_timeout=30.0)
+    for _ in range(3):
+        breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow_request()
+
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.allow_request()
+
+
+def test_cancelled_probe_releases_half_open_slot():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=30.0)
+    breaker.record_failure()
+    _expire(breaker)
+    assert breaker.allow_request()
+
+    breaker.release_probe()
+    assert breaker.state == "half_open"
+    assert breaker.allow_request()
+
+
+def test_fast_primary_is_not_hedged():
+    primary = FakeProvider("primary", text="1순위", latency=0.01)
+    secondary = FakeProvider("secondary", text="2순위")
+    router = LLMRouter([primary, secondary], hedge_default_delay=1.0)
+
+    result = asyncio.run(router.generate(REQUEST))
+
+    assert (result.provider, result.text, result.hedged) == ("primary", "1순위", False)
+    assert secondary.calls == 0
+
+
+def test_slow_primary_is_hedged_and_loser_cancelled():
+    primary = FakeProvider("primary", text="1순위", latency=1.0)
+    secondary = FakeProvider("secondary", text="2순위", latency=0.01)
+    router = LLMRouter([primary, secondary], hedge_default_delay=0.05)
+
+    async def main():
+        result = await router.generate(REQUEST)
+        # 취소가 전달될 때까지 한 번 양보
+        await asyncio.sleep(0)
+        return result
+
+    result = asyncio.run(main())
+
+    assert (result.provider, result.text, result.hedged) == ("secondary", "2순위", True)
+    assert primary.calls == 1 and secondary.calls == 1
+    assert primary.cancelled == 1
+    # 헤지 경쟁에서 진 호출은 실패로 기록하지 않음
+    assert router.health["primary"].failures == 0
+    assert router.breakers["primary"].state == "closed"
+
+
+def test_failed_primary_falls_back_and_opens_breaker():
+    primary = FakeProvider("primary", fail=True)
+    secondary = FakeProvider("secondary", text="2순위")
+    router = LLMRouter([primary, secondary], hedge=False, failure_threshold=2)
+
+    async def main():
+        return [await router.generate(REQUEST) for _ in range(3)]
+
+    results = asyncio.run(main())
+
+    assert [result.provider for result in results] == ["secondary"] * 3
+    # 두 번 실패한 뒤에는 회로가 열려 1순위를 호출하지 않음
+    assert primary.calls == 2
+    assert router.breakers["primary"].state == "open"
+
+
+def test_all_breakers_open_raises_unavailable():
+    providers = [FakeProvider("primary"), FakeProvider("secondary")]
+    router = LLMRouter(providers, failure_threshold=1)
+    for breaker in router.breakers.values():
+        breaker.record_failure()
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(router.generate(REQUEST))
+    assert all(provider.calls == 0 for provider in providers)
@@ -0,0 +1,46 @@
+"""
+턴 처리 핫 쿼리 실행 계획 회귀 테스트
+
+tools/check_query_plans.py와 같은 방법으로 prisma/schema.prisma의 테이블/인덱스를 SQLite 메모리 DB에 만들고,
+핫 쿼리(HOT_QUERIES)마다 필터 컬럼 전체를 쓰는 인덱스 검색을 하는지, 정렬용 임시 B-tree를 만들지 않는지 확인합니다.
+스키마에서 복합 인덱스가 빠지거나 컬럼 순서가 바뀌면 실패합니다.
+"""
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tools.check_query_plans import HOT_QUERIES, SCHEMA_PATH, build_database, check_plan, parse_schema  # noqa: E402
+
+
+@pytest.fixture(scope="module")
+def conn():
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        models = parse_schema(f.read())
+    connection = build_database(models, sorted({model for model, _, _, _ in HOT_QUERIES}), rows=2000)
+    yield connection
+    connection.close()
+
+
+@pytest.mark.parametrize("model,sql,eq_cols,order_cols", HOT_QUERIES, ids=[sql for _, sql, _, _ in HOT_QUERIES])
+def test_hot_query_uses_index(conn, model, sql, eq_cols, order_cols):
+    ok, plan = check_plan(conn, sql, eq_cols, order_cols)
+    assert ok, f"{sql}\n  실행 계획: {plan}"
+
+
+def test_missing_composite_index_is_detected():
+    # 검사 자체가 회귀를 잡는지 확인: PlayerBuilding의 (cityId, status) 인덱스를 빼면 실패해야 함
+    with open(SCHEMA_PATH, encoding="utf-8") as f:
+        models = parse_schema(f.read())
+    models["PlayerBuilding"]["indexes"] = [
+        (unique, cols) for unique, cols in models["PlayerBuilding"]["indexes"] if cols[:2] != ["cityId", "status"]
+    ]
+    connection = build_database(models, ["PlayerBuilding"], rows=2000)
+    try:
+        ok, _ = check_plan(connection, 'SELECT * FROM "PlayerBuilding" WHERE "cityId" = ? AND "status" = ?',
+                           ["cityId", "status"], [])
+    finally:
+        connection.close()
+    assert not ok
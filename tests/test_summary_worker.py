@@ -0,0 +1,57 @@
+"""
+게임 요약 작업 큐 재시도 테스트
+
+핸들러가 False를 반환하면(요약할 스냅샷 없음) 재시도하지 않고 건너뛰고,
+예외(일시적 오류)만 지수 백오프로 재시도해야 합니다.
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.summary_worker import SummaryWorker  # noqa: E402
+
+
+def _run(worker: SummaryWorker, game_id: str, turn: int) -> None:
+    async def main():
+        worker.start()
+        worker.submit(game_id, turn)
+        await worker.join()
+        await worker.stop()
+
+    asyncio.run(main())
+
+
+def test_missing_data_is_skipped_without_retry():
+    calls = []
+
+    async def no_snapshot(game_id, turn):
+        calls.append((game_id, turn))
+        return False
+
+    worker = SummaryWorker(no_snapshot, concurrency=1, max_retries=3, retry_delay=0)
+    _run(worker, "1", 2)
+
+    assert calls == [("1", 2)]
+    assert worker.stats["skipped"] == 1
+    assert worker.stats["retries"] == 0
+    assert worker.stats["failed"] == 0
+
+
+def test_exception_is_retried_until_success():
+    calls = []
+
+    async def flaky(game_id, turn):
+        calls.append(turn)
+        if len(calls) < 3:
+            raise RuntimeError("DB 연결 끊김")
+        return True
+
+    worker = SummaryWorker(flaky, concurrency=1, max_retries=3, retry_delay=0)
+    _run(worker, "1", 5)
+
+    assert calls == [5, 5, 5]
+    assert worker.stats["retries"] == 2
+    assert worker.stats["processed"] == 1
+    assert worker.stats["failed"] == 0
@@ -0,0 +1,189 @@
+"""
+턴 종료 선점 테스트
+
+인메모리 DB 대체 클라이언트(tools/fake_db.py)로 end_turn을 호출합니다.
+워커 두 개가 같은 턴을 동시에 종료하는 경우(프로세스 잠금은 공유되지 않음)에도
+턴 처리(플레이어 상태 반영 + AI 결정 적용)는 한 번만 실행되고, 다른 요청은 아무것도 쓰지 않고 409를 받아야 합니다.
+"""
+import asyncio
+import inspect
+import os
+import random
+import sys
+from contextlib import asynccontextmanager
+from datetime import datetime
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import routers.game as game_router  # noqa: E402
+from services.game_aggregate import game_aggregates  # noqa: E402
+from services.game_catalog import game_catalog  # noqa: E402
+from services.turn_commit import GameTurnLocks, turn_commits  # noqa: E402
+from tools.bench_turns import build_request, seed_game  # noqa: E402
+from tools.fake_db import FakePrisma  # noqa: E402
+
+
+class _WorkerLocks:
+    """워커마다 잠금이 따로 있는 상황 (프로세스 간에는 asyncio.Lock이 공유되지 않음)"""
+
+    @asynccontextmanager
+    async def hold(self, game_id):
+        yield
+
+
+class _Summaries:
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, game_id, turn):
+        self.submitted.append((game_id, turn))
+
+
+@pytest.fixture
+def game_db(monkeypatch):
+    db = FakePrisma()
+    game = seed_game(db, civs=3, cities=2, units=2, rng=random.Random(1))
+    monkeypatch.setattr(game_router, "prisma", db)
+    monkeypatch.setattr(game_router.db_pool, "client", db)
+    monkeypatch.setattr(game_router, "turn_locks", _WorkerLocks())
+    monkeypatch.setattr(game_router, "summary_worker", _Summaries())
+    monkeypatch.setattr(turn_commits, "db", db)
+    monkeypatch.setattr(game_aggregates, "db", db)
+    monkeypatch.setattr(game_catalog, "db", db)
+    game_catalog.invalidate()
+    yield db, game
+    game_catalog.invalidate()
+
+
+def _request(db, game, turn):
+    request_model = inspect.signature(game_router.end_turn).parameters["request"].annotation
+    return build_request(request_model, db, game, turn)
+
+
+def test_concurrent_end_turn_processes_turn_once(game_db, monkeypatch):
+    db, game = game_db
+    processed = []
+    process_turn = game_router.process_turn
+
+    async def counting_process_turn(*args, **kwargs):
+        processed.append(args[2])
+        return await process_turn(*args, **kwargs)
+
+    monkeypatch.setattr(game_router, "process_turn", counting_process_turn)
+
+    # 두 요청이 모두 게임(버전)을 읽은 뒤에 선점을 시도하도록 맞춤
+    readers = []
+    both_read = asyncio.Event()
+    find_game = db.game.find_unique
+
+    async def find_game_then_wait(*args, **kwargs):
+        found = await find_game(*args, **kwargs)
+        readers.append(found)
+        if len(readers) == 2:
+            both_read.set()
+        await asyncio.wait_for(both_read.wait(), timeout=5)
+        return found
+
+    monkeypatch.setattr(db.game, "find_unique", find_game_then_wait)
+
+    async def run_both():
+        return await asyncio.gather(
+            game_router.end_turn(request=_request(db, game, 1), idempotency_key="worker-a"),
+            game_router.end_turn(request=_request(db, game, 1), idempotency_key="worker-b"),
+        )
+
+    responses = asyncio.run(run_both())
+
+    assert sorted(response.status_code for response in responses) == [200, 409]
+    assert processed == [str(game["id"])]
+    assert db.game.rows[game["id"]]["version"] == 1
+    commits = list(db.turncommit.rows.values())
+    assert len(commits) == 1
+    assert commits[0]["completedAt"] is not None
+    assert game_router.summary_worker.submitted == [(str(game["id"]), 1)]
+
+
+def test_idempotency_key_is_scoped_to_game(game_db):
+    db, game = game_db
+    # 다른 게임에서 같은 키로 커밋된 결과
+    db.turncommit.insert({"gameId": 99, "turn": 1, "idempotencyKey": "shared-key",
+                          "response": {"success": True, "message": "다른 게임"}, "completedAt": datetime.now()})
+
+    response = asyncio.run(game_router.end_turn(request=_request(db, game, 1), idempotency_key="shared-key"))
+
+    assert response.status_code == 200
+    assert "Idempotent-Replayed" not in response.headers
+    assert db.game.rows[game["id"]]["version"] == 1
+
+
+def test_failed_turn_releases_claim(game_db, monkeypatch):
+    db, game = game_db
+    process_turn = game_router.process_turn
+    calls = []
+
+    async def fail_once(*args, **kwargs):
+        calls.append(args[3])
+        if len(calls) == 1:
+            raise RuntimeError("AI 처리 실패")
+        return await process_turn(*args, **kwargs)
+
+    monkeypatch.setattr(game_router, "process_turn", fail_once)
+
+    failed = asyncio.run(game_router.end_turn(request=_request(db, game, 1), idempotency_key="retry"))
+    assert failed.status_code == 500
+    assert not db.turncommit.rows
+
+    retried = asyncio.run(game_router.end_turn(request=_request(db, game, 1), idempotency_key="retry"))
+    assert retried.status_code == 200
+    assert len(calls) == 2
+
+
+def test_ai_decisions_are_applied_in_turn_transaction(game_db, monkeypatch):
+    db, game = game_db
+    in_tx = []
+    applied = []
+    tx = db.tx
+
+    @asynccontextmanager
+    async def tracking_tx(*args, **kwargs):
+        async with tx(*args, **kwargs) as client:
+            in_tx.append(True)
+            try:
+                yield client
+            finally:
+                in_tx.pop()
+
+    async def record_apply(game_id, civ_id, decisions, db=None):
+        applied.append((civ_id, bool(in_tx)))
+
+    monkeypatch.setattr(db, "tx", tracking_tx)
+    monkeypatch.setattr(game_router, "apply_ai_decisions", record_apply)
+
+    response = asyncio.run(game_router.end_turn(request=_request(db, game, 1), idempotency_key="tx"))
+
+    assert response.status_code == 200
+    assert applied and all(inside for _, inside in applied)
+
+
+def test_waiting_for_game_lock_does_not_hold_pool_slot(game_db, monkeypatch):
+    db, game = game_db
+    locks = GameTurnLocks()
+    monkeypatch.setattr(game_router, "turn_locks", locks)
+    pool = game_router.db_pool
+
+    async def main():
+        async with locks.hold(str(game["id"])):
+            waiting = asyncio.create_task(
+                game_router.end_turn(request=_request(db, game, 1), idempotency_key="queued")
+            )
+            await asyncio.sleep(0.01)
+            # 앞선 요청이 잠금을 쥐고 있는 동안 기다리는 요청은 풀 슬롯을 잡지 않음
+            assert not waiting.done()
+            assert pool.in_use == 0
+        return await waiting
+
+    response = asyncio.run(main())
+    assert response.status_code == 200
+    assert pool.in_use == 0
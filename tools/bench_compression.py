@@ -0,0 +1,159 @@
+"""
+응답 압축 벤치마크
+
+tools/bench_json.py의 합성 응답(/map/data, /games/{id}, 연구 상태)을 services/compression.py 규칙으로 압축해
+인코딩별 압축률과 압축 시간을 비교하고, CompressionMiddleware를 실제 ASGI 앱에 씌워 다음을 확인합니다.
+- 최소 크기 미만 응답은 압축하지 않음
+- ETag가 있는 응답은 처음 한 번만 압축하고 이후에는 캐시에서 재사용 (압축 시간 vs 캐시 적중 시간)
+- 압축 해제한 본문이 원본과 같음
+
+사용법:
+    python tools/bench_compression.py [--radius 58] [--turns 200] [--repeat 20] [--json]
+"""
+import argparse
+import asyncio
+import gzip
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services import compression, fast_json  # noqa: E402
+from tools.bench_json import game_state_payload, map_payload, research_payload  # noqa: E402
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def decompress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return compression.brotli.decompress(body)
+    return gzip.decompress(body)
+
+
+def body_app(body: bytes, etag: str = None):
+    headers = [(b"content-type", b"application/json"), (b"content-length", str(len(body)).encode())]
+    if etag:
+        headers.append((b"etag", etag.encode()))
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+    return app
+
+
+async def call(app, accept_encoding: str) -> Tuple[Dict[bytes, bytes], bytes]:
+    messages: List[Dict[str, Any]] = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    scope = {"type": "http", "method": "GET", "path": "/", "headers": [(b"accept-encoding", accept_encoding.encode())]}
+    await app(scope, receive, send)
+    return dict(messages[0]["headers"]), b"".join(m.get("body", b"") for m in messages[1:])
+
+
+def middleware_check(body: bytes, encoding: str, repeat: int) -> Dict[str, Any]:
+    """ETag 있는 응답을 같은 미들웨어로 여러 번 보내 첫 압축/캐시 적중 시간과 결과를 확인"""
+    cache = compression.PrecompressedCache()
+    app = compression.CompressionMiddleware(body_app(body, etag='"bench"'), cache=cache)
+    loop = asyncio.new_event_loop()
+    try:
+        started = time.perf_counter()
+        headers, first = loop.run_until_complete(call(app, encoding))
+        first_ms = (time.perf_counter() - started) * 1000
+        cached_ms = timed(lambda: loop.run_until_complete(call(app, encoding)), repeat)
+        if headers.get(b"content-encoding") != encoding.encode() or decompress(first, encoding) != body:
+            raise AssertionError(f"{encoding}: 압축 응답이 원본과 다릅니다.")
+        if headers.get(b"etag") != b'W/"bench"':
+            raise AssertionError("압축 응답의 ETag가 약한 ETag가 아닙니다.")
+        # 최소 크기 미만 응답은 그대로
+        small = compression.CompressionMiddleware(body_app(b'{"ok":true}'), cache=cache)
+        small_headers, small_body = loop.run_until_complete(call(small, encoding))
+        if b"content-encoding" in small_headers or small_body != b'{"ok":true}':
+            raise AssertionError("최소 크기 미만 응답이 압축되었습니다.")
+    finally:
+        loop.close()
+    return {"first_ms": round(first_ms, 3), "cached_ms": cached_ms, "hits": cache.stats["hits"],
+            "compressed": cache.stats["compressed"]}
+
+
+def run(radius: int, turns: int, repeat: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    payloads = {
+        "map_data": map_payload(radius, rng),
+        "game_state": game_state_payload(turns, 40),
+        "research_status": research_payload(rng),
+    }
+    results = {}
+    for name, payload in payloads.items():
+        body = fast_json.dumps(payload)
+        row: Dict[str, Any] = {"bytes": len(body)}
+        for encoding in compression.supported_encodings():
+            compressed = compression.compress(body, encoding)
+            row[encoding] = {
+                "bytes": len(compressed),
+                "ratio": round(len(body) / len(compressed), 1),
+                "compress_ms": timed(lambda: compression.compress(body, encoding), repeat),
+            }
+            if len(body) >= compression.RESPONSE_COMPRESSION_MIN_SIZE:
+                row[encoding]["middleware"] = middleware_check(body, encoding, repeat)
+        results[name] = row
+
+    return {
+        "meta": {"created_at": datetime.now().isoformat(), "map_radius": radius, "turns": turns, "repeat": repeat,
+                 "min_size": compression.RESPONSE_COMPRESSION_MIN_SIZE, "gzip_level": compression.RESPONSE_GZIP_LEVEL,
+                 "brotli": compression.brotli is not None},
+        "endpoints": results,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    meta = result["meta"]
+    print(f"맵 반경 {meta['map_radius']}, {meta['turns']}턴 상태, 최소 크기 {meta['min_size']}B, "
+          f"gzip {meta['gzip_level']}, brotli={'있음' if meta['brotli'] else '없음'} (중앙값, {meta['repeat']}회)\n")
+    print(f"{'endpoint':>16} {'enc':>5} {'KB':>8} {'out_KB':>8} {'ratio':>6} {'compress_ms':>12} {'cached_ms':>10}")
+    for name, row in result["endpoints"].items():
+        for encoding in ("br", "gzip"):
+            data = row.get(encoding)
+            if data is None:
+                continue
+            cached = data.get("middleware", {}).get("cached_ms", "-")
+            print(f"{name:>16} {encoding:>5} {row['bytes'] / 1024:>8.1f} {data['bytes'] / 1024:>8.1f} "
+                  f"{data['ratio']:>6} {data['compress_ms']:>12} {cached:>10}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="응답 압축 벤치마크")
+    parser.add_argument("--radius", type=int, default=58, help="맵 반경 (58이면 약 10k 타일)")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    result = run(args.radius, args.turns, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
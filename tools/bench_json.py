@@ -0,0 +1,167 @@
+"""
+큰 응답 JSON 렌더링 벤치마크
+
+가장 큰 엔드포인트 응답을 합성해서 직렬화 시간을 비교합니다.
+- /map/data: 타일 맵(기본 반경 58, 약 10k 타일) + 문명/도시/유닛 (TileGrid로 get_map_data와 같은 형식)
+- /games/{id}: 200턴 진행한 게임의 stateData (tools/bench_snapshots.py의 합성 상태)
+- 연구 상태: 기술 200개 규모의 completed / available 목록
+직렬화 방식:
+- default: FastAPI 기본 경로 (jsonable_encoder로 복사 → JSONResponse의 json.dumps)
+- fast: services/fast_json.dumps (orjson, 설치되어 있을 때)
+- fast_stdlib: 같은 규칙의 표준 json 대체 경로 (orjson이 없을 때)
+모든 방식의 결과를 다시 읽어 같은 값인지 확인합니다. (2^53 초과 정수는 빠른 경로에서 문자열)
+
+사용법:
+    python tools/bench_json.py [--radius 58] [--turns 200] [--repeat 20] [--json]
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict
+
+from fastapi.encoders import jsonable_encoder
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services import fast_json  # noqa: E402
+from services.game_bootstrap import generate_tiles  # noqa: E402
+from services.hex_grid import TileGrid  # noqa: E402
+from tools.bench_snapshots import simulate_game  # noqa: E402
+
+
+def default_render(content: Any) -> bytes:
+    """FastAPI 기본 경로 (serialize_response → JSONResponse.render)"""
+    return json.dumps(jsonable_encoder(content), ensure_ascii=False, allow_nan=False, indent=None,
+                      separators=(",", ":")).encode("utf-8")
+
+
+def stdlib_render(content: Any) -> bytes:
+    module_orjson = fast_json.orjson
+    fast_json.orjson = None
+    try:
+        return fast_json.dumps(content)
+    finally:
+        fast_json.orjson = module_orjson
+
+
+def map_payload(radius: int, rng: random.Random) -> Dict[str, Any]:
+    grid = TileGrid.from_rows(generate_tiles(radius, rng))
+    coords = [(q, r) for _, q, r, _, _ in grid.cells()]
+    civs = []
+    for civ_id in range(1, 7):
+        cities = [{"id": civ_id * 100 + i, "name": f"도시{i}", "q": q, "r": r, "population": rng.randint(1, 12),
+                   "food": rng.randint(0, 40), "production": rng.randint(0, 40)}
+                  for i, (q, r) in enumerate(rng.sample(coords, 8))]
+        units = [{"id": civ_id * 1000 + i, "typeId": rng.randint(1, 20), "q": q, "r": r, "hp": rng.randint(1, 100)}
+                 for i, (q, r) in enumerate(rng.sample(coords, 40))]
+        civs.append({"id": civ_id, "name": f"문명 {civ_id}", "isPlayer": civ_id == 1, "gold": 100, "science": 20,
+                     "culture": 5, "cities": cities, "units": units})
+    centers = [(city["q"], city["r"]) for city in civs[0]["cities"]] + [(u["q"], u["r"]) for u in civs[0]["units"]]
+    explored = rng.sample(coords, len(coords) // 3)
+    return {
+        "success": True,
+        "status_code": 200,
+        "message": "턴 200의 게임 상태를 조회했습니다.",
+        "data": {"tiles": grid.exploration_tiles(grid.sight_mask(centers, 2), grid.mask_of(explored)), "civs": civs},
+        "player_resources": {"gold": 100, "science": 20, "culture": 5, "food": 40, "production": 30},
+        "meta": {"game_id": 1, "turn": 200, "year": 6000, "createdAt": datetime.now().isoformat()},
+    }
+
+
+def game_state_payload(turns: int, radius: int) -> Dict[str, Any]:
+    state = simulate_game(turns, radius)[-1]
+    return {
+        "success": True,
+        "status_code": 200,
+        "message": f"턴 {turns}의 게임 상태를 조회했습니다.",
+        "data": {**state["stateData"], "observedMap": state["observedMap"], "diplomacy": state["diplomacyState"]},
+        "player_resources": state["playerResources"],
+        # BigInt ID(2^53 초과)와 datetime이 섞인 메타 정보
+        "meta": {"game_id": 2 ** 60 + 7, "turn": turns, "current_turn": turns, "created_at": datetime.now()},
+    }
+
+
+def research_payload(rng: random.Random) -> Dict[str, Any]:
+    tech_ids = list(range(1, 201))
+    completed = sorted(rng.sample(tech_ids, 80))
+    available = [tech_id for tech_id in tech_ids if tech_id not in completed][:60]
+    return {"success": True, "data": {"completed": completed, "inProgress": {"techId": 150, "points": 40,
+                                                                              "required": 300},
+                                      "available": available}, "error": None}
+
+
+def timed(render: Callable[[Any], bytes], content: Any, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        render(content)
+        times.append(time.perf_counter() - started)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def run(radius: int, turns: int, repeat: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    payloads = {
+        "map_data": map_payload(radius, rng),
+        "game_state": game_state_payload(turns, 40),
+        "research_status": research_payload(rng),
+    }
+    renderers = {"default": default_render, "fast_stdlib": stdlib_render}
+    if fast_json.orjson is not None:
+        renderers["fast"] = fast_json.dumps
+
+    results = {}
+    for name, payload in payloads.items():
+        expected = json.loads(default_render(payload))
+        # 빠른 경로는 BigInt 문자열 변환만 다르고 나머지는 같아야 함
+        expected_fast = fast_json.js_safe(expected)
+        row: Dict[str, Any] = {"bytes": len(default_render(payload))}
+        for renderer_name, render in renderers.items():
+            decoded = json.loads(render(payload))
+            if decoded != (expected if renderer_name == "default" else expected_fast):
+                raise AssertionError(f"{name}: {renderer_name} 결과가 기본 경로와 다릅니다.")
+            row[f"{renderer_name}_ms"] = timed(render, payload, repeat)
+        fastest = row.get("fast_ms", row["fast_stdlib_ms"])
+        row["speedup"] = round(row["default_ms"] / fastest, 1) if fastest else None
+        results[name] = row
+
+    return {
+        "meta": {"created_at": datetime.now().isoformat(), "map_radius": radius, "turns": turns, "repeat": repeat,
+                 "orjson": fast_json.orjson is not None},
+        "endpoints": results,
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    meta = result["meta"]
+    print(f"맵 반경 {meta['map_radius']}, {meta['turns']}턴 상태, orjson={'있음' if meta['orjson'] else '없음'} "
+          f"(중앙값, {meta['repeat']}회)\n")
+    print(f"{'endpoint':>16} {'KB':>8} {'default_ms':>11} {'fast_ms':>9} {'stdlib_ms':>10} {'speedup':>8}")
+    for name, row in result["endpoints"].items():
+        print(f"{name:>16} {row['bytes'] / 1024:>8.1f} {row['default_ms']:>11} {row.get('fast_ms', '-'):>9} "
+              f"{row['fast_stdlib_ms']:>10} {row['speedup']:>8}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="큰 응답 JSON 렌더링 벤치마크")
+    parser.add_argument("--radius", type=int, default=58, help="맵 반경 (58이면 약 10k 타일)")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    result = run(args.radius, args.turns, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
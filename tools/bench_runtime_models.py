@@ -0,0 +1,224 @@
+"""
+런타임 모델 메모리/순회 벤치마크
+
+큰 맵(기본 타일 약 10k개, 유닛 2k개)에서 엔진 내부 표현별 메모리와 처리 시간을 비교합니다.
+- 타일: Prisma 모델과 같은 Pydantic 객체(MapTile 필드) / API 모델 HexTile / 열 기반 TileGrid(services/hex_grid.py)
+  생성 시간, 메모리(tracemalloc), 맵 응답 생성(도시·유닛 주변 2헥스 시야 + 탐색 여부 표시) 시간
+- 유닛: Prisma 모델과 같은 Pydantic 객체(GameUnit 필드) / dict / __slots__ UnitState(services/game_aggregate.py)
+  생성 시간, 메모리, 순회(위치 수집 + 체력 합계) 시간
+prisma-client-py의 모델은 Pydantic BaseModel이므로 같은 필드의 BaseModel로 조회 결과 비용을 흉내 냅니다.
+
+사용법:
+    python tools/bench_runtime_models.py [--tiles 10000] [--units 2000] [--repeat 5] [--json]
+"""
+import argparse
+import gc
+import json
+import math
+import os
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from models.hexmap import HexTile  # noqa: E402
+from services.game_aggregate import UnitState  # noqa: E402
+from services.game_bootstrap import generate_tiles  # noqa: E402
+from services.hex_grid import TileGrid  # noqa: E402
+
+SIGHT = 2
+TERRAIN_NAMES = {"Plains": "평지", "Grassland": "초원", "Hills": "언덕", "Forest": "숲", "Desert": "사막",
+                 "Mountain": "산악"}
+
+
+class PrismaMapTile(BaseModel):
+    q: int
+    r: int
+    gameId: int
+    terrain: str
+    resource: str
+
+
+class PrismaGameUnit(BaseModel):
+    id: int
+    q: int
+    r: int
+    hp: int
+    moved: bool
+    createdTurn: int
+    gameCivId: int
+    promotionLevel: int
+    unitTypeId: int
+
+
+def radius_for(tiles: int) -> int:
+    """타일 수가 tiles 이상이 되는 가장 작은 맵 반경"""
+    return max(1, math.ceil((-3 + math.sqrt(9 + 12 * (tiles - 1))) / 6))
+
+
+def measure(build: Callable[[], Any], repeat: int) -> Tuple[Any, float, int]:
+    """(결과, 생성 시간 중앙값 ms, 결과가 차지하는 메모리 바이트)"""
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        build()
+        times.append(time.perf_counter() - started)
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    result = build()
+    gc.collect()
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return result, statistics.median(times) * 1000, used
+
+
+def timed(fn: Callable[[], Any], repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - started)
+    return round(statistics.median(times) * 1000, 3)
+
+
+def object_map_response(tiles: List[Any], centers: List[Tuple[int, int]], explored: set) -> List[Dict[str, Any]]:
+    """기존 get_map_data 방식: (q, r) 집합으로 시야를 만들고 타일 객체마다 조회"""
+    visible = set()
+    for q0, r0 in centers:
+        for dq in range(-SIGHT, SIGHT + 1):
+            for dr in range(max(-SIGHT, -dq - SIGHT), min(SIGHT, -dq + SIGHT) + 1):
+                visible.add((q0 + dq, r0 + dr))
+    return [
+        {"q": tile.q, "r": tile.r, "terrain": tile.terrain, "resource": tile.resource,
+         "exploration": "visible" if (tile.q, tile.r) in visible else
+         "explored" if (tile.q, tile.r) in explored else "unexplored"}
+        for tile in tiles
+    ]
+
+
+def grid_map_response(grid: TileGrid, centers: List[Tuple[int, int]], explored: set) -> List[Dict[str, Any]]:
+    """get_map_data 방식: 마스크로 시야/탐색 표시"""
+    return grid.exploration_tiles(grid.sight_mask(centers, SIGHT), grid.mask_of(explored))
+
+
+def walk_units(units: List[Any], get: Callable[[Any, str], Any]) -> Tuple[int, int]:
+    positions = set()
+    hp = 0
+    for unit in units:
+        positions.add((get(unit, "q"), get(unit, "r")))
+        hp += get(unit, "hp")
+    return len(positions), hp
+
+
+def run(tiles: int, units: int, repeat: int, seed: int) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    radius = radius_for(tiles)
+    rows = generate_tiles(radius, rng)
+    coords = [(row["q"], row["r"]) for row in rows]
+    unit_rows = []
+    for unit_id in range(1, units + 1):
+        q, r = rng.choice(coords)
+        unit_rows.append({"id": unit_id, "q": q, "r": r, "hp": rng.randint(1, 100), "moved": False, "createdTurn": 1,
+                          "gameCivId": unit_id % 8 + 1, "promotionLevel": 0, "unitTypeId": rng.randint(1, 20)})
+    # 플레이어 시야: 도시 10개 + 유닛 중 1/8, 탐색한 타일은 전체의 1/3
+    centers = rng.sample(coords, 10) + [(row["q"], row["r"]) for row in unit_rows if row["gameCivId"] == 1]
+    explored = set(rng.sample(coords, len(coords) // 3))
+
+    tile_results = {}
+    prisma_tiles, build_ms, memory = measure(
+        lambda: [PrismaMapTile(gameId=1, **row) for row in rows], repeat)
+    tile_results["prisma_model"] = {
+        "build_ms": round(build_ms, 3), "bytes": memory,
+        "map_response_ms": timed(lambda: object_map_response(prisma_tiles, centers, explored), repeat),
+    }
+    hex_tiles, build_ms, memory = measure(
+        lambda: [HexTile(q=row["q"], r=row["r"], terrain=TERRAIN_NAMES[row["terrain"]]) for row in rows], repeat)
+    tile_results["pydantic_hextile"] = {
+        "build_ms": round(build_ms, 3), "bytes": memory,
+        "map_response_ms": timed(lambda: object_map_response(hex_tiles, centers, explored), repeat),
+    }
+    grid, build_ms, memory = measure(lambda: TileGrid.from_rows(rows), repeat)
+    tile_results["tile_grid"] = {
+        "build_ms": round(build_ms, 3), "bytes": memory,
+        "map_response_ms": timed(lambda: grid_map_response(grid, centers, explored), repeat),
+    }
+    # 같은 응답을 만드는지 확인
+    expected = object_map_response(prisma_tiles, centers, explored)
+    if grid_map_response(grid, centers, explored) != expected:
+        raise AssertionError("TileGrid 맵 응답이 객체 방식과 다릅니다.")
+
+    class _Row:
+        __slots__ = tuple(unit_rows[0]) if unit_rows else ()
+
+        def __init__(self, values):
+            for key, value in values.items():
+                setattr(self, key, value)
+
+    unit_results = {}
+    by_attr = getattr
+    prisma_units, build_ms, memory = measure(lambda: [PrismaGameUnit(**row) for row in unit_rows], repeat)
+    unit_results["prisma_model"] = {"build_ms": round(build_ms, 3), "bytes": memory,
+                                    "walk_ms": timed(lambda: walk_units(prisma_units, by_attr), repeat)}
+    dict_units, build_ms, memory = measure(lambda: [dict(row) for row in unit_rows], repeat)
+    unit_results["dict"] = {"build_ms": round(build_ms, 3), "bytes": memory,
+                            "walk_ms": timed(lambda: walk_units(dict_units, lambda unit, key: unit[key]), repeat)}
+    # UnitState는 조회 결과 행에서 만들어지므로 행 변환 비용은 제외하고 UnitState 생성만 측정
+    source_rows = [_Row(row) for row in unit_rows]
+    slot_units, build_ms, memory = measure(lambda: [UnitState(row) for row in source_rows], repeat)
+    unit_results["slots_unit_state"] = {
+        "build_ms": round(build_ms, 3), "bytes": memory,
+        "walk_ms": timed(lambda: walk_units(slot_units, by_attr), repeat),
+    }
+
+    return {
+        "meta": {"created_at": datetime.now().isoformat(), "map_radius": radius, "tiles": len(rows),
+                 "units": units, "repeat": repeat, "seed": seed},
+        "tiles": tile_results,
+        "units": unit_results,
+    }
+
+
+def _ratio(base: Dict[str, Any], other: Dict[str, Any], key: str) -> Optional[float]:
+    return round(base[key] / other[key], 1) if other.get(key) else None
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    meta = result["meta"]
+    print(f"맵 반경 {meta['map_radius']}: 타일 {meta['tiles']}개, 유닛 {meta['units']}개 (중앙값, {meta['repeat']}회)\n")
+    for section, walk_key in (("tiles", "map_response_ms"), ("units", "walk_ms")):
+        rows = result[section]
+        print(f"{section:>18} {'build_ms':>10} {'KB':>10} {walk_key:>16}")
+        for name, data in rows.items():
+            print(f"{name:>18} {data['build_ms']:>10} {data['bytes'] / 1024:>10.1f} {data[walk_key]:>16}")
+        base = rows["prisma_model"]
+        last_name, last = list(rows.items())[-1]
+        print(f"{'':>18} prisma_model 대비 {last_name}: 메모리 {_ratio(base, last, 'bytes')}배 적음, "
+              f"{walk_key} {_ratio(base, last, walk_key)}배 빠름\n")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="런타임 모델 메모리/순회 벤치마크")
+    parser.add_argument("--tiles", type=int, default=10000, help="최소 타일 수 (맵 반경을 여기에 맞춤)")
+    parser.add_argument("--units", type=int, default=2000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    result = run(args.tiles, args.units, args.repeat, args.seed)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()
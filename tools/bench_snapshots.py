@@ -0,0 +1,170 @@
+"""
+TurnSnapshot 델타 인코딩 벤치마크
+
+200턴 게임의 턴별 상태를 합성해서
+- 전체 JSON 저장 방식과 키프레임 + 델타 방식의 턴당 기록 바이트
+- 임의 턴 복원 시간(키프레임 + 델타 적용)
+을 비교하고, 모든 턴이 원래 상태로 정확히 복원되는지 확인합니다.
+DB 없이 services/snapshot_codec.py의 인코딩/디코딩만 사용합니다.
+
+사용법:
+    python tools/bench_snapshots.py [--turns 200] [--radius 10] [--keyframe-interval 10] [--json]
+"""
+import argparse
+import copy
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.snapshot_codec import SNAPSHOT_FIELDS, decode_delta, encode_delta  # noqa: E402
+
+
+def _size(value) -> int:
+    return len(json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+def simulate_game(turns: int, radius: int, seed: int = 7):
+    """턴마다 시야 확장, 유닛 이동, 도시 성장, 자원 변화가 있는 상태 목록을 생성합니다."""
+    rng = random.Random(seed)
+    all_tiles = [
+        (q, r) for q in range(-radius, radius + 1) for r in range(-radius, radius + 1)
+        if abs(q) + abs(r) + abs(-q - r) <= 2 * radius
+    ]
+    terrains = ["Plains", "Grassland", "Hills", "Forest", "Desert", "Mountain"]
+    tile_info = {tile: {"terrain": rng.choice(terrains), "resource": "NoResource"} for tile in all_tiles}
+
+    explored = []
+    explored_set = set()
+    cities = [{"id": 1, "name": "수도", "q": 0, "r": 0, "population": 1, "food": 2, "production": 2}]
+    units = [{"id": i, "typeId": rng.randint(1, 8), "q": 0, "r": 0, "hp": 100} for i in range(1, 9)]
+    resources = {"gold": 30, "science": 5, "culture": 0, "food": 20, "production": 10}
+    research = {"current": 1, "progress": 0, "queue": [2, 3, 4], "completed": []}
+    relations = {str(civ): {"score": 30, "status": "neutral"} for civ in range(2, 8)}
+
+    states = []
+    for turn in range(1, turns + 1):
+        # 시야 확장 (턴마다 새 타일 몇 개)
+        for tile in rng.sample(all_tiles, 6):
+            if tile not in explored_set:
+                explored_set.add(tile)
+                explored.append({"q": tile[0], "r": tile[1], **tile_info[tile]})
+        for unit in units:
+            unit["q"] += rng.choice((-1, 0, 1))
+            unit["r"] += rng.choice((-1, 0, 1))
+            if rng.random() < 0.1:
+                unit["hp"] = max(10, unit["hp"] - rng.randint(5, 30))
+        if turn % 15 == 0:
+            units.append({"id": len(units) + 1, "typeId": rng.randint(1, 8), "q": 0, "r": 0, "hp": 100})
+        if turn % 20 == 0:
+            cities.append({"id": len(cities) + 1, "name": f"도시{len(cities) + 1}", "q": rng.randint(-radius, radius),
+                           "r": rng.randint(-radius, radius), "population": 1, "food": 2, "production": 2})
+        for city in cities:
+            if rng.random() < 0.2:
+                city["population"] += 1
+            city["food"] += rng.randint(0, 2)
+            city["production"] += rng.randint(0, 2)
+        for key in resources:
+            resources[key] += rng.randint(0, 6)
+        research["progress"] += rng.randint(3, 10)
+        if research["progress"] >= 100 and research["queue"]:
+            research["completed"].append(research["current"])
+            research["current"] = research["queue"].pop(0)
+            research["queue"].append(research["current"] + 3)
+            research["progress"] = 0
+        if rng.random() < 0.3:
+            civ = rng.choice(list(relations))
+            relations[civ]["score"] += rng.randint(-5, 5)
+
+        states.append(copy.deepcopy({
+            "observedMap": {"tiles": explored},
+            "researchState": research,
+            "productionState": {"current": None, "queue": [{"cityId": c["id"], "itemId": 1} for c in cities]},
+            "diplomacyState": {"relations": relations},
+            "resourceState": resources,
+            "stateData": {"turn": turn, "year": 1000 + turn * 25, "cities": cities, "units": units, "resources": resources},
+            "playerResources": resources,
+        }))
+    return states
+
+
+def run(turns: int, radius: int, interval: int):
+    states = simulate_game(turns, radius)
+
+    full_bytes = []
+    stored_bytes = []
+    rows = []  # (is_keyframe, keyframe_index, payload)
+    encode_times = []
+    keyframe_index = None
+    for index, state in enumerate(states):
+        full_bytes.append(sum(_size(state[field]) for field in SNAPSHOT_FIELDS))
+        started = time.perf_counter()
+        if keyframe_index is None or index - keyframe_index >= interval:
+            keyframe_index = index
+            rows.append((True, index, state))
+            stored_bytes.append(full_bytes[-1])
+        else:
+            delta = encode_delta(states[keyframe_index], state)
+            rows.append((False, keyframe_index, delta))
+            stored_bytes.append(_size(delta))
+        encode_times.append(time.perf_counter() - started)
+
+    restore_times = []
+    mismatches = 0
+    for index, (is_keyframe, base_index, payload) in enumerate(rows):
+        started = time.perf_counter()
+        if is_keyframe:
+            restored = payload
+        else:
+            restored = decode_delta(rows[base_index][2], payload)
+        restore_times.append(time.perf_counter() - started)
+        if restored != states[index]:
+            mismatches += 1
+
+    def ms(values, q):
+        ordered = sorted(values)
+        return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+    return {
+        "turns": turns,
+        "map_radius": radius,
+        "keyframe_interval": interval,
+        "full_bytes_total": sum(full_bytes),
+        "delta_bytes_total": sum(stored_bytes),
+        "full_bytes_per_turn": round(statistics.mean(full_bytes)),
+        "delta_bytes_per_turn": round(statistics.mean(stored_bytes)),
+        "last_turn_full_bytes": full_bytes[-1],
+        "last_turn_stored_bytes": stored_bytes[-1],
+        "compression_ratio": round(sum(full_bytes) / max(1, sum(stored_bytes)), 2),
+        "encode_ms_p50": ms(encode_times, 0.5),
+        "encode_ms_p95": ms(encode_times, 0.95),
+        "restore_ms_p50": ms(restore_times, 0.5),
+        "restore_ms_p95": ms(restore_times, 0.95),
+        "restore_ms_max": ms(restore_times, 1.0),
+        "mismatches": mismatches,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="TurnSnapshot 델타 인코딩 벤치마크")
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--radius", type=int, default=10)
+    parser.add_argument("--keyframe-interval", type=int, default=10)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    result = run(args.turns, args.radius, args.keyframe_interval)
+    if args.json:
+        print(json.dumps(result, indent=2))
+    else:
+        for key, value in result.items():
+            print(f"{key:>24}: {value}")
+    return 1 if result["mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
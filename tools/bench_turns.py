@@ -0,0 +1,307 @@
+"""
+턴 처리 헤드리스 벤치마크
+
+인메모리 DB 대체 클라이언트(tools/fake_db.py)에 문명 N개, 문명당 도시 M개, 유닛 U개인 게임을 만들고
+routers/game.py의 end_turn을 T턴 동안 직접 호출합니다. AI는 규칙 기반 엔진(rule_ai_engine)을 그대로 사용합니다.
+- 턴 지연 p50/p95/max (end_turn 전체)
+- 단계별 시간, 쿼리 수(모델.연산 단위), 기록 바이트
+  (player_updates / idempotency / ai_civ_data / ai_decide / ai_apply / commit, 백그라운드 summary는 별도)
+결과는 JSON으로 저장할 수 있어 커밋 간 회귀 비교에 사용합니다. 실제 DB 지연은 포함되지 않으므로
+쿼리 수와 기록 바이트가 주 지표이고, 시간은 파이썬 처리 비용의 상대 비교용입니다.
+
+사용법:
+    python tools/bench_turns.py [--civs 6] [--cities 5] [--units 10] [--turns 30] [--json] [--out result.json]
+"""
+import argparse
+import asyncio
+import contextlib
+import inspect
+import io
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from tools.fake_db import FakePrisma  # noqa: E402
+
+import routers.game as game_router  # noqa: E402
+from services.ai_engine import rule_ai_engine  # noqa: E402
+from services.game_aggregate import game_aggregates  # noqa: E402
+from services.game_catalog import game_catalog  # noqa: E402
+from services.snapshot_store import snapshot_store  # noqa: E402
+from services.summary_worker import SummaryWorker  # noqa: E402
+from services.turn_commit import turn_commits  # noqa: E402
+
+TREE_TYPES = ["military", "defense", "economic", "science", "diplomacy"]
+BUILDING_CATEGORIES = ["Housing", "Production", "Science", "Defense", "Trade"]
+UNIT_CATEGORIES = ["Melee", "Ranged", "Cavalry", "Siege", "Civilian"]
+PERSONALITIES = ["Diplomat", "Warlike", "Pacifist", "Trader"]
+TURN_STAGES = ("player_updates", "idempotency", "ai_civ_data", "ai_decide", "ai_apply", "commit")
+
+
+def seed_game(db: FakePrisma, civs: int, cities: int, units: int, rng: random.Random) -> Dict[str, Any]:
+    """게임 하나와 카탈로그(기술/건물/유닛 타입)를 채웁니다. 1번 문명이 플레이어입니다."""
+    eras = ["Medieval", "Industrial", "Modern"]
+    for tech_id in range(1, 41):
+        db.technology.insert({"id": tech_id, "name": f"Tech {tech_id}", "era": eras[tech_id % 3],
+                              "researchCost": 20 + tech_id * 5, "treeType": TREE_TYPES[tech_id % len(TREE_TYPES)]})
+        if tech_id > 5:
+            db.prerequisite.insert({"prereqId": tech_id - 5, "techId": tech_id})
+    for building_id in range(1, 31):
+        db.building.insert({"id": building_id, "name": f"Building {building_id}",
+                            "category": BUILDING_CATEGORIES[building_id % len(BUILDING_CATEGORIES)],
+                            "buildTime": 3 + building_id % 5,
+                            "prerequisiteTechId": None if building_id <= 10 else building_id})
+    for unit_type_id in range(1, 21):
+        db.unittype.insert({"id": unit_type_id, "name": f"Unit {unit_type_id}", "buildTime": 2 + unit_type_id % 4,
+                            "category": UNIT_CATEGORIES[unit_type_id % len(UNIT_CATEGORIES)],
+                            "era": eras[unit_type_id % 3], "movement": 2,
+                            "prereqTechId": None if unit_type_id <= 5 else unit_type_id * 2})
+
+    game = db.game.insert({"id": 1, "mapRadius": 10, "turnLimit": 200, "userName": "bench", "year": 1000,
+                           "currentTurn": 1, "version": 0, "playerCivId": 1, "difficulty": "normal",
+                           "mapType": "continents", "gameMode": "standard"})
+    for civ_id in range(1, civs + 1):
+        db.civtype.insert({"id": civ_id, "name": f"Civ {civ_id}", "leaderName": f"Leader {civ_id}",
+                           "personality": PERSONALITIES[civ_id % len(PERSONALITIES)]})
+        db.gameciv.insert({"id": civ_id, "civTypeId": civ_id, "gameId": game["id"], "isPlayer": civ_id == 1,
+                           "startQ": 0, "startR": 0, "food": 0, "production": 0,
+                           "gold": 50, "science": 10, "culture": 5, "color": "#ffffff"})
+        for _ in range(cities):
+            city = db.city.insert({"gameCivId": civ_id, "name": f"City {civ_id}", "q": rng.randint(-10, 10),
+                                   "r": rng.randint(-10, 10), "population": rng.randint(1, 8), "createdTurn": 1,
+                                   "food": rng.randint(2, 10), "production": rng.randint(2, 10)})
+            for building_id in rng.sample(range(1, 11), 2):
+                db.playerbuilding.insert({"cityId": city["id"], "gameCivId": civ_id, "buildingId": building_id,
+                                          "status": "completed"})
+            db.playerbuilding.insert({"cityId": city["id"], "gameCivId": civ_id, "buildingId": rng.randint(11, 30),
+                                      "status": "in_progress", "progressPoints": 3})
+            db.buildqueue.insert({"cityId": city["id"], "buildingId": rng.randint(1, 30), "queuePosition": 1,
+                                  "queueOrder": 1})
+        for _ in range(units):
+            db.gameunit.insert({"gameCivId": civ_id, "unitTypeId": rng.randint(1, 20), "q": rng.randint(-10, 10),
+                                "r": rng.randint(-10, 10), "hp": 100, "moved": False, "createdTurn": 1,
+                                "promotionLevel": 0})
+        for tech_id in range(1, 6):
+            db.gamecivtechnology.insert({"gameCivId": civ_id, "techId": tech_id, "status": "completed",
+                                         "progressPoints": 100})
+        db.gamecivtechnology.insert({"gameCivId": civ_id, "techId": 6, "status": "in_progress", "progressPoints": 10})
+        for position, tech_id in enumerate((7, 8, 9), start=1):
+            db.researchqueue.insert({"gameCivId": civ_id, "techId": tech_id, "queuePosition": position})
+    return game
+
+
+def build_request(request_model, db: FakePrisma, game: Dict[str, Any], turn: int):
+    """플레이어 문명의 도시/유닛 상태를 담은 턴 종료 요청을 만듭니다."""
+    player_cities = [row for row in db.city.rows.values() if row["gameCivId"] == game["playerCivId"]]
+    player_units = [row for row in db.gameunit.rows.values() if row["gameCivId"] == game["playerCivId"]]
+
+    def location(row):
+        return {"q": row["q"], "r": row["r"], "s": -row["q"] - row["r"]}
+
+    cities = [{"id": row["id"], "name": row["name"], "population": row["population"] + turn % 3,
+               "location": location(row), "buildings": []} for row in player_cities]
+    units = [{"id": row["id"], "location": location(row), "hp": row["hp"], "maxHp": 100, "movement": 2,
+              "maxMovement": 2, "status": "idle"} for row in player_units]
+    now = datetime.now()
+    return request_model(**{
+        "capitalCity": cities[0] if cities else {"id": 0, "name": "-", "population": 1,
+                                                 "location": {"q": 0, "r": 0, "s": 0}, "buildings": []},
+        "cities": cities,
+        "units": units,
+        "civilizationId": game["playerCivId"],
+        "civilizationName": "Civ 1",
+        "difficulty": "normal",
+        "startTime": now,
+        "endTime": now,
+        "exploredTiles": 40 + turn,
+        "leaderName": "Leader 1",
+        "resources": {"gold": 50 + turn * 5, "science": 10 + turn, "culture": 5 + turn},
+        "successfulAttacks": 0,
+        "successfulDefenses": 0,
+        "techEra": "Medieval",
+        "territoryCaptured": 0,
+        "territoryLost": 0,
+        "totalCities": len(cities),
+        "totalPlayTime": turn * 60,
+        "totalScore": turn * 10,
+        "totalTechsResearched": 5,
+        "totalUnits": len(units),
+        "trades": 0,
+        "turn": turn,
+        "unexploredTiles": 300 - turn,
+        "unitsKilled": 0,
+        "victoryType": "science",
+        "unitsLost": 0,
+        "visibleTiles": 30,
+        "wars": 0,
+        "year": 1000 + turn * 25,
+        "gameId": game["id"],
+    })
+
+
+def _staged(db: FakePrisma, timings: Dict[str, float], stage: str, fn):
+    async def wrapper(*args, **kwargs):
+        # 백그라운드 요약 작업 안에서 호출되면 summary 단계로 집계
+        if db.current_stage() == "summary":
+            return await fn(*args, **kwargs)
+        started = time.perf_counter()
+        with db.stage(stage):
+            try:
+                return await fn(*args, **kwargs)
+            finally:
+                timings[stage] += time.perf_counter() - started
+    return wrapper
+
+
+def _ms(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))] * 1000, 3)
+
+
+def _git_revision() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(__file__)).stdout.strip()
+    except OSError:
+        return ""
+
+
+async def run(civs: int, cities: int, units: int, turns: int, seed: int, verbose: bool = False) -> Dict[str, Any]:
+    random.seed(seed)
+    db = FakePrisma()
+    game = seed_game(db, civs, cities, units, random.Random(seed))
+
+    # 라우터/서비스가 사용하는 DB를 인메모리 대체 클라이언트로 교체하고 단계별로 감쌈
+    timings: Dict[str, float] = defaultdict(float)
+    game_router.prisma = db
+    game_router.db_pool.client = db
+    snapshot_store.db = db
+    turn_commits.db = db
+    game_aggregates.db = db
+    game_aggregates.load = _staged(db, timings, "ai_civ_data", game_aggregates.load)
+    game_catalog.db = db
+    game_catalog.invalidate()
+    rule_ai_engine.decide = _staged(db, timings, "ai_decide", rule_ai_engine.decide)
+    game_router.apply_ai_decisions = _staged(db, timings, "ai_apply", game_router.apply_ai_decisions)
+    turn_commits.find = _staged(db, timings, "idempotency", turn_commits.find)
+    # 턴 선점(작업 전)과 결과 저장(작업 후)을 합쳐 commit 단계로 집계
+    turn_commits.claim = _staged(db, timings, "commit", turn_commits.claim)
+    turn_commits.complete = _staged(db, timings, "commit", turn_commits.complete)
+    summary_timings: Dict[str, float] = defaultdict(float)
+    worker = SummaryWorker(
+        _staged(db, summary_timings, "summary", game_router.collect_and_save_game_summary),
+        concurrency=1,
+        max_retries=0,
+    )
+    game_router.summary_worker = worker
+    worker.start()
+
+    request_model = inspect.signature(game_router.end_turn).parameters["request"].annotation
+    latencies: List[float] = []
+    stage_times: Dict[str, List[float]] = defaultdict(list)
+    failures = 0
+    for turn in range(1, turns + 1):
+        request = build_request(request_model, db, game, turn)
+        # 클라이언트가 턴 종료 전에 저장하는 턴 상태 (백그라운드 요약 작업이 이 스냅샷을 읽음, 측정에서 제외)
+        await snapshot_store.save(game["id"], turn, game["playerCivId"], {
+            "stateData": {"turn": turn, "year": 1000 + turn, "player_civ": {"name": "Civ 1", "leader": "Leader 1"},
+                          "cities": [{"id": city.id} for city in request.cities], "units": []},
+        }, year=1000 + turn)
+        timings.clear()
+        with contextlib.ExitStack() as output:
+            if not verbose:
+                output.enter_context(contextlib.redirect_stdout(io.StringIO()))
+                output.enter_context(contextlib.redirect_stderr(io.StringIO()))
+            started = time.perf_counter()
+            with db.stage("player_updates"):
+                response = await game_router.end_turn(request=request, idempotency_key=None)
+            elapsed = time.perf_counter() - started
+            # 요약 작업은 응답 이후 백그라운드에서 실행되므로 턴 지연과 분리해서 측정
+            await worker.join()
+        latencies.append(elapsed)
+        if getattr(response, "status_code", 200) != 200:
+            failures += 1
+        inner = sum(timings.values())
+        timings["player_updates"] += max(0.0, elapsed - inner)
+        for stage in TURN_STAGES:
+            stage_times[stage].append(timings.get(stage, 0.0))
+    await worker.stop()
+
+    stats = db.snapshot_stats()
+    stages = {}
+    for stage in TURN_STAGES + ("summary",):
+        ops = stats["queries"].get(stage, {})
+        total_queries = sum(ops.values())
+        stages[stage] = {
+            "ms_p50": _ms(stage_times[stage], 0.5) if stage in stage_times else None,
+            "ms_total": round(summary_timings["summary"] * 1000, 3) if stage == "summary"
+            else round(sum(stage_times[stage]) * 1000, 3),
+            "queries": total_queries,
+            "queries_per_turn": round(total_queries / turns, 1),
+            "bytes_written": stats["bytes_written"].get(stage, 0),
+            "operations": dict(sorted(ops.items(), key=lambda item: -item[1])),
+        }
+    turn_queries = sum(stages[stage]["queries"] for stage in TURN_STAGES)
+    return {
+        "meta": {
+            "revision": _git_revision(),
+            "created_at": datetime.now().isoformat(),
+            "civs": civs,
+            "cities_per_civ": cities,
+            "units_per_civ": units,
+            "turns": turns,
+            "seed": seed,
+        },
+        "turn_ms_p50": _ms(latencies, 0.5),
+        "turn_ms_p95": _ms(latencies, 0.95),
+        "turn_ms_max": _ms(latencies, 1.0),
+        "turn_ms_mean": round(statistics.mean(latencies) * 1000, 3),
+        "queries_per_turn": round(turn_queries / turns, 1),
+        "bytes_written_per_turn": round(sum(stages[stage]["bytes_written"] for stage in TURN_STAGES) / turns),
+        "failed_turns": failures,
+        "summary_worker": dict(worker.stats),
+        "stages": stages,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="턴 처리 헤드리스 벤치마크 (인메모리 DB)")
+    parser.add_argument("--civs", type=int, default=6)
+    parser.add_argument("--cities", type=int, default=5, help="문명당 도시 수")
+    parser.add_argument("--units", type=int, default=10, help="문명당 유닛 수")
+    parser.add_argument("--turns", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    parser.add_argument("--out", help="결과 JSON을 저장할 파일")
+    parser.add_argument("--verbose", action="store_true", help="라우터 출력 표시")
+    args = parser.parse_args()
+
+    result = asyncio.run(run(args.civs, args.cities, args.units, args.turns, args.seed, args.verbose))
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+    if args.json:
+        print(json.dumps(result, indent=2, ensure_ascii=False))
+    else:
+        for key in ("turn_ms_p50", "turn_ms_p95", "turn_ms_max", "queries_per_turn", "bytes_written_per_turn",
+                    "failed_turns"):
+            print(f"{key:>24}: {result[key]}")
+        print()
+        print(f"{'stage':>16} {'ms_p50':>9} {'queries/turn':>13} {'bytes':>10}")
+        for stage, data in result["stages"].items():
+            p50 = "-" if data["ms_p50"] is None else data["ms_p50"]
+            print(f"{stage:>16} {p50:>9} {data['queries_per_turn']:>13} {data['bytes_written']:>10}")
+    return 1 if result["failed_turns"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+"""
+턴 처리 핫 쿼리의 실행 계획 회귀 검사
+
+prisma/schema.prisma의 모델/인덱스 정의를 읽어 SQLite 메모리 DB에 같은 테이블과 인덱스를 만들고,
+데이터를 채운 뒤 EXPLAIN QUERY PLAN으로 각 핫 쿼리가
+- 필터 컬럼 전체를 사용하는 인덱스 검색(SEARCH ... USING INDEX (a=? AND b=?))을 하는지
+- 정렬을 위한 임시 B-tree(filesort에 해당)를 만들지 않는지
+확인합니다. MySQL 대신 SQLite를 사용하므로 옵티마이저 세부 동작은 다르지만,
+스키마에서 복합 인덱스가 빠지거나 컬럼 순서가 바뀌는 회귀를 잡아냅니다.
+
+사용법:
+    python tools/check_query_plans.py [--schema prisma/schema.prisma] [--rows 5000]
+하나라도 실패하면 종료 코드 1을 반환합니다.
+같은 검사가 tests/test_query_plans.py에서 pytest로 실행되므로 CI에서도 회귀가 잡힙니다.
+이 스크립트는 쿼리별 실행 계획을 직접 보려 할 때 사용합니다.
+"""
+import argparse
+import os
+import random
+import re
+import sqlite3
+import sys
+from typing import Dict, List, Tuple
+
+SCHEMA_PATH = os.path.join(os.path.dirname(__file__), "..", "prisma", "schema.prisma")
+
+# (모델, SQL, 인덱스로 처리되어야 하는 등호 조건 컬럼, 정렬 컬럼)
+HOT_QUERIES: List[Tuple[str, str, List[str], List[str]]] = [
+    ("GameCivTechnology",
+     'SELECT * FROM "GameCivTechnology" WHERE "gameCivId" = ? AND "status" = ?',
+     ["gameCivId", "status"], []),
+    ("GameCivTechnology",
+     'SELECT * FROM "GameCivTechnology" WHERE "gameCivId" = ? AND "techId" = ?',
+     ["gameCivId", "techId"], []),
+    ("PlayerBuilding",
+     'SELECT * FROM "PlayerBuilding" WHERE "cityId" = ? AND "status" = ?',
+     ["cityId", "status"], []),
+    ("TurnSnapshot",
+     'SELECT * FROM "TurnSnapshot" WHERE "gameId" = ? AND "turnNumber" = ?',
+     ["gameId", "turnNumber"], []),
+    ("TurnSnapshot",
+     'SELECT * FROM "TurnSnapshot" WHERE "gameId" = ? ORDER BY "turnNumber" DESC LIMIT 1',
+     ["gameId"], ["turnNumber"]),
+    ("GameCiv",
+     'SELECT * FROM "GameCiv" WHERE "gameId" = ? AND "isPlayer" = ?',
+     ["gameId", "isPlayer"], []),
+    ("ProductionQueue",
+     'SELECT * FROM "ProductionQueue" WHERE "cityId" = ? ORDER BY "queueOrder"',
+     ["cityId"], ["queueOrder"]),
+    ("ResearchQueue",
+     'SELECT * FROM "ResearchQueue" WHERE "gameCivId" = ? ORDER BY "queuePosition"',
+     ["gameCivId"], ["queuePosition"]),
+    ("Game",
+     'SELECT * FROM "Game" WHERE "pooled" = ? AND "mapRadius" = ? LIMIT 1',
+     ["pooled", "mapRadius"], []),
+    # 게임 집계 로더 (services/game_aggregate.py, 문명/도시 ID IN 목록의 각 값이 같은 경로를 탐)
+    ("City",
+     'SELECT * FROM "City" WHERE "gameCivId" = ?',
+     ["gameCivId"], []),
+    ("GameUnit",
+     'SELECT * FROM "GameUnit" WHERE "gameCivId" = ?',
+     ["gameCivId"], []),
+    ("PlayerBuilding",
+     'SELECT * FROM "PlayerBuilding" WHERE "gameCivId" = ?',
+     ["gameCivId"], []),
+    ("BuildQueue",
+     'SELECT * FROM "BuildQueue" WHERE "cityId" = ? ORDER BY "queuePosition"',
+     ["cityId"], ["queuePosition"]),
+]
+
+SCALAR_TYPES = {"String", "Int", "BigInt", "Boolean", "DateTime", "Json", "Float", "Decimal", "Bytes"}
+
+
+def parse_schema(text: str) -> Dict[str, Dict]:
+    """모델별 스칼라 컬럼과 @@index/@@unique 목록을 추출합니다."""
+    enums = set(re.findall(r"^enum\s+(\w+)\s*\{", text, re.M))
+    models = {}
+    for name, body in re.findall(r"^model\s+(\w+)\s*\{(.*?)^\}", text, re.M | re.S):
+        columns = []
+        indexes = []
+        for line in body.splitlines():
+            line = line.split("//")[0].strip()
+            if not line:
+                continue
+            if line.startswith("@@index") or line.startswith("@@unique"):
+                cols = re.search(r"\[([^\]]*)\]", line).group(1)
+                indexes.append((line.startswith("@@unique"), [c.strip() for c in cols.split(",")]))
+                continue
+            if line.startswith("@@"):
+                continue
+            parts = line.split()
+            if len(parts) < 2:
+                continue
+            base = parts[1].rstrip("?[]")
+            if parts[1].endswith("[]") or (base not in SCALAR_TYPES and base not in enums):
+                continue
+            columns.append(parts[0])
+            if "@unique" in line:
+                indexes.append((True, [parts[0]]))
+        models[name] = {"columns": columns, "indexes": indexes}
+    return models
+
+
+def build_database(models: Dict[str, Dict], tables: List[str], rows: int) -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    rng = random.Random(42)
+    for table in tables:
+        model = models[table]
+        cols = model["columns"]
+        conn.execute(f'CREATE TABLE "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in cols)})')
+        for i, (unique, index_cols) in enumerate(model["indexes"]):
+            kind = "UNIQUE INDEX" if unique else "INDEX"
+            conn.execute(
+                f'CREATE {kind} "{table}_idx{i}" ON "{table}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in index_cols)})'
+            )
+        # 고유 인덱스를 깨지 않도록 행 번호 기반 값을 사용하고, 나머지는 카디널리티를 다양하게
+        data = []
+        for row in range(rows):
+            values = []
+            for col in cols:
+                if col == "id":
+                    values.append(row + 1)
+                elif col.endswith("Id"):
+                    values.append(row // 20 if col in ("gameCivId", "cityId", "gameId") else row % 20)
+                elif col in ("status", "isPlayer"):
+                    values.append(rng.randint(0, 3))
+                else:
+                    values.append(rng.randint(0, 200))
+            data.append(values)
+        conn.executemany(
+            f'INSERT INTO "{table}" VALUES ({", ".join("?" for _ in cols)})', data
+        )
+    conn.execute("ANALYZE")
+    return conn
+
+
+def check_plan(conn: sqlite3.Connection, sql: str, eq_cols: List[str], order_cols: List[str]) -> Tuple[bool, str]:
+    params = [1] * sql.count("?")
+    plan = " | ".join(row[-1] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", params))
+    expected = " AND ".join(f"{c}=?" for c in eq_cols)
+    ok = "USING" in plan and "INDEX" in plan and f"({expected}" in plan
+    if order_cols and "TEMP B-TREE" in plan:
+        ok = False
+    return ok, plan
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="핫 쿼리 실행 계획 회귀 검사 (SQLite 대체 DB)")
+    parser.add_argument("--schema", default=SCHEMA_PATH)
+    parser.add_argument("--rows", type=int, default=5000)
+    args = parser.parse_args()
+
+    with open(args.schema, encoding="utf-8") as f:
+        models = parse_schema(f.read())
+
+    tables = sorted({model for model, _, _, _ in HOT_QUERIES})
+    conn = build_database(models, tables, args.rows)
+
+    failures = 0
+    for model, sql, eq_cols, order_cols in HOT_QUERIES:
+        ok, plan = check_plan(conn, sql, eq_cols, order_cols)
+        failures += 0 if ok else 1
+        print(f"[{'OK' if ok else 'FAIL'}] {sql}\n       {plan}")
+
+    print(f"\n{len(HOT_QUERIES) - failures}/{len(HOT_QUERIES)} 쿼리가 인덱스 계획을 사용합니다.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
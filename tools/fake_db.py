@@ -0,0 +1,386 @@
+"""
+벤치마크용 인메모리 Prisma 대체 클라이언트
+
+prisma-client-py의 비동기 모델 API 중 이 저장소가 사용하는 부분
+(find_unique / find_first / find_many / count / create / create_many / update / update_many /
+upsert / delete / delete_many, batch_(), tx())을 파이썬 dict로 흉내 냅니다.
+- where: 등호, None, in / not / lt / lte / gt / gte, OR / AND / NOT, 복합 고유키(gameId_turn 등)
+- order / take / skip, include(RELATIONS에 정의한 관계만)
+- update: increment / decrement / multiply / set
+모든 호출은 stats에 (단계, 모델.연산) 단위로 쿼리 수와 기록 바이트를 누적합니다.
+단계는 FakePrisma.stage() 컨텍스트로 지정합니다.
+"""
+import contextvars
+import json
+from collections import defaultdict
+from contextlib import asynccontextmanager, contextmanager
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+_stage: contextvars.ContextVar[str] = contextvars.ContextVar("fake_db_stage", default="other")
+
+# (모델, include 키) → (대상 모델, 내 컬럼, 대상 컬럼, 다건 여부)
+RELATIONS: Dict[Tuple[str, str], Tuple[str, str, str, bool]] = {
+    ("gameciv", "civType"): ("civtype", "civTypeId", "id", False),
+    ("gameciv", "cities"): ("city", "id", "gameCivId", True),
+    ("city", "buildings"): ("playerbuilding", "id", "cityId", True),
+    ("city", "productionQueue"): ("productionqueue", "id", "cityId", True),
+    ("playerbuilding", "building"): ("building", "buildingId", "id", False),
+    ("gamecivtechnology", "technology"): ("technology", "techId", "id", False),
+    ("researchqueue", "technology"): ("technology", "techId", "id", False),
+    ("gameunit", "unitType"): ("unittype", "unitTypeId", "id", False),
+    ("diplomacysession", "diplomacyActions"): ("diplomacyaction", "sessionId", "sessionId", True),
+}
+
+# 기본키 컬럼 이름이 id가 아닌 모델 (행에 id와 같은 값으로 함께 저장)
+PRIMARY_KEYS: Dict[str, str] = {
+    "diplomacysession": "sessionId",
+}
+
+
+def _plain(value: Any) -> Any:
+    """prisma Json/Base64 래퍼를 일반 값으로 바꿉니다."""
+    name = type(value).__name__
+    if name == "Json":
+        return value.data
+    if name == "Base64":
+        return value
+    return value
+
+
+def _encode_default(value: Any) -> Any:
+    plain = _plain(value)
+    return plain if plain is not value else str(value)
+
+
+def _size(data: Any) -> int:
+    return len(json.dumps(data, ensure_ascii=False, default=_encode_default).encode("utf-8"))
+
+
+def _same(a: Any, b: Any) -> bool:
+    # 라우터 코드가 BigInt 컬럼에 문자열 ID를 넘기는 경우가 있어 int/str 혼용을 허용
+    if a == b:
+        return True
+    if isinstance(a, (int, str)) and isinstance(b, (int, str)) and not isinstance(a, bool) and not isinstance(b, bool):
+        return str(a) == str(b)
+    return False
+
+
+def _match_value(actual: Any, cond: Any) -> bool:
+    if isinstance(cond, dict):
+        for op, expected in cond.items():
+            if op == "equals" and not _same(actual, expected):
+                return False
+            if op == "in" and not any(_same(actual, item) for item in expected):
+                return False
+            if op == "not":
+                if _match_value(actual, expected):
+                    return False
+            if op in ("lt", "lte", "gt", "gte"):
+                if actual is None:
+                    return False
+                if op == "lt" and not actual < expected:
+                    return False
+                if op == "lte" and not actual <= expected:
+                    return False
+                if op == "gt" and not actual > expected:
+                    return False
+                if op == "gte" and not actual >= expected:
+                    return False
+            if op == "contains" and (actual is None or expected not in actual):
+                return False
+        return True
+    if cond is None:
+        return actual is None
+    return _same(actual, cond)
+
+
+def _matches(row: Dict[str, Any], where: Optional[Dict[str, Any]]) -> bool:
+    for key, cond in (where or {}).items():
+        if key == "OR":
+            if not any(_matches(row, sub) for sub in cond):
+                return False
+        elif key == "AND":
+            subs = cond if isinstance(cond, list) else [cond]
+            if not all(_matches(row, sub) for sub in subs):
+                return False
+        elif key == "NOT":
+            subs = cond if isinstance(cond, list) else [cond]
+            if any(_matches(row, sub) for sub in subs):
+                return False
+        elif isinstance(cond, dict) and "_" in key and key not in row:
+            # 복합 고유키: {"gameId_turn": {"gameId": .., "turn": ..}}
+            if not _matches(row, cond):
+                return False
+        elif not _match_value(row.get(key), cond):
+            return False
+    return True
+
+
+class Record:
+    """조회 결과 행 (속성 접근)"""
+
+    def __init__(self, values: Dict[str, Any]):
+        self.__dict__.update(values)
+
+    def dict(self) -> Dict[str, Any]:
+        return dict(self.__dict__)
+
+    def __repr__(self) -> str:
+        return f"Record({self.__dict__})"
+
+
+class FakeModel:
+    def __init__(self, db: "FakePrisma", name: str):
+        self.db = db
+        self.name = name
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self._next_id = 1
+
+    # ---- 내부 ----
+
+    def _count(self, op: str, written: Any = None) -> None:
+        self.db.record(f"{self.name}.{op}", _size(written) if written is not None else 0)
+
+    def _select(self, where, order=None, skip=None, take=None) -> List[Dict[str, Any]]:
+        rows = [row for row in self.rows.values() if _matches(row, where)]
+        orders = order if isinstance(order, list) else ([order] if order else [])
+        for spec in reversed(orders):
+            for key, direction in reversed(list(spec.items())):
+                rows.sort(key=lambda row: (row.get(key) is None, row.get(key)), reverse=direction == "desc")
+        if skip:
+            rows = rows[skip:]
+        if take is not None:
+            rows = rows[:take] if take >= 0 else rows[take:]
+        return rows
+
+    def _record(self, row: Dict[str, Any], include: Optional[Dict[str, Any]] = None) -> Record:
+        values = dict(row)
+        for key, spec in (include or {}).items():
+            relation = RELATIONS.get((self.name, key))
+            if relation is None or not spec:
+                values[key] = None
+                continue
+            target, local, remote, many = relation
+            model = self.db.model(target)
+            nested = spec.get("include") if isinstance(spec, dict) else None
+            related = [r for r in model.rows.values() if _same(r.get(remote), row.get(local))]
+            if many:
+                values[key] = [model._record(r, nested) for r in related]
+            else:
+                values[key] = model._record(related[0], nested) if related else None
+        return Record(values)
+
+    def _apply(self, row: Dict[str, Any], data: Dict[str, Any]) -> None:
+        for key, value in data.items():
+            if isinstance(value, dict) and len(value) == 1 and next(iter(value)) in (
+                "increment", "decrement", "multiply", "divide", "set"
+            ):
+                op, amount = next(iter(value.items()))
+                current = row.get(key) or 0
+                row[key] = {
+                    "increment": lambda: current + amount,
+                    "decrement": lambda: current - amount,
+                    "multiply": lambda: current * amount,
+                    "divide": lambda: current / amount,
+                    "set": lambda: amount,
+                }[op]()
+            elif isinstance(value, dict) and ("connect" in value or "create" in value):
+                continue
+            else:
+                row[key] = _plain(value)
+
+    def insert(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """쿼리 집계 없이 행을 넣습니다. (시드 데이터용)"""
+        row = {key: _plain(value) for key, value in data.items()}
+        if row.get("id") is None:
+            row["id"] = self._next_id
+        self._next_id = max(self._next_id, int(row["id"]) + 1) if isinstance(row["id"], int) else self._next_id + 1
+        row.setdefault("createdAt", datetime.now())
+        if self.name in PRIMARY_KEYS:
+            row[PRIMARY_KEYS[self.name]] = row["id"]
+        self.rows[row["id"]] = row
+        return row
+
+    # ---- prisma 모델 API ----
+
+    async def find_unique(self, where, include=None):
+        self._count("find_unique")
+        rows = self._select(where, take=1)
+        return self._record(rows[0], include) if rows else None
+
+    async def find_first(self, where=None, include=None, order=None, skip=None):
+        self._count("find_first")
+        rows = self._select(where, order, skip, 1)
+        return self._record(rows[0], include) if rows else None
+
+    async def find_many(self, where=None, include=None, order=None, skip=None, take=None, **kwargs):
+        self._count("find_many")
+        return [self._record(row, include) for row in self._select(where, order, skip, take)]
+
+    async def count(self, where=None, **kwargs) -> int:
+        self._count("count")
+        return len(self._select(where))
+
+    async def create(self, data, include=None):
+        self._count("create", data)
+        return self._record(self.insert(data), include)
+
+    async def create_many(self, data, skip_duplicates: bool = False) -> int:
+        self._count("create_many", data)
+        for item in data:
+            self.insert(item)
+        return len(data)
+
+    async def update(self, where, data, include=None):
+        self._count("update", data)
+        rows = self._select(where, take=1)
+        if not rows:
+            return None
+        self._apply(rows[0], data)
+        return self._record(rows[0], include)
+
+    async def update_many(self, where, data) -> int:
+        self._count("update_many", data)
+        rows = self._select(where)
+        for row in rows:
+            self._apply(row, data)
+        return len(rows)
+
+    async def upsert(self, where, data=None, create=None, update=None, include=None):
+        # prisma-client-py는 data={"create":..., "update":...} 형태, 라우터 일부는 create/update 인자를 사용
+        if data is not None:
+            create, update = data.get("create"), data.get("update")
+        self._count("upsert", {"create": create, "update": update})
+        rows = self._select(where, take=1)
+        if rows:
+            self._apply(rows[0], update or {})
+            return self._record(rows[0], include)
+        return self._record(self.insert(create or {}), include)
+
+    async def delete(self, where, include=None):
+        self._count("delete")
+        rows = self._select(where, take=1)
+        if not rows:
+            return None
+        return self._record(self.rows.pop(rows[0]["id"]), include)
+
+    async def delete_many(self, where=None) -> int:
+        self._count("delete_many")
+        rows = self._select(where)
+        for row in rows:
+            self.rows.pop(row["id"], None)
+        return len(rows)
+
+
+class _Batch:
+    """batch_(): 모아 둔 쓰기를 한 번의 왕복으로 실행 (쿼리 1회로 집계)"""
+
+    def __init__(self, db: "FakePrisma"):
+        self._db = db
+        self._calls: List[Tuple[str, str, tuple, dict]] = []
+
+    def __getattr__(self, model: str):
+        batch = self
+
+        class _Recorder:
+            def __getattr__(self, op: str):
+                def call(*args, **kwargs):
+                    batch._calls.append((model, op, args, kwargs))
+                return call
+
+        return _Recorder()
+
+    async def commit(self) -> None:
+        self._db.record("batch", 0)
+        with self._db.paused():
+            for model, op, args, kwargs in self._calls:
+                await getattr(self._db.model(model), op)(*args, **kwargs)
+        self._calls = []
+
+
+class FakePrisma:
+    def __init__(self):
+        self._models: Dict[str, FakeModel] = {}
+        self._paused = False
+        self.queries: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        self.bytes_written: Dict[str, int] = defaultdict(int)
+
+    def model(self, name: str) -> FakeModel:
+        if name not in self._models:
+            self._models[name] = FakeModel(self, name)
+        return self._models[name]
+
+    def __getattr__(self, name: str) -> FakeModel:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return self.model(name)
+
+    # ---- 집계 ----
+
+    @contextmanager
+    def stage(self, name: str):
+        token = _stage.set(name)
+        try:
+            yield
+        finally:
+            _stage.reset(token)
+
+    def current_stage(self) -> str:
+        return _stage.get()
+
+    @contextmanager
+    def paused(self):
+        self._paused = True
+        try:
+            yield
+        finally:
+            self._paused = False
+
+    def record(self, operation: str, written: int) -> None:
+        if self._paused:
+            # 배치 안의 쓰기는 바이트만 누적
+            self.bytes_written[_stage.get()] += written
+            return
+        self.queries[_stage.get()][operation] += 1
+        self.bytes_written[_stage.get()] += written
+
+    def reset_stats(self) -> None:
+        self.queries.clear()
+        self.bytes_written.clear()
+
+    def snapshot_stats(self) -> Dict[str, Any]:
+        return {
+            "queries": {stage: dict(ops) for stage, ops in self.queries.items()},
+            "bytes_written": dict(self.bytes_written),
+        }
+
+    # ---- 클라이언트 API ----
+
+    def is_connected(self) -> bool:
+        return True
+
+    async def connect(self, timeout=None) -> None:
+        return None
+
+    async def disconnect(self, timeout=None) -> None:
+        return None
+
+    async def execute_raw(self, query: str, *args) -> int:
+        self.record("execute_raw", 0)
+        return 0
+
+    async def query_raw(self, query: str, *args) -> List[Dict[str, Any]]:
+        self.record("query_raw", 0)
+        return [{"1": 1}]
+
+    @asynccontextmanager
+    async def batch_(self):
+        batch = _Batch(self)
+        yield batch
+        await batch.commit()
+
+    @asynccontextmanager
+    async def tx(self, timeout=None, max_wait=None):
+        # 인메모리라 롤백은 흉내 내지 않음 (쿼리 수 집계용)
+        yield self
@@ -0,0 +1,41 @@
+"""
+테스트/벤치마크용 인프로세스 가짜 LLM 프로바이더
+
+services/llm_router.LLMRouter에 실제 프로바이더 대신 넣어 사용합니다.
+(HTTP로 Gemini API를 흉내 내는 서버는 tools/fake_llm_server.py)
+- text: 고정 응답 문자열, 또는 요청(LLMRequest)을 받아 응답을 만드는 함수
+- latency: 응답 지연(초)
+- failure_rate / fail: 무작위 실패 비율 / 항상 실패
+calls, cancelled에 호출 수와 (헤지 경쟁에서 져서) 취소된 호출 수를 기록합니다.
+"""
+import asyncio
+import random
+from typing import Callable, Union
+
+from services.llm_router import LLMProvider, LLMRequest
+
+
+class FakeProvider(LLMProvider):
+    """지연 시간과 실패율을 조절할 수 있는 가짜 프로바이더"""
+
+    def __init__(self, name: str, text: Union[str, Callable[[LLMRequest], str]] = "테스트 응답입니다.",
+                 latency: float = 0.0, failure_rate: float = 0.0, fail: bool = False):
+        self.name = name
+        self.text = text
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.fail = fail
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate(self, request: LLMRequest) -> str:
+        self.calls += 1
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.fail or (self.failure_rate and random.random() < self.failure_rate):
+            raise RuntimeError(f"{self.name} 가짜 프로바이더 실패")
+        return self.text(request) if callable(self.text) else self.text
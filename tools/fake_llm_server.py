@@ -0,0 +1,141 @@
+"""
+로컬 테스트용 가짜 LLM 서버 (Gemini generateContent 호환)
+
+AI 턴 계획기(services/ai_planner.py)를 실제 LLM 없이 시험하기 위한 서버입니다.
+프롬프트의 첫 번째 ```json 블록에서 문명별 후보(cty[].opt / un / tech)를 읽고
+그 안에서 무작위로 고른 계획을 {"plans": [...]} 형식으로 돌려줍니다.
+- --latency / --jitter: 응답 지연(초)과 무작위 추가 지연
+- --failure-rate: HTTP 500 응답 비율
+- --invalid-rate: 스키마에 맞지 않는 응답(후보에 없는 ID, 깨진 JSON) 비율
+표준 라이브러리만 사용합니다.
+
+사용법:
+    python tools/fake_llm_server.py [--port 8765] [--latency 0.3] [--failure-rate 0.1] [--invalid-rate 0.1]
+
+    # 다른 터미널에서
+    AI_PLANNER_MODE=llm AI_PLANNER_PROVIDER=gemini GOOGLE_API_KEY=fake \\
+    GEMINI_API_URL=http://127.0.0.1:8765/models uvicorn main:app
+"""
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+
+_JSON_FENCE = re.compile(r"```json\s*(.*?)```", re.S)
+
+
+def make_plans(state: Dict[str, Any], rng: random.Random) -> List[Dict[str, Any]]:
+    plans = []
+    for civ in state.get("civs", []):
+        cities = []
+        for city in civ.get("cty", []):
+            choices = [("building", item) for item in city.get("opt", [])]
+            choices += [("unit", item) for item in civ.get("un", [])]
+            if choices:
+                kind, item = rng.choice(choices)
+                cities.append({"city_id": city["id"], "build": {"type": kind, "id": item}})
+        techs = civ.get("tech", [])
+        plans.append({
+            "civ_id": civ.get("civ_id"),
+            "cities": cities,
+            "research": {"tech_id": rng.choice(techs)} if techs else None,
+        })
+    return plans
+
+
+def make_invalid(plans: List[Dict[str, Any]], rng: random.Random) -> str:
+    if rng.random() < 0.5 or not plans:
+        return '{"plans": [{"civ_id": '
+    broken = json.loads(json.dumps(plans))
+    broken[0]["research"] = {"tech_id": -1}
+    return json.dumps({"plans": broken})
+
+
+class FakeLLMHandler(BaseHTTPRequestHandler):
+    server_version = "FakeLLM/1.0"
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+    def _reply(self, status: int, payload: Dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if not self.path.split("?")[0].endswith(":generateContent"):
+            self._reply(404, {"error": {"message": "not found"}})
+            return
+        length = int(self.headers.get("Content-Length", "0"))
+        request = json.loads(self.rfile.read(length) or b"{}")
+        server = self.server
+        with server.lock:
+            rng = random.Random(server.rng.random())
+            server.requests += 1
+
+        time.sleep(server.latency + rng.uniform(0, server.jitter))
+        if rng.random() < server.failure_rate:
+            self._reply(500, {"error": {"message": "fake failure"}})
+            return
+
+        try:
+            prompt = request["contents"][0]["parts"][0]["text"]
+            match = _JSON_FENCE.search(prompt)
+            state = json.loads(match.group(1)) if match else {}
+        except (KeyError, IndexError, ValueError):
+            state = {}
+        plans = make_plans(state, rng)
+        if rng.random() < server.invalid_rate:
+            text = make_invalid(plans, rng)
+        else:
+            text = "```json\n" + json.dumps({"plans": plans}, ensure_ascii=False) + "\n```"
+        self._reply(200, {"candidates": [{"content": {"parts": [{"text": text}]}}]})
+
+
+def build_server(host: str, port: int, latency: float = 0.0, jitter: float = 0.0, failure_rate: float = 0.0,
+                 invalid_rate: float = 0.0, seed: int = 0, verbose: bool = False) -> ThreadingHTTPServer:
+    server = ThreadingHTTPServer((host, port), FakeLLMHandler)
+    server.latency = latency
+    server.jitter = jitter
+    server.failure_rate = failure_rate
+    server.invalid_rate = invalid_rate
+    server.rng = random.Random(seed)
+    server.lock = threading.Lock()
+    server.requests = 0
+    server.verbose = verbose
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="가짜 LLM 서버 (Gemini generateContent 호환)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.2)
+    parser.add_argument("--jitter", type=float, default=0.1)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    parser.add_argument("--invalid-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--verbose", action="store_true")
+    args = parser.parse_args()
+
+    server = build_server(args.host, args.port, args.latency, args.jitter, args.failure_rate,
+                          args.invalid_rate, args.seed, args.verbose)
+    print(f"가짜 LLM 서버: http://{args.host}:{args.port}/models/<model>:generateContent")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,253 @@
+"""
+LLM 프롬프트 크기/지연 측정
+
+기록된 게임 상태(턴별 AI 문명 데이터)로 기존 프롬프트와 압축 프롬프트(services/prompt_builder.py)를 비교합니다.
+- AI 턴 계획: 기존 get_ai_decisions 형식(문명마다 json.dumps(indent=2) 프롬프트 1개) vs
+  ai_planner.build_prompt(시스템 프롬프트 + 문명 AI_PLANNER_BATCH_SIZE개 묶음, 상위 K 후보, 변화분)
+- 상담가 채팅: 메시지마다 시스템 메시지에 상태를 덧붙이던 기존 방식 vs 최신 요약 하나로 교체
+토큰 수는 prompt_builder.estimate_tokens 추정치이고, 지연은 프롬프트 생성 시간(측정)과
+--prefill-tps 기준 프리필 시간(추정)입니다. 실제 LLM 호출은 하지 않습니다.
+
+상태 입력:
+- 기본: tools/bench_turns.py의 인메모리 게임을 --turns 동안 진행하며 계획기에 넘어간 AI 문명 데이터를 기록
+- --states FILE: 한 줄에 {"turn": N, "civs": [GameAggregate.civ_data() 결과, ...]} 형식의 JSONL (--save-states로 저장 가능)
+  (이 경우 건물/유닛/기술 카탈로그는 DATABASE_URL의 DB에서 읽습니다)
+
+사용법:
+    python tools/measure_prompts.py [--civs 6] [--cities 5] [--turns 20] [--states states.jsonl] [--json]
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import statistics
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from services.ai_engine import RuleBasedAIEngine  # noqa: E402
+from services.ai_planner import PLANNER_SYSTEM_PROMPT, AITurnPlanner, _PlanJob, ai_planner, civ_key  # noqa: E402
+from services.game_catalog import game_catalog  # noqa: E402
+from services.prompt_builder import StateMemory, advisor_context, estimate_tokens  # noqa: E402
+from tools import bench_turns  # noqa: E402
+
+
+def legacy_ai_prompt(civ_data: Dict[str, Any], game_state: Dict[str, Any], turn: int) -> str:
+    """기존 get_ai_decisions 프롬프트 (문명 하나당 한 번)"""
+    return f"""
+문명 게임에서 당신은 다음 문명의 AI 플레이어 역할을 맡게 됩니다:
+
+현재 턴: {turn}
+문명 이름: {civ_data.get('name')}
+
+도시:
+{json.dumps(civ_data.get('cities', []), indent=2, ensure_ascii=False)}
+
+연구 상태:
+{json.dumps(civ_data.get('research', {}), indent=2, ensure_ascii=False)}
+
+자원:
+{json.dumps(civ_data.get('resources', {}), indent=2, ensure_ascii=False)}
+
+게임 상황:
+{json.dumps(game_state, indent=2, ensure_ascii=False)}
+
+이번 턴에 당신의 문명이 취해야 할 행동을 결정하세요:
+1. 각 도시별로 건설할 건물 또는 생산할 유닛
+2. 연구할 기술
+3. 기타 중요한 결정사항
+
+다음 JSON 형식으로 답변해주세요:
+{{
+  "cities": [
+    {{
+      "city_id": 도시ID,
+      "build": {{
+        "type": "building" 또는 "unit",
+        "id": 건물ID 또는 유닛ID
+      }}
+    }}
+  ],
+  "research": {{
+    "tech_id": 연구할 기술ID
+  }}
+}}
+"""
+
+
+def legacy_advisor_update(game_state: Dict[str, Any]) -> str:
+    """기존 상담가 컨텍스트 업데이트 (메시지마다 시스템 메시지에 덧붙임)"""
+    player_civ = game_state.get("player_civ", {})
+    current_research = (player_civ.get("research", {}).get("in_progress") or {}).get("name", "없음")
+    city_info = "\n".join([f"- {city.get('name', '이름 없음')}: 인구 {city.get('population', '정보 없음')}, "
+                           f"건설 중: {(city.get('in_progress') or {}).get('building', '없음')}"
+                           for city in player_civ.get("cities", [])])
+    return f"""
+현재 게임 상태 업데이트:
+턴: {game_state.get('turn', '정보 없음')}
+시대: {game_state.get('era', '정보 없음')}
+현재 연구 중인 기술: {current_research}
+
+도시 정보:
+{city_info}
+
+이 정보를 바탕으로 플레이어의 질문에 답변해주세요.
+"""
+
+
+def game_overview(turn: int, civs: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """기존 프롬프트의 "게임 상황" (문명별 요약)"""
+    return {
+        "turn": turn,
+        "civilizations": [
+            {"id": civ.get("id"), "name": civ.get("name"), "cities": len(civ.get("cities", [])),
+             "resources": civ.get("resources")}
+            for civ in civs
+        ],
+    }
+
+
+async def record_states(civs: int, cities: int, units: int, turns: int, seed: int) -> List[Dict[str, Any]]:
+    """헤드리스 벤치 게임을 진행하며 턴별 AI 문명 데이터를 기록합니다."""
+    recorded: List[Dict[str, Any]] = []
+    original = ai_planner.plan
+
+    async def recording_plan(civ_datas, turn):
+        # end_turn은 턴마다 모든 AI 문명 데이터를 한 번에 계획기로 넘김
+        recorded.append({"turn": turn, "civs": json.loads(json.dumps(civ_datas, default=str))})
+        return await original(civ_datas, turn=turn)
+
+    ai_planner.plan = recording_plan
+    try:
+        await bench_turns.run(civs, cities, units, turns, seed)
+    finally:
+        ai_planner.plan = original
+    return recorded
+
+
+def measure(states: List[Dict[str, Any]], batch_size: int, top_k: int, prefill_tps: float) -> Dict[str, Any]:
+    engine = RuleBasedAIEngine(game_catalog, jitter=0.0)
+    planner = AITurnPlanner(engine, game_catalog, mode="llm", batch_size=batch_size, top_k=top_k)
+    advisor_memory = StateMemory()
+    legacy_advisor_system = ""
+    rows = []
+    for state in states:
+        turn, civs = state["turn"], state["civs"]
+
+        started = time.perf_counter()
+        overview = game_overview(turn, civs)
+        legacy_ai = [legacy_ai_prompt(civ, overview, turn) for civ in civs]
+        legacy_ai_ms = (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        jobs = [_PlanJob(civ_key(civ), civ, engine.options(civ, top_k), "", turn, None) for civ in civs]
+        compact_ai = [
+            PLANNER_SYSTEM_PROMPT + "\n\n" + planner.build_prompt(jobs[start:start + batch_size])
+            for start in range(0, len(jobs), batch_size)
+        ]
+        compact_ai_ms = (time.perf_counter() - started) * 1000
+
+        # 상담가: 첫 문명을 플레이어로 보고 매 턴 메시지 하나
+        game_state = {"turn": turn, "era": "Medieval", "player_civ": civs[0] if civs else {}}
+        legacy_advisor_system += "\n\n" + legacy_advisor_update(game_state)
+        compact_advisor = advisor_context(game_state, advisor_memory, "player")
+
+        legacy_ai_tokens = sum(estimate_tokens(prompt) for prompt in legacy_ai)
+        compact_ai_tokens = sum(estimate_tokens(prompt) for prompt in compact_ai)
+        rows.append({
+            "turn": turn,
+            "legacy_ai_tokens": legacy_ai_tokens,
+            "compact_ai_tokens": compact_ai_tokens,
+            "legacy_ai_requests": len(legacy_ai),
+            "compact_ai_requests": len(compact_ai),
+            "legacy_ai_build_ms": legacy_ai_ms,
+            "compact_ai_build_ms": compact_ai_ms,
+            "legacy_advisor_tokens": estimate_tokens(legacy_advisor_system),
+            "compact_advisor_tokens": estimate_tokens(compact_advisor),
+        })
+
+    def mean(key: str) -> float:
+        return round(statistics.mean(row[key] for row in rows), 2) if rows else 0.0
+
+    def reduction(before: float, after: float) -> float:
+        return round((1 - after / before) * 100, 1) if before else 0.0
+
+    legacy_ai, compact_ai = mean("legacy_ai_tokens"), mean("compact_ai_tokens")
+    legacy_advisor, compact_advisor = mean("legacy_advisor_tokens"), mean("compact_advisor_tokens")
+    return {
+        "turns": len(rows),
+        "civs_per_turn": round(statistics.mean(len(state["civs"]) for state in states), 1) if states else 0,
+        "ai": {
+            "legacy_tokens_per_turn": legacy_ai,
+            "compact_tokens_per_turn": compact_ai,
+            "token_reduction_pct": reduction(legacy_ai, compact_ai),
+            "legacy_requests_per_turn": mean("legacy_ai_requests"),
+            "compact_requests_per_turn": mean("compact_ai_requests"),
+            "legacy_build_ms": mean("legacy_ai_build_ms"),
+            "compact_build_ms": mean("compact_ai_build_ms"),
+            # 요청들이 순차로 처리된다고 볼 때의 프리필 시간 합 (추정)
+            "legacy_prefill_ms_est": round(legacy_ai / prefill_tps * 1000, 1),
+            "compact_prefill_ms_est": round(compact_ai / prefill_tps * 1000, 1),
+        },
+        "advisor": {
+            "legacy_context_tokens": legacy_advisor,
+            "compact_context_tokens": compact_advisor,
+            "legacy_context_tokens_last": rows[-1]["legacy_advisor_tokens"] if rows else 0,
+            "compact_context_tokens_last": rows[-1]["compact_advisor_tokens"] if rows else 0,
+            "token_reduction_pct": reduction(legacy_advisor, compact_advisor),
+        },
+    }
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    print(f"턴 {result['turns']}개, 턴당 AI 문명 {result['civs_per_turn']}개 (토큰은 추정치)\n")
+    for section, title in (("ai", "AI 턴 계획 프롬프트"), ("advisor", "상담가 시스템 컨텍스트")):
+        print(title)
+        for key, value in result[section].items():
+            print(f"  {key:>28}: {value}")
+        print()
+
+
+async def main_async(args) -> Dict[str, Any]:
+    if args.states:
+        with open(args.states, encoding="utf-8") as f:
+            states = [json.loads(line) for line in f if line.strip()]
+        await game_catalog.ensure_loaded()
+    else:
+        with contextlib.redirect_stdout(io.StringIO()):
+            states = await record_states(args.civs, args.cities, args.units, args.turns, args.seed)
+    if args.save_states:
+        with open(args.save_states, "w", encoding="utf-8") as f:
+            for state in states:
+                f.write(json.dumps(state, ensure_ascii=False) + "\n")
+    return measure(states, args.batch_size, args.top_k, args.prefill_tps)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LLM 프롬프트 토큰/지연 측정")
+    parser.add_argument("--civs", type=int, default=7)
+    parser.add_argument("--cities", type=int, default=5)
+    parser.add_argument("--units", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--states", help="기록된 상태 JSONL (없으면 벤치 게임으로 기록)")
+    parser.add_argument("--save-states", help="사용한 상태를 JSONL로 저장")
+    parser.add_argument("--batch-size", type=int, default=6)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--prefill-tps", type=float, default=1500.0, help="프리필 속도 가정 (토큰/초)")
+    parser.add_argument("--json", action="store_true", help="JSON으로 출력")
+    args = parser.parse_args()
+
+    result = asyncio.run(main_async(args))
+    if args.json:
+        print(json.dumps(result, ensure_ascii=False, indent=2))
+    else:
+        print_report(result)
+
+
+if __name__ == "__main__":
+    main()